@@ -4,7 +4,7 @@ Common agent utilities for Arcindex personas.
 
 from __future__ import annotations
 
-from typing import Optional
+from collections.abc import AsyncIterable
 
 from arcindex.artifacts import ArtifactRecord, ArtifactStore
 from arcindex.events import ArtifactEvent, EventEmitter, TokenEvent
@@ -24,28 +24,28 @@ class BaseAgent:
         self,
         name: str,
         *,
-        emitter: Optional[EventEmitter] = None,
-        artifact_store: Optional[ArtifactStore] = None,
+        emitter: EventEmitter | None = None,
+        artifact_store: ArtifactStore | None = None,
     ) -> None:
         self.name = name
         self._emitter = emitter
         self._artifact_store = artifact_store
 
     @property
-    def emitter(self) -> Optional[EventEmitter]:
+    def emitter(self) -> EventEmitter | None:
         """Return the configured emitter."""
         return self._emitter
 
     @property
-    def artifact_store(self) -> Optional[ArtifactStore]:
+    def artifact_store(self) -> ArtifactStore | None:
         """Return the configured artifact store."""
         return self._artifact_store
 
-    def bind_emitter(self, emitter: Optional[EventEmitter]) -> None:
+    def bind_emitter(self, emitter: EventEmitter | None) -> None:
         """Attach an event emitter."""
         self._emitter = emitter
 
-    def bind_artifact_store(self, store: Optional[ArtifactStore]) -> None:
+    def bind_artifact_store(self, store: ArtifactStore | None) -> None:
         """Attach an artifact store."""
         self._artifact_store = store
 
@@ -62,6 +62,15 @@ class BaseAgent:
         )
         self._emitter.emit(event)
 
+    async def astream_text(self, deltas: AsyncIterable[str], channel: str = "stdout") -> str:
+        """Emit a token event per delta as it arrives; returns the concatenated text."""
+        chunks: list[str] = []
+        async for delta in deltas:
+            chunks.append(delta)
+            if delta:
+                self.stream_text(delta, channel)
+        return "".join(chunks)
+
     def record_artifact(self, record: ArtifactRecord) -> None:
         """Emit an artifact event for the provided record."""
         if not self._emitter:
@@ -85,11 +94,11 @@ class BaseAgent:
         artifact_type: str,
         content: str,
         *,
-        phase: Optional[str] = None,
-        agent: Optional[str] = None,
+        phase: str | None = None,
+        agent: str | None = None,
         extension: str = ".md",
-        metadata: Optional[dict] = None,
-    ) -> Optional[ArtifactRecord]:
+        metadata: dict | None = None,
+    ) -> ArtifactRecord | None:
         """
         Persist a markdown artifact through the attached store.
 
@@ -113,10 +122,10 @@ class BaseAgent:
         artifact_type: str,
         document,
         *,
-        phase: Optional[str] = None,
-        agent: Optional[str] = None,
-        metadata: Optional[dict] = None,
-    ) -> Optional[ArtifactRecord]:
+        phase: str | None = None,
+        agent: str | None = None,
+        metadata: dict | None = None,
+    ) -> ArtifactRecord | None:
         """
         Persist a JSON artifact through the attached store.
         """
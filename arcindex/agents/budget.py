@@ -0,0 +1,185 @@
+"""
+Prompt budgets: local token estimates and compaction of discovery answers.
+
+Every summary and elicitation prompt inlines the discovery answers, and each
+elicitation round inlines the current summary as well, so prompts grow with
+long answers and repeated refinement. Before a request is sent, the current
+summary is truncated to its own share of the model's :class:`PromptBudget`
+(``max_summary_tokens``), and :func:`compact_answers` shrinks the answers to
+fit the rest:
+
+* answers already reflected verbatim in the current summary are omitted
+  (the summary carries them), and
+* answers longer than ``max_field_tokens`` are truncated; if the prompt still
+  does not fit, the per-answer limit is halved until it does or reaches
+  :data:`MIN_FIELD_TOKENS`.
+
+A prompt that still exceeds the budget raises :class:`PromptBudgetExceeded`
+rather than being sent. Token counts come from :func:`estimate_tokens`, a
+tokenizer-free approximation of the GPT tokenizers.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+
+DEFAULT_MAX_PROMPT_TOKENS = 16_000
+DEFAULT_MAX_FIELD_TOKENS = 1_000
+DEFAULT_MAX_SUMMARY_TOKENS = 8_000
+MIN_FIELD_TOKENS = 64
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+_CHARS_PER_WORD_TOKEN = 6
+_TRUNCATION_MARK = " […truncated]"
+# Shorter answers cost little to repeat and lose meaning without their key.
+_MIN_OMITTED_CHARS = 32
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate BPE token count of ``text``.
+
+    Each punctuation mark counts as one token and each word as one token per
+    six characters (common words are single tokens; rare, long ones split),
+    which tracks the GPT tokenizers closely for English prose.
+    """
+    return sum(
+        math.ceil(len(piece) / _CHARS_PER_WORD_TOKEN) for piece in _PIECES.findall(text)
+    )
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """``text`` cut at a word boundary to about ``max_tokens``, marked as truncated."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    kept = 0
+    end = 0
+    for match in _PIECES.finditer(text):
+        kept += math.ceil(len(match.group()) / _CHARS_PER_WORD_TOKEN)
+        if kept > max_tokens:
+            break
+        end = match.end()
+    return text[:end].rstrip() + _TRUNCATION_MARK
+
+
+@dataclass(frozen=True)
+class PromptBudget:
+    """Input token limits for one model's prompts."""
+
+    max_prompt_tokens: int = DEFAULT_MAX_PROMPT_TOKENS
+    max_field_tokens: int = DEFAULT_MAX_FIELD_TOKENS
+    max_summary_tokens: int = DEFAULT_MAX_SUMMARY_TOKENS
+
+    def __post_init__(self) -> None:
+        if self.max_prompt_tokens < 1 or min(
+            self.max_field_tokens, self.max_summary_tokens
+        ) < MIN_FIELD_TOKENS:
+            raise ValueError(
+                f"Prompt budgets need a positive prompt limit and field and summary "
+                f"limits of at least {MIN_FIELD_TOKENS} tokens."
+            )
+
+    def check(self, prompt_tokens: int, model: str) -> None:
+        """Raise :class:`PromptBudgetExceeded` when ``prompt_tokens`` is over the limit."""
+        if prompt_tokens > self.max_prompt_tokens:
+            raise PromptBudgetExceeded(model, prompt_tokens, self.max_prompt_tokens)
+
+
+DEFAULT_PROMPT_BUDGET = PromptBudget()
+
+# Per-model overrides; models not listed use DEFAULT_PROMPT_BUDGET.
+PROMPT_BUDGETS: dict[str, PromptBudget] = {
+    "gpt-4.1": PromptBudget(
+        max_prompt_tokens=32_000, max_field_tokens=2_000, max_summary_tokens=16_000
+    ),
+    "gpt-4.1-mini": DEFAULT_PROMPT_BUDGET,
+}
+
+
+def budget_for(model: str, budgets: Mapping[str, PromptBudget] | None = None) -> PromptBudget:
+    """The budget for ``model`` from ``budgets`` (default :data:`PROMPT_BUDGETS`)."""
+    return (PROMPT_BUDGETS if budgets is None else budgets).get(model, DEFAULT_PROMPT_BUDGET)
+
+
+class PromptBudgetExceeded(ValueError):
+    """A prompt did not fit its model's budget even after compaction."""
+
+    def __init__(self, model: str, prompt_tokens: int, max_prompt_tokens: int) -> None:
+        super().__init__(
+            f"Prompt for {model} is about {prompt_tokens} tokens after compaction; "
+            f"the budget is {max_prompt_tokens}."
+        )
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.max_prompt_tokens = max_prompt_tokens
+
+
+@dataclass
+class CompactedAnswers:
+    """Answers as they will be sent, and what compaction left out."""
+
+    answers: dict[str, str]
+    omitted: list[str] = field(default_factory=list)
+    truncated: list[str] = field(default_factory=list)
+
+
+def compact_answers(
+    answers: Mapping[str, str],
+    budget: PromptBudget,
+    *,
+    measure: Callable[[CompactedAnswers], int],
+    reflected_in: str | None = None,
+) -> CompactedAnswers:
+    """
+    Shrink ``answers`` until ``measure`` (the prompt's token count for the
+    compacted answers, including any note of those omitted) fits ``budget``.
+
+    Answers of a sentence or more found verbatim (ignoring case and
+    whitespace) in ``reflected_in`` are omitted first. The result may still
+    be over budget when the rest of the prompt alone is; callers check the
+    final prompt.
+    """
+    compacted = CompactedAnswers(answers=dict(answers))
+    if reflected_in:
+        haystack = _normalise(reflected_in)
+        for key, value in answers.items():
+            needle = _normalise(value)
+            if len(needle) >= _MIN_OMITTED_CHARS and needle in haystack:
+                del compacted.answers[key]
+                compacted.omitted.append(key)
+
+    limit = budget.max_field_tokens
+    while True:
+        for key in compacted.answers:
+            shortened = truncate_to_tokens(answers[key], limit)
+            if shortened != answers[key]:
+                compacted.answers[key] = shortened
+                if key not in compacted.truncated:
+                    compacted.truncated.append(key)
+        if limit <= MIN_FIELD_TOKENS or measure(compacted) <= budget.max_prompt_tokens:
+            return compacted
+        limit = max(MIN_FIELD_TOKENS, limit // 2)
+
+
+def _normalise(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+__all__ = [
+    "DEFAULT_MAX_FIELD_TOKENS",
+    "DEFAULT_MAX_PROMPT_TOKENS",
+    "DEFAULT_MAX_SUMMARY_TOKENS",
+    "DEFAULT_PROMPT_BUDGET",
+    "MIN_FIELD_TOKENS",
+    "PROMPT_BUDGETS",
+    "CompactedAnswers",
+    "PromptBudget",
+    "PromptBudgetExceeded",
+    "budget_for",
+    "compact_answers",
+    "estimate_tokens",
+    "truncate_to_tokens",
+]
@@ -0,0 +1,455 @@
+"""
+Disk-backed cache of LLM responses shared across runs and processes.
+
+:class:`CachingDiscoveryClient` wraps any
+:class:`~arcindex.agents.sdk.DiscoveryLLMClient` and serves a response from a
+:class:`ResponseCache` whenever the wrapped client would send a byte-identical
+request (same model, system prompt and user prompt; see
+:class:`~arcindex.agents.sdk.LLMRequest`). Test suites, replays and repeated
+projects therefore skip the round trip entirely.
+
+The cache is a single SQLite database, so concurrent runs and bridge worker
+processes share it safely. Entries expire ``ttl_s`` after they were written,
+and the least recently used entries are evicted once ``max_entries`` or
+``max_bytes`` is exceeded. Hit, miss, expiry and eviction counts are kept in
+the database alongside the entries. A hit is a plain read; the bookkeeping it
+causes is written later in batches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from arcindex.codec import dumps_compact, loads
+
+from .sdk import DiscoveryLLMClient, ElicitationResponse, LLMRequest, SummaryResponse
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600.0
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_FLUSH_EVERY = 64
+
+_SCHEMA = (
+    (
+        "CREATE TABLE IF NOT EXISTS responses ("
+        " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+        " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+    ),
+    "CREATE INDEX IF NOT EXISTS responses_by_access ON responses (accessed_at)",
+    "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+)
+_TOTALS = "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+_COUNTERS = ("hits", "misses", "expired", "evicted")
+
+
+@dataclass
+class CacheStats:
+    """Size of a response cache and what it has served."""
+
+    entries: int = 0
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evicted: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """
+    SQLite-backed LRU of response payloads with TTL and size limits.
+
+    Safe to share between threads; separate processes may open the same path.
+    ``ttl_s=None`` keeps entries until they are evicted.
+
+    Lookups only read: the access times and hit/miss counts they produce are
+    buffered and written in one transaction by the next :meth:`put`,
+    :meth:`stats` or :meth:`flush`, or once ``flush_every`` lookups have
+    accumulated. Expired entries are treated as misses and removed by those
+    same writes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl_s: float | None = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries < 1 or max_bytes < 1 or flush_every < 1:
+            raise ValueError("Response cache limits must be positive.")
+        self.path = Path(path)
+        self._ttl_s = ttl_s
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._flush_every = flush_every
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Buffered lookups: key -> latest access time, and counter increments.
+        self._accessed: dict[str, float] = {}
+        self._counts: Counter[str] = Counter()
+        self._lookups = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+
+    @property
+    def settings(self) -> tuple[float | None, int, int]:
+        """``(ttl_s, max_entries, max_bytes)`` this cache enforces."""
+        return self._ttl_s, self._max_entries, self._max_bytes
+
+    def get(self, key: str) -> str | None:
+        """The payload stored under ``key``, or ``None`` when absent or expired."""
+        now = self._clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            hit = row is not None and not self._expired(row[1], now)
+            if hit:
+                self._accessed[key] = now
+            self._counts["hits" if hit else "misses"] += 1
+            self._lookups += 1
+            if self._lookups >= self._flush_every:
+                self._lookups = 0
+                # Bookkeeping only: a busy database delays it rather than failing the lookup.
+                with suppress(sqlite3.OperationalError), self._transaction():
+                    self._write_pending(now)
+        return row[0] if hit else None
+
+    def put(self, key: str, value: str) -> None:
+        """Store ``value`` under ``key``, evicting expired then least recently used entries."""
+        now = self._clock()
+        size = len(value.encode("utf-8"))
+        with self._lock, self._transaction():
+            self._write_pending(now)
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict()
+
+    def flush(self) -> None:
+        """Write buffered access times and counts, and drop expired entries."""
+        now = self._clock()
+        with self._lock, self._transaction():
+            self._write_pending(now)
+
+    def clear(self) -> int:
+        """Remove every entry; returns how many were removed."""
+        with self._lock, self._transaction():
+            self._accessed.clear()
+            return self._db.execute("DELETE FROM responses").rowcount
+
+    def stats(self) -> CacheStats:
+        self.flush()
+        with self._lock:
+            entries, total = self._db.execute(_TOTALS).fetchone()
+            counters = dict(self._db.execute("SELECT name, value FROM counters").fetchall())
+        counts = {name: counters.get(name, 0) for name in _COUNTERS}
+        return CacheStats(entries=entries, bytes=total, **counts)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self._ttl_s is not None and now - created_at >= self._ttl_s
+
+    def _write_pending(self, now: float) -> None:
+        if self._accessed:
+            self._db.executemany(
+                "UPDATE responses SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+        if self._ttl_s is not None:
+            expired = self._db.execute(
+                "DELETE FROM responses WHERE created_at <= ?", (now - self._ttl_s,)
+            ).rowcount
+            self._counts["expired"] += expired
+        for name, amount in self._counts.items():
+            self._bump(name, amount)
+        self._counts.clear()
+        self._lookups = 0
+
+    def _evict(self) -> None:
+        entries, total = self._db.execute(_TOTALS).fetchone()
+        if entries <= self._max_entries and total <= self._max_bytes:
+            return
+        victims: list[tuple[str]] = []
+        oldest_first = "SELECT key, size FROM responses ORDER BY accessed_at, rowid"
+        for key, size in self._db.execute(oldest_first).fetchall():
+            if entries <= self._max_entries and total <= self._max_bytes:
+                break
+            victims.append((key,))
+            entries -= 1
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._bump("evicted", len(victims))
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        if amount:
+            self._db.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, amount),
+            )
+
+    def _transaction(self) -> _Transaction:
+        return _Transaction(self._db)
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT``/``ROLLBACK`` on an autocommit connection."""
+
+    def __init__(self, db: sqlite3.Connection) -> None:
+        self._db = db
+
+    def __enter__(self) -> None:
+        self._db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        self._db.execute("ROLLBACK" if exc_type is not None else "COMMIT")
+
+
+_OPEN_CACHES: dict[Path, ResponseCache] = {}
+_OPEN_CACHES_LOCK = threading.Lock()
+
+
+def open_response_cache(
+    path: Path,
+    *,
+    ttl_s: float | None = DEFAULT_TTL_SECONDS,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> ResponseCache:
+    """
+    Process-wide :class:`ResponseCache` for ``path``, opened on first use.
+
+    Raises ``ValueError`` if the cache is already open with other limits;
+    one database enforces one set of them.
+    """
+    resolved = Path(path).resolve()
+    with _OPEN_CACHES_LOCK:
+        cache = _OPEN_CACHES.get(resolved)
+        if cache is None:
+            cache = _OPEN_CACHES[resolved] = ResponseCache(
+                resolved, ttl_s=ttl_s, max_entries=max_entries, max_bytes=max_bytes
+            )
+        elif cache.settings != (ttl_s, max_entries, max_bytes):
+            raise ValueError(
+                f"Response cache {resolved} is already open with ttl_s, max_entries and "
+                f"max_bytes {cache.settings}, not {(ttl_s, max_entries, max_bytes)}."
+            )
+        return cache
+
+
+class CachingDiscoveryClient(DiscoveryLLMClient):
+    """
+    Serve repeated requests of ``client`` from ``cache``; misses call through and are stored.
+
+    The async methods run cache reads and writes in a worker thread, keeping
+    SQLite off the event loop.
+    """
+
+    def __init__(self, client: DiscoveryLLMClient, cache: ResponseCache) -> None:
+        self._client = client
+        self._cache = cache
+
+    @property
+    def cache(self) -> ResponseCache:
+        return self._cache
+
+    def summary_signature(self) -> tuple[str, str]:
+        return self._client.summary_signature()
+
+    def summary_request(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> LLMRequest:
+        return self._client.summary_request(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
+        )
+
+    def elicitation_request(
+        self,
+        *,
+        method_label: str,
+        method_instructions: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> LLMRequest:
+        return self._client.elicitation_request(
+            method_label=method_label,
+            method_instructions=method_instructions,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+
+    def generate_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> SummaryResponse:
+        key = self.summary_request(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
+        ).cache_key("summary")
+        cached = self._cache.get(key)
+        if cached is not None:
+            return SummaryResponse(**loads(cached))
+        response = self._client.generate_summary(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
+        )
+        self._cache.put(key, dumps_compact(asdict(response)))
+        return response
+
+    def apply_elicitation(
+        self,
+        *,
+        method_label: str,
+        method_instructions: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> ElicitationResponse:
+        key = self.elicitation_request(
+            method_label=method_label,
+            method_instructions=method_instructions,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        ).cache_key("elicitation")
+        cached = self._cache.get(key)
+        if cached is not None:
+            return ElicitationResponse(**loads(cached))
+        response = self._client.apply_elicitation(
+            method_label=method_label,
+            method_instructions=method_instructions,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+        self._cache.put(key, dumps_compact(asdict(response)))
+        return response
+
+    async def agenerate_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> SummaryResponse:
+        key = self.summary_request(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
+        ).cache_key("summary")
+        cached = await asyncio.to_thread(self._cache.get, key)
+        if cached is not None:
+            return SummaryResponse(**loads(cached))
+        response = await self._client.agenerate_summary(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
+        )
+        await asyncio.to_thread(self._cache.put, key, dumps_compact(asdict(response)))
+        return response
+
+    async def aapply_elicitation(
+        self,
+        *,
+        method_label: str,
+        method_instructions: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> ElicitationResponse:
+        key = self.elicitation_request(
+            method_label=method_label,
+            method_instructions=method_instructions,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        ).cache_key("elicitation")
+        cached = await asyncio.to_thread(self._cache.get, key)
+        if cached is not None:
+            return ElicitationResponse(**loads(cached))
+        response = await self._client.aapply_elicitation(
+            method_label=method_label,
+            method_instructions=method_instructions,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+        await asyncio.to_thread(self._cache.put, key, dumps_compact(asdict(response)))
+        return response
+
+    async def astream_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> AsyncIterator[str]:
+        # A hit replays the whole summary as one delta; a miss is stored only
+        # once the wrapped stream has finished.
+        key = self.summary_request(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
+        ).cache_key("summary")
+        cached = await asyncio.to_thread(self._cache.get, key)
+        if cached is not None:
+            yield SummaryResponse(**loads(cached)).markdown
+            return
+        deltas: list[str] = []
+        async for delta in self._client.astream_summary(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
+        ):
+            deltas.append(delta)
+            yield delta
+        response = SummaryResponse(markdown="".join(deltas).strip())
+        await asyncio.to_thread(self._cache.put, key, dumps_compact(asdict(response)))
+
+
+__all__ = [
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_MAX_ENTRIES",
+    "DEFAULT_TTL_SECONDS",
+    "CacheStats",
+    "CachingDiscoveryClient",
+    "ResponseCache",
+    "open_response_cache",
+]
@@ -8,12 +8,13 @@ can rely on true model output instead of deterministic templates.
 
 from __future__ import annotations
 
+from collections.abc import Mapping, MutableMapping
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Mapping, MutableMapping, Optional
 
 from arcindex.agents.base import BaseAgent
 from arcindex.artifacts import ArtifactRecord
+from arcindex.state.atomic import DEFAULT_DURABILITY, atomic_write_text
 from arcindex.tools import current_timestamp
 from arcindex.tools.elicitation import get_elicitation_method_details
 
@@ -31,8 +32,8 @@ class DiscoveryResult:
 
     summary_markdown: str
     summary_path: Path
-    summary_artifact: Optional[ArtifactRecord]
-    docs_markdown_path: Optional[Path] = None
+    summary_artifact: ArtifactRecord | None
+    docs_markdown_path: Path | None = None
 
 
 class DiscoveryAgent(BaseAgent):
@@ -44,17 +45,17 @@ class DiscoveryAgent(BaseAgent):
         self,
         *,
         phase: str = "discovery",
-        client: Optional[DiscoveryLLMClient] = None,
+        client: DiscoveryLLMClient | None = None,
         **kwargs,
     ) -> None:
         super().__init__("discovery", **kwargs)
         self._phase = phase
         self._client: DiscoveryLLMClient = client or self.default_client_factory()
-        self._cached_summary: Optional[str] = None
-        self._cached_answers: Optional[Mapping[str, str]] = None
-        self._cached_project_name: Optional[str] = None
+        self._cached_summary: str | None = None
+        self._cached_answers: Mapping[str, str] | None = None
+        self._cached_project_name: str | None = None
         self._cached_workflow_type: str = "greenfield-discovery"
-        self._cached_timestamp: Optional[str] = None
+        self._cached_timestamp: str | None = None
 
     # ------------------------------------------------------------------#
     # Summary generation and persistence
@@ -63,7 +64,7 @@ class DiscoveryAgent(BaseAgent):
     def build_summary_markdown(
         self,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         *,
         workflow_type: str,
     ) -> str:
@@ -81,10 +82,11 @@ class DiscoveryAgent(BaseAgent):
         state: MutableMapping[str, object],
         answers: Mapping[str, str],
         state_dir: Path,
-        project_name: Optional[str] = None,
-        timestamp: Optional[str] = None,
-        legacy_dir: Optional[Path] = None,
-        docs_root: Optional[Path] = None,
+        project_name: str | None = None,
+        timestamp: str | None = None,
+        legacy_dir: Path | None = None,
+        docs_root: Path | None = None,
+        durability: str = DEFAULT_DURABILITY,
     ) -> DiscoveryResult:
         """
         Persist discovery outputs to disk and, when available, the artifact store.
@@ -105,6 +107,7 @@ class DiscoveryAgent(BaseAgent):
             state_dir,
             ts,
             legacy_dir=legacy_dir,
+            durability=durability,
         )
 
         summary_markdown = self._cached_summary
@@ -112,13 +115,14 @@ class DiscoveryAgent(BaseAgent):
             # Safeguard: fall back to legacy builder if the SDK call failed.
             summary_markdown = build_discovery_summary_markdown(answers, project_name)
 
-        docs_markdown_path: Optional[Path] = None
+        docs_markdown_path: Path | None = None
         if docs_root is not None:
             docs_markdown_path = self._write_docs_markdown(
                 docs_root,
                 summary_markdown,
                 workflow_id=str(state.get("workflow_id", "")),
                 timestamp=ts,
+                durability=durability,
             )
 
         artifact_record = self.persist_markdown(
@@ -139,6 +143,47 @@ class DiscoveryAgent(BaseAgent):
             docs_markdown_path=docs_markdown_path,
         )
 
+    def load_persisted_summary(
+        self,
+        state: Mapping[str, object],
+        docs_root: Path | None = None,
+    ) -> DiscoveryResult | None:
+        """
+        Rebuild the result of an earlier :meth:`persist_summary` for this run.
+
+        Returns ``None`` unless the state records the summary file and every
+        output it would write (summary JSON, docs markdown, run artifact)
+        exists, so a retried step only skips work that fully landed.
+        """
+        if self._artifact_store is None:
+            return None
+        project_discovery = state.get("project_discovery")
+        if not isinstance(project_discovery, Mapping):
+            return None
+        summary_path = project_discovery.get("discovery_summary_path")
+        if not summary_path or not Path(str(summary_path)).exists():
+            return None
+        docs_markdown_path: Path | None = None
+        if docs_root is not None:
+            docs_path = project_discovery.get("discovery_summary_markdown_path")
+            if not docs_path or not Path(str(docs_path)).exists():
+                return None
+            docs_markdown_path = Path(str(docs_path))
+        record = self._artifact_store.existing(
+            "discovery_summary",
+            phase=self._phase,
+            agent=self.name,
+            mime_type="text/markdown",
+        )
+        if record is None:
+            return None
+        return DiscoveryResult(
+            summary_markdown=record.path.read_text(encoding="utf-8"),
+            summary_path=Path(str(summary_path)),
+            summary_artifact=record,
+            docs_markdown_path=docs_markdown_path,
+        )
+
     # ------------------------------------------------------------------#
     # Agent SDK helpers
     # ------------------------------------------------------------------#
@@ -146,7 +191,7 @@ class DiscoveryAgent(BaseAgent):
     def generate_summary(
         self,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         *,
         workflow_type: str,
     ) -> str:
@@ -159,37 +204,156 @@ class DiscoveryAgent(BaseAgent):
         self.stream_text(response.markdown)
         return response.markdown
 
+    async def agenerate_summary(
+        self,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        *,
+        workflow_type: str,
+    ) -> str:
+        """
+        Async :meth:`generate_summary`, through the client's async path.
+
+        The summary is streamed as token events while the model writes it,
+        rather than emitted once it is complete.
+        """
+        deltas = self._client.astream_summary(
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+        response = SummaryResponse(markdown=(await self.astream_text(deltas)).strip())
+        self._cache_summary(response, answers, project_name, workflow_type)
+        return response.markdown
+
+    def summary_signature(self) -> tuple[str, str]:
+        """Prompt and model identifying this agent's generated summaries."""
+        return self._client.summary_signature()
+
+    def prime_summary(
+        self,
+        markdown: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        *,
+        workflow_type: str,
+    ) -> None:
+        """Adopt a previously generated summary (e.g. a memoised one) without calling the model."""
+        self._cache_summary(
+            SummaryResponse(markdown=markdown), answers, project_name, workflow_type
+        )
+
     def apply_elicitation_method(
         self,
         *,
         method_label: str,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         workflow_type: str,
+        precomputed: ElicitationResponse | None = None,
     ) -> ElicitationResponse:
+        """
+        Refine the cached summary with ``method_label`` and adopt the result.
+
+        ``precomputed`` is a response already obtained from
+        :meth:`compute_elicitation` for the current summary; it is adopted
+        without calling the model.
+        """
         if self._cached_summary is None:
             self.generate_summary(answers, project_name, workflow_type=workflow_type)
 
-        instructions = get_elicitation_method_details(method_label)
-        response = self._client.apply_elicitation(
+        response = precomputed or self.compute_elicitation(
+            method_label=method_label,
+            current_summary=self._cached_summary or "",
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+        self._adopt_elicitation(response, answers, project_name)
+        return response
+
+    async def aapply_elicitation_method(
+        self,
+        *,
+        method_label: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+        precomputed: ElicitationResponse | None = None,
+    ) -> ElicitationResponse:
+        """Async :meth:`apply_elicitation_method`, through the client's async path."""
+        if self._cached_summary is None:
+            await self.agenerate_summary(answers, project_name, workflow_type=workflow_type)
+
+        response = precomputed or await self.acompute_elicitation(
             method_label=method_label,
-            method_instructions=instructions,
             current_summary=self._cached_summary or "",
             answers=answers,
             project_name=project_name,
             workflow_type=workflow_type,
         )
+        self._adopt_elicitation(response, answers, project_name)
+        return response
+
+    def compute_elicitation(
+        self,
+        *,
+        method_label: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> ElicitationResponse:
+        """
+        Call the model to apply ``method_label`` to ``current_summary``.
+
+        Leaves the agent's cached summary untouched, so several methods can be
+        computed concurrently against the same summary.
+        """
+        return self._client.apply_elicitation(
+            method_label=method_label,
+            method_instructions=get_elicitation_method_details(method_label),
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+
+    async def acompute_elicitation(
+        self,
+        *,
+        method_label: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> ElicitationResponse:
+        """Async :meth:`compute_elicitation`, through the client's async path."""
+        return await self._client.aapply_elicitation(
+            method_label=method_label,
+            method_instructions=get_elicitation_method_details(method_label),
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+
+    def _adopt_elicitation(
+        self,
+        response: ElicitationResponse,
+        answers: Mapping[str, str],
+        project_name: str | None,
+    ) -> None:
         self._cached_summary = response.markdown
         self._cached_answers = answers
         self._cached_project_name = project_name
         self.stream_text(response.markdown)
-        return response
 
     def _cache_summary(
         self,
         response: SummaryResponse,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         workflow_type: str,
     ) -> None:
         self._cached_summary = response.markdown
@@ -205,15 +369,14 @@ class DiscoveryAgent(BaseAgent):
         *,
         workflow_id: str,
         timestamp: str,
+        durability: str = DEFAULT_DURABILITY,
     ) -> Path:
         """
         Persist the AI generated markdown to the repository docs directory.
         """
         safe_workflow = workflow_id or f"arcindex-{timestamp}"
-        docs_dir = docs_root / "discovery"
-        docs_dir.mkdir(parents=True, exist_ok=True)
-        doc_path = docs_dir / f"{safe_workflow}-summary.md"
-        doc_path.write_text(markdown, encoding="utf-8")
+        doc_path = docs_root / "discovery" / f"{safe_workflow}-summary.md"
+        atomic_write_text(doc_path, markdown, durability=durability)
         return doc_path
 
 
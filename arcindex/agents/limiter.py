@@ -0,0 +1,414 @@
+"""
+Process-wide admission control for model calls: adaptive concurrency plus
+request and token buckets, per model.
+
+Every ``responses.create`` call from any run in the process first acquires a
+permit from :data:`LLM_LIMITER`:
+
+* **Concurrency** adapts by AIMD. Each call that finishes at a normal latency
+  raises the model's limit by ``1 / limit`` (about one per round of calls, up
+  to ``max_concurrency``). A ``429``, a timeout, or a latency more than
+  ``latency_spike_ratio`` times the running average halves it (down to
+  ``min_concurrency``), at most once per average latency so one burst of
+  rejections counts once.
+* **Rate** is capped by token buckets refilled at ``requests_per_minute`` and
+  ``tokens_per_minute`` (estimated prompt tokens), so bursts are spread out
+  before the provider rejects them.
+* **Queueing** is first come, first served across all runs. A caller waits no
+  longer than its cancellation token allows (see
+  :mod:`arcindex.tools.cancellation`): it gives up with
+  :class:`~arcindex.tools.cancellation.DeadlineExceeded` without sending when
+  its deadline passes, or when the buckets could not admit it in time.
+
+Waits are recorded as ``llm.queue`` spans, and :meth:`LLMLimiter.stats` reports
+the current limit, queue and cumulative queue wait per model. Limits come from
+``runs.llm_limits``, applied once per process by
+:func:`arcindex.orchestrator.configure_llm_clients`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+
+from arcindex.events.trace import Span, span
+from arcindex.tools.cancellation import (
+    CancellationToken,
+    DeadlineExceeded,
+    current_token,
+)
+
+DEFAULT_INITIAL_CONCURRENCY = 8
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_LATENCY_SPIKE_RATIO = 3.0
+_LATENCY_SMOOTHING = 0.2
+_LATENCY_WARMUP_CALLS = 5
+
+
+@dataclass(frozen=True)
+class ModelLimits:
+    """Admission limits for one model; ``None`` rates are not capped."""
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+    initial_concurrency: int = DEFAULT_INITIAL_CONCURRENCY
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    min_concurrency: int = 1
+    latency_spike_ratio: float = DEFAULT_LATENCY_SPIKE_RATIO
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.min_concurrency <= self.max_concurrency:
+            raise ValueError("Model limits need 1 <= min_concurrency <= max_concurrency.")
+        for rate in (self.requests_per_minute, self.tokens_per_minute):
+            if rate is not None and rate <= 0:
+                raise ValueError("Model rate limits must be positive.")
+
+
+@dataclass
+class LimiterStats:
+    """Admission of one model's calls so far."""
+
+    limit: float = 0.0
+    in_flight: int = 0
+    queued: int = 0
+    admitted: int = 0
+    expired: int = 0
+    throttled: int = 0
+    decreases: int = 0
+    queue_wait_s: float = 0.0
+    max_queue_wait_s: float = 0.0
+
+    @property
+    def mean_queue_wait_s(self) -> float:
+        return self.queue_wait_s / self.admitted if self.admitted else 0.0
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket holding up to one minute of ``per_minute``.
+
+    :meth:`reserve` takes tokens immediately, going into debt if needed, and
+    returns how long the caller must wait for that debt to be repaid.
+    """
+
+    def __init__(
+        self, per_minute: float, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._rate = per_minute / 60.0
+        self._capacity = per_minute
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._level = per_minute
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` (at most the capacity); seconds until it is covered."""
+        amount = min(amount, self._capacity)
+        with self._lock:
+            now = self._clock()
+            self._level = min(self._capacity, self._level + (now - self._updated) * self._rate)
+            self._updated = now
+            self._level -= amount
+            return max(0.0, -self._level / self._rate)
+
+    def refund(self, amount: float) -> None:
+        """Return a reservation that was not used."""
+        with self._lock:
+            self._level = min(self._capacity, self._level + min(amount, self._capacity))
+
+
+class Permit:
+    """Admission of one call; feeds its outcome back into the limit."""
+
+    def __init__(self, model: _ModelLimiter) -> None:
+        self._model = model
+        self._started = model.clock()
+        self._latency_s: float | None = None
+
+    def first_byte(self) -> None:
+        """Mark the response as started; its latency is measured up to here."""
+        if self._latency_s is None:
+            self._latency_s = self._model.clock() - self._started
+
+    def _release(self, error: BaseException | None) -> None:
+        self.first_byte()
+        self._model.release(self._latency_s or 0.0, error)
+
+
+class _Waiter:
+    def __init__(self) -> None:
+        self.future: Future[None] = Future()
+
+
+class _ModelLimiter:
+    """Concurrency window, buckets and FIFO queue of one model."""
+
+    def __init__(self, limits: ModelLimits, clock: Callable[[], float]) -> None:
+        self.clock = clock
+        self._limits = limits
+        self._lock = threading.Lock()
+        self._queue: deque[_Waiter] = deque()
+        self._limit = float(
+            min(limits.max_concurrency, max(limits.min_concurrency, limits.initial_concurrency))
+        )
+        self._in_flight = 0
+        self._latency: float | None = None
+        self._samples = 0
+        self._last_decrease = float("-inf")
+        self._requests = (
+            TokenBucket(limits.requests_per_minute, clock=clock)
+            if limits.requests_per_minute
+            else None
+        )
+        self._tokens = (
+            TokenBucket(limits.tokens_per_minute, clock=clock) if limits.tokens_per_minute else None
+        )
+        self._stats = LimiterStats()
+
+    def enqueue(self) -> _Waiter:
+        waiter = _Waiter()
+        with self._lock:
+            self._queue.append(waiter)
+        self._dispatch()
+        return waiter
+
+    def abandon(self, waiter: _Waiter | None) -> None:
+        """Leave the queue, or give back a granted slot (``waiter`` ``None``)."""
+        if waiter is not None and waiter.future.cancel():
+            with self._lock:
+                self._stats.expired += 1
+                if waiter in self._queue:
+                    self._queue.remove(waiter)
+            return
+        with self._lock:
+            self._stats.expired += 1
+            self._in_flight -= 1
+        self._dispatch()
+
+    def admitted(self, waited_s: float) -> None:
+        with self._lock:
+            self._stats.admitted += 1
+            self._stats.queue_wait_s += waited_s
+            self._stats.max_queue_wait_s = max(self._stats.max_queue_wait_s, waited_s)
+
+    def reserve(self, tokens: int) -> float:
+        """Take one request and ``tokens`` from the buckets; seconds to wait for them."""
+        delay = 0.0
+        if self._requests is not None:
+            delay = max(delay, self._requests.reserve(1))
+        if self._tokens is not None:
+            delay = max(delay, self._tokens.reserve(tokens))
+        return delay
+
+    def refund(self, tokens: int) -> None:
+        if self._requests is not None:
+            self._requests.refund(1)
+        if self._tokens is not None:
+            self._tokens.refund(tokens)
+
+    def release(self, latency_s: float, error: BaseException | None) -> None:
+        limits = self._limits
+        now = self.clock()
+        with self._lock:
+            self._in_flight -= 1
+            throttled = _is_throttle(error)
+            spike = (
+                error is None
+                and self._samples >= _LATENCY_WARMUP_CALLS
+                and self._latency is not None
+                and latency_s > limits.latency_spike_ratio * self._latency
+            )
+            if throttled:
+                self._stats.throttled += 1
+            if throttled or spike:
+                # One burst of rejections is one signal: back off at most once per
+                # typical call duration.
+                if now - self._last_decrease >= (self._latency or 1.0):
+                    self._limit = max(float(limits.min_concurrency), self._limit / 2)
+                    self._last_decrease = now
+                    self._stats.decreases += 1
+            elif error is None:
+                self._limit = min(float(limits.max_concurrency), self._limit + 1 / self._limit)
+            if error is None:
+                self._samples += 1
+                self._latency = (
+                    latency_s
+                    if self._latency is None
+                    else (1 - _LATENCY_SMOOTHING) * self._latency + _LATENCY_SMOOTHING * latency_s
+                )
+        self._dispatch()
+
+    def stats(self) -> LimiterStats:
+        with self._lock:
+            stats = LimiterStats(**vars(self._stats))
+            stats.limit = self._limit
+            stats.in_flight = self._in_flight
+            stats.queued = len(self._queue)
+            return stats
+
+    def _dispatch(self) -> None:
+        granted = []
+        with self._lock:
+            while self._queue and self._in_flight < int(self._limit):
+                waiter = self._queue.popleft()
+                if waiter.future.set_running_or_notify_cancel():
+                    self._in_flight += 1
+                    granted.append(waiter)
+        for waiter in granted:
+            waiter.future.set_result(None)
+
+
+def _is_throttle(error: BaseException | None) -> bool:
+    if error is None:
+        return False
+    if getattr(error, "status_code", None) == 429 or isinstance(error, TimeoutError):
+        return True
+    return type(error).__name__ in {"RateLimitError", "APITimeoutError"}
+
+
+class LLMLimiter:
+    """Per-model admission control shared by every client in the process."""
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._limits: dict[str, ModelLimits] = {}
+        self._models: dict[str, _ModelLimiter] = {}
+
+    def configure(self, model: str, limits: ModelLimits) -> None:
+        """Set ``model``'s limits; calls already admitted or queued keep the old ones."""
+        with self._lock:
+            if self._limits.get(model) != limits:
+                self._limits[model] = limits
+                self._models.pop(model, None)
+
+    def stats(self) -> dict[str, LimiterStats]:
+        with self._lock:
+            models = dict(self._models)
+        return {model: state.stats() for model, state in models.items()}
+
+    @contextmanager
+    def acquire(self, model: str, tokens: int = 0) -> Iterator[Permit]:
+        """Wait (in this thread) for admission of a call to ``model`` sending ``tokens``."""
+        state = self._model(model)
+        token = current_token()
+        waiter = state.enqueue()
+        start = self._clock()
+        with span("llm.queue", "llm", model=model, tokens=tokens) as record:
+            self._wait(state, waiter, token)
+            delay = self._reserve(state, token, tokens)
+            if delay:
+                time.sleep(delay)
+            self._admitted(state, record, start)
+        permit = Permit(state)
+        try:
+            yield permit
+        except BaseException as exc:
+            permit._release(exc)
+            raise
+        permit._release(None)
+
+    @asynccontextmanager
+    async def aacquire(self, model: str, tokens: int = 0) -> AsyncIterator[Permit]:
+        """Async :meth:`acquire`: the wait does not hold a thread."""
+        state = self._model(model)
+        token = current_token()
+        waiter = state.enqueue()
+        start = self._clock()
+        with span("llm.queue", "llm", model=model, tokens=tokens) as record:
+            # Shielded so giving up leaves the slot to :meth:`_ModelLimiter.abandon`.
+            granted = asyncio.shield(asyncio.wrap_future(waiter.future))
+            try:
+                await (token.run(granted) if token is not None else granted)
+            except BaseException:
+                state.abandon(waiter)
+                raise
+            delay = self._reserve(state, token, tokens)
+            if delay:
+                try:
+                    await asyncio.sleep(delay)
+                except BaseException:
+                    state.refund(tokens)
+                    state.abandon(waiter)
+                    raise
+            self._admitted(state, record, start)
+        permit = Permit(state)
+        try:
+            yield permit
+        except BaseException as exc:
+            permit._release(exc)
+            raise
+        permit._release(None)
+
+    def _model(self, model: str) -> _ModelLimiter:
+        with self._lock:
+            state = self._models.get(model)
+            if state is None:
+                limits = self._limits.get(model, ModelLimits())
+                state = self._models[model] = _ModelLimiter(limits, self._clock)
+            return state
+
+    @staticmethod
+    def _wait(
+        state: _ModelLimiter, waiter: _Waiter, token: CancellationToken | None
+    ) -> None:
+        if token is None:
+            waiter.future.result()
+            return
+        woken = threading.Event()
+        waiter.future.add_done_callback(lambda _: woken.set())
+        unregister = token.add_callback(woken.set)
+        try:
+            woken.wait(token.remaining())
+        finally:
+            unregister()
+        if not waiter.future.done():
+            state.abandon(waiter)
+            token.raise_if_cancelled()
+            raise DeadlineExceeded()
+        if token.is_cancelled():
+            state.abandon(waiter)
+            token.raise_if_cancelled()
+
+    @staticmethod
+    def _reserve(
+        state: _ModelLimiter, token: CancellationToken | None, tokens: int
+    ) -> float:
+        delay = state.reserve(tokens)
+        remaining = token.remaining() if token is not None else None
+        if delay and remaining is not None and delay > remaining:
+            # The buckets cannot admit the call in time; give the budget back
+            # rather than sleep until the deadline.
+            state.refund(tokens)
+            state.abandon(None)
+            raise DeadlineExceeded()
+        return delay
+
+    def _admitted(self, state: _ModelLimiter, record: Span | None, start: float) -> None:
+        waited = self._clock() - start
+        state.admitted(waited)
+        if record is not None:
+            record.args["wait_ms"] = round(waited * 1000, 3)
+
+
+# Shared by every OpenAI client in the process: provider limits apply to the
+# account, not to one run.
+LLM_LIMITER = LLMLimiter()
+
+
+__all__ = [
+    "DEFAULT_INITIAL_CONCURRENCY",
+    "DEFAULT_MAX_CONCURRENCY",
+    "LLM_LIMITER",
+    "LLMLimiter",
+    "LimiterStats",
+    "ModelLimits",
+    "Permit",
+    "TokenBucket",
+]
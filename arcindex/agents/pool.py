@@ -0,0 +1,189 @@
+"""
+Process-wide pool of reusable SDK clients.
+
+Constructing an ``OpenAI`` client builds a fresh HTTP client, connection pool
+and TLS session, so doing it per call pays connection setup on every request.
+A :class:`ClientPool` instead leases out idle clients and takes them back
+afterwards, keeping their keep-alive connections warm for the next call from
+any run in the process.
+
+A lease is exclusive, so aborting a cancelled request (which closes its
+client's connections) cannot disturb another run's request; an aborted
+client is discarded rather than returned to the pool.
+
+Async clients need no pool: one client multiplexes every concurrent request
+of an event loop, and a cancelled request is aborted by cancelling its task.
+Their connections belong to the loop that opened them, though, so
+:class:`LoopBoundClients` keeps one client per running loop, to be closed
+with :meth:`LoopBoundClients.aclose` before the loop ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import threading
+import weakref
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_MAX_IDLE_CLIENTS = 8
+
+
+@dataclass
+class PoolStats:
+    """How a pool's leases were served."""
+
+    created: int = 0
+    reused: int = 0
+    discarded: int = 0
+    idle: int = 0
+
+
+class ClientLease:
+    """One exclusive use of a pooled client."""
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+        self.aborted = False
+
+    def abort(self) -> None:
+        """Close the client, failing its in-flight request; it is not reused."""
+        self.aborted = True
+        _close(self.client)
+
+
+class ClientPool:
+    """
+    Thread-safe pool of clients built by ``factory``.
+
+    At most ``max_idle`` clients are kept between calls; leases beyond that
+    are served by new clients, which are closed when returned.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        *,
+        max_idle: int = DEFAULT_MAX_IDLE_CLIENTS,
+    ) -> None:
+        if max_idle < 0:
+            raise ValueError("max_idle cannot be negative.")
+        self._factory = factory
+        self._max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle: list[Any] = []
+        self._stats = PoolStats()
+
+    @property
+    def max_idle(self) -> int:
+        return self._max_idle
+
+    def resize(self, max_idle: int) -> None:
+        """Change how many idle clients are kept, closing any surplus."""
+        if max_idle < 0:
+            raise ValueError("max_idle cannot be negative.")
+        with self._lock:
+            self._max_idle = max_idle
+            surplus, self._idle = self._idle[max_idle:], self._idle[:max_idle]
+        for client in surplus:
+            _close(client)
+
+    @contextmanager
+    def lease(self) -> Iterator[ClientLease]:
+        with self._lock:
+            client = self._idle.pop() if self._idle else None
+            if client is None:
+                self._stats.created += 1
+            else:
+                self._stats.reused += 1
+        lease = ClientLease(client if client is not None else self._factory())
+        try:
+            yield lease
+        finally:
+            self._release(lease)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                created=self._stats.created,
+                reused=self._stats.reused,
+                discarded=self._stats.discarded,
+                idle=len(self._idle),
+            )
+
+    def close(self) -> None:
+        """Close every idle client."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for client in idle:
+            _close(client)
+
+    def _release(self, lease: ClientLease) -> None:
+        with self._lock:
+            keep = not lease.aborted and len(self._idle) < self._max_idle
+            if keep:
+                self._idle.append(lease.client)
+            else:
+                self._stats.discarded += 1
+        if not keep and not lease.aborted:
+            _close(lease.client)
+
+
+class LoopBoundClients:
+    """
+    One client built by ``factory`` per event loop, shared by all its tasks.
+
+    Entry points that run a fresh loop (e.g. through :func:`asyncio.run`)
+    await :meth:`aclose` before the loop ends, so its client's connections
+    are not left behind. A loop closed without it just drops its client.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self) -> Any:
+        """The running loop's client, created on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = self._clients[loop] = self._factory()
+            return client
+
+    async def aclose(self) -> None:
+        """Close the running loop's client, if it has one; the next :meth:`get` builds another."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await _aclose(client)
+
+
+def _close(client: Any) -> None:
+    close = getattr(client, "close", None)
+    if callable(close):
+        close()
+
+
+async def _aclose(client: Any) -> None:
+    close = getattr(client, "close", None)
+    if callable(close):
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+
+
+__all__ = [
+    "DEFAULT_MAX_IDLE_CLIENTS",
+    "ClientLease",
+    "ClientPool",
+    "LoopBoundClients",
+    "PoolStats",
+]
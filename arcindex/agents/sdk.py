@@ -9,21 +9,82 @@ default factory can be swapped during tests.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, List, Mapping, Optional
+import asyncio
+import hashlib
+from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from typing import Any
+
+from arcindex.codec import dumps_compact
+from arcindex.events.trace import span
+from arcindex.events.usage import record_llm_request
+from arcindex.tools.cancellation import (
+    CancellationError,
+    CancellationToken,
+    abort_on_cancel,
+    current_token,
+)
+from arcindex.tools.retry import CircuitBreaker
+
+from .budget import (
+    CompactedAnswers,
+    PromptBudget,
+    budget_for,
+    compact_answers,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+from .limiter import LLM_LIMITER, LLMLimiter
+from .pool import ClientPool, LoopBoundClients
 
 try:  # pragma: no cover - the OpenAI SDK may not be installed in test environments
-    from openai import OpenAI
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 except Exception:  # pragma: no cover - fall back to a stub to keep imports happy
+    AsyncOpenAI = None  # type: ignore[misc,assignment]
     OpenAI = None  # type: ignore[misc,assignment]
 
 
+@dataclass(frozen=True)
+class LLMRequest:
+    """The model and prompts a client call sends; identical requests share cached responses."""
+
+    model: str
+    system: str
+    user: str
+    # Answers left out of, or shortened in, the prompt to fit its budget.
+    omitted_answers: tuple[str, ...] = field(default=(), compare=False)
+    truncated_answers: tuple[str, ...] = field(default=(), compare=False)
+    truncated_summary: bool = field(default=False, compare=False)
+
+    def cache_key(self, purpose: str) -> str:
+        payload = dumps_compact([purpose, self.model, self.system, self.user])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Estimated input tokens (see :func:`~arcindex.agents.budget.estimate_tokens`)."""
+        return estimate_tokens(self.system) + estimate_tokens(self.user)
+
+    def trace_args(self, purpose: str) -> dict[str, Any]:
+        """Span arguments recording what this request sends."""
+        return {
+            "model": self.model,
+            "purpose": purpose,
+            "prompt_tokens": self.prompt_tokens,
+            "omitted_answers": len(self.omitted_answers),
+            "truncated_answers": len(self.truncated_answers),
+            "truncated_summary": self.truncated_summary,
+        }
+
+
 @dataclass
 class SummaryResponse:
     """Structured response from the LLM when generating a discovery summary."""
 
     markdown: str
-    reasoning: Optional[str] = None
+    reasoning: str | None = None
 
 
 @dataclass
@@ -32,7 +93,7 @@ class ElicitationResponse:
 
     markdown: str
     method_label: str
-    notes: Optional[str] = None
+    notes: str | None = None
 
 
 class DiscoveryLLMClient:
@@ -48,11 +109,73 @@ class DiscoveryLLMClient:
         self,
         *,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         workflow_type: str,
     ) -> SummaryResponse:
         raise NotImplementedError
 
+    def summary_signature(self) -> tuple[str, str]:
+        """
+        Prompt and model that determine ``generate_summary`` output.
+
+        Used to key memoised summaries; clients whose output depends on more
+        than their inputs should include it here.
+        """
+        return type(self).__qualname__, ""
+
+    def summary_request(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> LLMRequest:
+        """
+        What ``generate_summary`` would send for these inputs.
+
+        The default describes the inputs themselves; clients that build prompts
+        should return those, so equivalent inputs share cache entries.
+        """
+        return LLMRequest(
+            model=type(self).__qualname__,
+            system="",
+            user=dumps_compact(
+                {
+                    "answers": dict(answers),
+                    "project_name": project_name,
+                    "workflow_type": workflow_type,
+                },
+                sort_keys=True,
+            ),
+        )
+
+    def elicitation_request(
+        self,
+        *,
+        method_label: str,
+        method_instructions: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> LLMRequest:
+        """What ``apply_elicitation`` would send for these inputs (see :meth:`summary_request`)."""
+        return LLMRequest(
+            model=type(self).__qualname__,
+            system="",
+            user=dumps_compact(
+                {
+                    "method_label": method_label,
+                    "method_instructions": method_instructions,
+                    "current_summary": current_summary,
+                    "answers": dict(answers),
+                    "project_name": project_name,
+                    "workflow_type": workflow_type,
+                },
+                sort_keys=True,
+            ),
+        )
+
     def apply_elicitation(
         self,
         *,
@@ -60,35 +183,230 @@ class DiscoveryLLMClient:
         method_instructions: str,
         current_summary: str,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         workflow_type: str,
     ) -> ElicitationResponse:
         raise NotImplementedError
 
+    async def agenerate_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> SummaryResponse:
+        """
+        Async :meth:`generate_summary`.
+
+        The default runs the synchronous method in a worker thread; clients
+        with an async transport override it to avoid holding a thread.
+        """
+        return await asyncio.to_thread(
+            self.generate_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+
+    async def aapply_elicitation(
+        self,
+        *,
+        method_label: str,
+        method_instructions: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> ElicitationResponse:
+        """Async :meth:`apply_elicitation` (see :meth:`agenerate_summary`)."""
+        return await asyncio.to_thread(
+            self.apply_elicitation,
+            method_label=method_label,
+            method_instructions=method_instructions,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+
+    async def astream_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the summary :meth:`agenerate_summary` would return as markdown deltas.
+
+        The default yields the whole summary at once; clients with a streaming
+        transport override it so callers see text while it is generated.
+        """
+        response = await self.agenerate_summary(
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+        yield response.markdown
+
+
+_SUMMARY_SYSTEM_PROMPT = (
+    "You are the Arcindex Discovery Agent. "
+    "Produce a concise, implementation-ready discovery summary in markdown. "
+    "Respect the heading structure shown in the instructions and do not invent "
+    "additional sections. Capture concrete details from the provided answers."
+)
+
+_ELICITATION_SYSTEM_PROMPT = (
+    "Apply the requested elicitation method to the discovery summary. "
+    "Preserve markdown formatting, keep the original headings, and fold the "
+    "refinements directly into the summary. Provide the updated summary only."
+)
+
+
+def _llm_span(request: LLMRequest, purpose: str, **args: Any) -> AbstractContextManager[Any]:
+    """Trace span for sending ``request``, which also counts it against the current node."""
+    record_llm_request(request.prompt_tokens)
+    return span("openai.responses.create", "llm", **args, **request.trace_args(purpose))
+
+
+def _request_options(token: CancellationToken | None) -> dict[str, Any]:
+    """Per-request options bounding an API call by the caller's deadline."""
+    remaining = token.remaining() if token is not None else None
+    return {} if remaining is None else {"timeout": remaining}
+
+
+# Shared by every client in the process: an outage is the provider's, not one agent's.
+_OPENAI_CIRCUIT = CircuitBreaker("openai")
+
+
+def _connection_limits() -> Any:
+    # Sized with the pool by configure_openai_clients(); 0 leaves connections unbounded.
+    size = OPENAI_CLIENT_POOL.max_idle
+    return httpx.Limits(max_connections=size or None, max_keepalive_connections=size)
+
+
+def _new_openai_client() -> Any:
+    return OpenAI(http_client=DefaultHttpxClient(limits=_connection_limits()))
+
+
+# Shared by every default-configured client in the process, so runs reuse
+# each other's keep-alive connections instead of reconnecting per call.
+OPENAI_CLIENT_POOL = ClientPool(_new_openai_client)
+
+
+def _new_async_openai_client() -> Any:
+    return AsyncOpenAI(http_client=DefaultAsyncHttpxClient(limits=_connection_limits()))
+
+
+# The async path shares one client per event loop: it multiplexes every
+# concurrent request of the loop over its own keep-alive connection pool.
+ASYNC_OPENAI_CLIENTS = LoopBoundClients(_new_async_openai_client)
+
+
+def configure_openai_clients(pool_size: int) -> None:
+    """
+    Size the process-wide default clients from ``runs.llm_pool_size``.
+
+    At most ``pool_size`` idle clients are kept for reuse, and each client
+    opens at most ``pool_size`` connections, so an event loop's async client
+    queues requests beyond that instead of connecting for each one. Call it
+    once at start-up: clients that already exist keep their limits.
+    """
+    OPENAI_CLIENT_POOL.resize(pool_size)
+
 
 def _render_answer_table(answers: Mapping[str, str]) -> str:
     """Render the discovery answers as markdown to provide structure to the model."""
-    lines: List[str] = ["| Question Key | Response |", "|--------------|----------|"]
+    lines: list[str] = ["| Question Key | Response |", "|--------------|----------|"]
     for key, value in answers.items():
         sanitized = value.replace("\n", " ").strip()
         lines.append(f"| {key} | {sanitized or '*Not provided*'} |")
     return "\n".join(lines)
 
 
+def _messages(request: LLMRequest) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": request.system},
+        {"role": "user", "content": request.user},
+    ]
+
+
+def _output_text(response: Any) -> str:
+    markdown = (getattr(response, "output_text", None) or "").strip()
+    if not markdown:
+        # Fall back to first text block when output_text isn't populated.
+        for output in getattr(response, "output", []):
+            for content in getattr(output, "content", []):
+                if getattr(content, "type", None) == "output_text":
+                    markdown += getattr(content, "text", "")
+        markdown = markdown.strip()
+    return markdown
+
+
+def _stream_error(event: Any) -> str:
+    error = getattr(getattr(event, "response", None), "error", None) or event
+    return getattr(error, "message", None) or "unknown error"
+
+
+def _summary_response(response: Any) -> SummaryResponse:
+    markdown = _output_text(response)
+    if not markdown:
+        raise RuntimeError("OpenAI response did not include summary markdown.")
+    return SummaryResponse(markdown=markdown)
+
+
+def _elicitation_response(response: Any, method_label: str) -> ElicitationResponse:
+    markdown = _output_text(response)
+    if not markdown:
+        raise RuntimeError("OpenAI response did not include elicitation output.")
+    return ElicitationResponse(markdown=markdown, method_label=method_label)
+
+
 class OpenAIDiscoveryClient(DiscoveryLLMClient):
     """
     Thin wrapper around the OpenAI Responses API.
 
     The prompts lean on deterministic formatting so downstream tooling can rely
     on markdown headings that match the structured JSON persisted elsewhere.
+
+    Each call leases an SDK client from ``client_pool`` (by default
+    :data:`OPENAI_CLIENT_POOL`, shared process-wide; a custom
+    ``client_factory`` gets a pool of its own) rather than constructing one;
+    :func:`configure_openai_clients` sizes the default clients.
+    The async methods (``agenerate_summary``, ``aapply_elicitation``) use the
+    ``AsyncOpenAI`` client instead, one per event loop, so a single loop can
+    keep many requests in flight without a thread each; ``astream_summary``
+    yields the summary's text deltas as the server sends them.
+
+    Prompts are fitted to the model's budget from ``prompt_budgets`` (by
+    default :data:`~arcindex.agents.budget.PROMPT_BUDGETS`) before they are
+    sent, and each request's estimated prompt tokens are recorded on its span
+    and counted against the graph node that sent it.
+    Every call is then admitted by ``limiter`` (by default
+    :data:`~arcindex.agents.limiter.LLM_LIMITER`), which queues it behind the
+    model's adaptive concurrency limit and request/token rate limits.
+
+    Requests honour the current cancellation token (see
+    :mod:`arcindex.tools.cancellation`): they time out at its deadline and are
+    aborted, by closing the leased client, when it is cancelled. They also
+    pass through ``circuit_breaker`` (by default one shared by all OpenAI
+    clients in the process), which fails calls fast with
+    :class:`~arcindex.tools.retry.CircuitOpenError` while the provider keeps
+    failing.
     """
 
     def __init__(
         self,
         *,
         summary_model: str = "gpt-4.1-mini",
-        elicitation_model: Optional[str] = None,
-        client_factory: Optional[Callable[[], OpenAI]] = None,
+        elicitation_model: str | None = None,
+        client_factory: Callable[[], OpenAI] | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        client_pool: ClientPool | None = None,
+        async_client_factory: Callable[[], Any] | None = None,
+        prompt_budgets: Mapping[str, PromptBudget] | None = None,
+        limiter: LLMLimiter | None = None,
     ) -> None:
         if OpenAI is None:  # pragma: no cover - enforced in production environments
             raise RuntimeError(
@@ -97,48 +415,40 @@ class OpenAIDiscoveryClient(DiscoveryLLMClient):
             )
         self._summary_model = summary_model
         self._elicitation_model = elicitation_model or summary_model
-        self._client_factory = client_factory or OpenAI
+        if client_pool is None:
+            client_pool = ClientPool(client_factory) if client_factory else OPENAI_CLIENT_POOL
+        self._pool = client_pool
+        self._async_clients = (
+            LoopBoundClients(async_client_factory) if async_client_factory else ASYNC_OPENAI_CLIENTS
+        )
+        self._circuit = circuit_breaker or _OPENAI_CIRCUIT
+        self._prompt_budgets = prompt_budgets
+        self._limiter = limiter or LLM_LIMITER
 
-    def _client(self) -> OpenAI:
-        return self._client_factory()  # type: ignore[return-value]
+    def summary_signature(self) -> tuple[str, str]:
+        # The answer-independent parts of the prompt: system prompt plus template.
+        template = self._build_summary_prompt({}, None, "")
+        return f"{_SUMMARY_SYSTEM_PROMPT}\n{template}", self._summary_model
 
     def generate_summary(
         self,
         *,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         workflow_type: str,
     ) -> SummaryResponse:
-        prompt = self._build_summary_prompt(answers, project_name, workflow_type)
-        client = self._client()
-        response = client.responses.create(  # type: ignore[union-attr]
-            model=self._summary_model,
-            input=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are the Arcindex Discovery Agent. "
-                        "Produce a concise, implementation-ready discovery summary in markdown. "
-                        "Respect the heading structure shown in the instructions and do not invent "
-                        "additional sections. Capture concrete details from the provided answers."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-        )
-        markdown = (getattr(response, "output_text", None) or "").strip()
-        if not markdown:
-            # Fall back to first text block when output_text isn't populated.
-            for output in getattr(response, "output", []):
-                for content in getattr(output, "content", []):
-                    if getattr(content, "type", None) == "output_text":
-                        markdown += getattr(content, "text", "")
-            markdown = markdown.strip()
-
-        if not markdown:
-            raise RuntimeError("OpenAI response did not include summary markdown.")
-
-        return SummaryResponse(markdown=markdown)
+        request = self.summary_request(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
+        )
+        admission = self._limiter.acquire(request.model, request.prompt_tokens)
+        with (
+            admission,
+            self._pool.lease() as lease,
+            abort_on_cancel(lease.abort) as token,
+            _llm_span(request, "summary"),
+        ):
+            response = self._create_response(lease.client, token, request)
+        return _summary_response(response)
 
     def apply_elicitation(
         self,
@@ -147,49 +457,240 @@ class OpenAIDiscoveryClient(DiscoveryLLMClient):
         method_instructions: str,
         current_summary: str,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         workflow_type: str,
     ) -> ElicitationResponse:
-        prompt = self._build_elicitation_prompt(
-            method_label,
-            method_instructions,
-            current_summary,
-            answers,
-            project_name,
-            workflow_type,
+        request = self.elicitation_request(
+            method_label=method_label,
+            method_instructions=method_instructions,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
         )
-        client = self._client()
-        response = client.responses.create(  # type: ignore[union-attr]
-            model=self._elicitation_model,
-            input=[
-                {
-                    "role": "system",
-                    "content": (
-                        "Apply the requested elicitation method to the discovery summary. "
-                        "Preserve markdown formatting, keep the original headings, and fold the "
-                        "refinements directly into the summary. Provide the updated summary only."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
+        admission = self._limiter.acquire(request.model, request.prompt_tokens)
+        with (
+            admission,
+            self._pool.lease() as lease,
+            abort_on_cancel(lease.abort) as token,
+            _llm_span(request, "elicitation"),
+        ):
+            response = self._create_response(lease.client, token, request)
+        return _elicitation_response(response, method_label)
+
+    async def agenerate_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> SummaryResponse:
+        request = self.summary_request(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
         )
-        markdown = (getattr(response, "output_text", None) or "").strip()
-        if not markdown:
-            for output in getattr(response, "output", []):
-                for content in getattr(output, "content", []):
-                    if getattr(content, "type", None) == "output_text":
-                        markdown += getattr(content, "text", "")
-            markdown = markdown.strip()
+        with _llm_span(request, "summary"):
+            response = await self._acreate_response(request)
+        return _summary_response(response)
 
-        if not markdown:
-            raise RuntimeError("OpenAI response did not include elicitation output.")
+    async def aapply_elicitation(
+        self,
+        *,
+        method_label: str,
+        method_instructions: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> ElicitationResponse:
+        request = self.elicitation_request(
+            method_label=method_label,
+            method_instructions=method_instructions,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=workflow_type,
+        )
+        with _llm_span(request, "elicitation"):
+            response = await self._acreate_response(request)
+        return _elicitation_response(response, method_label)
+
+    async def astream_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> AsyncIterator[str]:
+        request = self.summary_request(
+            answers=answers, project_name=project_name, workflow_type=workflow_type
+        )
+        received = False
+        with _llm_span(request, "summary", stream=True):
+            async for delta in self._astream_response(request):
+                received = received or bool(delta.strip())
+                yield delta
+        if not received:
+            raise RuntimeError("OpenAI response did not include summary markdown.")
+
+    def summary_request(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> LLMRequest:
+        model = self._summary_model
+        budget = budget_for(model, self._prompt_budgets)
+        project_name = project_name or answers.get("project_name")
 
-        return ElicitationResponse(markdown=markdown, method_label=method_label)
+        def user(fitted: Mapping[str, str]) -> str:
+            return self._build_summary_prompt(fitted, project_name, workflow_type)
+
+        fixed = estimate_tokens(_SUMMARY_SYSTEM_PROMPT)
+        compacted = compact_answers(
+            answers, budget, measure=lambda fitted: fixed + estimate_tokens(user(fitted.answers))
+        )
+        request = LLMRequest(
+            model=model,
+            system=_SUMMARY_SYSTEM_PROMPT,
+            user=user(compacted.answers),
+            truncated_answers=tuple(compacted.truncated),
+        )
+        budget.check(request.prompt_tokens, model)
+        return request
+
+    def elicitation_request(
+        self,
+        *,
+        method_label: str,
+        method_instructions: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> LLMRequest:
+        model = self._elicitation_model
+        budget = budget_for(model, self._prompt_budgets)
+        project_name = project_name or answers.get("project_name")
+        # The summary gets its own share of the budget; the answers fit the rest.
+        summary = truncate_to_tokens(current_summary.strip(), budget.max_summary_tokens)
+
+        def user(fitted: CompactedAnswers) -> str:
+            return self._build_elicitation_prompt(
+                method_label,
+                method_instructions,
+                summary,
+                fitted.answers,
+                project_name,
+                workflow_type,
+                omitted=fitted.omitted,
+            )
+
+        # The summary already restates most answers; only the rest are repeated.
+        fixed = estimate_tokens(_ELICITATION_SYSTEM_PROMPT)
+        compacted = compact_answers(
+            answers,
+            budget,
+            measure=lambda fitted: fixed + estimate_tokens(user(fitted)),
+            reflected_in=summary,
+        )
+        request = LLMRequest(
+            model=model,
+            system=_ELICITATION_SYSTEM_PROMPT,
+            user=user(compacted),
+            omitted_answers=tuple(compacted.omitted),
+            truncated_answers=tuple(compacted.truncated),
+            truncated_summary=summary != current_summary.strip(),
+        )
+        budget.check(request.prompt_tokens, model)
+        return request
+
+    def _create_response(
+        self,
+        client: Any,
+        token: CancellationToken | None,
+        request: LLMRequest,
+    ) -> Any:
+        self._circuit.before_call()
+        try:
+            response = client.responses.create(
+                model=request.model, input=_messages(request), **_request_options(token)
+            )
+        except BaseException as exc:
+            # A request we aborted says nothing about the provider's health.
+            aborted = token is not None and token.is_cancelled()
+            self._circuit.record_failure(CancellationError() if aborted else exc)
+            raise
+        self._circuit.record_success()
+        return response
+
+    async def _acreate_response(self, request: LLMRequest) -> Any:
+        # Cancellation cancels the awaiting task, which closes just this
+        # request's connection; the loop's shared client stays usable.
+        token = current_token()
+        client = self._async_clients.get()
+        async with self._limiter.aacquire(request.model, request.prompt_tokens):
+            self._circuit.before_call()
+            try:
+                call = client.responses.create(
+                    model=request.model, input=_messages(request), **_request_options(token)
+                )
+                response = await (token.run(call) if token is not None else call)
+            except BaseException as exc:
+                aborted = token is not None and token.is_cancelled()
+                self._circuit.record_failure(CancellationError() if aborted else exc)
+                raise
+            self._circuit.record_success()
+        return response
+
+    async def _astream_response(self, request: LLMRequest) -> AsyncIterator[str]:
+        # Like _acreate_response, but yields output text deltas as the
+        # server-sent events arrive; each wait is cancellable on its own. The
+        # limiter's permit is held until the stream ends.
+        token = current_token()
+        client = self._async_clients.get()
+        async with self._limiter.aacquire(request.model, request.prompt_tokens) as permit:
+            self._circuit.before_call()
+            stream = None
+            try:
+                call = client.responses.create(
+                    model=request.model,
+                    input=_messages(request),
+                    stream=True,
+                    **_request_options(token),
+                )
+                stream = await (token.run(call) if token is not None else call)
+                permit.first_byte()
+                events = stream.__aiter__()
+                while True:
+                    step = events.__anext__()
+                    try:
+                        event = await (token.run(step) if token is not None else step)
+                    except StopAsyncIteration:
+                        break
+                    kind = getattr(event, "type", None)
+                    if kind == "response.output_text.delta":
+                        yield event.delta
+                    elif kind in ("error", "response.failed"):
+                        raise RuntimeError(
+                            f"OpenAI streaming response failed: {_stream_error(event)}"
+                        )
+            except BaseException as exc:
+                # The consumer closing the stream early is an abort, like cancellation.
+                aborted = isinstance(exc, GeneratorExit) or (
+                    token is not None and token.is_cancelled()
+                )
+                self._circuit.record_failure(CancellationError() if aborted else exc)
+                raise
+            finally:
+                if stream is not None:
+                    await stream.close()
+            self._circuit.record_success()
 
     @staticmethod
     def _build_summary_prompt(
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         workflow_type: str,
     ) -> str:
         table = _render_answer_table(answers)
@@ -218,18 +719,26 @@ class OpenAIDiscoveryClient(DiscoveryLLMClient):
         method_instructions: str,
         current_summary: str,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
         workflow_type: str,
+        *,
+        omitted: Sequence[str] = (),
     ) -> str:
         table = _render_answer_table(answers)
         effective_name = project_name or answers.get("project_name") or "TBD Project"
+        reflected = (
+            f"Answers already reflected in the summary, not repeated: {', '.join(omitted)}\n"
+            if omitted
+            else ""
+        )
         return (
             f"You must apply the elicitation method '{method_label}'.\n\n"
             f"Method guidance:\n{method_instructions.strip()}\n\n"
             f"Project name: {effective_name}\n"
             f"Workflow type: {workflow_type}\n"
             "Discovery answers:\n"
-            f"{table}\n\n"
+            f"{table}\n"
+            f"{reflected}\n"
             "Current discovery summary (markdown):\n"
             f"{current_summary.strip()}\n\n"
             "Return only the updated markdown summary."
@@ -237,9 +746,13 @@ class OpenAIDiscoveryClient(DiscoveryLLMClient):
 
 
 __all__ = [
+    "ASYNC_OPENAI_CLIENTS",
+    "OPENAI_CLIENT_POOL",
     "DiscoveryLLMClient",
     "ElicitationResponse",
+    "LLMRequest",
     "OpenAIDiscoveryClient",
     "SummaryResponse",
+    "configure_openai_clients",
 ]
 
@@ -0,0 +1,365 @@
+"""
+Single-flight deduplication of identical in-flight LLM requests.
+
+When several runs ask for the same summary or elicitation at once (bridge
+jobs over the same answers, speculation racing a user's choice), only the
+first caller, the *leader*, sends the request; callers with the same
+:meth:`~arcindex.agents.sdk.LLMRequest.cache_key` that arrive while it is in
+flight, the *followers*, wait for the leader's response instead. Requests are
+only shared while in flight; keeping responses afterwards is the job of
+:class:`~arcindex.agents.cache.CachingDiscoveryClient`.
+
+Outcomes for followers are defined as follows:
+
+* The leader succeeds: every follower receives the same response.
+* The leader fails: every follower receives the same exception, as it would
+  have from sending the identical request at the same moment.
+* The leader is cancelled (its run's token, task cancellation, or a streaming
+  consumer stopping early): the flight is abandoned and its followers start
+  over, so one of them leads a fresh request. One run's cancellation never
+  fails another run.
+* A follower is cancelled: it stops waiting; the leader and other followers
+  are unaffected.
+
+A :class:`SingleFlight` group works across threads and event loops, so the
+process-wide :data:`LLM_FLIGHTS` collapses requests from every run in the
+process. A blocking caller on an event loop's thread never follows, though:
+waiting there would stall that loop, which may be the one running the leader,
+so it sends its own request instead. A group's :meth:`~SingleFlight.stats`
+count leaders, collapsed followers, abandoned flights and failures, and each
+collapsed call is recorded as an ``llm.single_flight`` span.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from arcindex.events.trace import span
+from arcindex.tools.cancellation import CancellationError, current_token
+
+from .sdk import DiscoveryLLMClient, ElicitationResponse, LLMRequest, SummaryResponse
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """How a single-flight group's calls were served."""
+
+    leaders: int = 0
+    collapsed: int = 0
+    abandoned: int = 0
+    failed: int = 0
+    in_flight: int = 0
+
+
+class _Abandoned(Exception):
+    """The leader was cancelled; followers start over."""
+
+
+class SingleFlight:
+    """In-flight calls by key, shared by every caller of the same key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[str, Future[Any]] = {}
+        self._stats = SingleFlightStats()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        Call ``fn``, or wait for the in-flight call with the same ``key``.
+
+        On an event loop's thread, ``fn`` is called rather than waiting.
+        """
+        if _on_event_loop():
+            # Waiting here would block the loop, which may be running the leader.
+            claimed = self._claim(key)
+            return fn() if claimed is None else self._lead(key, claimed, fn)
+        while True:
+            flight, leading = self._join(key)
+            if leading:
+                return self._lead(key, flight, fn)
+            try:
+                return self._follow(key, flight)
+            except _Abandoned:
+                continue
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Async :meth:`do`: await ``fn()``, or the in-flight call with the same ``key``."""
+        while True:
+            flight, leading = self._join(key)
+            if leading:
+                return await self._alead(key, flight, fn)
+            try:
+                return await self._afollow(key, flight)
+            except _Abandoned:
+                continue
+
+    async def astream(
+        self,
+        key: str,
+        stream: Callable[[], AsyncIterator[str]],
+        result: Callable[[str], SummaryResponse],
+    ) -> AsyncIterator[str]:
+        """
+        Yield the deltas of ``stream()``, or the text of the in-flight stream with
+        the same ``key``.
+
+        The leader's deltas are forwarded as they arrive and their concatenation
+        is shared with followers as ``result(text)``; a follower yields the
+        shared text in one piece once the leader finishes.
+        """
+        while True:
+            flight, leading = self._join(key)
+            if not leading:
+                try:
+                    shared: SummaryResponse = await self._afollow(key, flight)
+                except _Abandoned:
+                    continue
+                yield shared.markdown
+                return
+            deltas: list[str] = []
+            try:
+                async for delta in stream():
+                    deltas.append(delta)
+                    yield delta
+            except BaseException as exc:
+                self._finish(key, flight, error=exc)
+                raise
+            self._finish(key, flight, value=result("".join(deltas).strip()))
+            return
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            return SingleFlightStats(
+                leaders=self._stats.leaders,
+                collapsed=self._stats.collapsed,
+                abandoned=self._stats.abandoned,
+                failed=self._stats.failed,
+                in_flight=len(self._flights),
+            )
+
+    def _claim(self, key: str) -> Future[Any] | None:
+        """A new flight for ``key`` to lead, or ``None`` if one is already in flight."""
+        with self._lock:
+            if key in self._flights:
+                return None
+            flight = self._flights[key] = Future()
+            self._stats.leaders += 1
+            return flight
+
+    def _join(self, key: str) -> tuple[Future[Any], bool]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self._stats.collapsed += 1
+                return flight, False
+            flight = self._flights[key] = Future()
+            self._stats.leaders += 1
+            return flight, True
+
+    def _lead(self, key: str, flight: Future[Any], fn: Callable[[], T]) -> T:
+        try:
+            value = fn()
+        except BaseException as exc:
+            self._finish(key, flight, error=exc)
+            raise
+        self._finish(key, flight, value=value)
+        return value
+
+    async def _alead(self, key: str, flight: Future[Any], fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            value = await fn()
+        except BaseException as exc:
+            self._finish(key, flight, error=exc)
+            raise
+        self._finish(key, flight, value=value)
+        return value
+
+    def _finish(
+        self,
+        key: str,
+        flight: Future[Any],
+        *,
+        value: object = None,
+        error: BaseException | None = None,
+    ) -> None:
+        # Cancellation (tokens, task cancellation, a stream closed early) and
+        # interrupts are no outcome worth sharing; everything else is.
+        abandoned = isinstance(error, CancellationError) or (
+            error is not None and not isinstance(error, Exception)
+        )
+        with self._lock:
+            self._flights.pop(key, None)
+            if abandoned:
+                self._stats.abandoned += 1
+            elif error is not None:
+                self._stats.failed += 1
+        if abandoned:
+            flight.set_exception(_Abandoned())
+        elif error is not None:
+            flight.set_exception(error)
+        else:
+            flight.set_result(value)
+
+    def _follow(self, key: str, flight: Future[T]) -> T:
+        token = current_token()
+        woken = threading.Event()
+        flight.add_done_callback(lambda _: woken.set())
+        unregister = token.add_callback(woken.set) if token is not None else None
+        try:
+            with span("llm.single_flight", "llm", key=key[:12]):
+                woken.wait()
+        finally:
+            if unregister is not None:
+                unregister()
+        if not flight.done() and token is not None:
+            token.raise_if_cancelled()
+        return flight.result()
+
+    async def _afollow(self, key: str, flight: Future[T]) -> T:
+        # Shielded so a follower giving up does not cancel the shared flight.
+        token = current_token()
+        waiting = asyncio.shield(asyncio.wrap_future(flight))
+        with span("llm.single_flight", "llm", key=key[:12]):
+            return await (token.run(waiting) if token is not None else waiting)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+# Shared by every client in the process, so identical requests from
+# different runs (and controllers) collapse into one.
+LLM_FLIGHTS = SingleFlight()
+
+
+class SingleFlightDiscoveryClient(DiscoveryLLMClient):
+    """Send each distinct request of ``client`` once while it is in flight."""
+
+    def __init__(self, client: DiscoveryLLMClient, flights: SingleFlight | None = None) -> None:
+        self._client = client
+        self._flights = flights or LLM_FLIGHTS
+
+    @property
+    def flights(self) -> SingleFlight:
+        return self._flights
+
+    def summary_signature(self) -> tuple[str, str]:
+        return self._client.summary_signature()
+
+    def summary_request(self, **kwargs) -> LLMRequest:
+        return self._client.summary_request(**kwargs)
+
+    def elicitation_request(self, **kwargs) -> LLMRequest:
+        return self._client.elicitation_request(**kwargs)
+
+    def generate_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> SummaryResponse:
+        inputs: dict[str, Any] = {
+            "answers": answers,
+            "project_name": project_name,
+            "workflow_type": workflow_type,
+        }
+        key = self._client.summary_request(**inputs).cache_key("summary")
+        return self._flights.do(key, lambda: self._client.generate_summary(**inputs))
+
+    def apply_elicitation(
+        self,
+        *,
+        method_label: str,
+        method_instructions: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> ElicitationResponse:
+        inputs: dict[str, Any] = {
+            "method_label": method_label,
+            "method_instructions": method_instructions,
+            "current_summary": current_summary,
+            "answers": answers,
+            "project_name": project_name,
+            "workflow_type": workflow_type,
+        }
+        key = self._client.elicitation_request(**inputs).cache_key("elicitation")
+        return self._flights.do(key, lambda: self._client.apply_elicitation(**inputs))
+
+    async def agenerate_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> SummaryResponse:
+        inputs: dict[str, Any] = {
+            "answers": answers,
+            "project_name": project_name,
+            "workflow_type": workflow_type,
+        }
+        key = self._client.summary_request(**inputs).cache_key("summary")
+        return await self._flights.ado(key, lambda: self._client.agenerate_summary(**inputs))
+
+    async def aapply_elicitation(
+        self,
+        *,
+        method_label: str,
+        method_instructions: str,
+        current_summary: str,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> ElicitationResponse:
+        inputs: dict[str, Any] = {
+            "method_label": method_label,
+            "method_instructions": method_instructions,
+            "current_summary": current_summary,
+            "answers": answers,
+            "project_name": project_name,
+            "workflow_type": workflow_type,
+        }
+        key = self._client.elicitation_request(**inputs).cache_key("elicitation")
+        return await self._flights.ado(key, lambda: self._client.aapply_elicitation(**inputs))
+
+    async def astream_summary(
+        self,
+        *,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        workflow_type: str,
+    ) -> AsyncIterator[str]:
+        inputs: dict[str, Any] = {
+            "answers": answers,
+            "project_name": project_name,
+            "workflow_type": workflow_type,
+        }
+        key = self._client.summary_request(**inputs).cache_key("summary")
+        deltas = self._flights.astream(
+            key,
+            lambda: self._client.astream_summary(**inputs),
+            lambda markdown: SummaryResponse(markdown=markdown),
+        )
+        async for delta in deltas:
+            yield delta
+
+
+__all__ = [
+    "LLM_FLIGHTS",
+    "SingleFlight",
+    "SingleFlightDiscoveryClient",
+    "SingleFlightStats",
+]
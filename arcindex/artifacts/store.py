@@ -7,12 +7,16 @@ Artifacts are written beneath ``runs/<run_id>/artifacts/...`` and referenced via
 
 from __future__ import annotations
 
-import json
 import os
+from collections.abc import Mapping, MutableMapping
 from dataclasses import dataclass
 from hashlib import sha256
 from pathlib import Path
-from typing import Any, Mapping, MutableMapping, Optional, Union
+from typing import Any
+
+from arcindex.codec import dumps_pretty
+from arcindex.events.trace import span
+from arcindex.state.atomic import DEFAULT_DURABILITY, atomic_write_bytes, validate_durability
 
 
 @dataclass(frozen=True)
@@ -23,10 +27,10 @@ class ArtifactRecord:
     path: Path
     uri: str
     sha256: str
-    phase: Optional[str]
-    agent: Optional[str]
-    mime_type: Optional[str]
-    metadata: Optional[Mapping[str, Any]]
+    phase: str | None
+    agent: str | None
+    mime_type: str | None
+    metadata: Mapping[str, Any] | None
 
     def to_event_payload(self) -> MutableMapping[str, Any]:
         """
@@ -58,9 +62,16 @@ class ArtifactStore:
     The store will create the run directory on demand.
     """
 
-    def __init__(self, run_id: str, runs_root: Path) -> None:
+    def __init__(
+        self,
+        run_id: str,
+        runs_root: Path,
+        *,
+        durability: str = DEFAULT_DURABILITY,
+    ) -> None:
         self._run_id = run_id
         self._runs_root = runs_root
+        self._durability = validate_durability(durability)
         self._run_dir = self._prepare_run_directory()
 
     @property
@@ -73,12 +84,12 @@ class ArtifactStore:
         artifact_type: str,
         content: str,
         *,
-        phase: Optional[str] = None,
-        agent: Optional[str] = None,
+        phase: str | None = None,
+        agent: str | None = None,
         extension: str = ".md",
         encoding: str = "utf-8",
-        mime_type: Optional[str] = None,
-        metadata: Optional[Mapping[str, Any]] = None,
+        mime_type: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
     ) -> ArtifactRecord:
         """Write a text artifact."""
         data = content.encode(encoding)
@@ -95,15 +106,16 @@ class ArtifactStore:
     def write_json(
         self,
         artifact_type: str,
-        document: Union[Mapping[str, Any], Any],
+        document: Mapping[str, Any] | Any,
         *,
-        phase: Optional[str] = None,
-        agent: Optional[str] = None,
-        metadata: Optional[Mapping[str, Any]] = None,
+        phase: str | None = None,
+        agent: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
         sort_keys: bool = True,
     ) -> ArtifactRecord:
         """Write a JSON artifact."""
-        text = json.dumps(document, indent=2, sort_keys=sort_keys)
+        with span("artifact.encode", "serialise", artifact_type=artifact_type):
+            text = dumps_pretty(document, sort_keys=sort_keys)
         return self._write_bytes(
             artifact_type,
             text.encode("utf-8"),
@@ -119,11 +131,11 @@ class ArtifactStore:
         artifact_type: str,
         blob: bytes,
         *,
-        phase: Optional[str] = None,
-        agent: Optional[str] = None,
+        phase: str | None = None,
+        agent: str | None = None,
         extension: str,
-        mime_type: Optional[str] = None,
-        metadata: Optional[Mapping[str, Any]] = None,
+        mime_type: str | None = None,
+        metadata: Mapping[str, Any] | None = None,
     ) -> ArtifactRecord:
         """Write arbitrary binary data to the store."""
         return self._write_bytes(
@@ -136,24 +148,54 @@ class ArtifactStore:
             metadata=metadata,
         )
 
+    def existing(
+        self,
+        artifact_type: str,
+        *,
+        phase: str | None = None,
+        agent: str | None = None,
+        extension: str = ".md",
+        mime_type: str | None = None,
+    ) -> ArtifactRecord | None:
+        """
+        Return the record of an artifact already written to this run, if any.
+
+        Lets a retried or resumed step detect that its output landed before an
+        earlier attempt failed.
+        """
+        rel_path = self._resolve_relative_path(artifact_type, extension, phase, agent)
+        abs_path = self._run_dir / rel_path
+        try:
+            blob = abs_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        return ArtifactRecord(
+            artifact_type=artifact_type,
+            path=abs_path,
+            uri=f"arc://runs/{self._run_id}/{rel_path.as_posix()}",
+            sha256=sha256(blob).hexdigest(),
+            phase=phase,
+            agent=agent,
+            mime_type=mime_type,
+            metadata=None,
+        )
+
     def _write_bytes(
         self,
         artifact_type: str,
         blob: bytes,
         *,
-        phase: Optional[str],
-        agent: Optional[str],
+        phase: str | None,
+        agent: str | None,
         extension: str,
-        mime_type: Optional[str],
-        metadata: Optional[Mapping[str, Any]],
+        mime_type: str | None,
+        metadata: Mapping[str, Any] | None,
     ) -> ArtifactRecord:
         rel_path = self._resolve_relative_path(artifact_type, extension, phase, agent)
         abs_path = self._run_dir / rel_path
-        abs_path.parent.mkdir(parents=True, exist_ok=True)
-        with abs_path.open("wb") as handle:
-            handle.write(blob)
-
-        checksum = sha256(blob).hexdigest()
+        with span("artifact.write", "disk", artifact_type=artifact_type, bytes=len(blob)):
+            atomic_write_bytes(abs_path, blob, durability=self._durability)
+            checksum = sha256(blob).hexdigest()
         uri = f"arc://runs/{self._run_id}/{rel_path.as_posix()}"
         return ArtifactRecord(
             artifact_type=artifact_type,
@@ -174,7 +216,7 @@ class ArtifactStore:
         return run_dir
 
     @staticmethod
-    def _normalize_component(value: Optional[str]) -> Optional[str]:
+    def _normalize_component(value: str | None) -> str | None:
         if value is None:
             return None
         sanitized = value.strip().replace(" ", "-")
@@ -184,8 +226,8 @@ class ArtifactStore:
         self,
         artifact_type: str,
         extension: str,
-        phase: Optional[str],
-        agent: Optional[str],
+        phase: str | None,
+        agent: str | None,
     ) -> Path:
         components = ["artifacts"]
         norm_phase = self._normalize_component(phase)
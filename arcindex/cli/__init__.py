@@ -2,6 +2,26 @@
 CLI package shim that re-exports the primary command group.
 """
 
-from .main import arcindex, continue_, main, start
+from .main import (
+    arcindex,
+    batch,
+    cache,
+    cache_clear,
+    cache_stats,
+    continue_,
+    main,
+    migrate_legacy,
+    start,
+)
 
-__all__ = ["arcindex", "start", "continue_", "main"]
+__all__ = [
+    "arcindex",
+    "batch",
+    "cache",
+    "cache_clear",
+    "cache_stats",
+    "continue_",
+    "main",
+    "migrate_legacy",
+    "start",
+]
@@ -3,11 +3,35 @@
 from __future__ import annotations
 
 import asyncio
+from pathlib import Path
 
 import click
 
+from arcindex.agents.cache import ResponseCache
+from arcindex.agents.sdk import ASYNC_OPENAI_CLIENTS
+from arcindex.config import load_runtime_config
+from arcindex.orchestrator import OrchestratorController, configure_llm_clients
+from arcindex.runner import (
+    EVENTS_RELATIVE_PATH,
+    ArcindexRunner,
+    BatchOutcome,
+    NodeCache,
+    RunNotFound,
+    RunResult,
+    load_run_progress,
+    run_batch,
+)
+from arcindex.runner.batch import BATCH_FAILED, DEFAULT_BATCH_CONCURRENCY
+from arcindex.state import (
+    LINK_MODES,
+    WorkflowStateError,
+    bulk_migrate_legacy_states,
+    discover_legacy_state_dirs,
+)
 from arcindex.workflows import discovery_to_analyst as workflow
 
+DEFAULT_RUNTIME_CONFIG = Path(__file__).resolve().parent.parent / "config" / "runtime.yaml"
+
 
 @click.group(help="Arcindex CLI orchestrating Codex Agents SDK workflows.")
 def arcindex() -> None:
@@ -53,14 +77,272 @@ def start(task: str, model: str, max_turns: int) -> None:
     )
 
 
-@arcindex.command(name="continue", help="Resume a paused workflow run (placeholder).")
-def continue_() -> None:
+@arcindex.command(
+    name="continue",
+    help="Resume an interrupted run: verify what it completed and finish its discovery.",
+)
+@click.argument("run_id", required=False)
+@click.option(
+    "--config",
+    "config_path",
+    default=DEFAULT_RUNTIME_CONFIG,
+    show_default=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Runtime configuration locating the runs root and workflow definitions.",
+)
+def continue_(run_id: str | None, config_path: Path) -> None:
+    """
+    Rebuild a run's progress from its event log and workflow state, then resume it.
+
+    Artifacts are re-verified by sha256; phases with missing or modified
+    artifacts are reported as remaining. The rest of the discovery graph is
+    executed, skipping the nodes that already completed. Defaults to the
+    most recent run.
+    """
+    controller = OrchestratorController.from_config_path(config_path)
+    runs_root = controller.config.runs.root
+    run_id = run_id or _latest_run_id(runs_root)
+    if run_id is None:
+        raise click.ClickException(f"No runs found under {runs_root}.")
+    try:
+        progress = load_run_progress(runs_root / run_id)
+    except RunNotFound as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    workflow_id = progress.workflow_id or controller.config.system.default_workflow
+    click.echo(f"🔁 Run {run_id} ({workflow_id})")
+    click.echo(f"   Completed phases: {', '.join(progress.completed_phases) or 'none'}")
+    failed = (
+        f" ({len(progress.invalid_artifacts)} failed verification)"
+        if progress.invalid_artifacts
+        else ""
+    )
+    click.echo(f"   Verified artifacts: {len(progress.artifacts)}{failed}")
+    for record in progress.invalid_artifacts:
+        click.echo(
+            f"   ⚠️  {record.path} is missing or modified; phase '{record.phase}' will re-run."
+        )
+    if progress.finished:
+        click.echo("✅ Run already completed; nothing to resume.")
+        return
+    try:
+        plan = controller.workflow_plan(workflow_id)
+    except WorkflowStateError:
+        click.echo("   No compiled plan for this workflow; completed phases are recorded above.")
+    else:
+        remaining = progress.remaining_steps(plan)
+        click.echo(f"   Remaining steps: {', '.join(remaining) or 'none'}")
+
+    configure_llm_clients(controller.config)
+    runner = ArcindexRunner(controller)
+    context, progress = runner.resume_run(run_id)
+
+    async def resume() -> RunResult:
+        try:
+            return await runner.resume_discovery(context, progress)
+        finally:
+            await ASYNC_OPENAI_CLIENTS.aclose()
+
+    try:
+        result = asyncio.run(resume())
+    except WorkflowStateError as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(f"✅ Discovery completed in {result.elapsed_ms / 1000:.2f}s.")
+    click.echo(f"   Summary: {result.summary_path}")
+
+
+def _latest_run_id(runs_root: Path) -> str | None:
+    if not runs_root.exists():
+        return None
+    logs = list(runs_root.glob(f"*/{EVENTS_RELATIVE_PATH.as_posix()}"))
+    if not logs:
+        return None
+    return max(logs, key=lambda path: path.stat().st_mtime_ns).parent.parent.name
+
+
+@arcindex.command(
+    name="migrate-legacy",
+    help="Import every legacy state directory beneath LEGACY_ROOT into run directories.",
+)
+@click.argument(
+    "legacy_root",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+)
+@click.option(
+    "--runs-root",
+    required=True,
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Directory that receives one run directory per migrated legacy project.",
+)
+@click.option(
+    "--workers",
+    default=None,
+    type=click.IntRange(1, 256),
+    help="Concurrent migrations (defaults to four per CPU, capped at 32).",
+)
+@click.option(
+    "--link-mode",
+    default="auto",
+    show_default=True,
+    type=click.Choice(LINK_MODES),
+    help="How files are materialised; auto tries reflink, then hardlink, then copy.",
+)
+@click.option(
+    "--manifest",
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help=(
+        "Progress manifest used to resume interrupted imports "
+        "(defaults to RUNS_ROOT/migration-manifest.ndjson)."
+    ),
+)
+def migrate_legacy(
+    legacy_root: Path,
+    runs_root: Path,
+    workers: int | None,
+    link_mode: str,
+    manifest: Path | None,
+) -> None:
+    """
+    Bulk-migrate legacy workflow state, skipping directories already recorded in the manifest.
+    """
+    sources = discover_legacy_state_dirs(legacy_root, exclude=[runs_root])
+    click.echo(f"📦 Found {len(sources)} legacy state directories under {legacy_root}.")
+    report = bulk_migrate_legacy_states(
+        sources,
+        runs_root,
+        workers=workers,
+        link_mode=link_mode,
+        manifest_path=manifest,
+    )
+    methods = (
+        ", ".join(f"{name}={count}" for name, count in sorted(report.methods.items())) or "none"
+    )
+    click.echo(
+        f"✅ Migrated {report.migrated}, skipped {report.skipped}, failed {report.failed} "
+        f"in {report.elapsed_s:.2f}s ({report.dirs_per_second:.1f} dirs/s, "
+        f"{report.bytes_copied} bytes copied; {methods})."
+    )
+    for outcome in report.outcomes:
+        if outcome.status == "failed":
+            click.echo(f"❌ {outcome.source}: {outcome.error}", err=True)
+    if report.failed:
+        raise SystemExit(1)
+
+
+@arcindex.command(help="Run discovery jobs from a JSONL file without interaction.")
+@click.argument("jobs", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--output",
+    "output_path",
+    required=True,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help=(
+        "JSONL file receiving one result per job; "
+        "jobs already recorded as ok are skipped on rerun."
+    ),
+)
+@click.option(
+    "--concurrency",
+    default=DEFAULT_BATCH_CONCURRENCY,
+    show_default=True,
+    type=click.IntRange(1, 256),
+    help="Jobs executed at the same time.",
+)
+@click.option(
+    "--config",
+    "config_path",
+    default=DEFAULT_RUNTIME_CONFIG,
+    show_default=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Runtime configuration used for every job.",
+)
+def batch(jobs: Path, output_path: Path, concurrency: int, config_path: Path) -> None:
+    """
+    Execute each job spec in JOBS through the runner and report throughput and latency.
+    """
+
+    def progress(outcome: BatchOutcome) -> None:
+        if outcome.status == BATCH_FAILED:
+            click.echo(f"❌ {outcome.job_id or '(invalid)'}: {outcome.error}", err=True)
+
+    configure_llm_clients(load_runtime_config(config_path))
+    report = asyncio.run(
+        run_batch(
+            jobs,
+            output_path,
+            lambda: OrchestratorController.from_config_path(config_path),
+            concurrency=concurrency,
+            on_outcome=progress,
+        )
+    )
+    latencies = ", ".join(
+        f"p{percentile}={value / 1000:.2f}s"
+        for percentile, value in report.latency_percentiles().items()
+    ) or "n/a"
+    click.echo(
+        f"✅ Completed {report.succeeded}, failed {report.failed}, skipped {report.skipped} "
+        f"in {report.elapsed_s:.2f}s ({report.jobs_per_second:.2f} jobs/s; latency {latencies})."
+    )
+    if report.failed:
+        raise SystemExit(1)
+
+
+@arcindex.group(help="Manage memoised node results shared across runs.")
+def cache() -> None:
+    """Node result cache commands."""
+
+
+@cache.command(
+    name="clear", help="Invalidate memoised node results so the next run recomputes them."
+)
+@click.option(
+    "--node",
+    default=None,
+    help="Only invalidate results for this graph node (e.g. generate_summary).",
+)
+@click.option(
+    "--config",
+    "config_path",
+    default=DEFAULT_RUNTIME_CONFIG,
+    show_default=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Runtime configuration locating the node cache.",
+)
+def cache_clear(node: str | None, config_path: Path) -> None:
+    """
+    Remove cached node results, either all of them or those of one node.
+    """
+    cache_dir = load_runtime_config(config_path).runs.node_cache
+    if cache_dir is None:
+        raise click.ClickException("No node cache is configured (runs.node_cache).")
+    node_cache = NodeCache(cache_dir)
+    removed = node_cache.invalidate_node(node) if node else node_cache.clear()
+    scope = f" for node '{node}'" if node else ""
+    click.echo(f"🧹 Removed {removed} cached result(s){scope} from {cache_dir}.")
+
+
+@cache.command(name="stats", help="Show the size and hit rate of the LLM response cache.")
+@click.option(
+    "--config",
+    "config_path",
+    default=DEFAULT_RUNTIME_CONFIG,
+    show_default=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Runtime configuration locating the LLM response cache.",
+)
+def cache_stats(config_path: Path) -> None:
     """
-    Placeholder for resuming workflows once multi-run persistence is implemented.
+    Report entries, size and lifetime hit/miss counts of the response cache.
     """
+    settings = load_runtime_config(config_path).runs.llm_cache
+    if settings is None:
+        raise click.ClickException("No LLM response cache is configured (runs.llm_cache).")
+    stats = ResponseCache(settings.path).stats()
     click.echo(
-        "⏸️  `arcindex continue` is not yet implemented. "
-        "TODO: restore workflow context once run persistence and guardrails migrate to Codex SDK."
+        f"📊 {stats.entries} response(s), {stats.bytes / 1024 / 1024:.1f} MB in {settings.path}: "
+        f"{stats.hits} hit(s), {stats.misses} miss(es) ({stats.hit_rate:.0%} hit rate), "
+        f"{stats.expired} expired, {stats.evicted} evicted."
     )
 
 
@@ -69,4 +351,14 @@ def main() -> None:
     arcindex()
 
 
-__all__ = ["arcindex", "start", "continue_", "main"]
+__all__ = [
+    "arcindex",
+    "batch",
+    "cache",
+    "cache_clear",
+    "cache_stats",
+    "continue_",
+    "main",
+    "migrate_legacy",
+    "start",
+]
@@ -0,0 +1,27 @@
+"""Serialization helpers shared across Arcindex."""
+
+from .json_codec import (
+    BACKEND_AUTO,
+    BACKEND_ENV_VAR,
+    BACKEND_ORJSON,
+    BACKEND_STDLIB,
+    JSON_BACKENDS,
+    dumps_compact,
+    dumps_pretty,
+    get_backend,
+    loads,
+    set_backend,
+)
+
+__all__ = [
+    "BACKEND_AUTO",
+    "BACKEND_ENV_VAR",
+    "BACKEND_ORJSON",
+    "BACKEND_STDLIB",
+    "JSON_BACKENDS",
+    "dumps_compact",
+    "dumps_pretty",
+    "get_backend",
+    "loads",
+    "set_backend",
+]
@@ -0,0 +1,160 @@
+"""
+JSON encoding shared by every Arcindex writer.
+
+Two output modes are provided:
+
+* :func:`dumps_pretty` renders the two-space indented documents people read
+  (``workflow.json``, state sections, discovery summaries, JSON artifacts). Its
+  output is byte-for-byte what ``json.dumps(obj, indent=2, sort_keys=True)``
+  produces, whichever backend is active.
+* :func:`dumps_compact` renders single-line records for machines (the event
+  log, SSE frames, checkpoint and migration manifests). It favours speed:
+  with ``orjson`` non-ASCII text is emitted as UTF-8 rather than ``\\u`` escapes.
+
+The backend is ``orjson`` when it is installed and ``stdlib`` otherwise. Set
+``ARCINDEX_JSON_BACKEND`` to ``stdlib`` or ``orjson`` to force one.
+
+The ``orjson`` pretty path falls back to the standard library for anything
+whose rendering could differ: floats outside ``[1e-4, 1e16)`` or non-finite
+(the two libraries format exponents differently), and values orjson refuses
+(non-string keys, integers wider than 64 bits, subclasses, dataclasses...).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency guard
+    orjson = None  # type: ignore[assignment]
+
+BACKEND_AUTO = "auto"
+BACKEND_ORJSON = "orjson"
+BACKEND_STDLIB = "stdlib"
+JSON_BACKENDS = (BACKEND_AUTO, BACKEND_ORJSON, BACKEND_STDLIB)
+BACKEND_ENV_VAR = "ARCINDEX_JSON_BACKEND"
+
+_NON_ASCII = re.compile("[^\\x00-\\x7e]")
+
+if orjson is not None:
+    _PASSTHROUGH = (
+        orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+    _PRETTY_OPTIONS = orjson.OPT_INDENT_2 | _PASSTHROUGH
+    _ORJSON_ERRORS = (orjson.JSONEncodeError, TypeError)
+
+_backend = BACKEND_STDLIB
+
+
+def set_backend(name: str = BACKEND_AUTO) -> str:
+    """
+    Select the encoding backend and return the one now active.
+
+    ``auto`` picks ``orjson`` when it is importable. Requesting ``orjson``
+    explicitly when it is not installed raises ``ValueError``.
+    """
+    global _backend
+    if name not in JSON_BACKENDS:
+        choices = ", ".join(JSON_BACKENDS)
+        raise ValueError(f"Unknown JSON backend '{name}'. Expected one of: {choices}.")
+    if name == BACKEND_AUTO:
+        name = BACKEND_ORJSON if orjson is not None else BACKEND_STDLIB
+    if name == BACKEND_ORJSON and orjson is None:
+        raise ValueError("The orjson JSON backend was requested but orjson is not installed.")
+    _backend = name
+    return _backend
+
+
+def get_backend() -> str:
+    """Name of the active backend, ``orjson`` or ``stdlib``."""
+    return _backend
+
+
+def dumps_pretty(obj: Any, *, sort_keys: bool = True) -> str:
+    """Render ``obj`` exactly as ``json.dumps(obj, indent=2, sort_keys=sort_keys)`` does."""
+    if _backend == BACKEND_ORJSON and _floats_render_identically(obj):
+        option = _PRETTY_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _PRETTY_OPTIONS
+        try:
+            raw = orjson.dumps(obj, option=option)
+        except _ORJSON_ERRORS:
+            pass
+        else:
+            return _ascii_escape(raw)
+    return json.dumps(obj, indent=2, sort_keys=sort_keys)
+
+
+def dumps_compact(obj: Any, *, sort_keys: bool = False) -> str:
+    """Render ``obj`` on a single line without whitespace between tokens."""
+    if _backend == BACKEND_ORJSON:
+        option = orjson.OPT_SORT_KEYS | _PASSTHROUGH if sort_keys else _PASSTHROUGH
+        try:
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except _ORJSON_ERRORS:
+            pass
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys)
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document with the active backend."""
+    if _backend == BACKEND_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # The standard library also accepts NaN/Infinity and oversized integers.
+            pass
+    return json.loads(data)
+
+
+def _ascii_escape(raw: bytes) -> str:
+    # The standard library escapes everything outside printable ASCII plus DEL;
+    # orjson has already escaped the control characters below 0x20 identically.
+    if raw.isascii() and b"\x7f" not in raw:
+        return raw.decode("ascii")
+    return _NON_ASCII.sub(_escape_char, raw.decode("utf-8"))
+
+
+def _escape_char(match: re.Match[str]) -> str:
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _floats_render_identically(obj: Any) -> bool:
+    obj_type = type(obj)
+    if obj_type is dict:
+        return all(map(_floats_render_identically, obj.values()))
+    if obj_type is list or obj_type is tuple:
+        return all(map(_floats_render_identically, obj))
+    if obj_type is float:
+        return obj == 0.0 or (math.isfinite(obj) and 1e-4 <= abs(obj) < 1e16)
+    return True
+
+
+def _backend_from_environment(value: str | None) -> str:
+    return set_backend((value or BACKEND_AUTO).strip().lower())
+
+
+_backend_from_environment(os.environ.get(BACKEND_ENV_VAR))
+
+
+__all__ = [
+    "BACKEND_AUTO",
+    "BACKEND_ENV_VAR",
+    "BACKEND_ORJSON",
+    "BACKEND_STDLIB",
+    "JSON_BACKENDS",
+    "dumps_compact",
+    "dumps_pretty",
+    "get_backend",
+    "loads",
+    "set_backend",
+]
@@ -3,6 +3,9 @@
 from .runtime import (
     DocsSettings,
     ElicitationSettings,
+    LLMCacheSettings,
+    LLMLimitSettings,
+    RetrySettings,
     RuntimeConfig,
     RunsSettings,
     StateSettings,
@@ -14,6 +17,9 @@ from .runtime import (
 __all__ = [
     "DocsSettings",
     "ElicitationSettings",
+    "LLMCacheSettings",
+    "LLMLimitSettings",
+    "RetrySettings",
     "RuntimeConfig",
     "RunsSettings",
     "StateSettings",
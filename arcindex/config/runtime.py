@@ -7,12 +7,16 @@ producing convenient Python objects with resolved filesystem paths.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Mapping, Optional
+from typing import Any
 
 import yaml
 
+from arcindex.state.atomic import DEFAULT_DURABILITY, validate_durability
+from arcindex.state.store import LAYOUT_SINGLE, validate_layout
+
 
 @dataclass
 class SystemSettings:
@@ -27,6 +31,8 @@ class WorkflowsSettings:
     """Workflow configuration metadata."""
 
     directory: Path
+    legacy_directory: Path | None = None
+    cache_directory: Path | None = None
 
 
 @dataclass
@@ -35,6 +41,10 @@ class StateSettings:
 
     persistence: Path
     workflow_template: Path
+    durability: str = DEFAULT_DURABILITY
+    layout: str = LAYOUT_SINGLE
+    validate: bool = False
+    legacy_template: Path | None = None
 
     @property
     def workflow_path(self) -> Path:
@@ -47,7 +57,36 @@ class ElicitationSettings:
     """Elicitation configuration."""
 
     default_mode: str
-    methods_source: Optional[Path]
+    methods_source: Path | None
+
+
+@dataclass
+class RetrySettings:
+    """Retry behaviour for failed graph nodes."""
+
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 20.0
+    budget_ratio: float = 0.2
+
+
+@dataclass
+class LLMCacheSettings:
+    """On-disk cache of model responses keyed by model and prompts."""
+
+    path: Path
+    ttl_seconds: float | None = 7 * 24 * 3600.0
+    max_entries: int = 10_000
+    max_mb: float = 256.0
+
+
+@dataclass
+class LLMLimitSettings:
+    """Admission limits for one model's calls, shared by every run in the process."""
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+    max_concurrency: int = 32
 
 
 @dataclass
@@ -55,6 +94,16 @@ class RunsSettings:
     """Run directory configuration."""
 
     root: Path
+    node_cache: Path | None = None
+    node_cache_max_entries: int = 10_000
+    node_cache_max_mb: float = 256.0
+    timeout_seconds: float | None = None
+    node_timeout_seconds: float | None = None
+    trace: bool = True
+    retry: RetrySettings = field(default_factory=RetrySettings)
+    llm_cache: LLMCacheSettings | None = None
+    llm_pool_size: int = 8
+    llm_limits: dict[str, LLMLimitSettings] = field(default_factory=dict)
 
 
 @dataclass
@@ -125,7 +174,17 @@ def _parse_workflows_settings(base: Path, data: Mapping[str, Any]) -> WorkflowsS
         msg = "Runtime config must define workflows.directory."
         raise ValueError(msg)
     workflow_dir = (base / str(directory)).resolve()
-    return WorkflowsSettings(directory=workflow_dir)
+    legacy_directory = data.get("legacy_directory")
+    cache_directory = data.get("cache_directory")
+    return WorkflowsSettings(
+        directory=workflow_dir,
+        legacy_directory=(
+            None if legacy_directory is None else (base / str(legacy_directory)).resolve()
+        ),
+        cache_directory=(
+            None if cache_directory is None else (base / str(cache_directory)).resolve()
+        ),
+    )
 
 
 def _parse_state_settings(base: Path, data: Mapping[str, Any]) -> StateSettings:
@@ -138,14 +197,27 @@ def _parse_state_settings(base: Path, data: Mapping[str, Any]) -> StateSettings:
 
     persistence_path = (base / str(persistence)).resolve()
     template_path = (base / str(template)).resolve()
+    durability = validate_durability(str(data.get("durability", DEFAULT_DURABILITY)))
+    layout = validate_layout(str(data.get("layout", LAYOUT_SINGLE)))
+    legacy_template = data.get("legacy_template")
+    legacy_template_path = (
+        None if legacy_template is None else (base / str(legacy_template)).resolve()
+    )
 
-    return StateSettings(persistence=persistence_path, workflow_template=template_path)
+    return StateSettings(
+        persistence=persistence_path,
+        workflow_template=template_path,
+        durability=durability,
+        layout=layout,
+        validate=bool(data.get("validate", False)),
+        legacy_template=legacy_template_path,
+    )
 
 
 def _parse_elicitation_settings(base: Path, data: Mapping[str, Any]) -> ElicitationSettings:
     default_mode = str(data.get("default_mode", "interactive"))
     methods_source = data.get("methods_source")
-    methods_path: Optional[Path]
+    methods_path: Path | None
     if methods_source is None:
         methods_path = None
     else:
@@ -159,7 +231,108 @@ def _parse_runs_settings(base: Path, data: Mapping[str, Any]) -> RunsSettings:
         msg = "Runtime config must define runs.root."
         raise ValueError(msg)
     runs_root = (base / str(root)).resolve()
-    return RunsSettings(root=runs_root)
+    node_cache = data.get("node_cache")
+    node_cache_path = None if node_cache is None else (base / str(node_cache)).resolve()
+    node_cache_max_entries = int(
+        data.get("node_cache_max_entries", RunsSettings.node_cache_max_entries)
+    )
+    node_cache_max_mb = float(data.get("node_cache_max_mb", RunsSettings.node_cache_max_mb))
+    if node_cache_max_entries < 1 or node_cache_max_mb <= 0:
+        msg = "Runtime config runs.node_cache limits must be positive."
+        raise ValueError(msg)
+    return RunsSettings(
+        root=runs_root,
+        node_cache=node_cache_path,
+        node_cache_max_entries=node_cache_max_entries,
+        node_cache_max_mb=node_cache_max_mb,
+        timeout_seconds=_optional_seconds(data, "timeout_seconds"),
+        node_timeout_seconds=_optional_seconds(data, "node_timeout_seconds"),
+        trace=bool(data.get("trace", True)),
+        retry=_parse_retry_settings(data.get("retry") or {}),
+        llm_cache=_parse_llm_cache_settings(base, data.get("llm_cache")),
+        llm_pool_size=_parse_pool_size(data),
+        llm_limits=_parse_llm_limits(data.get("llm_limits") or {}),
+    )
+
+
+def _parse_pool_size(data: Mapping[str, Any]) -> int:
+    size = int(data.get("llm_pool_size", RunsSettings.llm_pool_size))
+    if size < 0:
+        msg = "Runtime config runs.llm_pool_size cannot be negative."
+        raise ValueError(msg)
+    return size
+
+
+def _parse_llm_limits(data: Mapping[str, Any]) -> dict[str, LLMLimitSettings]:
+    limits = {}
+    for model, entry in data.items():
+        entry = entry or {}
+        rpm = entry.get("requests_per_minute")
+        tpm = entry.get("tokens_per_minute")
+        settings = LLMLimitSettings(
+            requests_per_minute=None if rpm is None else float(rpm),
+            tokens_per_minute=None if tpm is None else float(tpm),
+            max_concurrency=int(entry.get("max_concurrency", LLMLimitSettings.max_concurrency)),
+        )
+        rates = (settings.requests_per_minute, settings.tokens_per_minute)
+        if settings.max_concurrency < 1 or any(rate is not None and rate <= 0 for rate in rates):
+            msg = f"Runtime config runs.llm_limits.{model} limits must be positive."
+            raise ValueError(msg)
+        limits[str(model)] = settings
+    return limits
+
+
+def _parse_llm_cache_settings(
+    base: Path, data: Mapping[str, Any] | None
+) -> LLMCacheSettings | None:
+    if not data:
+        return None
+    path = data.get("path")
+    if path is None:
+        msg = "Runtime config runs.llm_cache must define path."
+        raise ValueError(msg)
+    defaults = LLMCacheSettings(path=Path())
+    ttl = data.get("ttl_seconds", defaults.ttl_seconds)
+    max_entries = int(data.get("max_entries", defaults.max_entries))
+    max_mb = float(data.get("max_mb", defaults.max_mb))
+    if max_entries < 1 or max_mb <= 0:
+        msg = "Runtime config runs.llm_cache limits must be positive."
+        raise ValueError(msg)
+    return LLMCacheSettings(
+        path=(base / str(path)).resolve(),
+        ttl_seconds=None if ttl is None else float(ttl),
+        max_entries=max_entries,
+        max_mb=max_mb,
+    )
+
+
+def _parse_retry_settings(data: Mapping[str, Any]) -> RetrySettings:
+    defaults = RetrySettings()
+    max_attempts = int(data.get("max_attempts", defaults.max_attempts))
+    if max_attempts < 1:
+        msg = "Runtime config runs.retry.max_attempts must be at least 1."
+        raise ValueError(msg)
+    budget_ratio = float(data.get("budget_ratio", defaults.budget_ratio))
+    if budget_ratio < 0:
+        msg = "Runtime config runs.retry.budget_ratio cannot be negative."
+        raise ValueError(msg)
+    return RetrySettings(
+        max_attempts=max_attempts,
+        base_delay_seconds=float(data.get("base_delay_seconds", defaults.base_delay_seconds)),
+        max_delay_seconds=float(data.get("max_delay_seconds", defaults.max_delay_seconds)),
+        budget_ratio=budget_ratio,
+    )
+
+
+def _optional_seconds(data: Mapping[str, Any], key: str) -> float | None:
+    value = data.get(key)
+    if value is None:
+        return None
+    seconds = float(value)
+    if seconds <= 0:
+        msg = f"Runtime config runs.{key} must be positive."
+        raise ValueError(msg)
+    return seconds
 
 
 def _parse_docs_settings(base: Path, data: Mapping[str, Any]) -> DocsSettings:
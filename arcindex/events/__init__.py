@@ -8,11 +8,14 @@ from .model import (
     BaseEvent,
     EndEvent,
     ErrorEvent,
+    NodeEvent,
     PhaseEvent,
     ReduceEvent,
     TokenEvent,
     ToolEvent,
 )
+from .trace import TRACE_FILENAME, Span, Tracer, current_tracer, span, traced, use_tracer
+from .usage import LLMUsage, record_llm_request, use_llm_usage
 
 __all__ = [
     "EventEmitter",
@@ -22,7 +25,18 @@ __all__ = [
     "TokenEvent",
     "ToolEvent",
     "ArtifactEvent",
+    "NodeEvent",
     "ReduceEvent",
     "ErrorEvent",
     "EndEvent",
+    "TRACE_FILENAME",
+    "Span",
+    "Tracer",
+    "current_tracer",
+    "span",
+    "traced",
+    "use_tracer",
+    "LLMUsage",
+    "record_llm_request",
+    "use_llm_usage",
 ]
@@ -4,15 +4,19 @@ Event emitter that fans out runtime events and persists them as NDJSON.
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from threading import RLock
 from typing import Callable, Dict, List, Optional
 
+from arcindex.codec import dumps_compact, loads
+
 from .model import BaseEvent
 
 EventSubscriber = Callable[[Dict[str, object]], None]
 
+# Enough of the log's end to hold its last complete record.
+_TAIL_BYTES = 64 * 1024
+
 
 class EventEmitter:
     """
@@ -20,7 +24,8 @@ class EventEmitter:
 
     The emitter fans events to in-process subscribers and appends a compact
     NDJSON record to ``runs/<run_id>/logs/events.ndjson``. Sequence numbers are
-    auto-incremented unless provided explicitly on the event payload.
+    auto-incremented unless provided explicitly on the event payload; an emitter
+    opened on an existing log (a resumed run) continues after its last record.
     """
 
     def __init__(self, run_id: str, runs_root: Path) -> None:
@@ -28,9 +33,8 @@ class EventEmitter:
         self._runs_root = runs_root
         self._subscribers: List[EventSubscriber] = []
         self._lock = RLock()
-        self._sequence = 0
-
         self._events_path = self._prepare_event_log()
+        self._sequence = self._next_sequence()
 
     @property
     def run_id(self) -> str:
@@ -93,7 +97,20 @@ class EventEmitter:
             events_path.touch()
         return events_path
 
+    def _next_sequence(self) -> int:
+        size = self._events_path.stat().st_size
+        if not size:
+            return 0
+        with self._events_path.open("rb") as handle:
+            handle.seek(max(0, size - _TAIL_BYTES))
+            lines = handle.read().splitlines()
+        for line in reversed(lines):
+            try:
+                return int(loads(line)["seq"]) + 1
+            except (ValueError, KeyError, TypeError):
+                continue  # torn final record or a partial first line
+        return 0
+
     def _append(self, payload: Dict[str, object]) -> None:
         with self._events_path.open("a", encoding="utf-8") as handle:
-            json.dump(payload, handle, separators=(",", ":"))
-            handle.write("\n")
+            handle.write(dumps_compact(payload) + "\n")
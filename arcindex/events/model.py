@@ -8,8 +8,9 @@ values so the payloads can be serialized directly as NDJSON records or SSE data.
 
 from __future__ import annotations
 
+from collections.abc import Mapping, MutableMapping
 from dataclasses import asdict, dataclass, field
-from typing import Any, ClassVar, Dict, Mapping, MutableMapping, Optional
+from typing import Any, ClassVar
 
 
 @dataclass
@@ -23,11 +24,11 @@ class BaseEvent:
 
     run_id: str
     ts: str
-    seq: Optional[int] = field(default=None, init=False)
+    seq: int | None = field(default=None, init=False)
 
     event: ClassVar[str]
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self) -> dict[str, Any]:
         """Convert the event to a JSON-safe dictionary."""
         data = asdict(self)
         data["event"] = self.event
@@ -41,7 +42,7 @@ class PhaseEvent(BaseEvent):
     event: ClassVar[str] = "phase"
     phase: str
     status: str  # start | end
-    meta: Optional[Mapping[str, Any]] = None
+    meta: Mapping[str, Any] | None = None
 
 
 @dataclass
@@ -62,9 +63,9 @@ class ToolEvent(BaseEvent):
     name: str
     status: str  # call | result | error
     args: Mapping[str, Any] = field(default_factory=dict)
-    agent: Optional[str] = None
-    duration_ms: Optional[int] = None
-    details: Optional[Mapping[str, Any]] = None
+    agent: str | None = None
+    duration_ms: int | None = None
+    details: Mapping[str, Any] | None = None
 
 
 @dataclass
@@ -75,11 +76,23 @@ class ArtifactEvent(BaseEvent):
     artifact_type: str
     path: str
     sha256: str
-    phase: Optional[str] = None
-    agent: Optional[str] = None
-    uri: Optional[str] = None
-    mime_type: Optional[str] = None
-    metadata: Optional[Mapping[str, Any]] = None
+    phase: str | None = None
+    agent: str | None = None
+    uri: str | None = None
+    mime_type: str | None = None
+    metadata: Mapping[str, Any] | None = None
+
+
+@dataclass
+class NodeEvent(BaseEvent):
+    """Lifecycle and timing for a single execution graph node."""
+
+    event: ClassVar[str] = "node"
+    node: str
+    status: str  # start | retry | done | error | skipped | cancelled
+    phase: str | None = None
+    duration_ms: int | None = None
+    details: Mapping[str, Any] | None = None
 
 
 @dataclass
@@ -88,10 +101,10 @@ class ReduceEvent(BaseEvent):
 
     event: ClassVar[str] = "reduce"
     node: str
-    status: str  # start | done | error
-    inputs: Optional[int] = None
-    result_ref: Optional[str] = None
-    details: Optional[Mapping[str, Any]] = None
+    status: str  # start | done | error | skipped | cancelled
+    inputs: int | None = None
+    result_ref: str | None = None
+    details: Mapping[str, Any] | None = None
 
 
 @dataclass
@@ -102,7 +115,7 @@ class ErrorEvent(BaseEvent):
     where: str  # executor | agent | tool | system
     message: str
     retryable: bool
-    details: Optional[Mapping[str, Any]] = None
+    details: Mapping[str, Any] | None = None
 
 
 @dataclass
@@ -111,5 +124,5 @@ class EndEvent(BaseEvent):
 
     event: ClassVar[str] = "end"
     status: str  # ok | partial | error | cancelled
-    elapsed_ms: Optional[int] = None
-    summary: Optional[MutableMapping[str, Any]] = None
+    elapsed_ms: int | None = None
+    summary: MutableMapping[str, Any] | None = None
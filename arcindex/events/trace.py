@@ -0,0 +1,253 @@
+"""
+Hierarchical span tracing exported in Chrome Trace Event format.
+
+A :class:`Tracer` collects timed spans for one run. Code marks the work it
+wants measured with :func:`span` (a context manager) or :func:`traced` (a
+decorator); both are no-ops unless a tracer is active in the current context
+(see :func:`use_tracer`), so instrumented library code costs one context
+variable lookup when tracing is off.
+
+Spans nest through a context variable, which asyncio tasks and
+``asyncio.to_thread`` inherit, so a span opened inside a graph node running in
+a worker thread is recorded as a child of that node. :meth:`Tracer.write`
+saves ``runs/<run_id>/trace.json``, which loads directly in
+``chrome://tracing`` or Perfetto to show where a run spent its time: model
+latency (``llm``), disk writes (``disk``), encoding (``serialise``), graph
+nodes (``node``) and so on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+from arcindex.codec import dumps_compact, loads
+
+TRACE_FILENAME = "trace.json"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_TRACER: contextvars.ContextVar[Tracer | None] = contextvars.ContextVar(
+    "arcindex_tracer", default=None
+)
+_PARENT: contextvars.ContextVar[int | None] = contextvars.ContextVar(
+    "arcindex_span_parent", default=None
+)
+
+
+@dataclass
+class Span:
+    """A finished (or, while ``end_us`` is ``None``, open) unit of traced work."""
+
+    span_id: int
+    name: str
+    category: str
+    start_us: float
+    thread_id: int
+    parent_id: int | None = None
+    end_us: float | None = None
+    args: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_us(self) -> float:
+        return (self.end_us if self.end_us is not None else self.start_us) - self.start_us
+
+    def to_trace_event(self, pid: int) -> dict[str, Any]:
+        """Render as a Chrome "complete" (``ph: X``) event."""
+        args = dict(self.args)
+        args["span_id"] = self.span_id
+        if self.parent_id is not None:
+            args["parent_id"] = self.parent_id
+        return {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": round(self.start_us, 3),
+            "dur": round(self.duration_us, 3),
+            "pid": pid,
+            "tid": self.thread_id,
+            "args": args,
+        }
+
+
+class Tracer:
+    """Thread-safe span collector for a single run."""
+
+    def __init__(self, run_id: str) -> None:
+        self._run_id = run_id
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+        self._next_id = 1
+        self._origin_ns = time.perf_counter_ns()
+        self._origin_epoch_us = time.time_ns() / 1000
+        self._threads: dict[int, str] = {}
+
+    @property
+    def run_id(self) -> str:
+        return self._run_id
+
+    @property
+    def spans(self) -> tuple[Span, ...]:
+        """Finished spans in the order they ended."""
+        with self._lock:
+            return tuple(self._spans)
+
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin_ns) / 1000
+
+    @contextmanager
+    def span(self, name: str, category: str = "run", **args: Any) -> Iterator[Span]:
+        """Time the enclosed block as a child of the current span."""
+        lane, lane_name = _lane()
+        with self._lock:
+            span_id = self._next_id
+            self._next_id += 1
+            self._threads.setdefault(lane, lane_name)
+        record = Span(
+            span_id=span_id,
+            name=name,
+            category=category,
+            start_us=self._now_us(),
+            thread_id=lane,
+            parent_id=_PARENT.get(),
+            args=dict(args),
+        )
+        reset = _PARENT.set(span_id)
+        try:
+            yield record
+        except BaseException as exc:
+            record.args["error"] = type(exc).__name__
+            raise
+        finally:
+            _PARENT.reset(reset)
+            record.end_us = self._now_us()
+            with self._lock:
+                self._spans.append(record)
+
+    def trace_events(self) -> list[dict[str, Any]]:
+        """Spans and thread names as Chrome Trace Event records."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self._spans)
+            threads = dict(self._threads)
+        events: list[dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        # Shift onto the wall clock so attempts of a resumed run line up.
+        for record in sorted(spans, key=lambda item: item.start_us):
+            event = record.to_trace_event(pid)
+            event["ts"] = round(event["ts"] + self._origin_epoch_us, 3)
+            events.append(event)
+        return events
+
+    def write(self, run_dir: Path) -> Path:
+        """
+        Write ``trace.json`` into ``run_dir``, appending to an earlier attempt's trace.
+        """
+        # Imported lazily: the state package itself records spans.
+        from arcindex.state.atomic import DURABILITY_NONE, atomic_write_text
+
+        path = run_dir / TRACE_FILENAME
+        events: list[Mapping[str, Any]] = []
+        if path.exists():
+            try:
+                events.extend(loads(path.read_bytes()).get("traceEvents", []))
+            except (OSError, ValueError, AttributeError):
+                events = []
+        events.extend(self.trace_events())
+        document = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"run_id": self._run_id},
+        }
+        # Losing a trace costs nothing but the trace; skip the fsync.
+        atomic_write_text(path, dumps_compact(document), durability=DURABILITY_NONE)
+        return path
+
+
+def _lane() -> tuple[int, str]:
+    # Trace viewers expect spans on one "thread" to nest, which concurrent
+    # asyncio tasks sharing the loop thread do not; give each task its own row.
+    thread = threading.current_thread()
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is None:
+        return thread.ident or 0, thread.name
+    return id(task), f"{thread.name}/{task.get_name()}"
+
+
+def current_tracer() -> Tracer | None:
+    """Tracer active in the current context, if any."""
+    return _TRACER.get()
+
+
+@contextmanager
+def use_tracer(tracer: Tracer | None) -> Iterator[Tracer | None]:
+    """Make ``tracer`` receive the spans recorded inside the block."""
+    reset = _TRACER.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _TRACER.reset(reset)
+
+
+@contextmanager
+def span(name: str, category: str = "run", **args: Any) -> Iterator[Span | None]:
+    """Record a span with the current tracer; does nothing when none is active."""
+    tracer = _TRACER.get()
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, category, **args) as record:
+        yield record
+
+
+def traced(name: str | None = None, category: str = "run") -> Callable[[F], F]:
+    """Decorate a sync or async function so each call is recorded as a span."""
+
+    def decorate(fn: F) -> F:
+        label = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(label, category):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _TRACER.get() is None:
+                return fn(*args, **kwargs)
+            with span(label, category):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+__all__ = [
+    "TRACE_FILENAME",
+    "Span",
+    "Tracer",
+    "current_tracer",
+    "span",
+    "traced",
+    "use_tracer",
+]
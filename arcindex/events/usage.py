@@ -0,0 +1,64 @@
+"""
+Per-node accounting of the LLM requests a graph node sends.
+
+The graph executor gives every node an :class:`LLMUsage` (see
+:func:`use_llm_usage`) and reports its totals on the node's ``done`` event in
+``events.ndjson``. LLM clients add each request they send with
+:func:`record_llm_request`, which is a no-op outside a node. Like tracing,
+the current usage travels in a context variable, so requests sent from tasks
+and ``asyncio.to_thread`` workers are counted against the node that started
+them.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+_USAGE: contextvars.ContextVar[LLMUsage | None] = contextvars.ContextVar(
+    "arcindex_llm_usage", default=None
+)
+
+
+@dataclass
+class LLMUsage:
+    """LLM requests sent, and their estimated prompt tokens."""
+
+    requests: int = 0
+    prompt_tokens: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, prompt_tokens: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+
+    def details(self) -> dict[str, int]:
+        """Event details for the totals; empty when nothing was sent."""
+        with self._lock:
+            if not self.requests:
+                return {}
+            return {"llm_requests": self.requests, "prompt_tokens": self.prompt_tokens}
+
+
+@contextmanager
+def use_llm_usage(usage: LLMUsage) -> Iterator[LLMUsage]:
+    """Count requests recorded in this context (and tasks started in it) in ``usage``."""
+    reset = _USAGE.set(usage)
+    try:
+        yield usage
+    finally:
+        _USAGE.reset(reset)
+
+
+def record_llm_request(prompt_tokens: int) -> None:
+    """Add one request of ``prompt_tokens`` to the current usage, if any."""
+    usage = _USAGE.get()
+    if usage is not None:
+        usage.add(prompt_tokens)
+
+
+__all__ = ["LLMUsage", "record_llm_request", "use_llm_usage"]
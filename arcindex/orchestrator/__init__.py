@@ -1,6 +1,6 @@
 """Orchestrator package exports."""
 
-from .controller import OrchestratorController
+from .controller import OrchestratorController, configure_llm_clients
 from .discovery import (
     build_discovery_summary_markdown,
     build_elicitation_menu,
@@ -10,14 +10,18 @@ from .discovery import (
     parse_discovery_answers,
     persist_discovery_summary,
 )
+from .speculation import ElicitationSpeculator, rank_options
 
 __all__ = [
+    "ElicitationSpeculator",
     "OrchestratorController",
     "build_discovery_summary_markdown",
     "build_elicitation_menu",
+    "configure_llm_clients",
     "format_discovery_questions",
     "get_discovery_questionnaire",
     "initialise_quality_gate",
     "parse_discovery_answers",
     "persist_discovery_summary",
+    "rank_options",
 ]
@@ -7,12 +7,22 @@ the discovery workflow from the CLI.
 
 from __future__ import annotations
 
-import json
+import asyncio
+from collections.abc import Mapping, MutableMapping
 from pathlib import Path
-from typing import Any, Mapping, MutableMapping, Optional, Tuple
+from typing import TYPE_CHECKING, Any
 
 from arcindex.agents import DiscoveryAgent, DiscoveryResult
+from arcindex.agents.cache import CachingDiscoveryClient, open_response_cache
+from arcindex.agents.limiter import LLM_LIMITER, ModelLimits
+from arcindex.agents.sdk import (
+    DiscoveryLLMClient,
+    ElicitationResponse,
+    configure_openai_clients,
+)
+from arcindex.agents.singleflight import SingleFlightDiscoveryClient
 from arcindex.config import RuntimeConfig, load_runtime_config
+from arcindex.events import traced
 from arcindex.orchestrator.discovery import (
     DISCOVERY_CHECKLIST_PATH,
     build_elicitation_menu,
@@ -21,7 +31,15 @@ from arcindex.orchestrator.discovery import (
     initialise_quality_gate,
     parse_discovery_answers,
 )
-from arcindex.state import WorkflowInitializationParams, WorkflowStateError, WorkflowStateStore
+from arcindex.runner.compiler import ExecutionPlan, shared_compiler
+from arcindex.state import (
+    Checkpoint,
+    CheckpointStore,
+    WorkflowInitializationParams,
+    WorkflowStateError,
+    WorkflowStateStore,
+    load_workflow_schema,
+)
 from arcindex.tools import (
     ElicitationMenu,
     ElicitationOption,
@@ -30,26 +48,78 @@ from arcindex.tools import (
     record_quality_gate_placeholder,
 )
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from arcindex.artifacts import ArtifactStore
+    from arcindex.events import EventEmitter
+
+
+def _discovery_client(runtime_config: RuntimeConfig) -> DiscoveryLLMClient:
+    """
+    The agent's default client, behind the response cache when one is configured.
+
+    Identical requests in flight from any run in the process are sent once.
+    """
+    client: DiscoveryLLMClient = DiscoveryAgent.default_client_factory()
+    settings = runtime_config.runs.llm_cache
+    if settings is not None:
+        cache = open_response_cache(
+            settings.path,
+            ttl_s=settings.ttl_seconds,
+            max_entries=settings.max_entries,
+            max_bytes=int(settings.max_mb * 1024 * 1024),
+        )
+        client = CachingDiscoveryClient(client, cache)
+    return SingleFlightDiscoveryClient(client)
+
+
+def configure_llm_clients(runtime_config: RuntimeConfig) -> None:
+    """
+    Apply ``runs.llm_pool_size`` and ``runs.llm_limits`` to the process-wide LLM clients.
+
+    Controllers are per run, but the SDK clients and rate limits behind them
+    are shared by the whole process, so entry points call this once at start-up.
+    """
+    configure_openai_clients(runtime_config.runs.llm_pool_size)
+    for model, limits in runtime_config.runs.llm_limits.items():
+        LLM_LIMITER.configure(
+            model,
+            ModelLimits(
+                requests_per_minute=limits.requests_per_minute,
+                tokens_per_minute=limits.tokens_per_minute,
+                max_concurrency=limits.max_concurrency,
+            ),
+        )
+
 
 class OrchestratorController:
     """Wraps configuration, workflow definitions, and state management."""
 
     def __init__(self, runtime_config: RuntimeConfig) -> None:
         self._config = runtime_config
+        state_settings = runtime_config.state
+        schema = (
+            load_workflow_schema(state_settings.workflow_template, state_settings.legacy_template)
+            if state_settings.validate
+            else None
+        )
         self._state_store = WorkflowStateStore(
-            runtime_config.state.persistence,
-            runtime_config.state.workflow_template,
+            state_settings.persistence,
+            state_settings.workflow_template,
+            durability=state_settings.durability,
+            layout=state_settings.layout,
+            schema=schema,
         )
-        self._discovery_agent = DiscoveryAgent()
+        self._discovery_agent = DiscoveryAgent(client=_discovery_client(runtime_config))
         self._legacy_state_dir = runtime_config.state.persistence
-        self._current_run_dir: Optional[Path] = None
+        self._current_run_dir: Path | None = None
         self._active_workflow_type: str = runtime_config.system.default_workflow
+        self._checkpoints: CheckpointStore | None = None
 
     def configure_run_context(
         self,
         *,
-        emitter: Optional["EventEmitter"] = None,
-        artifact_store: Optional["ArtifactStore"] = None,
+        emitter: EventEmitter | None = None,
+        artifact_store: ArtifactStore | None = None,
     ) -> None:
         """
         Attach streaming and persistence infrastructure for the active run.
@@ -67,8 +137,15 @@ class OrchestratorController:
         self._state_store.bind_run_directory(run_dir)
         self._state_store.save(state)
 
+    def resume_run_directory(self, run_dir: Path, state: Mapping[str, Any]) -> None:
+        """
+        Re-adopt an interrupted run's directory and the workflow its state records.
+        """
+        self.bind_run_directory(run_dir, state)
+        self._active_workflow_type = str(state.get("workflow_type") or self._active_workflow_type)
+
     @classmethod
-    def from_config_path(cls, config_path: Path) -> "OrchestratorController":
+    def from_config_path(cls, config_path: Path) -> OrchestratorController:
         """Instantiate the controller from a runtime configuration path."""
         runtime_config = load_runtime_config(config_path)
         return cls(runtime_config)
@@ -89,9 +166,9 @@ class OrchestratorController:
     def initialise_discovery(
         self,
         workflow_id: str,
-        project_name: Optional[str],
-        operation_mode: Optional[str] = None,
-    ) -> Tuple[MutableMapping[str, Any], str]:
+        project_name: str | None,
+        operation_mode: str | None = None,
+    ) -> tuple[MutableMapping[str, Any], str]:
         """
         Initialise the discovery phase state and return the state plus timestamp.
         """
@@ -109,19 +186,100 @@ class OrchestratorController:
         self._active_workflow_type = workflow_id
         return state, timestamp
 
-    def load_state(self) -> MutableMapping[str, Any]:
-        """Load the existing workflow state."""
+    def load_state(self, *, lazy: bool = False) -> MutableMapping[str, Any]:
+        """
+        Load the existing workflow state.
+
+        ``lazy=True`` defers section reads when the store uses the sectioned layout.
+        """
+        if lazy:
+            return self._state_store.load_lazy()
         return self._state_store.load()
 
     def save_state(self, state: Mapping[str, Any]) -> None:
         """Persist the workflow state to disk."""
         self._state_store.save(state)
 
-    def discovery_questions(self, project_name: Optional[str]) -> str:
+    # ------------------------------------------------------------------#
+    # Workflow plans
+    # ------------------------------------------------------------------#
+
+    def workflow_plans(self) -> Mapping[str, ExecutionPlan]:
+        """
+        Compiled plans for every configured workflow, keyed by workflow id.
+
+        Plans are shared across controllers in the process and only recompiled
+        when a workflow file's content changes.
+        """
+        settings = self._config.workflows
+        compiler = shared_compiler(settings.cache_directory)
+        return compiler.compile_directory(settings.directory, settings.legacy_directory)
+
+    def workflow_plan(self, workflow_id: str | None = None) -> ExecutionPlan:
+        """Return the compiled plan for ``workflow_id`` (default: the active workflow)."""
+        workflow_id = workflow_id or self._active_workflow_type
+        plans = self.workflow_plans()
+        if workflow_id not in plans:
+            available = ", ".join(sorted(plans)) or "none"
+            raise WorkflowStateError(f"Unknown workflow '{workflow_id}'. Available: {available}.")
+        return plans[workflow_id]
+
+    # ------------------------------------------------------------------#
+    # Checkpoints
+    # ------------------------------------------------------------------#
+
+    @property
+    def checkpoints(self) -> CheckpointStore:
+        """Checkpoint store for the directory that currently holds workflow state."""
+        directory = self._state_store.current_directory
+        if self._checkpoints is None or self._checkpoints.path.parent != directory:
+            self._checkpoints = CheckpointStore(
+                directory,
+                durability=self._state_store.durability,
+            )
+        return self._checkpoints
+
+    def checkpoint(
+        self,
+        state: MutableMapping[str, Any],
+        label: str,
+        *,
+        phase: str | None = None,
+        timestamp: str | None = None,
+    ) -> Checkpoint:
+        """Snapshot the workflow state and persist it with the checkpoint reference."""
+        checkpoint = self.checkpoints.capture(state, label=label, phase=phase, timestamp=timestamp)
+        self._state_store.save(state)
+        return checkpoint
+
+    def list_checkpoints(self) -> list[Checkpoint]:
+        """Return the checkpoints recorded for the active state directory."""
+        return self.checkpoints.list()
+
+    def restore_checkpoint(self, ref: str | int) -> MutableMapping[str, Any]:
+        """
+        Rewind the active workflow state to a checkpoint and persist it.
+
+        Later checkpoints remain in the log so the rewind itself can be undone.
+        """
+        state = self.checkpoints.load(ref)
+        self._state_store.save(state)
+        return state
+
+    def fork_from_checkpoint(self, ref: str | int, target_dir: Path) -> MutableMapping[str, Any]:
+        """
+        Start a new state directory from a checkpoint and make it the active one.
+        """
+        self.checkpoints.fork(ref, target_dir)
+        self._state_store.bind_run_directory(target_dir)
+        self._current_run_dir = target_dir
+        return self._state_store.load()
+
+    def discovery_questions(self, project_name: str | None) -> str:
         """Return the formatted discovery question block."""
         return format_discovery_questions(project_name)
 
-    def discovery_questionnaire(self, project_name: Optional[str]):
+    def discovery_questionnaire(self, project_name: str | None):
         """Return the ordered questionnaire for interactive prompting."""
         return get_discovery_questionnaire(project_name)
 
@@ -129,12 +287,13 @@ class OrchestratorController:
         """Parse raw numbered answers supplied via file."""
         return parse_discovery_answers(raw_text)
 
+    @traced("controller.persist_summary", "controller")
     def persist_summary(
         self,
         state: MutableMapping[str, Any],
         answers: Mapping[str, str],
         timestamp: str,
-        project_name: Optional[str],
+        project_name: str | None,
     ) -> DiscoveryResult:
         """Persist discovery summary data and update the state."""
         primary_dir = self._state_store.current_directory
@@ -147,14 +306,57 @@ class OrchestratorController:
             timestamp=timestamp,
             legacy_dir=legacy_dir,
             docs_root=self._config.docs.root,
+            durability=self._state_store.durability,
         )
         self._state_store.save(state)
         return result
 
+    def persisted_summary(self, state: Mapping[str, Any]) -> DiscoveryResult | None:
+        """Result of a :meth:`persist_summary` that already completed for this run, if any."""
+        return self._discovery_agent.load_persisted_summary(state, self._config.docs.root)
+
+    @staticmethod
+    def discovery_finalised(state: Mapping[str, Any]) -> str | None:
+        """Timestamp of an earlier :meth:`finalise_discovery` of ``state``, if any."""
+        project_discovery = state.get("project_discovery") or {}
+        finalised = "discovery" in state.get("completed_phases", ())
+        if finalised and project_discovery.get("discovery_completed"):
+            return project_discovery.get("discovery_timestamp")
+        return None
+
+    def record_discovery_answers(
+        self,
+        state: MutableMapping[str, Any],
+        answers: Mapping[str, str],
+    ) -> None:
+        """Keep the discovery answers in the workflow state so an interrupted run can finish."""
+        project_discovery = state.setdefault("project_discovery", {})
+        if project_discovery.get("answers") == dict(answers):
+            return
+        project_discovery["answers"] = dict(answers)
+        self._state_store.save(state)
+
+    @staticmethod
+    def discovery_inputs(
+        state: Mapping[str, Any],
+    ) -> tuple[dict[str, str], str, str | None] | None:
+        """
+        Answers, timestamp and project name a run's discovery was started with.
+
+        ``None`` when the state predates :meth:`record_discovery_answers`.
+        """
+        project_discovery = state.get("project_discovery") or {}
+        answers = project_discovery.get("answers")
+        timestamp = state.get("started_at")
+        if not isinstance(answers, Mapping) or not timestamp:
+            return None
+        return dict(answers), str(timestamp), state.get("project_name")
+
+    @traced("controller.summary_markdown", "controller")
     def summary_markdown(
         self,
         answers: Mapping[str, str],
-        project_name: Optional[str],
+        project_name: str | None,
     ) -> str:
         """Build the human-readable discovery summary."""
         return self._discovery_agent.build_summary_markdown(
@@ -163,11 +365,46 @@ class OrchestratorController:
             workflow_type=self._active_workflow_type,
         )
 
+    async def asummary_markdown(
+        self,
+        answers: Mapping[str, str],
+        project_name: str | None,
+    ) -> str:
+        """Async :meth:`summary_markdown`; the model call does not hold a thread."""
+        return await self._discovery_agent.agenerate_summary(
+            answers,
+            project_name,
+            workflow_type=self._active_workflow_type,
+        )
+
+    @property
+    def active_workflow_type(self) -> str:
+        """Workflow type of the run the controller is driving."""
+        return self._active_workflow_type
+
+    def summary_signature(self) -> tuple[str, str]:
+        """Prompt and model behind generated discovery summaries, for memoisation."""
+        return self._discovery_agent.summary_signature()
+
+    def prime_summary(
+        self,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        markdown: str,
+    ) -> None:
+        """Use an already generated summary instead of calling the model again."""
+        self._discovery_agent.prime_summary(
+            markdown,
+            answers,
+            project_name,
+            workflow_type=self._active_workflow_type,
+        )
+
     def elicitation_menu(self) -> str:
         """Return the formatted elicitation menu."""
         return build_elicitation_menu()
 
-    def elicitation_options(self) -> Tuple[ElicitationOption, ...]:
+    def elicitation_options(self) -> tuple[ElicitationOption, ...]:
         """Return the elicitation options for downstream use."""
         menu = ElicitationMenu()
         return tuple(menu.build())
@@ -178,8 +415,8 @@ class OrchestratorController:
         selection_number: int,
         selection_label: str,
         timestamp: str,
-        user_feedback: Optional[str] = None,
-        applied_changes: Optional[str] = None,
+        user_feedback: str | None = None,
+        applied_changes: str | None = None,
     ) -> None:
         """Append an elicitation event to workflow state."""
         history = state.setdefault("elicitation_history", [])
@@ -192,26 +429,70 @@ class OrchestratorController:
                 "applied_changes": applied_changes,
             }
         )
-        self._state_store.save(state)
+        self.checkpoint(
+            state,
+            f"elicitation:{selection_number}",
+            phase="discovery",
+            timestamp=timestamp,
+        )
 
+    @traced("controller.apply_elicitation", "controller")
     def apply_elicitation(
         self,
         state: MutableMapping[str, Any],
         answers: Mapping[str, str],
         selection: int,
         option: ElicitationOption,
-        project_name: Optional[str],
+        project_name: str | None,
+        *,
+        precomputed: ElicitationResponse | None = None,
     ) -> str:
         """
         Apply the chosen elicitation method using the Agent SDK and persist history.
+
+        ``precomputed`` (see :meth:`compute_elicitation`) skips the model call.
         """
         response = self._discovery_agent.apply_elicitation_method(
             method_label=option.label,
             answers=answers,
             project_name=project_name,
             workflow_type=self._active_workflow_type,
+            precomputed=precomputed,
         )
+        self._record_applied_elicitation(state, selection, option, response)
+        return response.markdown
 
+    @traced("controller.apply_elicitation", "controller")
+    async def aapply_elicitation(
+        self,
+        state: MutableMapping[str, Any],
+        answers: Mapping[str, str],
+        selection: int,
+        option: ElicitationOption,
+        project_name: str | None,
+        *,
+        precomputed: ElicitationResponse | None = None,
+    ) -> str:
+        """Async :meth:`apply_elicitation`; the model call does not hold a thread."""
+        response = await self._discovery_agent.aapply_elicitation_method(
+            method_label=option.label,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=self._active_workflow_type,
+            precomputed=precomputed,
+        )
+        await asyncio.to_thread(
+            self._record_applied_elicitation, state, selection, option, response
+        )
+        return response.markdown
+
+    def _record_applied_elicitation(
+        self,
+        state: MutableMapping[str, Any],
+        selection: int,
+        option: ElicitationOption,
+        response: ElicitationResponse,
+    ) -> None:
         self.record_elicitation_history(
             state,
             selection_number=selection,
@@ -219,10 +500,48 @@ class OrchestratorController:
             timestamp=current_timestamp(),
             user_feedback=None,
             applied_changes=response.notes,
+        )  # checkpoints, which also saves the state
+
+    @traced("controller.compute_elicitation", "controller")
+    def compute_elicitation(
+        self,
+        answers: Mapping[str, str],
+        option: ElicitationOption,
+        project_name: str | None,
+        current_summary: str,
+    ) -> ElicitationResponse:
+        """
+        Apply ``option`` to ``current_summary`` without touching state.
+
+        Safe to call concurrently; pass the result to :meth:`apply_elicitation`
+        to adopt it.
+        """
+        return self._discovery_agent.compute_elicitation(
+            method_label=option.label,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=self._active_workflow_type,
         )
-        self._state_store.save(state)
-        return response.markdown
 
+    @traced("controller.compute_elicitation", "controller")
+    async def acompute_elicitation(
+        self,
+        answers: Mapping[str, str],
+        option: ElicitationOption,
+        project_name: str | None,
+        current_summary: str,
+    ) -> ElicitationResponse:
+        """Async :meth:`compute_elicitation`."""
+        return await self._discovery_agent.acompute_elicitation(
+            method_label=option.label,
+            current_summary=current_summary,
+            answers=answers,
+            project_name=project_name,
+            workflow_type=self._active_workflow_type,
+        )
+
+    @traced("controller.finalise_discovery", "controller")
     def finalise_discovery(self, state: MutableMapping[str, Any], timestamp: str) -> None:
         """Mark the discovery phase as complete and prepare for analyst handoff."""
         project_discovery = state.setdefault("project_discovery", {})
@@ -257,4 +576,4 @@ class OrchestratorController:
         )
 
         state["last_updated"] = timestamp
-        self._state_store.save(state)
+        self.checkpoint(state, "discovery->analyst", phase="discovery", timestamp=timestamp)
@@ -6,12 +6,13 @@ These utilities mirror the behavior described in the legacy discovery agent inst
 
 from __future__ import annotations
 
-import json
 import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
+from arcindex.codec import dumps_pretty
+from arcindex.state.atomic import DEFAULT_DURABILITY, atomic_write_text
 from arcindex.tools import ElicitationMenu, QualityGateResult, record_quality_gate_placeholder
 
 SUMMARY_FILENAME = "discovery-summary.json"
@@ -217,6 +218,7 @@ def persist_discovery_summary(
     timestamp: str,
     *,
     legacy_dir: Optional[Path] = None,
+    durability: str = DEFAULT_DURABILITY,
 ) -> Path:
     """
     Persist discovery insights to a JSON file and update the workflow state.
@@ -224,16 +226,12 @@ def persist_discovery_summary(
     Returns the path to the saved summary file.
     """
     summary_data = _build_summary_payload(state, answers, timestamp)
-    primary_dir.mkdir(parents=True, exist_ok=True)
     summary_path = primary_dir / SUMMARY_FILENAME
-    with summary_path.open("w", encoding="utf-8") as handle:
-        json.dump(summary_data, handle, indent=2, sort_keys=True)
+    text = dumps_pretty(summary_data)
+    atomic_write_text(summary_path, text, durability=durability)
 
     if legacy_dir is not None and legacy_dir != primary_dir:
-        legacy_dir.mkdir(parents=True, exist_ok=True)
-        legacy_summary = legacy_dir / SUMMARY_FILENAME
-        with legacy_summary.open("w", encoding="utf-8") as handle:
-            json.dump(summary_data, handle, indent=2, sort_keys=True)
+        atomic_write_text(legacy_dir / SUMMARY_FILENAME, text, durability=durability)
 
     project_discovery = state.setdefault("project_discovery", {})
     project_discovery.update(
@@ -0,0 +1,156 @@
+"""
+Speculative pre-computation of elicitation methods.
+
+Applying an elicitation method is a blocking model call that normally starts
+only once the user has picked the method. While the user reads the base
+summary, an :class:`ElicitationSpeculator` applies the ``top_k`` methods they
+are most likely to pick concurrently in the background. A selection that was
+precomputed is served as soon as its call finishes (usually at once), and the
+calls for every other method are cancelled, aborting their in-flight requests.
+
+This spends spare model quota on methods nobody may pick in exchange for
+interactive latency, so it is opt-in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from arcindex.agents.sdk import ElicitationResponse
+from arcindex.tools.cancellation import CancellationError, CancellationToken, use_token
+from arcindex.tools.elicitation import PROCEED_LABEL, ElicitationOption
+
+DEFAULT_TOP_K = 3
+
+
+def rank_options(
+    options: Iterable[ElicitationOption],
+    popularity: Mapping[str, int] | None = None,
+) -> list[ElicitationOption]:
+    """
+    Refinement options ordered by how likely they are to be picked.
+
+    ``popularity`` counts past selections by label; ties (and the cold start)
+    fall back to menu order, which lists the most generally useful methods
+    first. The proceed option is never included.
+    """
+    counts = popularity or {}
+    candidates = [option for option in options if option.label != PROCEED_LABEL]
+    return sorted(candidates, key=lambda option: (-counts.get(option.label, 0), option.number))
+
+
+@dataclass
+class SpeculationStats:
+    """What one speculator launched and how its selection was served."""
+
+    started: int = 0
+    hit: bool = False
+    cancelled: int = 0
+
+
+class ElicitationSpeculator:
+    """
+    Precompute elicitation results for one summary on the running event loop.
+
+    Each method runs as a task under its own child of ``cancel_token``, so
+    cancelling the run also aborts speculative calls.
+    """
+
+    def __init__(
+        self,
+        controller: Any,
+        answers: Mapping[str, str],
+        project_name: str | None,
+        current_summary: str,
+        *,
+        top_k: int = DEFAULT_TOP_K,
+        popularity: Mapping[str, int] | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> None:
+        self._controller = controller
+        self._answers = dict(answers)
+        self._project_name = project_name
+        self._summary = current_summary
+        self._top_k = top_k
+        self._popularity = popularity
+        self._cancel_token = cancel_token
+        self._pending: dict[int, tuple[asyncio.Future[ElicitationResponse], CancellationToken]] = {}
+        self.stats = SpeculationStats()
+
+    def start(self, options: Iterable[ElicitationOption]) -> tuple[ElicitationOption, ...]:
+        """Begin computing the ``top_k`` most likely options; returns the chosen ones."""
+        chosen = tuple(rank_options(options, self._popularity)[: max(self._top_k, 0)])
+        for option in chosen:
+            token = (
+                self._cancel_token.child()
+                if self._cancel_token is not None
+                else CancellationToken()
+            )
+            with use_token(token):
+                work = asyncio.ensure_future(
+                    self._controller.acompute_elicitation(
+                        self._answers,
+                        option,
+                        self._project_name,
+                        self._summary,
+                    )
+                )
+            work.add_done_callback(_consume)
+            self._pending[option.number] = (work, token)
+        self.stats.started = len(chosen)
+        return chosen
+
+    def is_speculating(self, option: ElicitationOption) -> bool:
+        return option.number in self._pending
+
+    async def take(self, option: ElicitationOption) -> ElicitationResponse | None:
+        """
+        Result for the selected ``option``, cancelling every other speculation.
+
+        Returns ``None`` when ``option`` was not precomputed or its call failed,
+        in which case the caller applies the method directly.
+        """
+        entry = self._pending.pop(option.number, None)
+        self.cancel()
+        if entry is None:
+            return None
+        work, token = entry
+        try:
+            response = await token.run(work)
+        except CancellationError:
+            if self._cancel_token is not None and self._cancel_token.is_cancelled():
+                raise
+            return None
+        except Exception:  # noqa: BLE001 - a failed guess is computed again for real
+            return None
+        finally:
+            token.close()
+        self.stats.hit = True
+        return response
+
+    def cancel(self) -> None:
+        """Abandon every speculation still pending."""
+        for work, token in self._pending.values():
+            if not work.done():
+                self.stats.cancelled += 1
+            token.cancel()
+            work.cancel()
+            token.close()
+        self._pending.clear()
+
+
+def _consume(future: asyncio.Future[Any]) -> None:
+    # Speculations nobody takes may fail; that is not worth a warning.
+    if not future.cancelled():
+        future.exception()
+
+
+__all__ = [
+    "DEFAULT_TOP_K",
+    "ElicitationSpeculator",
+    "SpeculationStats",
+    "rank_options",
+]
@@ -2,13 +2,67 @@
 Runner orchestration exports.
 """
 
-from .graph import CancellationError, CancellationToken
+from arcindex.tools.retry import NO_RETRY, RetryBudget, RetryPolicy
+
+from .batch import BatchJob, BatchOutcome, BatchReport, run_batch
+from .compiler import (
+    ExecutionPlan,
+    PlanStep,
+    WorkflowCompileError,
+    WorkflowCompiler,
+    compile_workflow,
+    shared_compiler,
+)
+from .graph import (
+    CancellationError,
+    CancellationToken,
+    DeadlineExceeded,
+    ExecutionGraph,
+    GraphDefinitionError,
+    GraphExecutor,
+    GraphNode,
+    GraphRun,
+    NodeExecutionError,
+    NodeTiming,
+)
+from .memo import MemoEntry, MemoPolicy, NodeCache, memo_key
+from .resume import EVENTS_RELATIVE_PATH, RunNotFound, RunProgress, load_run_progress, read_events
 from .runner import ArcindexRunner, RunContext, RunResult
 
 __all__ = [
     "ArcindexRunner",
     "RunContext",
     "RunResult",
+    "BatchJob",
+    "BatchOutcome",
+    "BatchReport",
+    "run_batch",
     "CancellationError",
     "CancellationToken",
+    "DeadlineExceeded",
+    "ExecutionGraph",
+    "GraphDefinitionError",
+    "GraphExecutor",
+    "GraphNode",
+    "GraphRun",
+    "NodeExecutionError",
+    "NodeTiming",
+    "NO_RETRY",
+    "RetryBudget",
+    "RetryPolicy",
+    "ExecutionPlan",
+    "PlanStep",
+    "WorkflowCompileError",
+    "WorkflowCompiler",
+    "compile_workflow",
+    "shared_compiler",
+    "MemoEntry",
+    "MemoPolicy",
+    "NodeCache",
+    "memo_key",
+    "EVENTS_RELATIVE_PATH",
+    "RunNotFound",
+    "RunProgress",
+    "load_run_progress",
+    "read_events",
 ]
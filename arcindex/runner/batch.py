@@ -0,0 +1,310 @@
+"""
+Offline batch execution of discovery jobs read from JSONL.
+
+Each input line is a job spec::
+
+    {"id": "acme", "project_name": "Acme", "answers": {...},
+     "workflow": "greenfield-discovery", "elicitation_choice": 1}
+
+Only ``answers`` is required; ``id`` defaults to ``line-<n>``. Jobs are read
+lazily and executed through :class:`~arcindex.runner.ArcindexRunner`, at most
+``concurrency`` at a time, each with its own controller and run directory.
+One result record is appended to the output JSONL as each job finishes, so
+the output doubles as the checkpoint: rerunning the same batch skips every
+job already recorded as ``ok`` and retries the rest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from arcindex.agents.sdk import ASYNC_OPENAI_CLIENTS
+from arcindex.codec import dumps_compact, loads
+from arcindex.tools import current_timestamp
+
+from .runner import ArcindexRunner
+
+DEFAULT_BATCH_CONCURRENCY = 4
+
+BATCH_OK = "ok"
+BATCH_FAILED = "failed"
+BATCH_SKIPPED = "skipped"
+
+
+class BatchJobError(ValueError):
+    """Raised for an input line that is not a valid job spec."""
+
+
+@dataclass
+class BatchJob:
+    """One discovery job from a batch input file."""
+
+    job_id: str
+    answers: dict[str, str]
+    project_name: str | None = None
+    workflow_id: str | None = None
+    operation_mode: str | None = None
+    elicitation_choice: int = 1
+
+    @classmethod
+    def from_record(cls, record: Any, line_number: int) -> BatchJob:
+        if not isinstance(record, dict):
+            raise BatchJobError(f"Line {line_number}: expected a JSON object.")
+        answers = record.get("answers")
+        if not isinstance(answers, dict):
+            raise BatchJobError(f"Line {line_number}: 'answers' must be an object.")
+        choice = record.get("elicitation_choice", 1)
+        if not isinstance(choice, int) or isinstance(choice, bool):
+            raise BatchJobError(f"Line {line_number}: 'elicitation_choice' must be an integer.")
+        return cls(
+            job_id=str(record.get("id") or f"line-{line_number}"),
+            answers={str(key): str(value) for key, value in answers.items()},
+            project_name=record.get("project_name"),
+            workflow_id=record.get("workflow"),
+            operation_mode=record.get("operation_mode"),
+            elicitation_choice=choice,
+        )
+
+
+@dataclass
+class BatchOutcome:
+    """Result of one batch job."""
+
+    job_id: str
+    status: str  # ok | failed | skipped
+    run_id: str | None = None
+    elapsed_ms: int = 0
+    summary_path: str | None = None
+    error: str | None = None
+
+
+@dataclass
+class BatchReport:
+    """Aggregate results for a batch invocation."""
+
+    outcomes: list[BatchOutcome] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    def _count(self, status: str) -> int:
+        return sum(1 for outcome in self.outcomes if outcome.status == status)
+
+    @property
+    def succeeded(self) -> int:
+        return self._count(BATCH_OK)
+
+    @property
+    def failed(self) -> int:
+        return self._count(BATCH_FAILED)
+
+    @property
+    def skipped(self) -> int:
+        return self._count(BATCH_SKIPPED)
+
+    @property
+    def jobs_per_second(self) -> float:
+        """Jobs executed (successfully or not) per second during this invocation."""
+        executed = self.succeeded + self.failed
+        return executed / self.elapsed_s if self.elapsed_s else 0.0
+
+    def latency_percentiles(self, percentiles: tuple[int, ...] = (50, 90, 99)) -> dict[int, float]:
+        """Nearest-rank latency percentiles, in milliseconds, of the jobs executed."""
+        latencies = sorted(
+            outcome.elapsed_ms for outcome in self.outcomes if outcome.status != BATCH_SKIPPED
+        )
+        if not latencies:
+            return {}
+        return {
+            percentile: float(latencies[max(0, -(-percentile * len(latencies) // 100) - 1)])
+            for percentile in percentiles
+        }
+
+
+def read_batch_jobs(path: Path) -> Iterator[BatchJob | BatchJobError]:
+    """
+    Yield a :class:`BatchJob` per non-blank line of ``path``, reading lazily.
+
+    Invalid lines yield a :class:`BatchJobError` instead of aborting the batch.
+    """
+    with path.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield BatchJob.from_record(loads(line), line_number)
+            except ValueError as exc:
+                yield exc if isinstance(exc, BatchJobError) else BatchJobError(
+                    f"Line {line_number}: {exc}"
+                )
+
+
+def completed_job_ids(output_path: Path) -> set[str]:
+    """Job ids already recorded as ``ok`` in a previous invocation's output."""
+    completed: set[str] = set()
+    if not output_path.exists():
+        return completed
+    for line in output_path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = loads(line)
+        except ValueError:
+            continue  # torn trailing line from an interrupted batch
+        if isinstance(record, dict) and record.get("status") == BATCH_OK:
+            completed.add(str(record.get("job_id")))
+    return completed
+
+
+async def run_batch(
+    jobs_path: Path,
+    output_path: Path,
+    controller_factory: Callable[[], Any],
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_outcome: Callable[[BatchOutcome], None] | None = None,
+) -> BatchReport:
+    """
+    Execute every job in ``jobs_path`` and append results to ``output_path``.
+
+    ``controller_factory`` builds a fresh
+    :class:`~arcindex.orchestrator.OrchestratorController` per job, since a
+    controller is bound to one run's state. ``on_outcome`` is called as each
+    job completes (e.g. to print progress).
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+    completed = completed_job_ids(output_path)
+    report = BatchReport()
+    start = time.perf_counter()
+    in_flight: set[asyncio.Task[BatchOutcome]] = set()
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("a", encoding="utf-8") as output:
+
+        def record(outcome: BatchOutcome, *, write: bool = True) -> None:
+            report.outcomes.append(outcome)
+            if write:
+                output.write(dumps_compact(_output_record(outcome)) + "\n")
+                output.flush()
+            if on_outcome is not None:
+                on_outcome(outcome)
+
+        async def drain(until: int) -> None:
+            nonlocal in_flight
+            while len(in_flight) > until:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    record(task.result())
+
+        try:
+            for job in read_batch_jobs(jobs_path):
+                if isinstance(job, BatchJobError):
+                    record(BatchOutcome(job_id="", status=BATCH_FAILED, error=str(job)))
+                    continue
+                if job.job_id in completed:
+                    record(BatchOutcome(job_id=job.job_id, status=BATCH_SKIPPED), write=False)
+                    continue
+                completed.add(job.job_id)  # duplicate ids in one input run once
+                in_flight.add(asyncio.ensure_future(_run_job(job, controller_factory)))
+                await drain(concurrency - 1)
+            await drain(0)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await ASYNC_OPENAI_CLIENTS.aclose()  # shared by every job on this loop
+
+    report.elapsed_s = time.perf_counter() - start
+    return report
+
+
+async def _run_job(job: BatchJob, controller_factory: Callable[[], Any]) -> BatchOutcome:
+    start = time.perf_counter()
+    run_id: str | None = None
+    try:
+        controller = controller_factory()
+        runner = ArcindexRunner(controller)
+        workflow_id = job.workflow_id or controller.config.system.default_workflow
+        state, timestamp = controller.initialise_discovery(
+            workflow_id, job.project_name, job.operation_mode
+        )
+        answers = dict(job.answers)
+        if job.project_name and "project_name" not in answers:
+            answers["project_name"] = job.project_name
+
+        context = runner.create_run(emit_phase_start=False)
+        run_id = context.run_id
+        controller.bind_run_directory(context.artifact_store.run_directory, state)
+        try:
+            await runner.discovery_summary(context, answers, job.project_name)
+            if job.elicitation_choice != 1:
+                await _apply_elicitation(controller, state, answers, job)
+        except BaseException:
+            context.close()
+            raise
+        result = await runner.complete_discovery(
+            context, state, answers, timestamp, job.project_name
+        )
+    except Exception as exc:  # noqa: BLE001 - surfaced through the report and output
+        return BatchOutcome(
+            job_id=job.job_id,
+            status=BATCH_FAILED,
+            run_id=run_id,
+            elapsed_ms=int((time.perf_counter() - start) * 1000),
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return BatchOutcome(
+        job_id=job.job_id,
+        status=BATCH_OK,
+        run_id=result.run_id,
+        elapsed_ms=int((time.perf_counter() - start) * 1000),
+        summary_path=str(result.summary_path),
+    )
+
+
+async def _apply_elicitation(
+    controller: Any,
+    state: Any,
+    answers: Mapping[str, str],
+    job: BatchJob,
+) -> str:
+    option = next(
+        (opt for opt in controller.elicitation_options() if opt.number == job.elicitation_choice),
+        None,
+    )
+    if option is None:
+        raise BatchJobError(f"Invalid elicitation selection: {job.elicitation_choice}")
+    return await controller.aapply_elicitation(
+        state, answers, job.elicitation_choice, option, job.project_name
+    )
+
+
+def _output_record(outcome: BatchOutcome) -> dict[str, object]:
+    record: dict[str, object] = {
+        "job_id": outcome.job_id,
+        "status": outcome.status,
+        "run_id": outcome.run_id,
+        "ts": current_timestamp(),
+        "elapsed_ms": outcome.elapsed_ms,
+    }
+    if outcome.summary_path:
+        record["summary_path"] = outcome.summary_path
+    if outcome.error:
+        record["error"] = outcome.error
+    return record
+
+
+__all__ = [
+    "BATCH_FAILED",
+    "BATCH_OK",
+    "BATCH_SKIPPED",
+    "DEFAULT_BATCH_CONCURRENCY",
+    "BatchJob",
+    "BatchJobError",
+    "BatchOutcome",
+    "BatchReport",
+    "completed_job_ids",
+    "read_batch_jobs",
+    "run_batch",
+]
@@ -0,0 +1,446 @@
+"""
+Compile workflow definitions into cached execution plans.
+
+Workflow files come in two shapes: the Arcindex JSON definitions under
+``config/workflows`` and the legacy CODEX YAML pipelines, which keep their steps
+under ``phases`` or ``workflow.sequence``. Both are normalised into an
+:class:`ExecutionPlan` whose steps are topologically sorted into stages; steps
+sharing a stage have no dependency on each other and may run concurrently.
+
+Dependencies are derived from what each step declares:
+
+* ``requires``/``inputs`` entries of the form ``<step>.completed`` depend on
+  that step;
+* other entries depend on the nearest earlier step that ``creates``,
+  ``updates`` or ``outputs`` that name (or, failing that, a later one);
+  entries nobody produces are external inputs;
+* a step that declares neither ``requires`` nor ``inputs`` follows the step
+  before it, matching how the legacy orchestrator walked the file.
+
+Plans are cached by the SHA-256 of the workflow file, in memory and optionally
+as JSON on disk, so YAML is parsed once per file version rather than per job.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import re
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import yaml  # type: ignore[import-untyped]
+
+from arcindex.codec import dumps_compact, loads
+
+from .graph import ExecutionGraph, GraphNode
+
+# Bump when the plan layout or the compilation rules change; older cache files are ignored.
+PLAN_FORMAT_VERSION = 1
+WORKFLOW_SUFFIXES = (".yaml", ".yml", ".json")
+
+_COMPLETED_SUFFIX = ".completed"
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+StepHandler = Callable[["PlanStep", Mapping[str, Any]], Any]
+
+
+class WorkflowCompileError(ValueError):
+    """Raised when a workflow definition cannot be compiled into a plan."""
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """One step of a compiled workflow."""
+
+    id: str
+    agent: str | None
+    description: str = ""
+    depends_on: tuple[str, ...] = ()
+    produces: tuple[str, ...] = ()
+    consumes: tuple[str, ...] = ()
+    definition: Mapping[str, Any] = field(default_factory=dict, compare=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "agent": self.agent,
+            "description": self.description,
+            "depends_on": list(self.depends_on),
+            "produces": list(self.produces),
+            "consumes": list(self.consumes),
+            "definition": dict(self.definition),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> PlanStep:
+        return cls(
+            id=data["id"],
+            agent=data.get("agent"),
+            description=data.get("description", ""),
+            depends_on=tuple(data.get("depends_on", ())),
+            produces=tuple(data.get("produces", ())),
+            consumes=tuple(data.get("consumes", ())),
+            definition=data.get("definition", {}),
+        )
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """A validated, topologically sorted workflow ready to hand to the runner."""
+
+    workflow_id: str
+    version: str
+    description: str
+    steps: tuple[PlanStep, ...]
+    stages: tuple[tuple[str, ...], ...]
+    external_inputs: tuple[str, ...] = ()
+    source: str = ""
+    digest: str = ""
+
+    @property
+    def order(self) -> list[str]:
+        """Step ids in execution order."""
+        return [step_id for stage in self.stages for step_id in stage]
+
+    @property
+    def parallel_stages(self) -> list[tuple[str, ...]]:
+        """Stages holding more than one step, i.e. where concurrency is possible."""
+        return [stage for stage in self.stages if len(stage) > 1]
+
+    def step(self, step_id: str) -> PlanStep:
+        for step in self.steps:
+            if step.id == step_id:
+                return step
+        raise KeyError(f"Workflow '{self.workflow_id}' has no step '{step_id}'.")
+
+    def to_graph(self, handler: StepHandler) -> ExecutionGraph:
+        """
+        Build an :class:`ExecutionGraph` running ``handler`` once per step.
+
+        ``handler`` is called with the step and a mapping of each dependency's id
+        to the value its handler returned; it may be sync or async. Each step's
+        result is available in the graph run's values under the step id.
+        """
+        return ExecutionGraph(
+            GraphNode(
+                name=step.id,
+                fn=_bind_handler(handler, step),
+                inputs=step.depends_on,
+                outputs=(step.id,),
+                reduce=len(step.depends_on) > 1,
+                phase=step.id,
+            )
+            for step in self.steps
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "workflow_id": self.workflow_id,
+            "version": self.version,
+            "description": self.description,
+            "steps": [step.to_dict() for step in self.steps],
+            "stages": [list(stage) for stage in self.stages],
+            "external_inputs": list(self.external_inputs),
+            "source": self.source,
+            "digest": self.digest,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ExecutionPlan:
+        return cls(
+            workflow_id=data["workflow_id"],
+            version=data.get("version", ""),
+            description=data.get("description", ""),
+            steps=tuple(PlanStep.from_dict(step) for step in data["steps"]),
+            stages=tuple(tuple(stage) for stage in data["stages"]),
+            external_inputs=tuple(data.get("external_inputs", ())),
+            source=data.get("source", ""),
+            digest=data.get("digest", ""),
+        )
+
+
+def _bind_handler(handler: StepHandler, step: PlanStep) -> Callable[..., Any]:
+    # Graph nodes receive one keyword per input; input names are dependency step ids.
+    if _is_async(handler):
+
+        async def run_async(**results: Any) -> Any:
+            return await handler(step, results)
+
+        return run_async
+
+    def run(**results: Any) -> Any:
+        return handler(step, results)
+
+    return run
+
+
+def _is_async(fn: Callable[..., Any]) -> bool:
+    # Instances with an ``async def __call__`` are awaited like coroutine functions.
+    return inspect.iscoroutinefunction(fn) or inspect.iscoroutinefunction(type(fn).__call__)
+
+
+# ----------------------------------------------------------------------#
+# Compilation
+# ----------------------------------------------------------------------#
+
+
+def compile_workflow(
+    document: Mapping[str, Any],
+    *,
+    source: str = "",
+    digest: str = "",
+    default_id: str | None = None,
+) -> ExecutionPlan:
+    """Normalise a parsed workflow ``document`` into an :class:`ExecutionPlan`."""
+    nested = document.get("workflow")
+    root: Mapping[str, Any] = nested if isinstance(nested, Mapping) else document
+    workflow_id = root.get("workflow_id") or root.get("id") or default_id
+    if not workflow_id:
+        raise WorkflowCompileError(f"Workflow {source or '<document>'} does not declare an id.")
+    raw_steps = root.get("phases", root.get("sequence"))
+    if not isinstance(raw_steps, list) or not raw_steps:
+        raise WorkflowCompileError(f"Workflow '{workflow_id}' defines no phases or sequence.")
+
+    definitions: list[Mapping[str, Any]] = []
+    ids: list[str] = []
+    for index, raw in enumerate(raw_steps):
+        if not isinstance(raw, Mapping):
+            raise WorkflowCompileError(f"Workflow '{workflow_id}' step {index} is not a mapping.")
+        step_id = _step_id(raw)
+        if step_id is None:
+            raise WorkflowCompileError(
+                f"Workflow '{workflow_id}' step {index} has no phase, id, name, or agent."
+            )
+        if step_id in ids:
+            raise WorkflowCompileError(f"Workflow '{workflow_id}' defines step '{step_id}' twice.")
+        ids.append(step_id)
+        definitions.append(raw)
+
+    produced_by: dict[str, list[int]] = {}
+    produces: list[tuple[str, ...]] = []
+    for index, raw in enumerate(definitions):
+        names = _names(raw.get("creates")) + _names(raw.get("updates")) + _names(raw.get("outputs"))
+        produces.append(tuple(dict.fromkeys(names)))
+        for name in produces[-1]:
+            produced_by.setdefault(name, []).append(index)
+
+    steps: list[PlanStep] = []
+    external: dict[str, None] = {}
+    for index, raw in enumerate(definitions):
+        consumes = tuple(dict.fromkeys(_names(raw.get("requires")) + _names(raw.get("inputs"))))
+        if not consumes and "requires" not in raw and "inputs" not in raw:
+            depends_on: tuple[str, ...] = (ids[index - 1],) if index else ()
+        else:
+            resolved: dict[str, None] = {}
+            for name in consumes:
+                dependency = _resolve(name, index, ids, produced_by, workflow_id)
+                if dependency is None:
+                    external[name] = None
+                elif dependency != ids[index]:
+                    resolved[dependency] = None
+            depends_on = tuple(resolved)
+        agent = raw.get("agent", raw.get("primary_agent"))
+        steps.append(
+            PlanStep(
+                id=ids[index],
+                agent=str(agent) if agent is not None else None,
+                description=str(raw.get("description", "")).strip(),
+                depends_on=depends_on,
+                produces=produces[index],
+                consumes=consumes,
+                definition=raw,
+            )
+        )
+
+    return ExecutionPlan(
+        workflow_id=str(workflow_id),
+        version=str(root.get("version", "")),
+        description=" ".join(str(root.get("description", "")).split()),
+        steps=tuple(steps),
+        stages=_stages(steps, workflow_id),
+        external_inputs=tuple(external),
+        source=source,
+        digest=digest,
+    )
+
+
+def _step_id(raw: Mapping[str, Any]) -> str | None:
+    for key in ("phase", "id"):
+        if raw.get(key):
+            return str(raw[key])
+    if raw.get("name"):
+        return _SLUG.sub("_", str(raw["name"]).lower()).strip("_")
+    if raw.get("agent"):
+        return str(raw["agent"])
+    return None
+
+
+def _names(value: Any) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value if item is not None]
+    return [str(value)]
+
+
+def _resolve(
+    name: str,
+    index: int,
+    ids: Sequence[str],
+    produced_by: Mapping[str, Sequence[int]],
+    workflow_id: str,
+) -> str | None:
+    if name.endswith(_COMPLETED_SUFFIX):
+        step_id = name[: -len(_COMPLETED_SUFFIX)]
+        if step_id not in ids:
+            raise WorkflowCompileError(
+                f"Workflow '{workflow_id}' step '{ids[index]}' requires unknown step '{step_id}'."
+            )
+        return step_id
+    if name in ids:
+        return name
+    producers = produced_by.get(name)
+    if not producers:
+        return None
+    earlier = [producer for producer in producers if producer < index]
+    return ids[earlier[-1] if earlier else producers[0]]
+
+
+def _stages(steps: Sequence[PlanStep], workflow_id: str) -> tuple[tuple[str, ...], ...]:
+    remaining = {step.id: set(step.depends_on) for step in steps}
+    stages: list[tuple[str, ...]] = []
+    while remaining:
+        ready = tuple(step.id for step in steps if step.id in remaining and not remaining[step.id])
+        if not ready:
+            cycle = ", ".join(sorted(remaining))
+            raise WorkflowCompileError(
+                f"Workflow '{workflow_id}' has a dependency cycle among: {cycle}."
+            )
+        stages.append(ready)
+        for step_id in ready:
+            del remaining[step_id]
+        for dependencies in remaining.values():
+            dependencies.difference_update(ready)
+    return tuple(stages)
+
+
+# ----------------------------------------------------------------------#
+# Caching compiler
+# ----------------------------------------------------------------------#
+
+
+class WorkflowCompiler:
+    """
+    Compile workflow files, reusing plans for files whose content is unchanged.
+
+    Plans are memoised by content hash for the life of the compiler and, when
+    ``cache_dir`` is given, written there as ``<sha256>.json`` so later
+    processes skip YAML parsing too. The compiler is safe to share between threads.
+    """
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        self._cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._plans: dict[str, ExecutionPlan] = {}
+        # path -> (mtime_ns, size, digest), so unchanged files are not re-hashed.
+        self._digests: dict[Path, tuple[int, int, str]] = {}
+
+    def compile_file(self, path: Path) -> ExecutionPlan:
+        """Return the plan for ``path``, compiling it only if its content is new."""
+        path = path.resolve()
+        stat = path.stat()
+        with self._lock:
+            known = self._digests.get(path)
+            if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+                plan = self._plans.get(known[2])
+                if plan is not None:
+                    return plan
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._digests[path] = (stat.st_mtime_ns, stat.st_size, digest)
+            plan = self._plans.get(digest)
+        if plan is None:
+            plan = self._read_cache(digest)
+        if plan is None:
+            plan = self._compile_bytes(data, path, digest)
+            self._write_cache(plan)
+        with self._lock:
+            self._plans[digest] = plan
+        return plan
+
+    def compile_directory(self, *directories: Path | None) -> dict[str, ExecutionPlan]:
+        """
+        Compile every workflow file in ``directories``, keyed by workflow id.
+
+        Earlier directories take precedence when two define the same workflow id;
+        missing or ``None`` directories are ignored.
+        """
+        plans: dict[str, ExecutionPlan] = {}
+        for directory in directories:
+            if directory is None or not directory.is_dir():
+                continue
+            for path in sorted(directory.iterdir()):
+                if path.suffix in WORKFLOW_SUFFIXES and path.is_file():
+                    plan = self.compile_file(path)
+                    plans.setdefault(plan.workflow_id, plan)
+        return plans
+
+    @staticmethod
+    def _compile_bytes(data: bytes, path: Path, digest: str) -> ExecutionPlan:
+        try:
+            document = yaml.safe_load(data.decode("utf-8"))
+        except (UnicodeDecodeError, yaml.YAMLError) as exc:
+            raise WorkflowCompileError(f"Workflow file {path} could not be parsed: {exc}") from exc
+        if not isinstance(document, Mapping):
+            raise WorkflowCompileError(f"Workflow file {path} must contain a mapping.")
+        return compile_workflow(document, source=str(path), digest=digest, default_id=path.stem)
+
+    def _read_cache(self, digest: str) -> ExecutionPlan | None:
+        if self._cache_dir is None:
+            return None
+        cache_path = self._cache_dir / f"{digest}.json"
+        try:
+            record = loads(cache_path.read_bytes())
+            if record.get("format") != PLAN_FORMAT_VERSION:
+                return None
+            return ExecutionPlan.from_dict(record["plan"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_cache(self, plan: ExecutionPlan) -> None:
+        if self._cache_dir is None:
+            return
+        cache_path = self._cache_dir / f"{plan.digest}.json"
+        tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            payload = dumps_compact({"format": PLAN_FORMAT_VERSION, "plan": plan.to_dict()})
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(payload, encoding="utf-8")
+            tmp_path.replace(cache_path)
+        except (OSError, TypeError, ValueError):
+            # The on-disk cache is an optimisation; an unwritable cache only costs a re-parse.
+            tmp_path.unlink(missing_ok=True)
+
+
+@cache
+def shared_compiler(cache_dir: Path | None = None) -> WorkflowCompiler:
+    """Process-wide compiler for ``cache_dir``, so every job reuses the same plans."""
+    return WorkflowCompiler(cache_dir)
+
+
+__all__ = [
+    "PLAN_FORMAT_VERSION",
+    "ExecutionPlan",
+    "PlanStep",
+    "WorkflowCompileError",
+    "WorkflowCompiler",
+    "compile_workflow",
+    "shared_compiler",
+]
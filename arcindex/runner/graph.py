@@ -1,30 +1,631 @@
 """
-Lightweight primitives supporting Arcindex runner execution graphs.
+Execution graph primitives for the Arcindex runner.
+
+A graph is a set of :class:`GraphNode` definitions. Each node names the values
+it consumes (``inputs``) and produces (``outputs``); dependencies follow from
+which node produces each input. :class:`GraphExecutor` runs independent nodes
+concurrently on asyncio under a concurrency limit, emitting a ``node`` event
+with timing for every node and ``reduce`` events for fan-in nodes. A node's
+``done`` event also reports the LLM requests it sent and their estimated
+prompt tokens (see :mod:`arcindex.events.usage`).
+
+Each running node is raced against the run's :class:`CancellationToken` and
+its own ``timeout_s``: a cancelled or overdue node gives up its concurrency
+slot at once instead of waiting for the work to return, and the token is made
+current (see :func:`arcindex.tools.cancellation.current_token`) so clients
+called from the node can abort their in-flight requests.
+
+Failed attempts are retried according to the node's (or the executor's)
+:class:`~arcindex.tools.retry.RetryPolicy`, within the run's
+:class:`~arcindex.tools.retry.RetryBudget`. Every retry is announced with a
+``retry`` node event, and a node's ``idempotency`` check runs before each
+attempt so work that already landed (for example an artifact written just
+before a failure) is not repeated.
 """
 
 from __future__ import annotations
 
 import asyncio
+import inspect
+import random
+import time
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from arcindex.artifacts import ArtifactStore
+from arcindex.events import (
+    ArtifactEvent,
+    EventEmitter,
+    LLMUsage,
+    NodeEvent,
+    ReduceEvent,
+    span,
+    use_llm_usage,
+)
+from arcindex.tools import current_timestamp
+from arcindex.tools.cancellation import (
+    CancellationError,
+    CancellationToken,
+    DeadlineExceeded,
+    use_token,
+)
+from arcindex.tools.retry import CircuitOpenError, RetryBudget, RetryPolicy
+
+from .memo import MemoPolicy, NodeCache, memo_key
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class GraphDefinitionError(ValueError):
+    """Raised when a graph is malformed: duplicate names, unproduced inputs, or cycles."""
+
+
+class NodeExecutionError(RuntimeError):
+    """
+    Raised when a node fails; the original exception is available as ``error``.
+
+    ``attempts`` is how many times the node ran before giving up.
+    """
+
+    def __init__(self, node: str, error: BaseException, attempts: int = 1) -> None:
+        super().__init__(f"Graph node '{node}' failed: {error}")
+        self.node = node
+        self.error = error
+        self.attempts = attempts
+
+
+@dataclass(frozen=True)
+class GraphNode:
+    """
+    A unit of work in an execution graph.
+
+    ``fn`` is called with one keyword argument per input and may be sync (run
+    in a worker thread) or async. A node with a single output returns that
+    value; a node with several outputs returns a mapping keyed by output name.
+    ``reduce`` marks fan-in nodes, which additionally emit ``reduce`` events.
+    ``memo`` opts the node into result caching (see :mod:`arcindex.runner.memo`).
+    ``timeout_s`` bounds a single attempt; an overdue node fails with a
+    :class:`TimeoutError`. ``retry`` overrides the executor's retry policy
+    (``NO_RETRY`` for work that must not be repeated). ``idempotency`` is
+    called with the node's inputs before each attempt; a result other than
+    ``None`` means the work is already done and is used as the node's return
+    value without calling ``fn``.
+    """
+
+    name: str
+    fn: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    reduce: bool = False
+    phase: str | None = None
+    memo: MemoPolicy | None = None
+    timeout_s: float | None = None
+    retry: RetryPolicy | None = None
+    idempotency: Callable[..., Any] | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "inputs", tuple(self.inputs))
+        object.__setattr__(self, "outputs", tuple(self.outputs))
+
+
+@dataclass(frozen=True)
+class NodeTiming:
+    """When a node ran, in milliseconds relative to the start of the graph run."""
+
+    node: str
+    start_ms: float
+    end_ms: float
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+
+@dataclass
+class GraphRun:
+    """Values and per-node timings produced by one graph execution."""
+
+    values: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, NodeTiming] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+    memo_hits: set[str] = field(default_factory=set)
+
+
+class ExecutionGraph:
+    """A validated set of nodes and the dependencies between them."""
+
+    def __init__(self, nodes: Iterable[GraphNode] = ()) -> None:
+        self._nodes: dict[str, GraphNode] = {}
+        self._producers: dict[str, str] = {}
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: GraphNode) -> GraphNode:
+        """Register ``node``; names and output values must be unique."""
+        if node.name in self._nodes:
+            raise GraphDefinitionError(f"Duplicate graph node '{node.name}'.")
+        for output in node.outputs:
+            if output in self._producers:
+                raise GraphDefinitionError(
+                    f"Value '{output}' is produced by both "
+                    f"'{self._producers[output]}' and '{node.name}'."
+                )
+        self._nodes[node.name] = node
+        for output in node.outputs:
+            self._producers[output] = node.name
+        return node
+
+    @property
+    def nodes(self) -> list[GraphNode]:
+        """Nodes in registration order."""
+        return list(self._nodes.values())
+
+    def node(self, name: str) -> GraphNode:
+        """Return the node called ``name``."""
+        return self._nodes[name]
+
+    def producer(self, value: str) -> str | None:
+        """Name of the node producing ``value``, or ``None`` if it must be provided."""
+        return self._producers.get(value)
+
+    def dependencies(self, name: str) -> set[str]:
+        """Nodes whose outputs ``name`` consumes."""
+        return {
+            self._producers[value]
+            for value in self._nodes[name].inputs
+            if value in self._producers
+        }
+
+    def topological_order(self, provided: Iterable[str] = ()) -> list[str]:
+        """
+        Return node names in dependency order.
+
+        Raises :class:`GraphDefinitionError` when an input is neither produced by
+        a node nor in ``provided``, or when the dependencies form a cycle.
+        """
+        available = set(provided)
+        for node in self._nodes.values():
+            missing = [
+                value
+                for value in node.inputs
+                if value not in self._producers and value not in available
+            ]
+            if missing:
+                raise GraphDefinitionError(
+                    f"Node '{node.name}' needs {', '.join(sorted(missing))}, "
+                    "which nothing provides."
+                )
+
+        remaining = {name: self.dependencies(name) for name in self._nodes}
+        order: list[str] = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise GraphDefinitionError(
+                    f"Graph has a dependency cycle between: {', '.join(sorted(remaining))}."
+                )
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+
+class _Slot:
+    """
+    One of the executor's concurrency slots, held by a node while it runs.
+
+    :meth:`released` gives the slot up for a stretch of waiting (a retry
+    backoff) and takes it back afterwards; a node cancelled while waiting
+    leaves without one, so the slot count stays balanced.
+    """
+
+    def __init__(self, semaphore: asyncio.Semaphore) -> None:
+        self._semaphore = semaphore
+        self._held = False
+
+    async def __aenter__(self) -> None:
+        await self._semaphore.acquire()
+        self._held = True
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._held:
+            self._held = False
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def released(self) -> AsyncIterator[None]:
+        self._held = False
+        self._semaphore.release()
+        yield
+        await self._semaphore.acquire()
+        self._held = True
+
+
+class GraphExecutor:
+    """
+    Run an :class:`ExecutionGraph` on asyncio.
+
+    Nodes start as soon as every node they depend on has finished, with at
+    most ``max_concurrency`` running at once. The first failure cancels the
+    nodes still running and is raised as :class:`NodeExecutionError`.
+    Cancelling ``cancel_token`` (or passing its deadline) interrupts running
+    nodes, which emit a ``cancelled`` event, and raises
+    :class:`CancellationError`. ``node_timeout_s`` applies to nodes that do
+    not set their own ``timeout_s``.
+
+    With a ``cache``, memoised nodes whose key is already cached are not run;
+    their outputs are restored and, like fresh results, written to
+    ``artifact_store`` and announced with an ``artifact`` event. ``refresh``
+    ignores cached results and overwrites them.
+
+    ``retry`` is the policy for nodes without their own; by default failed
+    nodes are not retried. ``retry_budget`` bounds retries across every graph
+    sharing it. A node backing off before a retry frees its concurrency slot
+    for other ready nodes.
+    """
+
+    def __init__(
+        self,
+        graph: ExecutionGraph,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        emitter: EventEmitter | None = None,
+        run_id: str | None = None,
+        cancel_token: CancellationToken | None = None,
+        cache: NodeCache | None = None,
+        artifact_store: ArtifactStore | None = None,
+        refresh: bool = False,
+        node_timeout_s: float | None = None,
+        retry: RetryPolicy | None = None,
+        retry_budget: RetryBudget | None = None,
+        rng: random.Random | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self._cache = cache
+        self._artifact_store = artifact_store
+        self._refresh = refresh
+        self._graph = graph
+        self._max_concurrency = max_concurrency
+        self._emitter = emitter
+        self._run_id = run_id or (emitter.run_id if emitter else "")
+        self._cancel_token = cancel_token
+        self._node_timeout_s = node_timeout_s
+        self._retry = retry
+        self._retry_budget = retry_budget
+        self._rng = rng or random.Random()
+
+    async def execute(
+        self,
+        initial: Mapping[str, Any] | None = None,
+        *,
+        completed: Mapping[str, Mapping[str, Any]] | None = None,
+    ) -> GraphRun:
+        """
+        Execute every node and return the produced values and timings.
+
+        ``completed`` maps nodes finished by an earlier attempt to the output
+        values to restore for them; those nodes emit a ``skipped`` event instead
+        of running, which is how resumed runs avoid repeating work.
+        """
+        completed = completed or {}
+        run = GraphRun(values=dict(initial or {}))
+        order = self._graph.topological_order(run.values)
+        waiting = {name: self._graph.dependencies(name) for name in order}
+        dependents: dict[str, list[str]] = {name: [] for name in order}
+        for name, deps in waiting.items():
+            for dep in deps:
+                dependents[dep].append(name)
+
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        started = time.perf_counter()
+        ready = [name for name in order if not waiting[name]]
+        running: dict[asyncio.Task[dict[str, Any]], str] = {}
+
+        def release(name: str) -> None:
+            for child in dependents[name]:
+                waiting[child].discard(name)
+                if not waiting[child]:
+                    ready.append(child)
+
+        try:
+            while ready or running:
+                while ready:
+                    node = self._graph.node(ready.pop(0))
+                    if node.name in completed:
+                        restored = completed[node.name]
+                        run.values.update({output: restored.get(output) for output in node.outputs})
+                        self._emit_node(node, "skipped")
+                        release(node.name)
+                        continue
+                    task = asyncio.ensure_future(self._run_node(node, run, semaphore, started))
+                    running[task] = node.name
+                if not running:
+                    continue
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    run.values.update(task.result())
+                    release(name)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        run.elapsed_ms = (time.perf_counter() - started) * 1000
+        return run
+
+    async def _run_node(
+        self,
+        node: GraphNode,
+        run: GraphRun,
+        semaphore: asyncio.Semaphore,
+        started: float,
+    ) -> dict[str, Any]:
+        slot = _Slot(semaphore)
+        async with slot:
+            if self._cancel_token is not None:
+                self._cancel_token.raise_if_cancelled()
+            kwargs = {name: run.values[name] for name in node.inputs}
+            key = memo_key(node.name, kwargs, node.memo) if self._cache and node.memo else None
+            cached = self._cached_outputs(node, key)
+            if cached is None:
+                existing = await self._already_done(node, kwargs)
+                if existing is not None:
+                    self._emit_node(node, "skipped", details={"idempotent": True})
+                    return existing
+            start_ms = (time.perf_counter() - started) * 1000
+            self._emit_node(node, "start")
+            if self._retry_budget is not None:
+                self._retry_budget.record_attempt()
+            usage = LLMUsage()
+            attempt = 1
+            while True:
+                try:
+                    outputs = (
+                        cached if cached is not None else await self._attempt(node, kwargs, usage)
+                    )
+                    break
+                except (asyncio.CancelledError, CancellationError) as exc:
+                    duration_ms = (time.perf_counter() - started) * 1000 - start_ms
+                    self._emit_node(
+                        node,
+                        "cancelled",
+                        duration_ms=duration_ms,
+                        error=exc if isinstance(exc, DeadlineExceeded) else None,
+                    )
+                    raise
+                except Exception as exc:
+                    delay_s = self._retry_delay(node, exc, attempt)
+                    if delay_s is None:
+                        duration_ms = (time.perf_counter() - started) * 1000 - start_ms
+                        self._emit_node(
+                            node,
+                            "error",
+                            duration_ms=duration_ms,
+                            error=exc,
+                            details={"attempts": attempt} if attempt > 1 else None,
+                        )
+                        raise NodeExecutionError(node.name, exc, attempt) from exc
+                    self._emit_node(
+                        node,
+                        "retry",
+                        error=exc,
+                        details={
+                            "attempt": attempt,
+                            "error_type": type(exc).__name__,
+                            "delay_ms": int(delay_s * 1000),
+                        },
+                    )
+                try:
+                    # Other ready nodes may use the slot while this one waits.
+                    async with slot.released():
+                        await self._backoff(delay_s)
+                except CancellationError:
+                    duration_ms = (time.perf_counter() - started) * 1000 - start_ms
+                    self._emit_node(node, "cancelled", duration_ms=duration_ms)
+                    raise
+                existing = await self._already_done(node, kwargs)
+                if existing is not None:
+                    self._emit_node(
+                        node, "skipped", details={"idempotent": True, "attempts": attempt}
+                    )
+                    return existing
+                attempt += 1
+            details: dict[str, Any] | None = {"attempts": attempt} if attempt > 1 else None
+            if usage.requests:
+                details = dict(details or {}, **usage.details())
+            if key is not None:
+                hit = cached is not None
+                if hit:
+                    run.memo_hits.add(node.name)
+                elif self._cache is None or self._cache.put(key, node.name, outputs) is None:
+                    key = None  # outputs are not serialisable; nothing was cached
+                if key is not None:
+                    details = dict(details or {}, memo="hit" if hit else "miss", memo_key=key)
+                    self._record_memo_artifact(node, key, outputs, hit)
+            end_ms = (time.perf_counter() - started) * 1000
+            run.timings[node.name] = NodeTiming(node.name, start_ms, end_ms)
+            self._emit_node(node, "done", duration_ms=end_ms - start_ms, details=details)
+            return outputs
+
+    async def _attempt(
+        self,
+        node: GraphNode,
+        kwargs: Mapping[str, Any],
+        usage: LLMUsage,
+    ) -> dict[str, Any]:
+        """
+        Run ``node`` once under its own token, counting its LLM requests in
+        ``usage``; a timeout raises ``TimeoutError``.
+        """
+        timeout_s = node.timeout_s if node.timeout_s is not None else self._node_timeout_s
+        token = self._node_token(timeout_s)
+        try:
+            with use_token(token), use_llm_usage(usage):
+                work = asyncio.ensure_future(self._invoke(node, kwargs))
+            result = await token.run(work) if token is not None else await work
+            return self._collect_outputs(node, result)
+        except DeadlineExceeded as exc:
+            if self._cancel_token is not None and self._cancel_token.is_cancelled():
+                raise
+            raise TimeoutError(f"Node '{node.name}' exceeded its {timeout_s:g}s timeout.") from exc
+        finally:
+            if token is not None:
+                token.close()
+
+    def _retry_delay(self, node: GraphNode, error: Exception, attempt: int) -> float | None:
+        """Seconds to wait before retrying ``node``, or ``None`` to give up."""
+        policy = node.retry or self._retry
+        if policy is None:
+            return None
+        policy = policy.for_error(error)
+        if not policy.should_retry(error, attempt):
+            return None
+        if self._retry_budget is not None and not self._retry_budget.try_spend():
+            return None
+        delay_s = policy.delay_s(attempt, self._rng)
+        if isinstance(error, CircuitOpenError):
+            delay_s = max(delay_s, error.retry_after_s)
+        return delay_s
+
+    async def _backoff(self, delay_s: float) -> None:
+        if self._cancel_token is None:
+            await asyncio.sleep(delay_s)
+        else:
+            await self._cancel_token.run(asyncio.sleep(delay_s))
+
+    async def _already_done(
+        self,
+        node: GraphNode,
+        kwargs: Mapping[str, Any],
+    ) -> dict[str, Any] | None:
+        if node.idempotency is None:
+            return None
+        result = await asyncio.to_thread(node.idempotency, **kwargs)
+        return None if result is None else self._collect_outputs(node, result)
 
+    def _node_token(self, timeout_s: float | None) -> CancellationToken | None:
+        if self._cancel_token is not None:
+            return self._cancel_token.child(timeout_s)
+        if timeout_s is not None:
+            return CancellationToken(timeout=timeout_s)
+        return None
 
-class CancellationError(RuntimeError):
-    """Raised when a run is cancelled."""
+    @staticmethod
+    async def _invoke(node: GraphNode, kwargs: Mapping[str, Any]) -> Any:
+        with span(node.name, "node", phase=node.phase):
+            if inspect.iscoroutinefunction(node.fn):
+                return await node.fn(**kwargs)
+            # A node abandoned on cancellation leaves its thread to finish (or be
+            # aborted by the client's cancel hook) without holding a slot.
+            result = await asyncio.to_thread(node.fn, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
 
+    def _cached_outputs(self, node: GraphNode, key: str | None) -> dict[str, Any] | None:
+        if key is None or self._refresh or self._cache is None:
+            return None
+        entry = self._cache.get(key)
+        if entry is None or any(name not in entry.outputs for name in node.outputs):
+            return None
+        return {name: entry.outputs[name] for name in node.outputs}
 
-class CancellationToken:
-    """Async-aware cancellation helper."""
+    def _record_memo_artifact(
+        self,
+        node: GraphNode,
+        key: str,
+        outputs: Mapping[str, Any],
+        hit: bool,
+    ) -> None:
+        # Fresh and replayed results produce byte-identical artifacts, so a hit
+        # looks to consumers exactly like the run that originally computed it.
+        if self._artifact_store is None:
+            return
+        metadata = {"memo_key": key, "memo": "hit" if hit else "miss"}
+        record = self._artifact_store.write_json(
+            f"{node.name}-outputs",
+            dict(outputs),
+            phase=node.phase,
+            metadata=metadata,
+        )
+        if self._emitter is not None:
+            event = ArtifactEvent(
+                run_id=self._run_id, ts=current_timestamp(), **record.to_event_payload()
+            )
+            self._emitter.emit(event)
 
-    def __init__(self) -> None:
-        self._event = asyncio.Event()
+    @staticmethod
+    def _collect_outputs(node: GraphNode, result: Any) -> dict[str, Any]:
+        if not node.outputs:
+            return {}
+        if len(node.outputs) == 1:
+            return {node.outputs[0]: result}
+        if not isinstance(result, Mapping):
+            raise TypeError(
+                f"Node '{node.name}' must return a mapping of {', '.join(node.outputs)}."
+            )
+        missing = [name for name in node.outputs if name not in result]
+        if missing:
+            raise KeyError(f"Node '{node.name}' did not produce {', '.join(missing)}.")
+        return {name: result[name] for name in node.outputs}
 
-    def cancel(self) -> None:
-        """Trigger cancellation."""
-        self._event.set()
+    def _emit_node(
+        self,
+        node: GraphNode,
+        status: str,
+        *,
+        duration_ms: float | None = None,
+        error: BaseException | None = None,
+        details: Mapping[str, Any] | None = None,
+    ) -> None:
+        if self._emitter is None:
+            return
+        ts = current_timestamp()
+        if error is not None:
+            details = dict(details or {}, error=str(error))
+        self._emitter.emit(
+            NodeEvent(
+                run_id=self._run_id,
+                ts=ts,
+                node=node.name,
+                status=status,
+                phase=node.phase,
+                duration_ms=int(duration_ms) if duration_ms is not None else None,
+                details=details,
+            )
+        )
+        if node.reduce:
+            self._emitter.emit(
+                ReduceEvent(
+                    run_id=self._run_id,
+                    ts=ts,
+                    node=node.name,
+                    status=status,
+                    inputs=len(node.inputs),
+                    result_ref=(
+                        ",".join(node.outputs) if status == "done" and node.outputs else None
+                    ),
+                    details=details,
+                )
+            )
 
-    def is_cancelled(self) -> bool:
-        """Return True if cancellation has been requested."""
-        return self._event.is_set()
 
-    async def wait(self) -> None:
-        """Await cancellation."""
-        await self._event.wait()
+__all__ = [
+    "DEFAULT_MAX_CONCURRENCY",
+    "CancellationError",
+    "CancellationToken",
+    "DeadlineExceeded",
+    "ExecutionGraph",
+    "GraphDefinitionError",
+    "GraphExecutor",
+    "GraphNode",
+    "GraphRun",
+    "NodeExecutionError",
+    "NodeTiming",
+]
@@ -0,0 +1,278 @@
+"""
+Memoization of execution graph node results.
+
+A node opts in by carrying a :class:`MemoPolicy`. Its cache key is the SHA-256
+of a canonical JSON rendering of the node name, its input values, and the
+policy's prompt, model, and version, so changing any of them (a new prompt
+revision or model) misses the cache rather than replaying a stale answer.
+
+Results are kept in a :class:`NodeCache` directory shared by every run,
+one JSON document per key, bounded by entry count and total size with the
+least recently used entries evicted first. Only nodes whose inputs and
+outputs are JSON-serialisable are memoised; anything else simply executes.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from arcindex.codec import dumps_compact, dumps_pretty, loads
+from arcindex.state.atomic import DURABILITY_NONE, atomic_write_text
+from arcindex.tools import current_timestamp
+
+MEMO_FORMAT_VERSION = 1
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class MemoPolicy:
+    """
+    Marks a graph node as memoisable and names what else its result depends on.
+
+    ``prompt`` is the prompt (or a template identifier) the node sends to a
+    model and ``model`` the model it targets; ``version`` can be bumped to
+    retire every cached result for the node.
+    """
+
+    prompt: str = ""
+    model: str = ""
+    version: str = ""
+
+
+@dataclass(frozen=True)
+class MemoEntry:
+    """A cached node result."""
+
+    key: str
+    node: str
+    outputs: Mapping[str, Any]
+    created_at: str
+    path: Path
+
+
+def memo_key(node: str, inputs: Mapping[str, Any], policy: MemoPolicy) -> str | None:
+    """
+    Return the cache key for running ``node`` on ``inputs``, or ``None`` when an
+    input cannot be rendered canonically (the node is then not memoised).
+    """
+    try:
+        document = {
+            "format": MEMO_FORMAT_VERSION,
+            "node": node,
+            "inputs": {name: _canonical(value) for name, value in inputs.items()},
+            "prompt": hashlib.sha256(policy.prompt.encode("utf-8")).hexdigest(),
+            "model": policy.model,
+            "version": policy.version,
+        }
+        encoded = dumps_compact(document, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, Mapping):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canonical(item) for item in value)
+    if isinstance(value, Path):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _canonical(dataclasses.asdict(value))
+    raise TypeError(f"Cannot derive a cache key from {type(value).__name__}.")
+
+
+class NodeCache:
+    """
+    Content-addressed store of node results shared across runs.
+
+    Entries live at ``<directory>/<key[:2]>/<key>.json``. Invalidate single
+    keys, every entry for a node, or everything; a run can also bypass hits
+    entirely (see ``refresh`` on :class:`~arcindex.runner.graph.GraphExecutor`).
+
+    Once a store pushes the cache past ``max_entries`` or ``max_bytes`` (``None``
+    for no limit), the least recently stored or read entries are removed. Recency
+    survives restarts through file modification times; processes sharing the
+    directory each enforce the limits on the entries they know about.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
+        max_bytes: int | None = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self._directory = directory
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> size in bytes, least recently used first; loaded on first store.
+        self._index: OrderedDict[str, int] | None = None
+        self._bytes = 0
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> MemoEntry | None:
+        """Return the entry stored under ``key``, if any."""
+        path = self._path(key)
+        try:
+            record = loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        entry = self._entry(record, path)
+        if entry is not None:
+            self._touch(key, path)
+        return entry
+
+    def put(self, key: str, node: str, outputs: Mapping[str, Any]) -> MemoEntry | None:
+        """Store ``outputs`` under ``key``; returns ``None`` if they are not JSON-serialisable."""
+        record = {
+            "format": MEMO_FORMAT_VERSION,
+            "key": key,
+            "node": node,
+            "created_at": current_timestamp(),
+            "outputs": dict(outputs),
+        }
+        try:
+            text = dumps_pretty(record)
+        except (TypeError, ValueError):
+            return None
+        path = self._path(key)
+        # A lost cache entry only costs a recomputation, so skip the fsync.
+        atomic_write_text(path, text, durability=DURABILITY_NONE)
+        self._track(key, len(text.encode("utf-8")))
+        return self._entry(record, path)
+
+    def invalidate(self, key: str) -> bool:
+        """Remove the entry for ``key``; returns whether one existed."""
+        with self._lock:
+            if self._index is not None:
+                self._bytes -= self._index.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def invalidate_node(self, node: str) -> int:
+        """Remove every entry recorded for ``node``; returns how many were removed."""
+        removed = 0
+        for entry in self.entries():
+            if entry.node == node and self.invalidate(entry.key):
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry; returns how many were removed."""
+        removed = 0
+        for entry in self.entries():
+            if self.invalidate(entry.key):
+                removed += 1
+        return removed
+
+    def entries(self) -> Iterator[MemoEntry]:
+        """Iterate over every readable entry in the cache."""
+        if not self._directory.is_dir():
+            return
+        for shard in sorted(os.scandir(self._directory), key=lambda item: item.name):
+            if not shard.is_dir():
+                continue
+            for item in sorted(os.scandir(shard.path), key=lambda item: item.name):
+                if item.name.endswith(".json"):
+                    entry = self.get(item.name[: -len(".json")])
+                    if entry is not None:
+                        yield entry
+
+    def _touch(self, key: str, path: Path) -> None:
+        with self._lock:
+            if self._index is not None and key in self._index:
+                self._index.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _track(self, key: str, size: int) -> None:
+        with self._lock:
+            index = self._load_index()
+            self._bytes += size - index.pop(key, 0)
+            index[key] = size
+            evicted = []
+            # The entry just stored is never evicted, even if it alone exceeds a limit.
+            while len(index) > 1 and self._over_limit(index):
+                oldest, oldest_size = index.popitem(last=False)
+                self._bytes -= oldest_size
+                evicted.append(oldest)
+        for oldest in evicted:
+            try:
+                self._path(oldest).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _over_limit(self, index: OrderedDict[str, int]) -> bool:
+        if self._max_entries is not None and len(index) > self._max_entries:
+            return True
+        return self._max_bytes is not None and self._bytes > self._max_bytes
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._index is not None:
+            return self._index
+        found: list[tuple[int, str, int]] = []
+        if self._directory.is_dir():
+            for shard in os.scandir(self._directory):
+                if not shard.is_dir():
+                    continue
+                for item in os.scandir(shard.path):
+                    if not item.name.endswith(".json"):
+                        continue
+                    try:
+                        stat = item.stat()
+                    except OSError:
+                        continue
+                    found.append((stat.st_mtime_ns, item.name[: -len(".json")], stat.st_size))
+        found.sort()
+        self._index = OrderedDict((key, size) for _, key, size in found)
+        self._bytes = sum(self._index.values())
+        return self._index
+
+    @staticmethod
+    def _entry(record: Mapping[str, Any], path: Path) -> MemoEntry | None:
+        if record.get("format") != MEMO_FORMAT_VERSION:
+            return None
+        return MemoEntry(
+            key=record["key"],
+            node=record["node"],
+            outputs=record["outputs"],
+            created_at=record.get("created_at", ""),
+            path=path,
+        )
+
+
+__all__ = [
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_MAX_ENTRIES",
+    "MEMO_FORMAT_VERSION",
+    "MemoEntry",
+    "MemoPolicy",
+    "NodeCache",
+    "memo_key",
+]
@@ -0,0 +1,184 @@
+"""
+Reconstruct how far a run got so it can be resumed.
+
+A run directory holds everything needed: ``logs/events.ndjson`` records which
+phases ended, which graph nodes finished, and every artifact persisted (with
+its sha256), while ``workflow.json`` records the phases the workflow state
+considers complete. :func:`load_run_progress` folds both into a
+:class:`RunProgress`.
+
+Completed work is only trusted if its artifacts are intact: an artifact whose
+file is missing or whose content no longer matches the logged sha256 marks its
+phase, and every node in that phase, as incomplete so it is executed again.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, MutableMapping
+from dataclasses import dataclass, field
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+from arcindex.artifacts import ArtifactRecord
+from arcindex.codec import loads
+from arcindex.state import STATE_FILENAME
+
+from .compiler import ExecutionPlan
+
+EVENTS_RELATIVE_PATH = Path("logs") / "events.ndjson"
+
+
+class RunNotFound(FileNotFoundError):
+    """Raised when a run directory or its event log does not exist."""
+
+
+@dataclass
+class RunProgress:
+    """What a previous attempt at a run completed, verified against disk."""
+
+    run_id: str
+    run_dir: Path
+    state: MutableMapping[str, Any] | None = None
+    status: str | None = None  # status of the last end event, if any
+    last_seq: int = -1
+    completed_phases: list[str] = field(default_factory=list)
+    completed_nodes: list[str] = field(default_factory=list)
+    artifacts: list[ArtifactRecord] = field(default_factory=list)
+    invalid_artifacts: list[ArtifactRecord] = field(default_factory=list)
+    node_phases: dict[str, str | None] = field(default_factory=dict)
+
+    @property
+    def finished(self) -> bool:
+        """True when the run already ended successfully."""
+        return self.status == "ok"
+
+    @property
+    def workflow_id(self) -> str | None:
+        """Workflow the run was executing, as recorded in ``workflow.json``."""
+        if not self.state:
+            return None
+        return self.state.get("workflow_type") or self.state.get("workflow_id") or None
+
+    def artifacts_for(self, phase: str) -> tuple[ArtifactRecord, ...]:
+        """Verified artifacts persisted during ``phase``."""
+        return tuple(record for record in self.artifacts if record.phase == phase)
+
+    def completed_steps(self, plan: ExecutionPlan) -> dict[str, dict[str, Any]]:
+        """
+        Steps of ``plan`` that need not run again, with their restored outputs.
+
+        A step is complete when its node finished (or its phase ended) and all of
+        its dependencies are complete too; anything downstream of re-executed
+        work is re-executed as well. A restored step's output is the tuple of
+        verified artifacts it persisted. The discovery graph is not resumed
+        this way: see :meth:`~arcindex.runner.ArcindexRunner.resume_discovery`,
+        whose nodes rebuild their real outputs from the persisted state.
+        """
+        done_nodes = set(self.completed_nodes)
+        done_phases = set(self.completed_phases)
+        completed: dict[str, dict[str, Any]] = {}
+        for step_id in plan.order:
+            step = plan.step(step_id)
+            finished = step_id in done_nodes or step_id in done_phases
+            if finished and all(dependency in completed for dependency in step.depends_on):
+                completed[step_id] = {step_id: self.artifacts_for(step_id)}
+        return completed
+
+    def remaining_steps(self, plan: ExecutionPlan) -> list[str]:
+        """Step ids of ``plan`` that a resume would execute, in plan order."""
+        completed = self.completed_steps(plan)
+        return [step_id for step_id in plan.order if step_id not in completed]
+
+
+def read_events(path: Path) -> list[dict[str, Any]]:
+    """Parse an NDJSON event log, ignoring a torn trailing record."""
+    events: list[dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                events.append(loads(line))
+            except ValueError:
+                break
+    return events
+
+
+def load_run_progress(run_dir: Path) -> RunProgress:
+    """Determine what the run in ``run_dir`` completed before it stopped."""
+    events_path = run_dir / EVENTS_RELATIVE_PATH
+    if not events_path.exists():
+        raise RunNotFound(f"No event log found for run at {run_dir}.")
+
+    progress = RunProgress(run_id=run_dir.name, run_dir=run_dir)
+    state_path = run_dir / STATE_FILENAME
+    if state_path.exists():
+        progress.state = loads(state_path.read_bytes())
+
+    phases: dict[str, None] = {}
+    nodes: dict[str, None] = {}
+    for event in read_events(events_path):
+        kind = event.get("event")
+        progress.last_seq = max(progress.last_seq, int(event.get("seq", -1)))
+        if kind == "phase" and event.get("status") == "end":
+            phases[event["phase"]] = None
+        elif kind == "node" and event.get("status") in ("done", "skipped"):
+            nodes[event["node"]] = None
+            progress.node_phases[event["node"]] = event.get("phase")
+        elif kind == "artifact":
+            record = _artifact_record(event)
+            if _verify(record):
+                progress.artifacts.append(record)
+            else:
+                progress.invalid_artifacts.append(record)
+        elif kind == "end":
+            progress.status = event.get("status")
+
+    if progress.state:
+        for phase in progress.state.get("completed_phases") or ():
+            phases.setdefault(phase, None)
+
+    damaged: set[str | None] = {record.phase for record in progress.invalid_artifacts}
+    progress.completed_phases = [phase for phase in phases if phase not in damaged]
+    progress.completed_nodes = [
+        node
+        for node in nodes
+        if node not in damaged and progress.node_phases.get(node) not in damaged
+    ]
+    if damaged and progress.status == "ok":
+        progress.status = None
+    return progress
+
+
+def _artifact_record(event: Mapping[str, Any]) -> ArtifactRecord:
+    return ArtifactRecord(
+        artifact_type=event.get("artifact_type", ""),
+        path=Path(event["path"]),
+        uri=event.get("uri", ""),
+        sha256=event.get("sha256", ""),
+        phase=event.get("phase"),
+        agent=event.get("agent"),
+        mime_type=event.get("mime_type"),
+        metadata=event.get("metadata"),
+    )
+
+
+def _verify(record: ArtifactRecord) -> bool:
+    digest = sha256()
+    try:
+        with record.path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return False
+    return digest.hexdigest() == record.sha256
+
+
+__all__ = [
+    "EVENTS_RELATIVE_PATH",
+    "RunNotFound",
+    "RunProgress",
+    "load_run_progress",
+    "read_events",
+]
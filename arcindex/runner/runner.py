@@ -4,20 +4,43 @@ Arcindex runner skeleton for Phase 1.
 
 from __future__ import annotations
 
-import asyncio
 import time
 import uuid
+from collections.abc import Callable, Iterable, Mapping, MutableMapping
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Callable, Iterable, Mapping, MutableMapping, Optional, Tuple
+from typing import Any
 
 from arcindex.agents import DiscoveryResult
 from arcindex.artifacts import ArtifactRecord, ArtifactStore
-from arcindex.events import ArtifactEvent, EndEvent, EventEmitter, EventSubscriber, PhaseEvent
+from arcindex.events import (
+    ArtifactEvent,
+    EndEvent,
+    EventEmitter,
+    EventSubscriber,
+    PhaseEvent,
+    Tracer,
+    span,
+    use_tracer,
+)
 from arcindex.events.model import ErrorEvent
+from arcindex.state import WorkflowStateError
 from arcindex.tools import current_timestamp
+from arcindex.tools.retry import RetryBudget, RetryPolicy, is_transient
 
-from .graph import CancellationError, CancellationToken
+from .compiler import ExecutionPlan, StepHandler
+from .graph import (
+    DEFAULT_MAX_CONCURRENCY,
+    CancellationError,
+    CancellationToken,
+    ExecutionGraph,
+    GraphExecutor,
+    GraphNode,
+    GraphRun,
+    NodeExecutionError,
+)
+from .memo import MemoPolicy, NodeCache
+from .resume import RunProgress, load_run_progress
 
 
 @dataclass
@@ -25,17 +48,22 @@ class RunContext:
     """Holds per-run infrastructure."""
 
     run_id: str
-    started_at: Optional[str]
+    started_at: str | None
     emitter: EventEmitter
     artifact_store: ArtifactStore
     events_path: Path
     phase_started: bool = False
-    _unsubscribe: Tuple[Callable[[], None], ...] = field(default_factory=tuple)
+    completed_nodes: list[str] = field(default_factory=list)
+    tracer: Tracer | None = None
+    retry_budget: RetryBudget | None = None
+    _unsubscribe: tuple[Callable[[], None], ...] = field(default_factory=tuple)
 
     def close(self) -> None:
-        """Detach any subscribers registered for this run."""
+        """Detach any subscribers registered for this run and write its trace."""
         for unsubscribe in self._unsubscribe:
             unsubscribe()
+        if self.tracer is not None and self.tracer.spans:
+            self.tracer.write(self.artifact_store.run_directory)
 
 
 @dataclass
@@ -49,20 +77,76 @@ class RunResult:
     elapsed_ms: int
     summary_markdown: str
     summary_path: Path
-    summary_artifact: Optional[ArtifactRecord]
-    docs_markdown_path: Optional[Path]
+    summary_artifact: ArtifactRecord | None
+    docs_markdown_path: Path | None
     events_path: Path
 
 
 class ArcindexRunner:
-    """Coordinates discovery execution for Phase 1."""
+    """
+    Coordinates discovery execution for Phase 1.
 
-    def __init__(self, controller) -> None:
+    ``run_timeout_s`` and ``node_timeout_s`` default to ``runs.timeout_seconds``
+    and ``runs.node_timeout_seconds`` from the runtime config. The run deadline
+    starts when the runner first executes a graph, so time spent waiting for
+    discovery answers does not count against it.
+
+    Graph nodes that fail with a transient error (a timeout, rate limit or
+    provider 5xx) are retried with backoff per ``runs.retry``; ``retry``
+    overrides that policy. Retries are capped per run by a
+    :class:`~arcindex.tools.retry.RetryBudget`.
+    """
+
+    def __init__(
+        self,
+        controller,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        refresh_cache: bool = False,
+        run_timeout_s: float | None = None,
+        node_timeout_s: float | None = None,
+        retry: RetryPolicy | None = None,
+    ) -> None:
         self._controller = controller
         self._cancel_token = CancellationToken()
+        self._run_token: CancellationToken | None = None
+        self._max_concurrency = max_concurrency
+        runs = controller.config.runs
+        self._node_cache = (
+            NodeCache(
+                runs.node_cache,
+                max_entries=runs.node_cache_max_entries,
+                max_bytes=int(runs.node_cache_max_mb * 1024 * 1024),
+            )
+            if runs.node_cache is not None
+            else None
+        )
+        self._refresh_cache = refresh_cache
+        self._run_timeout_s = run_timeout_s if run_timeout_s is not None else runs.timeout_seconds
+        self._node_timeout_s = (
+            node_timeout_s if node_timeout_s is not None else runs.node_timeout_seconds
+        )
+        self._retry = retry or RetryPolicy(
+            max_attempts=runs.retry.max_attempts,
+            base_delay_s=runs.retry.base_delay_seconds,
+            max_delay_s=runs.retry.max_delay_seconds,
+        )
+        self._retry_budget_ratio = runs.retry.budget_ratio
+
+    @property
+    def node_cache(self) -> NodeCache | None:
+        """Shared cache of memoised node results, if configured."""
+        return self._node_cache
+
+    @property
+    def cancel_token(self) -> CancellationToken:
+        """Token governing this runner's graph executions, armed with the run deadline."""
+        if self._run_token is None:
+            self._run_token = self._cancel_token.child(self._run_timeout_s)
+        return self._run_token
 
     def cancel(self) -> None:
-        """Request cancellation of the active run."""
+        """Request cancellation of the active run, interrupting in-flight nodes."""
         self._cancel_token.cancel()
 
     def create_run(
@@ -70,20 +154,27 @@ class ArcindexRunner:
         subscribers: Iterable[EventSubscriber] = (),
         *,
         emit_phase_start: bool = True,
+        run_id: str | None = None,
     ) -> RunContext:
         """
         Prepare run infrastructure and emit initial phase start event.
+
+        Passing an existing ``run_id`` reopens that run's directory and event log.
         """
-        run_id = uuid.uuid4().hex
+        run_id = run_id or uuid.uuid4().hex
         runs_root = self._controller.config.runs.root
 
         emitter = EventEmitter(run_id, runs_root)
-        artifact_store = ArtifactStore(run_id, runs_root)
+        artifact_store = ArtifactStore(
+            run_id,
+            runs_root,
+            durability=self._controller.config.state.durability,
+        )
         unsubscribers = tuple(emitter.subscribe(sub) for sub in subscribers)
 
         self._controller.configure_run_context(emitter=emitter, artifact_store=artifact_store)
 
-        started_at: Optional[str] = None
+        started_at: str | None = None
         phase_started = False
         if emit_phase_start:
             started_at = current_timestamp()
@@ -104,6 +195,8 @@ class ArcindexRunner:
             artifact_store=artifact_store,
             events_path=emitter.events_path,
             phase_started=phase_started,
+            tracer=Tracer(run_id) if self._controller.config.runs.trace else None,
+            retry_budget=RetryBudget(self._retry_budget_ratio),
             _unsubscribe=unsubscribers,
         )
 
@@ -113,7 +206,7 @@ class ArcindexRunner:
         state: MutableMapping[str, object],
         answers: Mapping[str, str],
         timestamp: str,
-        project_name: Optional[str],
+        project_name: str | None,
     ) -> RunResult:
         """
         Persist discovery artifacts, finalise workflow state, and emit terminal events.
@@ -132,100 +225,304 @@ class ArcindexRunner:
 
         start_perf = time.perf_counter()
         try:
-            self._ensure_not_cancelled()
-            discovery_result = self._controller.persist_summary(
-                state,
-                answers,
-                timestamp,
-                project_name,
+            with use_tracer(context.tracer), span("complete_discovery", "run"):
+                try:
+                    self._ensure_not_cancelled()
+                    self._controller.record_discovery_answers(state, answers)
+                    graph_run = await self.run_graph(
+                        context,
+                        self.discovery_graph(),
+                        {
+                            "state": state,
+                            "answers": answers,
+                            "timestamp": timestamp,
+                            "project_name": project_name,
+                        },
+                    )
+                    discovery_result: DiscoveryResult = graph_run.values["discovery_result"]
+                    completed_at: str = graph_run.values["completed_at"]
+
+                    elapsed_ms = int((time.perf_counter() - start_perf) * 1000)
+                    context.emitter.emit(
+                        PhaseEvent(
+                            run_id=context.run_id,
+                            ts=completed_at,
+                            phase="discovery",
+                            status="end",
+                        )
+                    )
+                    self._emit_artifact_event(context, discovery_result.summary_artifact)
+
+                    context.emitter.emit(
+                        EndEvent(
+                            run_id=context.run_id,
+                            ts=completed_at,
+                            status="ok",
+                            elapsed_ms=elapsed_ms,
+                            summary={
+                                "summary_path": str(discovery_result.summary_path),
+                                "artifact_uri": (
+                                    discovery_result.summary_artifact.uri
+                                    if discovery_result.summary_artifact
+                                    else None
+                                ),
+                                "docs_markdown_path": (
+                                    str(discovery_result.docs_markdown_path)
+                                    if discovery_result.docs_markdown_path
+                                    else None
+                                ),
+                            },
+                        )
+                    )
+
+                    return RunResult(
+                        run_id=context.run_id,
+                        status="ok",
+                        started_at=context.started_at or completed_at,
+                        completed_at=completed_at,
+                        elapsed_ms=elapsed_ms,
+                        summary_markdown=discovery_result.summary_markdown,
+                        summary_path=discovery_result.summary_path,
+                        summary_artifact=discovery_result.summary_artifact,
+                        docs_markdown_path=discovery_result.docs_markdown_path,
+                        events_path=context.events_path,
+                    )
+                except CancellationError as exc:
+                    # Report what finished before the interruption so the run can be
+                    # resumed; nothing that completed is rolled back.
+                    completed_at = current_timestamp()
+                    context.emitter.emit(
+                        EndEvent(
+                            run_id=context.run_id,
+                            ts=completed_at,
+                            status="partial" if context.completed_nodes else "cancelled",
+                            elapsed_ms=int((time.perf_counter() - start_perf) * 1000),
+                            summary={
+                                "reason": exc.reason,
+                                "completed_nodes": list(context.completed_nodes),
+                            },
+                        )
+                    )
+                    raise
+                except Exception as exc:
+                    completed_at = current_timestamp()
+                    error = exc.error if isinstance(exc, NodeExecutionError) else exc
+                    details = (
+                        {"node": exc.node, "attempts": exc.attempts}
+                        if isinstance(exc, NodeExecutionError)
+                        else None
+                    )
+                    context.emitter.emit(
+                        ErrorEvent(
+                            run_id=context.run_id,
+                            ts=completed_at,
+                            where="runner",
+                            message=str(error),
+                            # Retries (or their budget) ran out; a later rerun may succeed.
+                            retryable=is_transient(error),
+                            details=details,
+                        )
+                    )
+                    context.emitter.emit(
+                        EndEvent(
+                            run_id=context.run_id,
+                            ts=completed_at,
+                            status="error",
+                        )
+                    )
+                    raise
+        finally:
+            context.close()
+
+    async def run_graph(
+        self,
+        context: RunContext,
+        graph: ExecutionGraph,
+        initial: Mapping[str, Any] | None = None,
+        *,
+        max_concurrency: int | None = None,
+        completed: Mapping[str, Mapping[str, Any]] | None = None,
+    ) -> GraphRun:
+        """
+        Execute ``graph`` for this run, streaming node events to the run's emitter.
+
+        Independent nodes (for example several personas reviewing the same
+        brief) run concurrently, bounded by ``max_concurrency``. Nodes listed in
+        ``completed`` are restored rather than executed.
+        """
+        executor = GraphExecutor(
+            graph,
+            max_concurrency=max_concurrency or self._max_concurrency,
+            emitter=context.emitter,
+            run_id=context.run_id,
+            cancel_token=self.cancel_token,
+            cache=self._node_cache,
+            artifact_store=context.artifact_store,
+            refresh=self._refresh_cache,
+            node_timeout_s=self._node_timeout_s,
+            retry=self._retry,
+            retry_budget=context.retry_budget,
+        )
+
+        def track(payload: dict[str, Any]) -> None:
+            if payload.get("event") == "node" and payload.get("status") in ("done", "skipped"):
+                context.completed_nodes.append(payload["node"])
+
+        unsubscribe = context.emitter.subscribe(track)
+        try:
+            with use_tracer(context.tracer):
+                return await executor.execute(initial, completed=completed)
+        finally:
+            unsubscribe()
+
+    async def run_plan(
+        self,
+        context: RunContext,
+        plan: ExecutionPlan,
+        handler: StepHandler,
+        *,
+        max_concurrency: int | None = None,
+        progress: RunProgress | None = None,
+    ) -> GraphRun:
+        """
+        Execute a compiled workflow plan, calling ``handler`` once per step.
+
+        Steps in the same plan stage run concurrently; each step's result is
+        stored in the returned run's values under its step id. With
+        ``progress`` from a previous attempt, steps it completed are skipped
+        (see :meth:`RunProgress.completed_steps`).
+        """
+        return await self.run_graph(
+            context,
+            plan.to_graph(handler),
+            max_concurrency=max_concurrency,
+            completed=progress.completed_steps(plan) if progress else None,
+        )
+
+    def resume_run(
+        self,
+        run_id: str,
+        subscribers: Iterable[EventSubscriber] = (),
+    ) -> tuple[RunContext, RunProgress]:
+        """
+        Reopen an interrupted run and report what it already completed.
+
+        The returned context appends to the run's existing event log; pass the
+        progress to :meth:`resume_discovery` to finish its discovery, or to
+        :meth:`run_plan` to execute only the remaining plan steps.
+        """
+        run_dir = self._controller.config.runs.root / run_id
+        progress = load_run_progress(run_dir)
+        context = self.create_run(subscribers, emit_phase_start=False, run_id=run_id)
+        if progress.state is not None:
+            self._controller.resume_run_directory(run_dir, progress.state)
+        return context, progress
+
+    async def resume_discovery(self, context: RunContext, progress: RunProgress) -> RunResult:
+        """
+        Run the rest of an interrupted run's discovery graph.
+
+        Nodes that already completed are not executed again: their idempotency
+        checks rebuild the real outputs (the persisted :class:`DiscoveryResult`,
+        the finalisation timestamp) from ``workflow.json`` and the run's
+        artifacts. Raises :class:`WorkflowStateError` if the run's state does
+        not record the answers its discovery was started with.
+        """
+        state = progress.state
+        inputs = self._controller.discovery_inputs(state) if state is not None else None
+        if state is None or inputs is None:
+            context.close()
+            raise WorkflowStateError(
+                f"Run {progress.run_id} did not record its discovery answers; start a new run."
             )
+        answers, timestamp, project_name = inputs
+        return await self.complete_discovery(context, state, answers, timestamp, project_name)
 
-            self._ensure_not_cancelled()
-            completed_at = current_timestamp()
-            self._controller.finalise_discovery(state, completed_at)
+    async def discovery_summary(
+        self,
+        context: RunContext,
+        answers: Mapping[str, str],
+        project_name: str | None,
+    ) -> str:
+        """
+        Generate the discovery summary as a memoised graph node.
 
-            elapsed_ms = int((time.perf_counter() - start_perf) * 1000)
-            context.emitter.emit(
-                PhaseEvent(
-                    run_id=context.run_id,
-                    ts=completed_at,
+        Re-running discovery with the same answers, project name, workflow type,
+        prompt and model replays the cached summary instead of calling the model.
+        """
+        controller = self._controller
+        prompt, model = controller.summary_signature()
+
+        async def generate(
+            answers: Mapping[str, str], project_name: str | None, workflow_type: str
+        ) -> str:
+            return await controller.asummary_markdown(answers, project_name)
+
+        graph = ExecutionGraph(
+            [
+                GraphNode(
+                    name="generate_summary",
+                    fn=generate,
+                    inputs=("answers", "project_name", "workflow_type"),
+                    outputs=("summary_markdown",),
                     phase="discovery",
-                    status="end",
+                    memo=MemoPolicy(prompt=prompt, model=model),
                 )
-            )
-            self._emit_artifact_event(context, discovery_result.summary_artifact)
+            ]
+        )
+        run = await self.run_graph(
+            context,
+            graph,
+            {
+                "answers": dict(answers),
+                "project_name": project_name,
+                "workflow_type": controller.active_workflow_type,
+            },
+        )
+        summary: str = run.values["summary_markdown"]
+        if "generate_summary" in run.memo_hits:
+            controller.prime_summary(answers, project_name, summary)
+        return summary
 
-            context.emitter.emit(
-                EndEvent(
-                    run_id=context.run_id,
-                    ts=completed_at,
-                    status="ok",
-                    elapsed_ms=elapsed_ms,
-                    summary={
-                        "summary_path": str(discovery_result.summary_path),
-                        "artifact_uri": (
-                            discovery_result.summary_artifact.uri
-                            if discovery_result.summary_artifact
-                            else None
-                        ),
-                        "docs_markdown_path": (
-                            str(discovery_result.docs_markdown_path)
-                            if discovery_result.docs_markdown_path
-                            else None
-                        ),
-                    },
-                )
-            )
+    def discovery_graph(self) -> ExecutionGraph:
+        """
+        Graph that persists the discovery summary and hands off to the analyst.
 
-            return RunResult(
-                run_id=context.run_id,
-                status="ok",
-                started_at=context.started_at or completed_at,
-                completed_at=completed_at,
-                elapsed_ms=elapsed_ms,
-                summary_markdown=discovery_result.summary_markdown,
-                summary_path=discovery_result.summary_path,
-                summary_artifact=discovery_result.summary_artifact,
-                docs_markdown_path=discovery_result.docs_markdown_path,
-                events_path=context.events_path,
-            )
-        except CancellationError:
-            completed_at = current_timestamp()
-            context.emitter.emit(
-                EndEvent(
-                    run_id=context.run_id,
-                    ts=completed_at,
-                    status="cancelled",
-                )
-            )
-            raise
-        except Exception as exc:
+        Consumes ``state``, ``answers``, ``timestamp`` and ``project_name``;
+        produces ``discovery_result`` and ``completed_at``.
+        """
+        controller = self._controller
+
+        def finalise(state: MutableMapping[str, object], discovery_result: DiscoveryResult) -> str:
             completed_at = current_timestamp()
-            context.emitter.emit(
-                ErrorEvent(
-                    run_id=context.run_id,
-                    ts=completed_at,
-                    where="runner",
-                    message=str(exc),
-                    retryable=False,
-                )
-            )
-            context.emitter.emit(
-                EndEvent(
-                    run_id=context.run_id,
-                    ts=completed_at,
-                    status="error",
-                )
-            )
-            raise
-        finally:
-            context.close()
+            controller.finalise_discovery(state, completed_at)
+            return completed_at
+
+        return ExecutionGraph(
+            [
+                GraphNode(
+                    name="persist_summary",
+                    fn=controller.persist_summary,
+                    inputs=("state", "answers", "timestamp", "project_name"),
+                    outputs=("discovery_result",),
+                    phase="discovery",
+                    idempotency=lambda state, **_: controller.persisted_summary(state),
+                ),
+                GraphNode(
+                    name="finalise_discovery",
+                    fn=finalise,
+                    inputs=("state", "discovery_result"),
+                    outputs=("completed_at",),
+                    phase="discovery",
+                    idempotency=lambda state, **_: controller.discovery_finalised(state),
+                ),
+            ]
+        )
 
     def _ensure_not_cancelled(self) -> None:
-        if self._cancel_token.is_cancelled():
-            raise CancellationError()
+        self.cancel_token.raise_if_cancelled()
 
-    def _emit_artifact_event(self, context: RunContext, record: Optional[ArtifactRecord]) -> None:
+    def _emit_artifact_event(self, context: RunContext, record: ArtifactRecord | None) -> None:
         if not record:
             return
         context.emitter.emit(
@@ -1,21 +1,71 @@
 """State management utilities for Arcindex."""
 
+from .atomic import (
+    DEFAULT_DURABILITY,
+    DURABILITY_FSYNC,
+    DURABILITY_FULL,
+    DURABILITY_LEVELS,
+    DURABILITY_NONE,
+    atomic_write_bytes,
+    atomic_write_text,
+)
+from .checkpoints import (
+    CHECKPOINTS_FILENAME,
+    Checkpoint,
+    CheckpointNotFound,
+    CheckpointStore,
+)
+from .migrate import (
+    LINK_MODES,
+    BulkMigrationReport,
+    MigrationOutcome,
+    bulk_migrate_legacy_states,
+    discover_legacy_state_dirs,
+    migrate_legacy_state_to_run,
+)
+from .schema import WorkflowStateSchema, WorkflowStateValidationError, load_workflow_schema
+from .sections import LazyWorkflowState
 from .store import (
+    LAYOUT_SECTIONED,
+    LAYOUT_SINGLE,
     STATE_FILENAME,
+    STATE_LAYOUTS,
     SUMMARY_FILENAME,
     WorkflowInitializationParams,
     WorkflowStateError,
     WorkflowStateNotInitialized,
     WorkflowStateStore,
 )
-from .migrate import migrate_legacy_state_to_run
 
 __all__ = [
+    "CHECKPOINTS_FILENAME",
+    "DEFAULT_DURABILITY",
+    "DURABILITY_FSYNC",
+    "DURABILITY_FULL",
+    "DURABILITY_LEVELS",
+    "DURABILITY_NONE",
+    "LAYOUT_SECTIONED",
+    "LAYOUT_SINGLE",
+    "LINK_MODES",
     "STATE_FILENAME",
+    "STATE_LAYOUTS",
     "SUMMARY_FILENAME",
+    "BulkMigrationReport",
+    "Checkpoint",
+    "CheckpointNotFound",
+    "CheckpointStore",
+    "LazyWorkflowState",
+    "MigrationOutcome",
     "WorkflowInitializationParams",
     "WorkflowStateError",
     "WorkflowStateNotInitialized",
+    "WorkflowStateSchema",
     "WorkflowStateStore",
+    "WorkflowStateValidationError",
+    "atomic_write_bytes",
+    "atomic_write_text",
+    "bulk_migrate_legacy_states",
+    "discover_legacy_state_dirs",
+    "load_workflow_schema",
     "migrate_legacy_state_to_run",
 ]
@@ -0,0 +1,123 @@
+"""
+Crash-safe file replacement helpers.
+
+Every write goes to a temporary sibling file that is renamed over the target
+once complete, so a crash or a concurrent reader only ever observes the old or
+the new document, never a truncated one. The durability level controls how much
+``fsync`` work is done before the call returns:
+
+``none``
+    Write and rename only. Survives process crashes, but an OS crash may lose the
+    update (the previous version is kept).
+``fsync``
+    Flush the file contents to disk before the rename. After an OS crash the
+    target holds either the old or the new contents, never a partial file.
+``full``
+    Additionally ``fsync`` the parent directory so the rename itself is durable
+    when the call returns.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+DURABILITY_NONE = "none"
+DURABILITY_FSYNC = "fsync"
+DURABILITY_FULL = "full"
+DURABILITY_LEVELS = (DURABILITY_NONE, DURABILITY_FSYNC, DURABILITY_FULL)
+DEFAULT_DURABILITY = DURABILITY_FSYNC
+
+_DEFAULT_FILE_MODE = 0o644
+
+
+def validate_durability(level: str) -> str:
+    """Return ``level`` if it is a known durability level, otherwise raise ``ValueError``."""
+    if level not in DURABILITY_LEVELS:
+        choices = ", ".join(DURABILITY_LEVELS)
+        raise ValueError(f"Unknown durability level '{level}'. Expected one of: {choices}.")
+    return level
+
+
+def atomic_write_bytes(
+    path: Path,
+    data: bytes,
+    *,
+    durability: str = DEFAULT_DURABILITY,
+) -> None:
+    """
+    Atomically replace ``path`` with ``data``.
+
+    The parent directory is created when missing. On failure the temporary file
+    is removed and the previous contents of ``path`` are left untouched.
+    """
+    validate_durability(durability)
+    directory = path.parent
+    directory.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            _match_permissions(handle.fileno(), path)
+            if durability != DURABILITY_NONE:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if durability == DURABILITY_FULL:
+        _fsync_directory(directory)
+
+
+def atomic_write_text(
+    path: Path,
+    text: str,
+    *,
+    encoding: str = "utf-8",
+    durability: str = DEFAULT_DURABILITY,
+) -> None:
+    """Atomically replace ``path`` with ``text`` encoded as ``encoding``."""
+    atomic_write_bytes(path, text.encode(encoding), durability=durability)
+
+
+def _match_permissions(fd: int, path: Path) -> None:
+    # mkstemp creates files as 0600; keep the mode readers expect from a plain open().
+    if not hasattr(os, "fchmod"):  # pragma: no cover - Windows
+        return
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = _DEFAULT_FILE_MODE
+    os.fchmod(fd, mode)
+
+
+def _fsync_directory(directory: Path) -> None:
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - platforms without directory handles
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:  # pragma: no cover - some filesystems reject directory fsync
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+__all__ = [
+    "DEFAULT_DURABILITY",
+    "DURABILITY_FSYNC",
+    "DURABILITY_FULL",
+    "DURABILITY_LEVELS",
+    "DURABILITY_NONE",
+    "atomic_write_bytes",
+    "atomic_write_text",
+    "validate_durability",
+]
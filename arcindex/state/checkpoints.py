@@ -0,0 +1,375 @@
+"""
+Versioned workflow state checkpoints.
+
+Checkpoints are captured at phase transitions and elicitation rounds so a run
+can be inspected, resumed, or forked from mid-workflow without replaying the
+LLM phases that produced it. Each checkpoint is appended to
+``checkpoints.ndjson`` in the state directory as a delta against the previous
+checkpoint, with a full keyframe every ``keyframe_interval`` records to bound
+replay cost.
+
+In memory, snapshots share every unchanged subtree with their predecessor, so
+keeping the full history of a run costs roughly the size of its deltas. Shared
+snapshots are never mutated; callers always receive private copies.
+"""
+
+from __future__ import annotations
+
+import builtins
+import os
+import uuid
+from collections.abc import Mapping, MutableMapping, Sequence
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+from threading import RLock
+from typing import Any, Union
+
+from arcindex.codec import dumps_compact, dumps_pretty, loads
+from arcindex.tools import current_timestamp
+
+from .atomic import DEFAULT_DURABILITY, DURABILITY_NONE, atomic_write_text, validate_durability
+from .store import STATE_FILENAME, WorkflowStateError
+
+CHECKPOINTS_FILENAME = "checkpoints.ndjson"
+
+OpPath = list[str]
+DeltaOp = dict[str, Any]
+CheckpointRef = Union[str, int]  # noqa: UP007 - evaluated at import on Python 3.9
+
+
+class CheckpointNotFound(WorkflowStateError):
+    """Raised when a checkpoint id or sequence number cannot be resolved."""
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Metadata describing a captured checkpoint."""
+
+    checkpoint_id: str
+    seq: int
+    label: str
+    phase: str | None
+    timestamp: str
+    keyframe: bool
+
+    def to_state_entry(self, checkpoint_file: Path) -> MutableMapping[str, Any]:
+        """Render the reference stored in ``workflow.json``'s ``context_checkpoints``."""
+        return {
+            "checkpoint_id": self.checkpoint_id,
+            "seq": self.seq,
+            "label": self.label,
+            "phase": self.phase,
+            "timestamp": self.timestamp,
+            "checkpoint_file": str(checkpoint_file),
+        }
+
+
+class CheckpointStore:
+    """
+    Capture and replay workflow state checkpoints for a single state directory.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        keyframe_interval: int = 16,
+        durability: str = DEFAULT_DURABILITY,
+    ) -> None:
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1.")
+        self._directory = directory
+        self._keyframe_interval = keyframe_interval
+        self._durability = validate_durability(durability)
+        self._lock = RLock()
+        self._checkpoints: list[Checkpoint] = []
+        self._snapshots: dict[int, Mapping[str, Any]] = {}
+        self._loaded = False
+
+    @property
+    def path(self) -> Path:
+        """Location of the checkpoint log."""
+        return self._directory / CHECKPOINTS_FILENAME
+
+    # ------------------------------------------------------------------#
+    # Capture
+    # ------------------------------------------------------------------#
+
+    def capture(
+        self,
+        state: MutableMapping[str, Any],
+        *,
+        label: str,
+        phase: str | None = None,
+        timestamp: str | None = None,
+    ) -> Checkpoint:
+        """
+        Record a checkpoint of ``state``.
+
+        A reference to the checkpoint is appended to ``state["context_checkpoints"]``
+        before the snapshot is taken, so every snapshot lists itself.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            seq = self._checkpoints[-1].seq + 1 if self._checkpoints else 0
+            keyframe = seq % self._keyframe_interval == 0
+            checkpoint = Checkpoint(
+                checkpoint_id=uuid.uuid4().hex,
+                seq=seq,
+                label=label,
+                phase=phase if phase is not None else state.get("current_phase"),
+                timestamp=timestamp or current_timestamp(),
+                keyframe=keyframe,
+            )
+            state.setdefault("context_checkpoints", []).append(
+                checkpoint.to_state_entry(self.path)
+            )
+
+            previous = self._snapshots.get(seq - 1) if seq else None
+            record: MutableMapping[str, Any] = {
+                "checkpoint_id": checkpoint.checkpoint_id,
+                "seq": seq,
+                "label": label,
+                "phase": checkpoint.phase,
+                "timestamp": checkpoint.timestamp,
+            }
+            if keyframe or previous is None:
+                record["state"] = state if isinstance(state, dict) else dict(state)
+            else:
+                record["ops"] = diff_states(previous, state)
+
+            self._append(record)
+            self._snapshots[seq] = share_structure(previous, state)
+            self._checkpoints.append(checkpoint)
+            return checkpoint
+
+    # ------------------------------------------------------------------#
+    # Time travel
+    # ------------------------------------------------------------------#
+
+    def list(self) -> builtins.list[Checkpoint]:
+        """Return all checkpoints in capture order."""
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._checkpoints)
+
+    def resolve(self, ref: CheckpointRef) -> Checkpoint:
+        """
+        Resolve a checkpoint id or sequence number.
+
+        Integer references resolve to the latest checkpoint whose sequence number
+        does not exceed ``ref``.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if isinstance(ref, int):
+                candidates = [cp for cp in self._checkpoints if cp.seq <= ref]
+                if candidates:
+                    return candidates[-1]
+            else:
+                for checkpoint in self._checkpoints:
+                    if checkpoint.checkpoint_id == ref:
+                        return checkpoint
+            raise CheckpointNotFound(f"No checkpoint matches '{ref}'.")
+
+    def load(self, ref: CheckpointRef) -> MutableMapping[str, Any]:
+        """Return a private, mutable copy of the state as of ``ref``."""
+        checkpoint = self.resolve(ref)
+        with self._lock:
+            return dict(deepcopy(self._snapshots[checkpoint.seq]))
+
+    def diff(self, older: CheckpointRef, newer: CheckpointRef) -> builtins.list[DeltaOp]:
+        """Return the delta operations transforming ``older`` into ``newer``."""
+        first = self.resolve(older)
+        second = self.resolve(newer)
+        with self._lock:
+            return diff_states(self._snapshots[first.seq], self._snapshots[second.seq])
+
+    def fork(self, ref: CheckpointRef, target_dir: Path) -> Path:
+        """
+        Materialise ``ref`` into ``target_dir`` as a new, resumable state directory.
+
+        The checkpoint history up to and including ``ref`` is carried over so the
+        fork can itself be rewound. Returns the path of the forked ``workflow.json``.
+        """
+        checkpoint = self.resolve(ref)
+        state = self.load(checkpoint.seq)
+        forked_log = target_dir / CHECKPOINTS_FILENAME
+        for entry in state.get("context_checkpoints", []):
+            if isinstance(entry, MutableMapping) and "checkpoint_file" in entry:
+                entry["checkpoint_file"] = str(forked_log)
+        state_path = target_dir / STATE_FILENAME
+        atomic_write_text(
+            state_path,
+            dumps_pretty(state),
+            durability=self._durability,
+        )
+
+        lines = []
+        for line in self._read_lines():
+            record = loads(line)
+            if record["seq"] > checkpoint.seq:
+                break
+            lines.append(line)
+        atomic_write_text(
+            forked_log,
+            "".join(f"{line}\n" for line in lines),
+            durability=self._durability,
+        )
+        return state_path
+
+    # ------------------------------------------------------------------#
+    # Persistence
+    # ------------------------------------------------------------------#
+
+    def _append(self, record: Mapping[str, Any]) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        line = dumps_compact(record, sort_keys=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+            if self._durability != DURABILITY_NONE:
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def _read_lines(self) -> builtins.list[str]:
+        if not self.path.exists():
+            return []
+        lines = []
+        for raw in self.path.read_text(encoding="utf-8").splitlines():
+            if not raw.strip():
+                continue
+            try:
+                loads(raw)
+            except ValueError:
+                # A crash mid-append leaves at most one torn trailing record.
+                break
+            lines.append(raw)
+        return lines
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        snapshot: Mapping[str, Any] | None = None
+        for line in self._read_lines():
+            record = loads(line)
+            if "state" in record:
+                current = record["state"]
+            else:
+                if snapshot is None:
+                    raise WorkflowStateError(
+                        f"Checkpoint log {self.path} starts with a delta; the keyframe is missing."
+                    )
+                current = apply_ops(snapshot, record.get("ops", []))
+            snapshot = share_structure(snapshot, current)
+            seq = int(record["seq"])
+            self._snapshots[seq] = snapshot
+            self._checkpoints.append(
+                Checkpoint(
+                    checkpoint_id=record["checkpoint_id"],
+                    seq=seq,
+                    label=record.get("label", ""),
+                    phase=record.get("phase"),
+                    timestamp=record.get("timestamp", ""),
+                    keyframe="state" in record,
+                )
+            )
+
+
+# ----------------------------------------------------------------------#
+# Structural deltas
+# ----------------------------------------------------------------------#
+
+
+def diff_states(old: Any, new: Any, path: OpPath | None = None) -> list[DeltaOp]:
+    """
+    Compute the operations that transform ``old`` into ``new``.
+
+    Mappings are diffed key by key. Lists that only grew at the end (history
+    logs) produce an ``extend`` operation; any other change replaces the value.
+    """
+    path = path or []
+    if old == new:
+        return []
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        ops: list[DeltaOp] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": path + [key]})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "set", "path": path + [key], "value": deepcopy(value)})
+            else:
+                ops.extend(diff_states(old[key], value, path + [key]))
+        return ops
+    if (
+        isinstance(old, list)
+        and isinstance(new, list)
+        and len(new) > len(old)
+        and new[: len(old)] == old
+    ):
+        return [{"op": "extend", "path": path, "values": deepcopy(new[len(old):])}]
+    return [{"op": "set", "path": path, "value": deepcopy(new)}]
+
+
+def apply_ops(base: Mapping[str, Any], ops: Sequence[DeltaOp]) -> Mapping[str, Any]:
+    """
+    Apply delta operations to ``base`` without mutating it.
+
+    Only the containers along each operation's path are copied; every other
+    subtree is shared with ``base``.
+    """
+    result: Any = base
+    for op in ops:
+        result = _apply_op(result, list(op["path"]), op)
+    return result
+
+
+def _apply_op(node: Any, path: OpPath, op: DeltaOp) -> Any:
+    if not path:
+        if op["op"] == "set":
+            return op["value"]
+        if op["op"] == "extend":
+            return list(node) + list(op["values"])
+        raise WorkflowStateError(f"Cannot apply '{op['op']}' at the document root.")
+
+    key, rest = path[0], path[1:]
+    copied = dict(node)
+    if not rest and op["op"] == "remove":
+        copied.pop(key, None)
+        return copied
+    copied[key] = _apply_op(node.get(key), rest, op)
+    return copied
+
+
+def share_structure(previous: Any | None, current: Any) -> Any:
+    """
+    Return an immutable-by-convention copy of ``current``.
+
+    Subtrees equal to the matching subtree of ``previous`` are reused rather
+    than copied, which is what keeps a long checkpoint history cheap.
+    """
+    if previous is not None and previous == current:
+        return previous
+    if isinstance(current, Mapping):
+        prior = previous if isinstance(previous, Mapping) else {}
+        return {key: share_structure(prior.get(key), value) for key, value in current.items()}
+    if isinstance(current, list):
+        prior_list = previous if isinstance(previous, list) else []
+        return [
+            share_structure(prior_list[index] if index < len(prior_list) else None, value)
+            for index, value in enumerate(current)
+        ]
+    return current
+
+
+__all__ = [
+    "CHECKPOINTS_FILENAME",
+    "Checkpoint",
+    "CheckpointNotFound",
+    "CheckpointStore",
+    "apply_ops",
+    "diff_states",
+    "share_structure",
+]
@@ -2,29 +2,295 @@
 
 from __future__ import annotations
 
+import os
 import shutil
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from hashlib import sha1
 from pathlib import Path
 
+from arcindex.codec import dumps_compact, loads
+from arcindex.tools import current_timestamp
+
 from .store import STATE_FILENAME, SUMMARY_FILENAME, WorkflowStateNotInitialized
 
+MIGRATION_MANIFEST_FILENAME = "migration-manifest.ndjson"
+
+LINK_AUTO = "auto"
+LINK_REFLINK = "reflink"
+LINK_HARDLINK = "hardlink"
+LINK_COPY = "copy"
+LINK_MODES = (LINK_AUTO, LINK_REFLINK, LINK_HARDLINK, LINK_COPY)
+
+# Directories never worth descending into while discovering legacy state.
+_DISCOVERY_PRUNE = {".git", ".hg", ".venv", "__pycache__", "node_modules"}
+
+# ioctl request number for FICLONE on Linux (btrfs, XFS, bcachefs, ...).
+_FICLONE = 0x40049409
 
-def migrate_legacy_state_to_run(legacy_dir: Path, run_dir: Path) -> Path:
+
+def migrate_legacy_state_to_run(
+    legacy_dir: Path,
+    run_dir: Path,
+    *,
+    link_mode: str = LINK_COPY,
+) -> Path:
     """
     Copy legacy workflow state and summary into the run directory.
 
+    ``link_mode`` selects how files are materialised (see :func:`clone_file`).
     Returns the path to the migrated ``workflow.json``.
     """
+    target_state, _ = _migrate_files(legacy_dir, run_dir, link_mode)
+    return target_state
+
 
+def _migrate_files(legacy_dir: Path, run_dir: Path, link_mode: str) -> tuple[Path, str]:
     legacy_state = legacy_dir / STATE_FILENAME
     if not legacy_state.exists():
         raise WorkflowStateNotInitialized("Legacy workflow state does not exist.")
 
     run_dir.mkdir(parents=True, exist_ok=True)
     target_state = run_dir / STATE_FILENAME
-    shutil.copy2(legacy_state, target_state)
+    method = clone_file(legacy_state, target_state, link_mode)
 
     legacy_summary = legacy_dir / SUMMARY_FILENAME
     if legacy_summary.exists():
-        shutil.copy2(legacy_summary, run_dir / SUMMARY_FILENAME)
+        clone_file(legacy_summary, run_dir / SUMMARY_FILENAME, link_mode)
 
-    return target_state
+    return target_state, method
+
+
+def clone_file(source: Path, target: Path, link_mode: str = LINK_AUTO) -> str:
+    """
+    Materialise ``source`` at ``target`` and return the method that succeeded.
+
+    ``auto`` tries a copy-on-write reflink, then a hardlink, then a full copy.
+    Hardlinks are safe because state writers replace ``workflow.json`` by rename
+    rather than rewriting it in place, so the legacy original is never modified.
+    """
+    if link_mode not in LINK_MODES:
+        choices = ", ".join(LINK_MODES)
+        raise ValueError(f"Unknown link mode '{link_mode}'. Expected one of: {choices}.")
+
+    attempts = (LINK_REFLINK, LINK_HARDLINK, LINK_COPY) if link_mode == LINK_AUTO else (link_mode,)
+    last_error: OSError | None = None
+    for method in attempts:
+        try:
+            if target.exists() or target.is_symlink():
+                target.unlink()
+            if method == LINK_REFLINK:
+                _reflink(source, target)
+            elif method == LINK_HARDLINK:
+                os.link(source, target)
+            else:
+                shutil.copy2(source, target)
+            return method
+        except OSError as exc:
+            last_error = exc
+    assert last_error is not None
+    raise last_error
+
+
+def _reflink(source: Path, target: Path) -> None:
+    try:
+        import fcntl
+    except ImportError as exc:  # pragma: no cover - Windows
+        raise OSError("Reflinks are not supported on this platform.") from exc
+
+    with source.open("rb") as src, target.open("wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            target.unlink()
+            raise
+    shutil.copystat(source, target)
+
+
+@dataclass
+class MigrationOutcome:
+    """Result of migrating a single legacy state directory."""
+
+    source: Path
+    run_id: str
+    status: str  # migrated | skipped | failed
+    method: str | None = None
+    bytes_copied: int = 0
+    elapsed_ms: int = 0
+    error: str | None = None
+
+
+@dataclass
+class BulkMigrationReport:
+    """Aggregate results for a bulk migration."""
+
+    outcomes: list[MigrationOutcome] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    def _count(self, status: str) -> int:
+        return sum(1 for outcome in self.outcomes if outcome.status == status)
+
+    @property
+    def migrated(self) -> int:
+        return self._count("migrated")
+
+    @property
+    def skipped(self) -> int:
+        return self._count("skipped")
+
+    @property
+    def failed(self) -> int:
+        return self._count("failed")
+
+    @property
+    def bytes_copied(self) -> int:
+        return sum(outcome.bytes_copied for outcome in self.outcomes)
+
+    @property
+    def dirs_per_second(self) -> float:
+        """Directories migrated per second during this invocation."""
+        return self.migrated / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def methods(self) -> dict[str, int]:
+        """How many directories were materialised with each link method."""
+        counts: dict[str, int] = {}
+        for outcome in self.outcomes:
+            if outcome.method:
+                counts[outcome.method] = counts.get(outcome.method, 0) + 1
+        return counts
+
+
+def discover_legacy_state_dirs(root: Path, *, exclude: Iterable[Path] = ()) -> list[Path]:
+    """
+    Return every directory beneath ``root`` (inclusive) that holds a ``workflow.json``.
+
+    Legacy projects keep their state under ``.codex/state``, so hidden directories
+    are searched; VCS metadata, virtualenvs, and anything beneath ``exclude``
+    (typically the runs root) are not.
+    """
+    excluded = {path.resolve() for path in exclude}
+    found: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        current = Path(dirpath)
+        dirnames[:] = sorted(
+            name
+            for name in dirnames
+            if name not in _DISCOVERY_PRUNE and (current / name).resolve() not in excluded
+        )
+        if STATE_FILENAME in filenames:
+            found.append(current)
+    return found
+
+
+def legacy_run_id(legacy_dir: Path) -> str:
+    """Deterministic run identifier for a legacy directory, so reruns are idempotent."""
+    digest = sha1(str(legacy_dir.resolve()).encode("utf-8")).hexdigest()
+    return f"legacy-{digest[:16]}"
+
+
+def bulk_migrate_legacy_states(
+    sources: Iterable[Path],
+    runs_root: Path,
+    *,
+    workers: int | None = None,
+    link_mode: str = LINK_AUTO,
+    manifest_path: Path | None = None,
+) -> BulkMigrationReport:
+    """
+    Migrate many legacy state directories into ``runs_root`` concurrently.
+
+    Progress is appended to an NDJSON manifest (``runs_root/migration-manifest.ndjson``
+    by default) as each directory completes; directories already recorded as
+    migrated are skipped, so an interrupted import can simply be re-run.
+    """
+    manifest_path = manifest_path or runs_root / MIGRATION_MANIFEST_FILENAME
+    completed = _read_manifest(manifest_path)
+    report = BulkMigrationReport()
+    start = time.perf_counter()
+
+    pending: list[Path] = []
+    for source in sources:
+        key = str(source.resolve())
+        if key in completed:
+            report.outcomes.append(
+                MigrationOutcome(source=source, run_id=completed[key], status="skipped")
+            )
+        else:
+            pending.append(source)
+
+    runs_root.mkdir(parents=True, exist_ok=True)
+    max_workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool, manifest_path.open(
+        "a", encoding="utf-8"
+    ) as manifest:
+        futures = [
+            pool.submit(_migrate_one, source, runs_root, link_mode) for source in pending
+        ]
+        for future in as_completed(futures):
+            outcome = future.result()
+            report.outcomes.append(outcome)
+            manifest.write(dumps_compact(_manifest_record(outcome)) + "\n")
+            manifest.flush()
+
+    report.elapsed_s = time.perf_counter() - start
+    return report
+
+
+def _migrate_one(source: Path, runs_root: Path, link_mode: str) -> MigrationOutcome:
+    run_id = legacy_run_id(source)
+    start = time.perf_counter()
+    try:
+        migrated, method = _migrate_files(source, runs_root / run_id, link_mode)
+        copied = 0
+        if method == LINK_COPY:
+            # Reflinks and hardlinks share blocks with the source; only copies cost I/O.
+            copied = sum(
+                path.stat().st_size
+                for path in (migrated, migrated.parent / SUMMARY_FILENAME)
+                if path.exists()
+            )
+        status, error = "migrated", None
+    except Exception as exc:  # noqa: BLE001 - surfaced through the report and manifest
+        method, copied, status, error = None, 0, "failed", str(exc)
+    return MigrationOutcome(
+        source=source,
+        run_id=run_id,
+        status=status,
+        method=method,
+        bytes_copied=copied,
+        elapsed_ms=int((time.perf_counter() - start) * 1000),
+        error=error,
+    )
+
+
+def _manifest_record(outcome: MigrationOutcome) -> dict[str, object]:
+    record: dict[str, object] = {
+        "source": str(outcome.source.resolve()),
+        "run_id": outcome.run_id,
+        "status": outcome.status,
+        "ts": current_timestamp(),
+        "elapsed_ms": outcome.elapsed_ms,
+    }
+    if outcome.method:
+        record["method"] = outcome.method
+    if outcome.error:
+        record["error"] = outcome.error
+    return record
+
+
+def _read_manifest(path: Path) -> dict[str, str]:
+    completed: dict[str, str] = {}
+    if not path.exists():
+        return completed
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = loads(line)
+        except ValueError:
+            continue  # torn trailing line from an interrupted run
+        if record.get("status") == "migrated":
+            completed[record["source"]] = record["run_id"]
+    return completed
@@ -0,0 +1,332 @@
+"""
+Schema validation for workflow state.
+
+The schema is derived from the state templates rather than maintained by hand:
+``workflow_template.json`` (what Arcindex initialises) and, when available, the
+legacy ``workflow.json.template`` (which documents the shape of every section
+the legacy system filled in). Templates are merged field by field:
+
+* a field defined by every template is required, and is only nullable when a
+  template leaves it ``null`` or as a ``{placeholder}``;
+* a field documented by only some templates is optional and nullable;
+* list item shapes come from the example items in the templates;
+* a field that is ``null`` everywhere accepts any value.
+
+The merged schema is compiled once into nested check functions that return a
+bool without allocating. Error messages are only produced, by walking the
+schema again, when a check fails.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import re
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Any,
+)
+
+from .store import WorkflowStateError
+
+KIND_OBJECT = "object"
+KIND_ARRAY = "array"
+KIND_STRING = "string"
+KIND_BOOLEAN = "boolean"
+KIND_NUMBER = "number"
+
+_PLACEHOLDER = re.compile(r"\{[^{}]*\}")
+_SCALAR_TYPES = {
+    KIND_STRING: (str,),
+    KIND_BOOLEAN: (bool,),
+    KIND_NUMBER: (int, float),
+}
+
+Check = Callable[[Any], bool]
+
+
+class WorkflowStateValidationError(WorkflowStateError):
+    """Raised when workflow state does not match the compiled schema."""
+
+    def __init__(self, errors: Sequence[str]) -> None:
+        self.errors = list(errors)
+        shown = "; ".join(self.errors[:5])
+        more = f" (+{len(self.errors) - 5} more)" if len(self.errors) > 5 else ""
+        super().__init__(f"Workflow state failed validation: {shown}{more}")
+
+
+@dataclass
+class FieldSchema:
+    """Merged description of one field across the templates."""
+
+    kinds: set[str] = field(default_factory=set)
+    nullable: bool = False
+    fields: dict[str, FieldSchema] = field(default_factory=dict)
+    required: tuple[str, ...] = ()
+    items: FieldSchema | None = None
+
+    @property
+    def accepts_anything(self) -> bool:
+        return not self.kinds
+
+
+def _kind_of(value: Any) -> str:
+    if isinstance(value, bool):
+        return KIND_BOOLEAN
+    if isinstance(value, (int, float)):
+        return KIND_NUMBER
+    if isinstance(value, str):
+        return KIND_STRING
+    if isinstance(value, Mapping):
+        return KIND_OBJECT
+    return KIND_ARRAY
+
+
+def infer_schema(samples: Sequence[Any], *, strict: bool = True) -> FieldSchema:
+    """
+    Merge template ``samples`` for one field into a :class:`FieldSchema`.
+
+    ``strict`` is true when every template defines the field.
+    """
+    schema = FieldSchema(nullable=not strict)
+    for value in samples:
+        if value is None:
+            schema.nullable = True
+            continue
+        if isinstance(value, str) and _PLACEHOLDER.fullmatch(value):
+            schema.nullable = True
+        schema.kinds.add(_kind_of(value))
+
+    mappings = [value for value in samples if isinstance(value, Mapping)]
+    if mappings:
+        # Keys present in every template's (non-empty) object are required.
+        complete = strict and len(mappings) == len(samples)
+        keys: list[str] = []
+        for mapping in mappings:
+            keys.extend(key for key in mapping if key not in keys)
+        required = []
+        for key in keys:
+            child_samples = [mapping[key] for mapping in mappings if key in mapping]
+            child_strict = complete and len(child_samples) == len(mappings)
+            schema.fields[key] = infer_schema(child_samples, strict=child_strict)
+            if child_strict:
+                required.append(key)
+        schema.required = tuple(required)
+
+    item_samples = [item for value in samples if isinstance(value, list) for item in value]
+    if item_samples:
+        schema.items = infer_schema(item_samples, strict=False)
+    return schema
+
+
+def compile_check(schema: FieldSchema) -> Check:
+    """Compile ``schema`` into a function returning whether a value conforms."""
+    if schema.accepts_anything:
+        return _accept
+
+    nullable = schema.nullable
+    scalar_types: tuple[type, ...] = tuple(
+        python_type
+        for kind in schema.kinds
+        if kind in _SCALAR_TYPES
+        for python_type in _SCALAR_TYPES[kind]
+    )
+    check_object = _compile_object(schema) if KIND_OBJECT in schema.kinds else None
+    check_array = _compile_array(schema) if KIND_ARRAY in schema.kinds else None
+
+    def check(value: Any) -> bool:
+        if value is None:
+            return nullable
+        value_type = type(value)
+        if value_type is dict or (check_object is not None and isinstance(value, Mapping)):
+            return check_object is not None and check_object(value)
+        if value_type is list:
+            return check_array is not None and check_array(value)
+        if value_type is bool:
+            return bool in scalar_types
+        return isinstance(value, scalar_types)
+
+    return check
+
+
+def _accept(value: Any) -> bool:
+    return True
+
+
+def _compile_object(schema: FieldSchema) -> Check:
+    required = schema.required
+    field_checks = tuple(
+        (key, compile_check(child))
+        for key, child in schema.fields.items()
+        if not child.accepts_anything
+    )
+    missing = object()
+
+    def check_object(value: Mapping[str, Any]) -> bool:
+        for key in required:
+            if key not in value:
+                return False
+        get = value.get
+        for key, check in field_checks:
+            item = get(key, missing)
+            if item is not missing and not check(item):
+                return False
+        return True
+
+    return check_object
+
+
+def _compile_array(schema: FieldSchema) -> Check:
+    if schema.items is None or schema.items.accepts_anything:
+        return _accept
+    check_item = compile_check(schema.items)
+
+    def check_array(value: list[Any]) -> bool:
+        return all(map(check_item, value))
+
+    return check_array
+
+
+def explain(schema: FieldSchema, value: Any, path: str) -> list[str]:
+    """Return human-readable reasons ``value`` does not match ``schema``."""
+    if schema.accepts_anything:
+        return []
+    if value is None:
+        return [] if schema.nullable else [f"{path}: must not be null"]
+    kind = _kind_of(value)
+    if kind not in schema.kinds:
+        expected = " or ".join(sorted(schema.kinds))
+        return [f"{path}: expected {expected}, got {kind}"]
+    errors: list[str] = []
+    if kind == KIND_OBJECT:
+        errors.extend(f"{path}.{key}: missing" for key in schema.required if key not in value)
+        for key, child in schema.fields.items():
+            if key in value:
+                errors.extend(explain(child, value[key], f"{path}.{key}"))
+    elif kind == KIND_ARRAY and schema.items is not None:
+        for index, item in enumerate(value):
+            errors.extend(explain(schema.items, item, f"{path}[{index}]"))
+    return errors
+
+
+class WorkflowStateSchema:
+    """Compiled validator for ``workflow.json`` documents."""
+
+    def __init__(self, root: FieldSchema) -> None:
+        self._root = root
+        self._required = root.required
+        self._fields = root.fields
+        self._checks: dict[str, Check] = {
+            key: compile_check(child) for key, child in root.fields.items()
+        }
+        # Top-level fields that never hold a section; cheap enough to check on every save.
+        self._scalar_keys = tuple(
+            key
+            for key, child in root.fields.items()
+            if not child.kinds & {KIND_OBJECT, KIND_ARRAY}
+        )
+        self._item_checks: dict[str, Check] = {
+            key: compile_check(child.items)
+            for key, child in root.fields.items()
+            if child.items is not None
+        }
+
+    @classmethod
+    def from_templates(cls, templates: Iterable[Mapping[str, Any]]) -> WorkflowStateSchema:
+        """Derive and compile a schema from parsed template documents."""
+        return cls(infer_schema(list(templates)))
+
+    @property
+    def root(self) -> FieldSchema:
+        """The merged schema for the whole document."""
+        return self._root
+
+    def check_section(self, key: str, value: Any) -> bool:
+        """True if ``value`` is valid for top-level field ``key`` (unknown keys pass)."""
+        check = self._checks.get(key)
+        return check is None or check(value)
+
+    def errors(
+        self,
+        state: Mapping[str, Any],
+        sections: Iterable[str] | Mapping[str, int] | None = None,
+    ) -> list[str]:
+        """
+        Return validation errors for ``state``.
+
+        Required keys and scalar fields are always checked. When ``sections`` is
+        given, only those keys are checked otherwise; the rest are assumed
+        unchanged since they were last validated. ``sections`` may map a
+        list section to the index of its first new item, so an append-only log
+        only has its tail checked.
+        """
+        errors = [f"{key}: missing" for key in self._required if key not in state]
+        if sections is None:
+            starts: Mapping[str, int] = dict.fromkeys(state.keys(), 0)
+        elif isinstance(sections, Mapping):
+            starts = sections
+        else:
+            starts = dict.fromkeys(sections, 0)
+
+        keys = list(starts) + [key for key in self._scalar_keys if key not in starts]
+        for key in keys:
+            if key not in state:
+                continue
+            value = state[key]
+            start = starts.get(key, 0)
+            if start and type(value) is list and key in self._item_checks:
+                tail = itertools.islice(value, start, None)
+                if not all(map(self._item_checks[key], tail)):
+                    items = self._fields[key].items
+                    assert items is not None  # item checks exist only for typed lists
+                    for index in range(start, len(value)):
+                        errors.extend(explain(items, value[index], f"{key}[{index}]"))
+            elif not self.check_section(key, value):
+                errors.extend(explain(self._fields[key], value, key))
+        return errors
+
+    def validate(
+        self,
+        state: Mapping[str, Any],
+        sections: Iterable[str] | Mapping[str, int] | None = None,
+    ) -> None:
+        """Raise :class:`WorkflowStateValidationError` if ``state`` is invalid."""
+        errors = self.errors(state, sections)
+        if errors:
+            raise WorkflowStateValidationError(errors)
+
+
+@lru_cache(maxsize=8)
+def _load_schema(paths: tuple[Path, ...]) -> WorkflowStateSchema:
+    templates = []
+    for path in paths:
+        with path.open("r", encoding="utf-8") as handle:
+            templates.append(json.load(handle))
+    return WorkflowStateSchema.from_templates(templates)
+
+
+def load_workflow_schema(*template_paths: Path | None) -> WorkflowStateSchema:
+    """
+    Return the compiled schema for the given templates, compiling it once per process.
+
+    Missing or ``None`` paths are ignored, so the legacy template can be passed
+    unconditionally.
+    """
+    paths = tuple(path.resolve() for path in template_paths if path is not None and path.exists())
+    if not paths:
+        raise WorkflowStateError("No workflow state templates found to derive a schema from.")
+    return _load_schema(paths)
+
+
+__all__ = [
+    "FieldSchema",
+    "WorkflowStateSchema",
+    "WorkflowStateValidationError",
+    "compile_check",
+    "explain",
+    "infer_schema",
+    "load_workflow_schema",
+]
@@ -0,0 +1,255 @@
+"""
+Sectioned on-disk layout for workflow state.
+
+Long-running projects accumulate large append-only sections
+(``elicitation_history``, ``violation_log``, ``execution_reports``,
+``epic_learnings``) while most callers only need ``current_phase`` or
+``project_discovery``. The sectioned layout stores every mapping or list
+section of ``workflow.json`` in its own file beneath ``workflow.sections/``
+and keeps scalar fields inline in ``index.json``::
+
+    workflow.sections/
+        index.json
+        project_discovery.3f2a9c1e0b7d4a66.json
+        elicitation_history.91c0d2e4f5a6b7c8.json
+
+Section files are content addressed and the index is replaced atomically last,
+so a multi-section update is all-or-nothing and readers holding the previous
+index can still resolve its files. :class:`LazyWorkflowState` loads sections
+on first access and saving it rewrites only the sections whose contents changed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping, MutableMapping
+from hashlib import sha256
+from pathlib import Path
+from typing import (
+    Any,
+)
+
+from arcindex.codec import dumps_pretty, loads
+
+from .atomic import DEFAULT_DURABILITY, atomic_write_text
+
+SECTIONS_DIRNAME = "workflow.sections"
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+
+
+def encode_section(value: Any) -> str:
+    """Serialise a section exactly as it is written to disk."""
+    return dumps_pretty(value)
+
+
+def _digest(text: str) -> str:
+    return sha256(text.encode("utf-8")).hexdigest()
+
+
+class SectionedStateFile:
+    """Read and write the sectioned layout inside one state directory."""
+
+    def __init__(self, directory: Path, *, durability: str = DEFAULT_DURABILITY) -> None:
+        self._root = directory / SECTIONS_DIRNAME
+        self._durability = durability
+
+    @property
+    def root(self) -> Path:
+        """Directory holding the index and section files."""
+        return self._root
+
+    @property
+    def index_path(self) -> Path:
+        """Location of the section index."""
+        return self._root / INDEX_FILENAME
+
+    def exists(self) -> bool:
+        """True once an index has been written."""
+        return self.index_path.exists()
+
+    def read_index(self) -> dict[str, Any]:
+        """Return the parsed index, or an empty index when none exists yet."""
+        if not self.index_path.exists():
+            return {"version": INDEX_VERSION, "order": [], "scalars": {}, "sections": {}}
+        return loads(self.index_path.read_bytes())
+
+    def read_section(self, entry: Mapping[str, Any]) -> Any:
+        """Load the section referenced by an index entry."""
+        return loads((self._root / entry["file"]).read_bytes())
+
+    def load_all(self) -> MutableMapping[str, Any]:
+        """Materialise the whole state as a plain dictionary."""
+        index = self.read_index()
+        state: dict[str, Any] = {}
+        for key in index["order"]:
+            if key in index["scalars"]:
+                state[key] = index["scalars"][key]
+            else:
+                state[key] = self.read_section(index["sections"][key])
+        return state
+
+    def write(
+        self,
+        state: Mapping[str, Any],
+        *,
+        candidates: set[str] | None = None,
+        before_write: Callable[[Mapping[str, str]], None] | None = None,
+    ) -> tuple[dict[str, Any], list[str]]:
+        """
+        Persist ``state`` and return the new index plus the names of the sections rewritten.
+
+        ``candidates`` limits which sections are re-encoded; sections outside the
+        set keep their current files. Scalars and key order are always refreshed.
+        ``before_write`` is called with the encoded text of each changed section
+        before anything touches disk, so it can veto the write by raising.
+        """
+        previous = self.read_index()
+        previous_sections: Mapping[str, Any] = previous.get("sections", {})
+        index: dict[str, Any] = {
+            "version": INDEX_VERSION,
+            "order": list(state.keys()),
+            "scalars": {},
+            "sections": {},
+        }
+        pending: dict[str, tuple[str, str]] = {}
+
+        for key in index["order"]:
+            if candidates is not None and key not in candidates and key in previous_sections:
+                index["sections"][key] = previous_sections[key]
+                continue
+            value = state[key]
+            if not isinstance(value, (Mapping, list)):
+                index["scalars"][key] = value
+                continue
+            text = encode_section(value)
+            digest = _digest(text)
+            prior = previous_sections.get(key)
+            if prior is not None and prior.get("sha256") == digest:
+                index["sections"][key] = prior
+                continue
+            filename = f"{key}.{digest[:16]}.json"
+            index["sections"][key] = {"file": filename, "sha256": digest}
+            pending[filename] = (key, text)
+
+        written = [key for key, _ in pending.values()]
+        if before_write is not None:
+            before_write(dict(pending.values()))
+        for filename, (_, text) in pending.items():
+            atomic_write_text(self._root / filename, text, durability=self._durability)
+
+        if written or index != previous:
+            atomic_write_text(
+                self.index_path,
+                dumps_pretty(index),
+                durability=self._durability,
+            )
+        self._collect_garbage(index, previous)
+        return index, written
+
+    def _collect_garbage(self, index: Mapping[str, Any], previous: Mapping[str, Any]) -> None:
+        # Keep the previous generation so readers holding the old index can finish.
+        keep = {INDEX_FILENAME}
+        for generation in (index, previous):
+            keep.update(entry["file"] for entry in generation.get("sections", {}).values())
+        for path in self._root.glob("*.json"):
+            if path.name not in keep:
+                try:
+                    path.unlink()
+                except FileNotFoundError:  # pragma: no cover - concurrent collector
+                    pass
+
+
+class LazyWorkflowState(MutableMapping[str, Any]):
+    """
+    Mapping proxy over the sectioned layout that loads sections on first access.
+
+    Scalars are available immediately from the index. Saving the proxy through
+    ``WorkflowStateStore.save`` only re-encodes the sections that were loaded or
+    assigned, and only rewrites those whose contents changed.
+    """
+
+    def __init__(self, layout: SectionedStateFile, index: Mapping[str, Any] | None = None) -> None:
+        index = index if index is not None else layout.read_index()
+        self._layout = layout
+        self._order: list[str] = list(index.get("order", []))
+        self._scalars: dict[str, Any] = dict(index.get("scalars", {}))
+        self._entries: dict[str, Mapping[str, Any]] = dict(index.get("sections", {}))
+        self._loaded: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._scalars:
+            return self._scalars[key]
+        if key in self._loaded:
+            return self._loaded[key]
+        entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        value = self._layout.read_section(entry)
+        self._loaded[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._scalars and key not in self._entries and key not in self._loaded:
+            self._order.append(key)
+        self._scalars.pop(key, None)
+        self._loaded.pop(key, None)
+        if isinstance(value, (Mapping, list)):
+            self._loaded[key] = value
+        else:
+            self._scalars[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._scalars.pop(key, None)
+        self._loaded.pop(key, None)
+        self._entries.pop(key, None)
+        self._order.remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._scalars or key in self._entries or key in self._loaded
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._order))
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def layout_root(self) -> Path:
+        """Sections directory this proxy reads from."""
+        return self._layout.root
+
+    def loaded_sections(self) -> set[str]:
+        """Names of the sections that have been loaded or assigned."""
+        return set(self._loaded)
+
+    def dirty_sections(self) -> set[str]:
+        """Loaded sections whose contents differ from the file they were read from."""
+        dirty: set[str] = set()
+        for key, value in self._loaded.items():
+            entry = self._entries.get(key)
+            if entry is None or entry.get("sha256") != _digest(encode_section(value)):
+                dirty.add(key)
+        return dirty
+
+    def save_candidates(self) -> set[str]:
+        """Keys that must be considered when this proxy is written back."""
+        return set(self._scalars) | set(self._loaded)
+
+    def materialise(self) -> dict[str, Any]:
+        """Load every section and return a plain dictionary."""
+        return {key: self[key] for key in self._order}
+
+    def mark_saved(self, index: Mapping[str, Any]) -> None:
+        """Adopt a freshly written index so later dirty checks compare against it."""
+        self._entries = dict(index.get("sections", {}))
+
+
+__all__ = [
+    "INDEX_FILENAME",
+    "SECTIONS_DIRNAME",
+    "LazyWorkflowState",
+    "SectionedStateFile",
+    "encode_section",
+]
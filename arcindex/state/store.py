@@ -2,20 +2,42 @@
 Workflow state persistence utilities.
 
 This module replaces the legacy `state-manager.md` behavior with Python code that
-creates and maintains `workflow.json`.
+creates and maintains `workflow.json`. Stores configured with the ``sectioned``
+layout keep the same document split per section (see ``arcindex.state.sections``).
 """
 
 from __future__ import annotations
 
-import json
+from collections.abc import Iterable, Mapping, MutableMapping
 from copy import deepcopy
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping, MutableMapping, Optional
+from typing import TYPE_CHECKING, Any
+
+from arcindex.codec import dumps_pretty, loads
+from arcindex.events.trace import span, traced
+
+from .atomic import DEFAULT_DURABILITY, atomic_write_text, validate_durability
+from .sections import LazyWorkflowState, SectionedStateFile
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle with schema.py
+    from .schema import WorkflowStateSchema
 
 STATE_FILENAME = "workflow.json"
 SUMMARY_FILENAME = "discovery-summary.json"
 
+LAYOUT_SINGLE = "single"
+LAYOUT_SECTIONED = "sectioned"
+STATE_LAYOUTS = (LAYOUT_SINGLE, LAYOUT_SECTIONED)
+
+
+def validate_layout(layout: str) -> str:
+    """Return ``layout`` if it is a known state layout, otherwise raise ``ValueError``."""
+    if layout not in STATE_LAYOUTS:
+        choices = ", ".join(STATE_LAYOUTS)
+        raise ValueError(f"Unknown state layout '{layout}'. Expected one of: {choices}.")
+    return layout
+
 
 class WorkflowStateError(RuntimeError):
     """Base exception for workflow state operations."""
@@ -30,7 +52,7 @@ class WorkflowInitializationParams:
     """Parameters required to create a new workflow state file."""
 
     workflow_type: str
-    project_name: Optional[str]
+    project_name: str | None
     operation_mode: str
     timestamp: str
 
@@ -38,16 +60,44 @@ class WorkflowInitializationParams:
 class WorkflowStateStore:
     """Read/write access to the workflow state JSON file."""
 
-    def __init__(self, legacy_dir: Path, template_path: Path) -> None:
+    def __init__(
+        self,
+        legacy_dir: Path,
+        template_path: Path,
+        *,
+        durability: str = DEFAULT_DURABILITY,
+        layout: str = LAYOUT_SINGLE,
+        schema: WorkflowStateSchema | None = None,
+    ) -> None:
         self._legacy_dir = legacy_dir
         self._active_dir = legacy_dir
         self._template_path = template_path
+        self._durability = validate_durability(durability)
+        self._layout = validate_layout(layout)
+        self._schema = schema
+        # Private copy of each section as last validated.
+        self._validated: dict[str, Any] = {}
 
     @property
     def path(self) -> Path:
         """Return the location of the workflow state file."""
         return self._active_dir / STATE_FILENAME
 
+    @property
+    def durability(self) -> str:
+        """Durability level applied to state writes (see ``arcindex.state.atomic``)."""
+        return self._durability
+
+    @property
+    def layout(self) -> str:
+        """On-disk layout, either ``single`` or ``sectioned``."""
+        return self._layout
+
+    @property
+    def schema(self) -> WorkflowStateSchema | None:
+        """Schema applied before each save, or ``None`` when validation is disabled."""
+        return self._schema
+
     @property
     def legacy_directory(self) -> Path:
         """Return the legacy state directory."""
@@ -66,34 +116,132 @@ class WorkflowStateStore:
         """True if a workflow state file already exists."""
         if self.path.exists():
             return True
+        if self._layout == LAYOUT_SECTIONED and any(
+            self._sections(directory).exists()
+            for directory in (self._active_dir, self._legacy_dir)
+        ):
+            return True
         return (self._legacy_dir / STATE_FILENAME).exists()
 
     def load(self) -> MutableMapping[str, Any]:
         """Load the workflow state."""
+        if self._layout == LAYOUT_SECTIONED:
+            for directory in (self._active_dir, self._legacy_dir):
+                sections = self._sections(directory)
+                if sections.exists():
+                    return sections.load_all()
+
         active_path = self.path
         if active_path.exists():
-            with active_path.open("r", encoding="utf-8") as handle:
-                return json.load(handle)
+            return loads(active_path.read_bytes())
 
         legacy_path = self._legacy_dir / STATE_FILENAME
         if not legacy_path.exists():
             raise WorkflowStateNotInitialized(
                 "Workflow state has not been initialized yet."
             )
-        with legacy_path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        return loads(legacy_path.read_bytes())
+
+    def load_lazy(self) -> MutableMapping[str, Any]:
+        """
+        Load the workflow state, deferring section reads until first access.
 
+        With the ``sectioned`` layout this returns a :class:`LazyWorkflowState`
+        whose scalar fields (``current_phase``, ``status``...) need only the index.
+        Single-file stores, and sectioned stores that have not been written yet,
+        fall back to :meth:`load`.
+        """
+        if self._layout == LAYOUT_SECTIONED:
+            for directory in (self._active_dir, self._legacy_dir):
+                sections = self._sections(directory)
+                if sections.exists():
+                    return LazyWorkflowState(sections)
+        return self.load()
+
+    @traced("state.save", "disk")
     def save(self, state: Mapping[str, Any]) -> None:
-        """Persist the workflow state."""
-        self._active_dir.mkdir(parents=True, exist_ok=True)
-        with self.path.open("w", encoding="utf-8") as handle:
-            json.dump(state, handle, indent=2, sort_keys=True)
+        """
+        Persist the workflow state.
+
+        The document is serialised once and atomically swapped into place so
+        readers never observe a partially written ``workflow.json``. Sectioned
+        stores rewrite only the sections whose contents changed.
+
+        When the store has a schema, the state is validated first and
+        :class:`~arcindex.state.schema.WorkflowStateValidationError` is raised
+        without writing anything. Only sections that changed since they were
+        last validated are checked again.
+        """
+        if self._layout == LAYOUT_SECTIONED:
+            self._save_sectioned(state)
+            return
+
+        if isinstance(state, LazyWorkflowState):
+            state = state.materialise()
+        with span("state.encode", "serialise"):
+            text = dumps_pretty(state)
+        if self._schema is not None:
+            with span("state.validate", "serialise"):
+                self._validate(state, list(state))
+        atomic_write_text(self.path, text, durability=self._durability)
 
         if self._active_dir != self._legacy_dir:
-            self._legacy_dir.mkdir(parents=True, exist_ok=True)
             legacy_path = self._legacy_dir / STATE_FILENAME
-            with legacy_path.open("w", encoding="utf-8") as handle:
-                json.dump(state, handle, indent=2, sort_keys=True)
+            atomic_write_text(legacy_path, text, durability=self._durability)
+
+    def _validate(self, state: Mapping[str, Any], keys: Iterable[str]) -> None:
+        schema = self._schema
+        if schema is None:
+            return
+        starts: dict[str, int] = {}
+        for key in keys:
+            start = self._validation_start(key, state[key])
+            if start is not None:
+                starts[key] = start
+        schema.validate(state, sections=starts)
+        for key, start in starts.items():
+            previous = self._validated.get(key)
+            if start and isinstance(previous, list):
+                previous.extend(deepcopy(state[key][start:]))
+            else:
+                self._validated[key] = deepcopy(state[key])
+
+    def _validation_start(self, key: str, value: Any) -> int | None:
+        """
+        Return ``None`` if ``key`` is unchanged since it was last validated,
+        otherwise the index of the first list item that needs checking.
+        """
+        if key not in self._validated:
+            return 0
+        previous = self._validated[key]
+        if value == previous:
+            return None
+        if (
+            isinstance(value, list)
+            and isinstance(previous, list)
+            and 0 < len(previous) < len(value)
+            and value[: len(previous)] == previous
+        ):
+            # Only items were appended; those already validated stay valid.
+            return len(previous)
+        return 0
+
+    def _sections(self, directory: Path) -> SectionedStateFile:
+        return SectionedStateFile(directory, durability=self._durability)
+
+    def _save_sectioned(self, state: Mapping[str, Any]) -> None:
+        candidates = state.save_candidates() if isinstance(state, LazyWorkflowState) else None
+        active = self._sections(self._active_dir)
+        index, _ = active.write(
+            state,
+            candidates=candidates,
+            before_write=lambda encoded: self._validate(state, encoded),
+        )
+        if isinstance(state, LazyWorkflowState) and state.layout_root == active.root:
+            state.mark_saved(index)
+
+        if self._active_dir != self._legacy_dir:
+            self._sections(self._legacy_dir).write(state, candidates=candidates)
 
     def initialize(self, params: WorkflowInitializationParams) -> MutableMapping[str, Any]:
         """
@@ -113,8 +261,7 @@ class WorkflowStateStore:
         self.save(state)
 
     def _load_template(self) -> MutableMapping[str, Any]:
-        with self._template_path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        return loads(self._template_path.read_bytes())
 
     def _apply_initial_values(
         self,
@@ -49,13 +49,10 @@ class _DummyDiscoveryClient(DiscoveryLLMClient):
 
 
 @pytest.fixture(autouse=True)
-def _fake_discovery_client() -> None:
+def _fake_discovery_client(monkeypatch: pytest.MonkeyPatch) -> None:
     """
     Swap the discovery agent client factory with a deterministic test double.
     """
-    original_factory = DiscoveryAgent.default_client_factory
-    DiscoveryAgent.default_client_factory = lambda: _DummyDiscoveryClient()
-    try:
-        yield
-    finally:
-        DiscoveryAgent.default_client_factory = original_factory
+    monkeypatch.setattr(
+        DiscoveryAgent, "default_client_factory", staticmethod(_DummyDiscoveryClient)
+    )
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bridge.scheduler import (
+    PRIORITY_BATCH,
+    AdmissionRejected,
+    RunScheduler,
+    SchedulerSettings,
+)
+
+
+def test_waiters_are_granted_by_priority_then_arrival_within_tenant_caps() -> None:
+    scheduler = RunScheduler(SchedulerSettings(max_concurrent=2, max_per_tenant=1))
+    granted: list[str] = []
+    positions: list[tuple[int, int]] = []
+
+    async def wait(name: str, tenant: str, priority: str = "interactive") -> None:
+        def on_position(position: int, queued: int) -> None:
+            if name == "b-batch":
+                positions.append((position, queued))
+
+        await scheduler.acquire(name, tenant=tenant, priority=priority, on_position=on_position)
+        granted.append(name)
+
+    async def main() -> None:
+        await scheduler.acquire("a1", tenant="a")
+        await scheduler.acquire("z1", tenant="z")
+        tasks = [
+            asyncio.create_task(wait("a2", "a")),
+            asyncio.create_task(wait("b-batch", "b", PRIORITY_BATCH)),
+            asyncio.create_task(wait("c1", "c")),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats().queued == 3
+
+        # a2 is still blocked by tenant a's cap, so c1 takes the free slot.
+        scheduler.release("z1", 1.0)
+        await asyncio.sleep(0)
+        assert granted == ["c1"]
+        # Interactive a2 then outranks the earlier batch job.
+        scheduler.release("a1", 1.0)
+        await asyncio.sleep(0)
+        assert granted == ["c1", "a2"]
+        scheduler.release("c1", 1.0)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+    assert granted == ["c1", "a2", "b-batch"]
+    assert positions == [(2, 2), (3, 3), (2, 2), (1, 1)]
+    assert scheduler.stats().running_by_tenant == {"a": 1, "b": 1}
+    assert scheduler.median_latency_s() == 1.0
+
+
+def test_admission_rejects_full_queue_and_sheds_batch_first() -> None:
+    scheduler = RunScheduler(
+        SchedulerSettings(
+            max_concurrent=1, max_per_tenant=1, max_queue_depth=2, batch_queue_share=0.5
+        )
+    )
+
+    async def main() -> None:
+        await scheduler.acquire("running")
+        waiter = asyncio.create_task(scheduler.acquire("queued-1"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            scheduler.admit(priority=PRIORITY_BATCH)
+        scheduler.admit()  # interactive work still fits
+        second = asyncio.create_task(scheduler.acquire("queued-2"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            scheduler.admit()
+        assert excinfo.value.retry_after_s >= 1.0
+
+        # Cancelling a queued wait withdraws it and frees queue space.
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+        assert scheduler.stats().queued == 1
+        scheduler.admit()
+
+        scheduler.release("running", 1.0)
+        await waiter
+        assert scheduler.stats().running == 1
+
+    asyncio.run(main())
+
+
+def test_latency_budget_rejects_jobs_that_would_wait_too_long() -> None:
+    scheduler = RunScheduler(
+        SchedulerSettings(max_concurrent=1, max_per_tenant=1, latency_budget_s=5.0)
+    )
+
+    async def main() -> None:
+        await scheduler.acquire("first")
+        scheduler.release("first", 4.0)
+        await scheduler.acquire("second")
+        scheduler.admit()  # one ahead: ~4s wait
+        waiter = asyncio.create_task(scheduler.acquire("third"))
+        await asyncio.sleep(0)
+        assert scheduler.estimated_wait_s() == pytest.approx(8.0)
+        with pytest.raises(AdmissionRejected) as excinfo:
+            scheduler.admit()
+        assert excinfo.value.retry_after_s == pytest.approx(8.0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    asyncio.run(main())
+
+
+def test_invalid_settings_and_priorities_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        SchedulerSettings(max_concurrent=0)
+    with pytest.raises(ValueError):
+        RunScheduler().admit(priority="urgent")
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from arcindex.agents.discovery import DiscoveryAgent
+from arcindex.agents.sdk import ElicitationResponse
+from arcindex.orchestrator import ElicitationSpeculator, rank_options
+from arcindex.tests.conftest import _DummyDiscoveryClient
+from arcindex.tests.test_runner_memo import _prepare_config
+from arcindex.tools import ElicitationMenu, current_token
+from bridge.adapter import RunJob, RunJobManager
+
+
+class _SlowController:
+    """Applies option 2 at once; other methods block until their call is aborted."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.aborted: list[str] = []
+
+    async def acompute_elicitation(
+        self, answers, option, project_name, current_summary
+    ) -> ElicitationResponse:
+        self.calls.append(option.label)
+        if option.number != 2:
+            token = current_token()
+            assert token is not None  # the speculator runs each call under its own token
+            try:
+                await asyncio.wait_for(token.wait(), 5)
+            finally:
+                self.aborted.append(option.label)
+        return ElicitationResponse(
+            markdown=f"{current_summary} + {option.label}", method_label=option.label
+        )
+
+
+def test_rank_options_prefers_popular_methods_then_menu_order() -> None:
+    options = ElicitationMenu().build()
+    ranked = rank_options(options, {options[4].label: 3, options[6].label: 1})
+
+    assert [option.number for option in ranked[:4]] == [5, 7, 2, 3]
+    assert all(option.number != 1 for option in ranked)
+
+
+def test_selected_speculation_is_served_and_the_rest_cancelled() -> None:
+    controller = _SlowController()
+    options = ElicitationMenu().build()
+
+    async def main():
+        speculator = ElicitationSpeculator(controller, {}, "Arcindex", "summary", top_k=3)
+        started = speculator.start(options)
+        assert [option.number for option in started] == [2, 3, 4]
+        while len(controller.calls) < 3:
+            await asyncio.sleep(0.01)
+        response = await speculator.take(options[1])
+        await asyncio.sleep(0.05)
+        return speculator, response
+
+    speculator, response = asyncio.run(main())
+
+    assert response.markdown == f"summary + {options[1].label}"
+    assert speculator.stats.hit and speculator.stats.cancelled == 2
+    assert sorted(controller.aborted) == sorted(option.label for option in options[2:4])
+
+
+async def _events_until(job: RunJob, kind: str) -> list[dict]:
+    events: list[dict] = []
+    while not events or events[-1].get("event") != kind:
+        events.append(await asyncio.wait_for(job.queue.get(), 10))
+    return events
+
+
+def test_deferred_choice_is_served_from_speculation(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[str] = []
+
+    class _CountingClient(_DummyDiscoveryClient):
+        def apply_elicitation(self, **kwargs) -> ElicitationResponse:
+            calls.append(kwargs["method_label"])
+            return super().apply_elicitation(**kwargs)
+
+    monkeypatch.setattr(DiscoveryAgent, "default_client_factory", staticmethod(_CountingClient))
+    runtime_path = _prepare_config(tmp_path)
+    options = ElicitationMenu().build()
+
+    async def run_job(manager: RunJobManager, choice: int) -> list[dict]:
+        job, status = await manager.start_job(project_name="Arcindex", elicitation_choice=None)
+        assert status == "pending"
+        answers = {key: f"{key} answer" for key in job.expected_keys}
+        assert await manager.submit_answers(job.run_id, answers) == "started"
+        menu = (await _events_until(job, "elicitation_menu"))[-1]
+        assert await manager.select_elicitation(job.run_id, choice) == "selected"
+        return [menu] + await _events_until(job, "end")
+
+    async def main():
+        manager = RunJobManager(runtime_path, speculate=2)
+        first = await run_job(manager, 3)
+        # Option 3 is now the most popular, so option 4 is not precomputed.
+        second = await run_job(manager, 4)
+        pending, _ = await manager.start_job(project_name="Arcindex", elicitation_choice=None)
+        with pytest.raises(ValueError):
+            await manager.select_elicitation(pending.run_id, 42)
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert first[0]["precomputing"] == [2, 3]
+    elicitation = next(event for event in first if event["event"] == "elicitation")
+    assert elicitation["method"] == options[2].label and elicitation["precomputed"] is True
+    assert first[-1]["status"] == "ok"
+
+    assert second[0]["precomputing"] == [3, 2]
+    elicitation = next(event for event in second if event["event"] == "elicitation")
+    assert elicitation["precomputed"] is False
+    # One call per speculated method plus the direct call for the miss.
+    assert sorted(calls) == sorted([options[1].label, options[2].label] * 2 + [options[3].label])
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from pathlib import Path
+
+import pytest
+
+from arcindex.orchestrator import OrchestratorController
+from arcindex.runner import CancellationError
+from arcindex.tests.test_runner_memo import ANSWERS, _prepare_config
+from bridge.workers import RunFailed, RunSpec, WorkerPool
+
+
+def _spec(runtime_path: Path, project_name: str) -> RunSpec:
+    controller = OrchestratorController.from_config_path(runtime_path)
+    state, timestamp = controller.initialise_discovery("greenfield-discovery", project_name)
+    run_id = uuid.uuid4().hex
+    controller.bind_run_directory(controller.config.runs.root / run_id, state)
+    return RunSpec(
+        run_id=run_id,
+        runtime_config=runtime_path,
+        state=dict(state),
+        answers=dict(ANSWERS, project_name=project_name),
+        timestamp=timestamp,
+        project_name=project_name,
+    )
+
+
+def test_runs_execute_in_worker_processes(tmp_path: Path) -> None:
+    runtime_path = _prepare_config(tmp_path)
+    specs = [_spec(runtime_path, name) for name in ("Alpha", "Beta")]
+    # fork so the workers inherit the stub discovery client installed by conftest.
+    pool = WorkerPool(2, start_method="fork")
+    events: dict[str, list[dict]] = {spec.run_id: [] for spec in specs}
+
+    async def main():
+        futures = [pool.submit(spec, events[spec.run_id].append) for spec in specs]
+        return await asyncio.wait_for(asyncio.gather(*futures), 60)
+
+    try:
+        results = asyncio.run(main())
+        assert pool.stats().alive == 2
+    finally:
+        pool.shutdown()
+
+    for spec, result in zip(specs, results):
+        assert result.run_id == spec.run_id
+        assert result.status == "ok"
+        assert spec.project_name in result.summary_markdown
+        kinds = [event["event"] for event in events[spec.run_id]]
+        assert kinds[0] == "node" and "summary" in kinds
+        assert kinds[-1] == "end" and events[spec.run_id][-1]["status"] == "ok"
+        assert result.events_path.exists()
+
+
+def test_worker_failures_and_cancellations_resolve_futures(tmp_path: Path) -> None:
+    runtime_path = _prepare_config(tmp_path)
+    good = _spec(runtime_path, "Gamma")
+    broken = RunSpec(
+        run_id="broken",
+        runtime_config=tmp_path / "missing.yaml",
+        state={},
+        answers={},
+        timestamp="",
+    )
+    pool = WorkerPool(1, start_method="fork")
+
+    async def main():
+        failed = pool.submit(broken, lambda payload: None)
+        cancelled = pool.submit(good, lambda payload: None)
+        pool.cancel(good.run_id)  # still queued behind the broken run
+        return await asyncio.wait_for(asyncio.gather(failed, cancelled, return_exceptions=True), 60)
+
+    try:
+        failed, cancelled = asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    assert isinstance(failed, RunFailed)
+    assert isinstance(cancelled, CancellationError)
+
+
+def test_pool_requires_workers() -> None:
+    with pytest.raises(ValueError):
+        WorkerPool(0)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from pathlib import Path
+
+import yaml  # type: ignore[import-untyped]
 from click.testing import CliRunner
 
 from arcindex.cli import arcindex
@@ -39,9 +42,15 @@ def test_cli_start_invokes_quickstart(monkeypatch):
     assert captured_kwargs["max_turns"] == 10
 
 
-def test_cli_continue_placeholder():
-    """`arcindex continue` should remind contributors that persistence is pending."""
+def test_cli_continue_without_runs(tmp_path: Path):
+    """`arcindex continue` should fail clearly when there is no run to resume."""
+    runtime_data = yaml.safe_load(Path("arcindex/config/runtime.yaml").read_text())
+    runtime_data["runs"]["root"] = str(tmp_path / "runs")
+    config_path = tmp_path / "runtime.yaml"
+    config_path.write_text(yaml.safe_dump(runtime_data))
+
     runner = CliRunner()
-    result = runner.invoke(arcindex, ["continue"], catch_exceptions=False)
-    assert result.exit_code == 0, result.output
-    assert "not yet implemented" in result.output.lower()
+    result = runner.invoke(arcindex, ["continue", "--config", str(config_path)])
+    assert result.exit_code != 0
+    assert "no runs found" in result.output.lower()
+
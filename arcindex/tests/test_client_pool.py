@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, ClassVar
+
+import pytest
+
+from arcindex.agents import sdk
+from arcindex.agents.limiter import LLMLimiter, ModelLimits
+from arcindex.agents.pool import DEFAULT_MAX_IDLE_CLIENTS, ClientPool, LoopBoundClients
+from arcindex.agents.sdk import OpenAIDiscoveryClient, configure_openai_clients
+from arcindex.tests.test_runner_memo import ANSWERS
+from arcindex.tools import CancellationError, CancellationToken, use_token
+
+SUMMARY_KWARGS: dict[str, Any] = {
+    "answers": ANSWERS,
+    "project_name": "Arcindex",
+    "workflow_type": "greenfield-discovery",
+}
+
+
+class _Client:
+    instances: ClassVar[list[_Client]] = []
+
+    def __init__(self, on_create=None) -> None:
+        self.closed = False
+        self.calls = 0
+        self._on_create = on_create
+        self.responses = self
+        _Client.instances.append(self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self._on_create is not None:
+            self._on_create(self)
+        return type("Response", (), {"output_text": "# Summary"})()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def _reset_instances() -> None:
+    _Client.instances = []
+
+
+def test_calls_reuse_pooled_clients_up_to_the_idle_limit() -> None:
+    client = OpenAIDiscoveryClient(client_pool=ClientPool(_Client))
+    for _ in range(3):
+        client.generate_summary(**SUMMARY_KWARGS)
+    assert len(_Client.instances) == 1 and _Client.instances[0].calls == 3
+
+    pool = ClientPool(_Client, max_idle=1)
+    with pool.lease() as first, pool.lease() as second:
+        assert first.client is not second.client  # leases are exclusive
+    assert [instance.closed for instance in _Client.instances[1:]] == [True, False]
+    stats = pool.stats()
+    assert (stats.created, stats.reused, stats.discarded, stats.idle) == (2, 0, 1, 1)
+
+    pool.resize(0)
+    assert all(instance.closed for instance in _Client.instances[1:])
+
+
+def test_default_clients_bound_their_connections_by_the_pool_size(monkeypatch) -> None:
+    limits: list[Any] = []
+    build = sdk.DefaultAsyncHttpxClient
+
+    def http_client(**kwargs: Any) -> Any:
+        limits.append(kwargs["limits"])
+        return build(**kwargs)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(sdk, "DefaultAsyncHttpxClient", http_client)
+    configure_openai_clients(3)
+    try:
+
+        async def main() -> None:
+            sdk.ASYNC_OPENAI_CLIENTS.get()
+            await sdk.ASYNC_OPENAI_CLIENTS.aclose()
+
+        asyncio.run(main())
+        assert sdk.OPENAI_CLIENT_POOL.max_idle == 3
+    finally:
+        configure_openai_clients(DEFAULT_MAX_IDLE_CLIENTS)
+
+    assert [(limit.max_connections, limit.max_keepalive_connections) for limit in limits] == [
+        (3, 3)
+    ]
+
+
+def test_cancelled_request_closes_only_its_own_client() -> None:
+    token = CancellationToken()
+    pool = ClientPool(lambda: _Client(on_create=lambda _: token.cancel()))
+    client = OpenAIDiscoveryClient(client_pool=pool)
+    with pool.lease() as warm:  # leave an idle client for the request to reuse
+        pass
+
+    with use_token(token):
+        client.generate_summary(**SUMMARY_KWARGS)
+
+    aborted = _Client.instances[0]
+    assert aborted is warm.client and aborted.closed
+    assert pool.stats().idle == 0  # the aborted client was not returned
+    client.generate_summary(**SUMMARY_KWARGS)
+    assert len(_Client.instances) == 2
+
+
+class _AsyncClient:
+    instances: ClassVar[list[_AsyncClient]] = []
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+        self.responses = self
+        self.closed = False
+        _AsyncClient.instances.append(self)
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def create(self, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await self.release.wait()
+        finally:
+            self.in_flight -= 1
+        return type("Response", (), {"output_text": f"# {kwargs['model']}"})()
+
+
+def test_async_path_keeps_many_calls_in_flight_on_one_shared_client() -> None:
+    _AsyncClient.instances = []
+    limiter = LLMLimiter()  # admission is not under test here
+    limiter.configure("gpt-4.1-mini", ModelLimits(initial_concurrency=200, max_concurrency=200))
+    client = OpenAIDiscoveryClient(async_client_factory=_AsyncClient, limiter=limiter)
+    threads_before = threading.active_count()
+
+    async def main():
+        calls = [
+            asyncio.ensure_future(client.agenerate_summary(**SUMMARY_KWARGS)) for _ in range(200)
+        ]
+        while not _AsyncClient.instances or _AsyncClient.instances[0].in_flight < 200:
+            await asyncio.sleep(0.01)
+        assert threading.active_count() == threads_before
+        _AsyncClient.instances[0].release.set()
+        return await asyncio.gather(*calls)
+
+    responses = asyncio.run(main())
+
+    assert {response.markdown for response in responses} == {"# gpt-4.1-mini"}
+    assert len(_AsyncClient.instances) == 1 and _AsyncClient.instances[0].peak == 200
+
+
+def test_each_loops_async_client_is_closed_by_aclose(monkeypatch) -> None:
+    _AsyncClient.instances = []
+    monkeypatch.setattr(sdk, "ASYNC_OPENAI_CLIENTS", LoopBoundClients(_AsyncClient))
+    client = OpenAIDiscoveryClient()
+
+    async def main() -> None:
+        call = asyncio.ensure_future(client.agenerate_summary(**SUMMARY_KWARGS))
+        while not _AsyncClient.instances or _AsyncClient.instances[-1].in_flight < 1:
+            await asyncio.sleep(0.01)
+        assert not _AsyncClient.instances[-1].closed
+        _AsyncClient.instances[-1].release.set()
+        await call
+        await sdk.ASYNC_OPENAI_CLIENTS.aclose()
+        await sdk.ASYNC_OPENAI_CLIENTS.aclose()  # nothing left to close
+
+    for _ in range(2):
+        asyncio.run(main())
+
+    assert [instance.closed for instance in _AsyncClient.instances] == [True, True]
+
+
+def test_cancelling_an_async_call_leaves_the_shared_client_in_use() -> None:
+    _AsyncClient.instances = []
+    client = OpenAIDiscoveryClient(async_client_factory=_AsyncClient)
+    token = CancellationToken()
+
+    async def main():
+        with use_token(token):
+            cancelled = asyncio.ensure_future(client.agenerate_summary(**SUMMARY_KWARGS))
+        other = asyncio.ensure_future(client.agenerate_summary(**SUMMARY_KWARGS))
+        while not _AsyncClient.instances or _AsyncClient.instances[0].in_flight < 2:
+            await asyncio.sleep(0.01)
+        token.cancel()
+        with pytest.raises(CancellationError):
+            await cancelled
+        await asyncio.sleep(0)
+        shared = _AsyncClient.instances[0]
+        assert shared.in_flight == 1
+        shared.release.set()
+        return await other
+
+    assert asyncio.run(main()).markdown == "# gpt-4.1-mini"
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from arcindex import codec
+
+BACKENDS = [codec.BACKEND_STDLIB]
+try:
+    import orjson  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    pass
+else:
+    BACKENDS.append(codec.BACKEND_ORJSON)
+
+PAYLOADS = [
+    {},
+    [],
+    {"b": 1, "a": [1, 2, {"z": None, "y": True}], "c": {}},
+    {"text": "café   \U0001f600 \x7f \x00 \x1f / \\ \" \t\n"},
+    {"floats": [0.0, -0.0, 0.1, 1e-4, 1e-5, 123456789.125, 1e15, 1e16, 1.5e300, 5e-324]},
+    {"big": 2**70, "negative": -(2**63)},
+    {2: "int keys", 1: "are stringified"},
+    {"tuple": (1, "two", 3.5)},
+    {"state": {"elicitation_history": [{"phase": "discovery", "user_response": None}] * 3}},
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = codec.get_backend()
+    codec.set_backend(request.param)
+    yield request.param
+    codec.set_backend(previous)
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_pretty_matches_stdlib_byte_for_byte(backend: str, payload) -> None:
+    assert codec.dumps_pretty(payload) == json.dumps(payload, indent=2, sort_keys=True)
+    assert codec.dumps_pretty(payload, sort_keys=False) == json.dumps(payload, indent=2)
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_compact_round_trips(backend: str, payload) -> None:
+    text = codec.dumps_compact(payload)
+
+    assert "\n" not in text
+    assert codec.loads(text) == json.loads(json.dumps(payload))
+
+
+def test_compact_sort_keys_orders_records(backend: str) -> None:
+    assert codec.dumps_compact({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+
+
+def test_unserialisable_values_raise_like_stdlib(backend: str) -> None:
+    with pytest.raises(TypeError):
+        codec.dumps_pretty({"value": object()})
+
+
+def test_loads_accepts_stdlib_extensions(backend: str) -> None:
+    assert codec.loads(b'{"n": NaN}')["n"] != codec.loads(b'{"n": NaN}')["n"]
+
+
+def test_set_backend_rejects_unknown_names() -> None:
+    with pytest.raises(ValueError):
+        codec.set_backend("simdjson")
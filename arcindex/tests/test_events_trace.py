@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from arcindex.artifacts import ArtifactStore
+from arcindex.events import TRACE_FILENAME, Tracer, span, traced, use_tracer
+from arcindex.orchestrator import OrchestratorController
+from arcindex.runner import ArcindexRunner, ExecutionGraph, GraphExecutor, GraphNode
+from arcindex.tests.test_runner_memo import ANSWERS, _prepare_config
+
+
+def test_spans_nest_across_threads_and_are_noops_without_tracer(tmp_path: Path) -> None:
+    @traced("save_brief", "controller")
+    def save(store: ArtifactStore, brief: str) -> str:
+        return store.write_text("brief", brief).sha256
+
+    store = ArtifactStore("run-1", tmp_path)
+    graph = ExecutionGraph(
+        [GraphNode("save", lambda brief: save(store, brief), inputs=("brief",), outputs=("sha",))]
+    )
+
+    with span("untraced"):
+        save(store, "ignored")
+
+    tracer = Tracer("run-1")
+    with use_tracer(tracer), tracer.span("run"):
+        asyncio.run(GraphExecutor(graph).execute({"brief": "scope"}))
+
+    spans = {record.name: record for record in tracer.spans}
+    assert set(spans) == {"run", "save", "save_brief", "artifact.write"}
+    helper = spans["save_brief"]
+    assert spans["save"].parent_id == spans["run"].span_id
+    assert helper.parent_id == spans["save"].span_id
+    assert spans["artifact.write"].parent_id == helper.span_id
+    assert spans["artifact.write"].category == "disk"
+    # The node body ran in a worker thread, not on the event loop.
+    assert helper.thread_id != spans["save"].thread_id
+    assert all(
+        record.end_us is not None and record.end_us >= record.start_us for record in tracer.spans
+    )
+
+
+def test_trace_is_written_in_chrome_format_and_appended_on_resume(tmp_path: Path) -> None:
+    for attempt in ("first", "second"):
+        tracer = Tracer("run-1")
+        with tracer.span(attempt, "run", attempt=attempt):
+            pass
+        path = tracer.write(tmp_path)
+
+    assert path == tmp_path / TRACE_FILENAME
+    document = json.loads(path.read_text())
+    complete = [event for event in document["traceEvents"] if event["ph"] == "X"]
+    assert [event["name"] for event in complete] == ["first", "second"]
+    assert complete[0]["args"]["attempt"] == "first"
+    assert {"ts", "dur", "pid", "tid", "cat"} <= set(complete[0])
+    assert any(event["ph"] == "M" for event in document["traceEvents"])
+    assert document["otherData"] == {"run_id": "run-1"}
+
+
+def test_discovery_run_writes_trace(tmp_path: Path) -> None:
+    controller = OrchestratorController.from_config_path(_prepare_config(tmp_path))
+    runner = ArcindexRunner(controller)
+    state, timestamp = controller.initialise_discovery("greenfield-discovery", "Arcindex")
+    context = runner.create_run(emit_phase_start=False)
+    controller.bind_run_directory(context.artifact_store.run_directory, state)
+
+    asyncio.run(runner.discovery_summary(context, ANSWERS, "Arcindex"))
+    asyncio.run(runner.complete_discovery(context, state, ANSWERS, timestamp, "Arcindex"))
+
+    document = json.loads((context.artifact_store.run_directory / TRACE_FILENAME).read_text())
+    names = {event["name"] for event in document["traceEvents"] if event["ph"] == "X"}
+    assert {
+        "generate_summary",
+        "complete_discovery",
+        "persist_summary",
+        "controller.persist_summary",
+        "state.save",
+        "state.encode",
+        "finalise_discovery",
+    } <= names
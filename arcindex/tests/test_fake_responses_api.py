@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from arcindex.agents.sdk import OpenAIDiscoveryClient
+from arcindex.tests.test_runner_memo import ANSWERS
+from arcindex.tools.retry import CircuitBreaker
+from scripts.fake_responses_api import FakeResponsesConfig, start_server
+
+openai = pytest.importorskip("openai")
+
+SUMMARY_KWARGS: dict[str, Any] = {
+    "answers": ANSWERS,
+    "project_name": "Arcindex",
+    "workflow_type": "greenfield-discovery",
+}
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**config):
+        servers.append(start_server(FakeResponsesConfig(**config)))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_streams_templated_markdown_at_the_configured_cadence(serve) -> None:
+    server = serve(
+        latency_ms=50,
+        chunk_tokens=8,
+        chunk_interval_ms=10,
+        template="# Summary from {model}\n\n" + "- point\n" * 16,
+    )
+    client = OpenAIDiscoveryClient(
+        async_client_factory=lambda: openai.AsyncOpenAI(api_key="fake", base_url=server.base_url)
+    )
+
+    async def main():
+        async for _ in client.astream_summary(**SUMMARY_KWARGS):
+            pass  # the SDK builds its event models on first use
+        start = time.perf_counter()
+        arrivals = []
+        async for delta in client.astream_summary(**SUMMARY_KWARGS):
+            arrivals.append((time.perf_counter() - start, delta))
+        return arrivals
+
+    arrivals = asyncio.run(main())
+
+    assert "".join(delta for _, delta in arrivals).startswith("# Summary from gpt-4.1-mini")
+    assert len(arrivals) == 5  # 36 words, 8 per delta
+    assert arrivals[0][0] >= 0.05 and arrivals[-1][0] - arrivals[0][0] >= 0.04
+    stats = server.stats()
+    assert (stats.requests, stats.streamed) == (2, 2)
+    assert stats.input_tokens > 200 and stats.output_tokens > 40
+
+
+def test_injects_rate_limits_and_server_errors(serve) -> None:
+    server = serve(rate_limit_rate=0.5, error_rate=0.5, seed=7)
+    client = OpenAIDiscoveryClient(
+        client_factory=lambda: openai.OpenAI(
+            api_key="fake", base_url=server.base_url, max_retries=0
+        ),
+        circuit_breaker=CircuitBreaker("fake", failure_threshold=100),
+    )
+
+    failures = []
+    for _ in range(20):
+        with pytest.raises(openai.APIStatusError) as excinfo:
+            client.generate_summary(**SUMMARY_KWARGS)
+        failures.append(excinfo.value.status_code)
+
+    stats = server.stats()
+    assert sorted(set(failures)) == [429, 500]
+    assert (stats.rate_limited, stats.errors) == (failures.count(429), failures.count(500))
+    assert stats.output_tokens == 0
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from arcindex.agents.cache import CachingDiscoveryClient, ResponseCache, open_response_cache
+from arcindex.agents.sdk import OpenAIDiscoveryClient
+from arcindex.tests.conftest import _DummyDiscoveryClient
+from arcindex.tests.test_runner_memo import ANSWERS
+
+
+class _CountingClient(_DummyDiscoveryClient):
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def generate_summary(self, **kwargs):
+        self.calls.append("summary")
+        return super().generate_summary(**kwargs)
+
+    def apply_elicitation(self, **kwargs):
+        self.calls.append(kwargs["method_label"])
+        return super().apply_elicitation(**kwargs)
+
+
+SUMMARY_INPUTS: dict[str, Any] = {
+    "answers": ANSWERS,
+    "project_name": "Arcindex",
+    "workflow_type": "greenfield-discovery",
+}
+
+
+def _elicitation(label: str) -> dict[str, Any]:
+    return {
+        "method_label": label,
+        "method_instructions": "Refine.",
+        "current_summary": "summary",
+        **SUMMARY_INPUTS,
+    }
+
+
+class _Responses:
+    """Stands in for ``OpenAI().responses``, recording each request."""
+
+    def __init__(self) -> None:
+        self.requests: list[dict[str, Any]] = []
+
+    def create(self, **kwargs: Any) -> Any:
+        self.requests.append(kwargs)
+        return type("Response", (), {"output_text": f"# Summary {len(self.requests)}"})()
+
+
+def _openai_client(responses: _Responses, **kwargs: Any) -> OpenAIDiscoveryClient:
+    stub = type("Client", (), {"responses": responses})
+    return OpenAIDiscoveryClient(client_factory=stub, **kwargs)
+
+
+def test_identical_requests_are_served_from_disk_across_instances(tmp_path: Path) -> None:
+    path = tmp_path / "llm.sqlite3"
+    inner = _CountingClient()
+    client = CachingDiscoveryClient(inner, ResponseCache(path))
+    summary_kwargs = SUMMARY_INPUTS
+
+    first = client.generate_summary(**summary_kwargs)
+    assert client.generate_summary(**summary_kwargs) == first
+    client.generate_summary(**{**summary_kwargs, "project_name": "Other"})
+    refined = client.apply_elicitation(**_elicitation("Critique and Refine"))
+    assert client.apply_elicitation(**_elicitation("Critique and Refine")) == refined
+
+    assert inner.calls == ["summary", "summary", "Critique and Refine"]
+    stats = client.cache.stats()
+    assert (stats.entries, stats.hits, stats.misses) == (3, 2, 3)
+
+    # A new process (or run) opening the same cache skips the round trip too.
+    reopened = CachingDiscoveryClient(_CountingClient(), ResponseCache(path))
+    assert reopened.generate_summary(**summary_kwargs) == first
+    assert reopened.cache.stats().hits == 3
+
+
+def test_entries_expire_and_least_recently_used_are_evicted(tmp_path: Path) -> None:
+    now = [0.0]
+    cache = ResponseCache(tmp_path / "llm.sqlite3", ttl_s=100, max_entries=2, clock=lambda: now[0])
+
+    cache.put("a", "1")
+    now[0] = 1
+    cache.put("b", "2")
+    now[0] = 2
+    assert cache.get("a") == "1"  # "b" is now least recently used
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+
+    now[0] = 101
+    assert cache.get("a") is None  # written at t=0
+    assert cache.get("c") == "3"
+
+    small = ResponseCache(tmp_path / "small.sqlite3", max_bytes=10)
+    small.put("x", "12345")
+    small.put("y", "123456")
+    assert small.get("x") is None and small.get("y") == "123456"
+
+    stats = cache.stats()
+    assert (stats.expired, stats.evicted, stats.entries) == (1, 1, 1)
+
+
+def test_lookups_only_read_until_bookkeeping_is_flushed(tmp_path: Path) -> None:
+    path = tmp_path / "llm.sqlite3"
+    now = [0.0]
+    cache = ResponseCache(path, flush_every=3, clock=lambda: now[0])
+    cache.put("a", "1")
+    observer = sqlite3.connect(path)
+
+    def accessed_at() -> float:
+        return observer.execute("SELECT accessed_at FROM responses").fetchone()[0]
+
+    now[0] = 5
+    assert cache.get("a") == "1"
+    assert cache.get("missing") is None
+    assert accessed_at() == 0
+    assert observer.execute("SELECT COUNT(*) FROM counters").fetchone()[0] == 0
+
+    # The third lookup reaches flush_every and writes the batch.
+    assert cache.get("a") == "1"
+    assert accessed_at() == 5
+    assert dict(observer.execute("SELECT name, value FROM counters")) == {"hits": 2, "misses": 1}
+
+
+def test_open_response_cache_rejects_conflicting_limits(tmp_path: Path) -> None:
+    path = tmp_path / "llm.sqlite3"
+    cache = open_response_cache(path, max_entries=5)
+
+    assert open_response_cache(path, max_entries=5) is cache
+    with pytest.raises(ValueError, match="already open"):
+        open_response_cache(path, max_entries=6)
+
+
+def test_openai_requests_are_keyed_by_model_and_prompts(tmp_path: Path) -> None:
+    responses = _Responses()
+    cache = ResponseCache(tmp_path / "llm.sqlite3")
+
+    mini = CachingDiscoveryClient(_openai_client(responses), cache)
+    assert mini.generate_summary(**SUMMARY_INPUTS).markdown == "# Summary 1"
+    assert mini.generate_summary(**SUMMARY_INPUTS).markdown == "# Summary 1"
+    full = CachingDiscoveryClient(_openai_client(responses, summary_model="gpt-4.1"), cache)
+    assert full.generate_summary(**SUMMARY_INPUTS).markdown == "# Summary 2"
+
+    requests = responses.requests
+    assert [request["model"] for request in requests] == ["gpt-4.1-mini", "gpt-4.1"]
+    assert [message["role"] for message in requests[0]["input"]] == ["system", "user"]
+
+
+def test_openai_elicitation_sends_the_method_and_current_summary() -> None:
+    responses = _Responses()
+    client = _openai_client(responses, elicitation_model="gpt-4.1")
+    inputs = _elicitation("Critique and Refine")
+
+    request = client.elicitation_request(**inputs)
+    response = client.apply_elicitation(**inputs)
+
+    assert (response.markdown, response.method_label) == ("# Summary 1", "Critique and Refine")
+    sent = responses.requests[0]
+    assert sent["model"] == request.model == "gpt-4.1"
+    assert [message["content"] for message in sent["input"]] == [request.system, request.user]
+    assert "Apply the requested elicitation method" in request.system
+    assert "'Critique and Refine'" in request.user and "summary" in request.user
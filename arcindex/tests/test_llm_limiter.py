@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from arcindex.agents.limiter import LLMLimiter, ModelLimits, TokenBucket
+from arcindex.tools import CancellationToken, DeadlineExceeded, use_token
+
+MODEL = "gpt-4.1-mini"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+def _call(
+    limiter: LLMLimiter, clock: _Clock, seconds: float, error: Exception | None = None
+) -> None:
+    with limiter.acquire(MODEL):
+        clock.now += seconds
+        if error is not None:
+            raise error
+
+
+def test_concurrency_grows_additively_and_halves_on_throttling() -> None:
+    clock = _Clock()
+    limiter = LLMLimiter(clock=clock)
+    limiter.configure(MODEL, ModelLimits(initial_concurrency=8, max_concurrency=32))
+
+    for _ in range(8):
+        _call(limiter, clock, 1.0)
+    assert limiter.stats()[MODEL].limit == pytest.approx(8.96, abs=0.01)
+
+    with pytest.raises(_RateLimited):
+        _call(limiter, clock, 0.1, _RateLimited())
+    # A burst of rejections within one typical latency backs off once.
+    with pytest.raises(_RateLimited):
+        _call(limiter, clock, 0.1, _RateLimited())
+    stats = limiter.stats()[MODEL]
+    assert stats.limit == pytest.approx(4.48, abs=0.01)
+    assert (stats.throttled, stats.decreases, stats.in_flight) == (2, 1, 0)
+
+    _call(limiter, clock, 5.0)  # five times the usual latency
+    assert limiter.stats()[MODEL].limit == pytest.approx(2.24, abs=0.01)
+
+
+def test_token_buckets_delay_calls_beyond_the_rate() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(60, clock=clock)
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(30) == pytest.approx(30.0)
+    clock.now += 40
+    assert bucket.reserve(10) == 0.0
+
+    limiter = LLMLimiter()
+    limiter.configure(MODEL, ModelLimits(tokens_per_minute=1000))
+    with limiter.acquire(MODEL, tokens=1000):
+        pass
+    # The next call would wait most of a minute: past its deadline, it is not queued.
+    with (
+        use_token(CancellationToken(timeout=1.0)),
+        pytest.raises(DeadlineExceeded),
+        limiter.acquire(MODEL, tokens=500),
+    ):
+        pass
+    stats = limiter.stats()[MODEL]
+    assert (stats.admitted, stats.expired, stats.in_flight) == (1, 1, 0)
+
+
+def test_waiters_are_admitted_in_arrival_order_until_their_deadline() -> None:
+    limiter = LLMLimiter()
+    limiter.configure(MODEL, ModelLimits(initial_concurrency=1, max_concurrency=1))
+    admitted: list[int] = []
+
+    async def call(index: int, release: asyncio.Event) -> None:
+        async with limiter.aacquire(MODEL):
+            admitted.append(index)
+            await release.wait()
+
+    async def main() -> None:
+        release = asyncio.Event()
+        release.set()
+        holder_release = asyncio.Event()
+        holder = asyncio.ensure_future(call(0, holder_release))
+        await asyncio.sleep(0)
+        waiters = []
+        for index in (1, 2, 3):
+            waiters.append(asyncio.ensure_future(call(index, release)))
+            await asyncio.sleep(0)
+        with use_token(CancellationToken(timeout=0.05)):
+            late = asyncio.ensure_future(call(4, release))
+        with pytest.raises(DeadlineExceeded):
+            await late
+        assert limiter.stats()[MODEL].queued == 3
+        holder_release.set()
+        await asyncio.gather(holder, *waiters)
+
+    asyncio.run(main())
+
+    assert admitted == [0, 1, 2, 3]
+    stats = limiter.stats()[MODEL]
+    assert (stats.admitted, stats.expired, stats.queued, stats.in_flight) == (4, 1, 0, 0)
+    assert stats.max_queue_wait_s >= 0.05
+
+
+def test_openai_client_backs_off_on_provider_rate_limits() -> None:
+    openai = pytest.importorskip("openai")
+    from arcindex.agents.sdk import OpenAIDiscoveryClient
+    from arcindex.tests.test_runner_memo import ANSWERS
+    from arcindex.tools.retry import CircuitBreaker
+    from scripts.fake_responses_api import FakeResponsesConfig, start_server
+
+    server = start_server(FakeResponsesConfig(rate_limit_rate=1.0))
+    try:
+        limiter = LLMLimiter()
+        client = OpenAIDiscoveryClient(
+            client_factory=lambda: openai.OpenAI(
+                api_key="fake", base_url=server.base_url, max_retries=0
+            ),
+            circuit_breaker=CircuitBreaker("fake", failure_threshold=100),
+            limiter=limiter,
+        )
+        with pytest.raises(openai.RateLimitError):
+            client.generate_summary(
+                answers=ANSWERS, project_name="Arcindex", workflow_type="greenfield-discovery"
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    stats = limiter.stats()[MODEL]
+    assert (stats.throttled, stats.limit, stats.in_flight) == (1, 4.0, 0)
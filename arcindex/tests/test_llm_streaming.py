@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from arcindex.agents import DiscoveryAgent
+from arcindex.agents.cache import CachingDiscoveryClient, ResponseCache
+from arcindex.agents.sdk import OpenAIDiscoveryClient
+from arcindex.events import EventEmitter
+from arcindex.tests.test_runner_memo import ANSWERS
+from arcindex.tools import CancellationError, CancellationToken, use_token
+
+DELTAS = ["# Discovery", " Summary\n\n", "- Concept"]
+
+
+class _Stream:
+    """Server-sent events of one Responses API call, released one at a time."""
+
+    def __init__(self) -> None:
+        self.sent: asyncio.Queue[SimpleNamespace | None] = asyncio.Queue()
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.sent.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def send(self, delta: str) -> None:
+        self.sent.put_nowait(SimpleNamespace(type="response.output_text.delta", delta=delta))
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _StreamingClient:
+    def __init__(self) -> None:
+        self.streams: list[_Stream] = []
+        self.responses = self
+
+    async def create(self, **kwargs):
+        assert kwargs["stream"] is True
+        stream = _Stream()
+        self.streams.append(stream)
+        return stream
+
+
+def _agent(tmp_path: Path, clients: list[_StreamingClient]):
+    def factory() -> _StreamingClient:
+        clients.append(_StreamingClient())
+        return clients[-1]
+
+    client = OpenAIDiscoveryClient(async_client_factory=factory)
+    cache = ResponseCache(tmp_path / "llm.sqlite3")
+    emitter = EventEmitter("run-stream", tmp_path / "runs")
+    tokens: list[str] = []
+    emitter.subscribe(lambda payload: tokens.append(str(payload["text"])))
+    agent = DiscoveryAgent(client=CachingDiscoveryClient(client, cache), emitter=emitter)
+    return agent, tokens
+
+
+async def _until(predicate) -> None:
+    while not predicate():
+        await asyncio.sleep(0.01)
+
+
+def test_summary_deltas_are_emitted_as_they_arrive_and_cached_whole(tmp_path: Path) -> None:
+    clients: list[_StreamingClient] = []
+    agent, tokens = _agent(tmp_path, clients)
+
+    async def main() -> str:
+        summary = asyncio.ensure_future(
+            agent.agenerate_summary(ANSWERS, "Arcindex", workflow_type="greenfield-discovery")
+        )
+        await _until(lambda: clients and clients[0].streams)
+        stream = clients[0].streams[0]
+        stream.send(DELTAS[0])
+        await _until(lambda: tokens)
+        assert tokens == [DELTAS[0]] and not summary.done()  # first token before the rest
+        for delta in DELTAS[1:]:
+            stream.send(delta)
+        stream.sent.put_nowait(None)
+        return await summary
+
+    assert asyncio.run(main()) == "".join(DELTAS)
+    assert tokens == DELTAS
+    assert clients[0].streams[0].closed
+
+    # The accumulated text was cached: a repeat replays it without a request.
+    tokens.clear()
+    replay = asyncio.run(
+        agent.agenerate_summary(ANSWERS, "Arcindex", workflow_type="greenfield-discovery")
+    )
+    assert replay == "".join(DELTAS) and tokens == ["".join(DELTAS)]
+    assert len(clients) == 1 and len(clients[0].streams) == 1
+
+
+def test_cancelling_a_stream_closes_it_and_caches_nothing(tmp_path: Path) -> None:
+    clients: list[_StreamingClient] = []
+    agent, tokens = _agent(tmp_path, clients)
+    token = CancellationToken()
+
+    async def main() -> None:
+        with use_token(token):
+            summary = asyncio.ensure_future(
+                agent.agenerate_summary(ANSWERS, "Arcindex", workflow_type="greenfield-discovery")
+            )
+        await _until(lambda: clients and clients[0].streams)
+        clients[0].streams[0].send(DELTAS[0])
+        await _until(lambda: tokens)
+        token.cancel()
+        with pytest.raises(CancellationError):
+            await summary
+
+    asyncio.run(main())
+    assert tokens == [DELTAS[0]] and clients[0].streams[0].closed
+    assert ResponseCache(tmp_path / "llm.sqlite3").stats().entries == 0
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from arcindex.agents.budget import (
+    PromptBudget,
+    PromptBudgetExceeded,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+from arcindex.agents.pool import ClientPool
+from arcindex.agents.sdk import OpenAIDiscoveryClient
+from arcindex.events import EventEmitter
+from arcindex.runner import ExecutionGraph, GraphExecutor, GraphNode
+from arcindex.tests.test_runner_memo import ANSWERS
+
+CONCEPT = "A command line assistant that turns discovery interviews into project briefs."
+
+
+def _client(**budget: int) -> OpenAIDiscoveryClient:
+    return OpenAIDiscoveryClient(
+        client_pool=ClientPool(object), prompt_budgets={"gpt-4.1-mini": PromptBudget(**budget)}
+    )
+
+
+def test_token_estimates_and_truncation_stay_within_the_limit() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Hello, world!") == 4
+    assert estimate_tokens("internationalisation") == 4  # long words cost more
+
+    text = " ".join(["word"] * 500)
+    shortened = truncate_to_tokens(text, 100)
+    assert shortened.endswith("[…truncated]") and estimate_tokens(shortened) <= 105
+    assert truncate_to_tokens("short answer", 100) == "short answer"
+
+
+def test_elicitation_prompts_skip_answers_the_summary_already_carries() -> None:
+    answers = {**ANSWERS, "project_concept": CONCEPT}
+    summary = f"# Discovery Summary\n\n## Concept\n{CONCEPT.upper()}\n"
+    request = _client().elicitation_request(
+        method_label="Critique and Refine",
+        method_instructions="Refine.",
+        current_summary=summary,
+        answers=answers,
+        project_name="Arcindex",
+        workflow_type="greenfield-discovery",
+    )
+
+    assert request.omitted_answers == ("project_concept",)
+    assert request.user.count(CONCEPT) == 0
+    assert "not repeated: project_concept" in request.user
+    args = request.trace_args("elicitation")
+    assert args["prompt_tokens"] == request.prompt_tokens > 0 and args["omitted_answers"] == 1
+
+
+def test_oversized_answers_are_truncated_until_the_prompt_fits() -> None:
+    answers = {**ANSWERS, "project_concept": "detail " * 3000, "target_users": "users " * 3000}
+    kwargs: dict[str, Any] = {
+        "answers": answers,
+        "project_name": "Arcindex",
+        "workflow_type": "greenfield-discovery",
+    }
+
+    request = _client(max_prompt_tokens=1500, max_field_tokens=1000).summary_request(**kwargs)
+    assert set(request.truncated_answers) == {"project_concept", "target_users"}
+    assert request.prompt_tokens <= 1500
+
+    with pytest.raises(PromptBudgetExceeded) as excinfo:
+        _client(max_prompt_tokens=150).summary_request(**kwargs)
+    assert excinfo.value.max_prompt_tokens == 150
+
+
+def test_long_summaries_are_cut_to_their_share_and_the_omission_note_counts() -> None:
+    answers = {**ANSWERS, "project_concept": CONCEPT}
+    summary = f"## Concept\n{CONCEPT}\n\n" + "Refined detail. " * 2000
+    request = _client(max_prompt_tokens=900, max_summary_tokens=400).elicitation_request(
+        method_label="Critique and Refine",
+        method_instructions="Refine.",
+        current_summary=summary,
+        answers=answers,
+        project_name="Arcindex",
+        workflow_type="greenfield-discovery",
+    )
+
+    assert request.truncated_summary and request.omitted_answers == ("project_concept",)
+    assert "not repeated: project_concept" in request.user
+    assert request.prompt_tokens <= 900
+    assert request.trace_args("elicitation")["truncated_summary"] is True
+
+
+def test_node_done_events_report_the_prompt_tokens_sent(tmp_path: Path) -> None:
+    responses = SimpleNamespace(create=lambda **kwargs: SimpleNamespace(output_text="# Summary"))
+    pool = ClientPool(lambda: SimpleNamespace(responses=responses))
+    llm = OpenAIDiscoveryClient(client_pool=pool)
+    inputs: dict[str, Any] = {
+        "answers": ANSWERS,
+        "project_name": "Arcindex",
+        "workflow_type": "greenfield-discovery",
+    }
+
+    def summarise(answers: dict[str, str]) -> str:
+        return llm.generate_summary(**{**inputs, "answers": answers}).markdown
+
+    emitter = EventEmitter("run-budget", tmp_path)
+    events: list[dict[str, Any]] = []
+    emitter.subscribe(events.append)
+    graph = ExecutionGraph([GraphNode("summary", summarise, inputs=("answers",))])
+    asyncio.run(GraphExecutor(graph, emitter=emitter).execute({"answers": ANSWERS}))
+
+    done = next(event for event in events if event["status"] == "done")
+    expected = llm.summary_request(**inputs).prompt_tokens
+    assert done["details"] == {"llm_requests": 1, "prompt_tokens": expected}
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from arcindex.cli import arcindex
+from arcindex.runner import BatchOutcome, BatchReport
+from arcindex.tests.test_runner_memo import ANSWERS, _prepare_config
+
+
+def _write_jobs(path: Path, lines: list[str]) -> Path:
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _read_results(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_batch_runs_jobs_streams_results_and_resumes_from_output(tmp_path: Path) -> None:
+    config_path = _prepare_config(tmp_path)
+    jobs = _write_jobs(
+        tmp_path / "jobs.jsonl",
+        [
+            json.dumps({"id": "alpha", "project_name": "Alpha", "answers": ANSWERS}),
+            json.dumps({"project_name": "Beta", "answers": ANSWERS, "elicitation_choice": 3}),
+            "",
+            json.dumps({"id": "broken", "answers": "not an object"}),
+            json.dumps({"id": "gamma", "answers": ANSWERS, "elicitation_choice": 99}),
+        ],
+    )
+    output = tmp_path / "out" / "results.jsonl"
+    args = ["batch", str(jobs), "--output", str(output), "--concurrency", "2"]
+    args += ["--config", str(config_path)]
+
+    result = CliRunner().invoke(arcindex, args)
+
+    assert result.exit_code == 1
+    assert "Completed 2, failed 2, skipped 0" in result.output
+    assert "jobs/s; latency p50=" in result.output
+    records = {record["job_id"]: record for record in _read_results(output)}
+    assert records["alpha"]["status"] == "ok" and Path(records["alpha"]["summary_path"]).exists()
+    assert records["line-2"]["status"] == "ok" and records["line-2"]["run_id"]
+    assert "'answers' must be an object" in records[""]["error"]
+    assert "Invalid elicitation selection: 99" in records["gamma"]["error"]
+
+    # Rerunning skips completed jobs and retries only the failures.
+    result = CliRunner().invoke(arcindex, args)
+
+    assert "Completed 0, failed 2, skipped 2" in result.output
+    assert len(_read_results(output)) == 6
+
+
+def test_latency_percentiles_use_nearest_rank() -> None:
+    report = BatchReport(
+        outcomes=[
+            BatchOutcome(job_id=str(ms), status="ok", elapsed_ms=ms) for ms in range(10, 110, 10)
+        ]
+        + [BatchOutcome(job_id="done", status="skipped")],
+        elapsed_s=2.0,
+    )
+
+    assert report.latency_percentiles() == {50: 50.0, 90: 90.0, 99: 100.0}
+    assert report.jobs_per_second == 5.0
+    assert BatchReport().latency_percentiles() == {}
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from arcindex.agents.discovery import DiscoveryAgent
+from arcindex.agents.sdk import SummaryResponse
+from arcindex.events import EventEmitter
+from arcindex.orchestrator import OrchestratorController
+from arcindex.runner import (
+    ArcindexRunner,
+    CancellationError,
+    CancellationToken,
+    DeadlineExceeded,
+    ExecutionGraph,
+    GraphExecutor,
+    GraphNode,
+    NodeExecutionError,
+)
+from arcindex.tests.conftest import _DummyDiscoveryClient
+from arcindex.tests.test_runner_memo import ANSWERS, _prepare_config
+from arcindex.tools import current_token
+
+
+def _blocking_node(release: threading.Event, seen: list[object]):
+    # Stands in for a blocking HTTP call: it only returns early when the abort
+    # hook registered on the current token fires.
+    def call(prompt: str) -> str:
+        token = current_token()
+        seen.append(token)
+        if token is not None:
+            token.add_callback(release.set)
+        release.wait(5)
+        return prompt
+
+    return call
+
+
+def test_cancel_interrupts_running_node(tmp_path: Path) -> None:
+    release = threading.Event()
+    seen: list[object] = []
+    token = CancellationToken()
+    emitter = EventEmitter("run-1", tmp_path)
+    events: list[dict] = []
+    emitter.subscribe(events.append)
+    graph = ExecutionGraph(
+        [GraphNode("call", _blocking_node(release, seen), inputs=("prompt",), outputs=("reply",))]
+    )
+
+    async def main() -> None:
+        asyncio.get_running_loop().call_later(0.05, threading.Thread(target=token.cancel).start)
+        await GraphExecutor(graph, emitter=emitter, cancel_token=token).execute({"prompt": "hi"})
+
+    started = time.perf_counter()
+    with pytest.raises(CancellationError):
+        asyncio.run(main())
+
+    assert time.perf_counter() - started < 1
+    assert release.is_set()
+    assert seen and seen[0] is not token  # the node runs under a child token
+    statuses = [event["status"] for event in events if event["event"] == "node"]
+    assert statuses == ["start", "cancelled"]
+
+
+def test_node_timeout_fails_the_node() -> None:
+    async def slow() -> str:
+        await asyncio.sleep(5)
+        return "late"
+
+    graph = ExecutionGraph([GraphNode("slow", slow, outputs=("value",), timeout_s=0.05)])
+    started = time.perf_counter()
+    with pytest.raises(NodeExecutionError) as excinfo:
+        asyncio.run(GraphExecutor(graph, node_timeout_s=10).execute())
+
+    assert time.perf_counter() - started < 1
+    assert isinstance(excinfo.value.error, TimeoutError)
+
+
+def test_child_tokens_follow_parent_and_deadline() -> None:
+    parent = CancellationToken(timeout=60)
+    child = parent.child(0.01)
+    assert child.deadline is not None and parent.deadline is not None
+    assert child.deadline < parent.deadline
+    assert parent.child().deadline == parent.deadline
+
+    time.sleep(0.02)
+    with pytest.raises(DeadlineExceeded):
+        child.raise_if_cancelled()
+    assert not parent.is_cancelled()
+
+    sibling = parent.child()
+    parent.cancel()
+    assert sibling.reason == "cancelled"
+
+
+class _HangingClient(_DummyDiscoveryClient):
+    released = threading.Event()
+
+    def generate_summary(self, **kwargs) -> SummaryResponse:
+        token = current_token()
+        assert token is not None and token.remaining() is not None
+        token.add_callback(self.released.set)
+        self.released.wait(5)
+        return super().generate_summary(**kwargs)
+
+
+def test_run_deadline_aborts_summary(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(DiscoveryAgent, "default_client_factory", staticmethod(_HangingClient))
+    monkeypatch.setattr(_HangingClient, "released", threading.Event())
+    controller = OrchestratorController.from_config_path(_prepare_config(tmp_path))
+    runner = ArcindexRunner(controller, run_timeout_s=0.1)
+    controller.initialise_discovery("greenfield-discovery", "Arcindex")
+    context = runner.create_run(emit_phase_start=False)
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(runner.discovery_summary(context, ANSWERS, "Arcindex"))
+
+    assert time.perf_counter() - started < 1
+    assert _HangingClient.released.is_set()
+
+
+def test_cancelled_run_reports_partial_end(tmp_path: Path) -> None:
+    controller = OrchestratorController.from_config_path(_prepare_config(tmp_path))
+    runner = ArcindexRunner(controller)
+    state, timestamp = controller.initialise_discovery("greenfield-discovery", "Arcindex")
+    events: list[dict] = []
+    context = runner.create_run([events.append], emit_phase_start=False)
+    controller.bind_run_directory(context.artifact_store.run_directory, state)
+
+    asyncio.run(runner.discovery_summary(context, ANSWERS, "Arcindex"))
+    runner.cancel()
+    with pytest.raises(CancellationError):
+        asyncio.run(runner.complete_discovery(context, state, ANSWERS, timestamp, "Arcindex"))
+
+    end = events[-1]
+    assert end["event"] == "end"
+    assert end["status"] == "partial"
+    assert end["summary"] == {"reason": "cancelled", "completed_nodes": ["generate_summary"]}
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml  # type: ignore[import-untyped]
+
+from arcindex.runner import (
+    ExecutionPlan,
+    GraphExecutor,
+    PlanStep,
+    WorkflowCompileError,
+    WorkflowCompiler,
+    compile_workflow,
+)
+
+LEGACY_WORKFLOWS = Path("legacy/.codex/workflows")
+
+
+def _write(path: Path, document: Mapping[str, Any]) -> Path:
+    path.write_text(yaml.safe_dump(document), encoding="utf-8")
+    return path
+
+
+def _review_workflow() -> Mapping[str, Any]:
+    return {
+        "workflow": {
+            "id": "review",
+            "sequence": [
+                {"phase": "discovery", "agent": "orchestrator", "outputs": ["project_context"]},
+                {"agent": "analyst", "creates": "brief.md", "requires": ["discovery.completed"]},
+                {"agent": "pm", "creates": "prd.md", "requires": ["brief.md"]},
+                {"agent": "architect", "creates": "architecture.md", "requires": ["brief.md"]},
+                {"agent": "qa", "creates": "test-plan.md", "requires": ["brief.md", "market.md"]},
+                {"agent": "prp-creator", "requires": ["prd.md", "architecture.md", "test-plan.md"]},
+                {"phase": "implementation", "agent": "dev"},
+            ],
+        }
+    }
+
+
+def test_compile_identifies_parallel_stages() -> None:
+    plan = compile_workflow(_review_workflow())
+
+    assert plan.workflow_id == "review"
+    assert plan.stages == (
+        ("discovery",),
+        ("analyst",),
+        ("pm", "architect", "qa"),
+        ("prp-creator",),
+        ("implementation",),
+    )
+    assert plan.parallel_stages == [("pm", "architect", "qa")]
+    assert plan.step("prp-creator").depends_on == ("pm", "architect", "qa")
+    # Steps without declared inputs follow the previous step.
+    assert plan.step("implementation").depends_on == ("prp-creator",)
+    assert plan.external_inputs == ("market.md",)
+
+
+def test_compile_rejects_invalid_workflows() -> None:
+    with pytest.raises(WorkflowCompileError, match="no phases"):
+        compile_workflow({"id": "empty"})
+    with pytest.raises(WorkflowCompileError, match="twice"):
+        compile_workflow({"id": "dup", "phases": [{"phase": "a"}, {"phase": "a"}]})
+    with pytest.raises(WorkflowCompileError, match="unknown step"):
+        compile_workflow({"id": "bad", "phases": [{"phase": "a", "requires": ["ghost.completed"]}]})
+    with pytest.raises(WorkflowCompileError, match="cycle"):
+        compile_workflow(
+            {
+                "id": "loop",
+                "phases": [
+                    {"phase": "a", "requires": ["b.completed"]},
+                    {"phase": "b", "requires": ["a.completed"]},
+                ],
+            }
+        )
+
+
+def test_legacy_workflows_compile() -> None:
+    plans = WorkflowCompiler().compile_directory(
+        Path("arcindex/config/workflows"), LEGACY_WORKFLOWS
+    )
+
+    assert {
+        "greenfield-discovery",
+        "greenfield-generic",
+        "brownfield-enhancement",
+        "health-check",
+    } <= set(plans)
+    swift = plans["greenfield-swift-ios"]
+    assert swift.order[:5] == ["discovery", "analyst", "pm", "architect", "prp-creator"]
+    assert plans["health-check"].parallel_stages == [("validation_testing", "cleanup")]
+
+
+def test_plans_are_cached_by_content_hash(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    workflow = _write(tmp_path / "review.yaml", _review_workflow())
+    cache_dir = tmp_path / "cache"
+    compiler = WorkflowCompiler(cache_dir)
+
+    first = compiler.compile_file(workflow)
+    assert compiler.compile_file(workflow) is first
+    assert (cache_dir / f"{first.digest}.json").exists()
+
+    # A fresh process loads the plan from disk without parsing YAML.
+    parses: list[Path] = []
+    original = WorkflowCompiler._compile_bytes
+
+    def recording_compile(data, path, digest):
+        parses.append(path)
+        return original(data, path, digest)
+
+    monkeypatch.setattr(WorkflowCompiler, "_compile_bytes", staticmethod(recording_compile))
+    reloaded = WorkflowCompiler(cache_dir).compile_file(workflow)
+    assert parses == []
+    assert reloaded == first
+    assert reloaded.step("analyst").definition["creates"] == "brief.md"
+
+    document = dict(_review_workflow()["workflow"], id="review-v2")
+    _write(workflow, document)
+    assert compiler.compile_file(workflow).workflow_id == "review-v2"
+    assert parses == [workflow.resolve()]
+
+
+def test_plan_round_trips_through_dict() -> None:
+    plan = compile_workflow(_review_workflow(), source="review.yaml", digest="abc")
+
+    assert ExecutionPlan.from_dict(plan.to_dict()) == plan
+
+
+def test_plan_executes_stages_concurrently() -> None:
+    plan = compile_workflow(_review_workflow())
+    active: list[str] = []
+    peak: list[int] = []
+
+    async def handler(step: PlanStep, results: Mapping[str, Any]) -> str:
+        active.append(step.id)
+        peak.append(len(active))
+        await asyncio.sleep(0.02)
+        active.remove(step.id)
+        return f"{step.id}<-{','.join(sorted(results))}"
+
+    run = asyncio.run(GraphExecutor(plan.to_graph(handler)).execute())
+
+    assert max(peak) == 3
+    assert run.values["prp-creator"] == "prp-creator<-architect,pm,qa"
+    assert set(run.timings) == set(plan.order)
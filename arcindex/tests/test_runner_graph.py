@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from arcindex.events import EventEmitter
+from arcindex.runner import (
+    CancellationError,
+    CancellationToken,
+    ExecutionGraph,
+    GraphDefinitionError,
+    GraphExecutor,
+    GraphNode,
+    NodeExecutionError,
+)
+
+
+def _persona_graph(active: list[int], peak: list[int]) -> ExecutionGraph:
+    async def review(brief: str, persona: str = "") -> str:
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.05)
+        active.pop()
+        return f"{persona}:{brief}"
+
+    def persona(name: str):
+        async def run(brief: str) -> str:
+            return await review(brief, name)
+
+        return run
+
+    return ExecutionGraph(
+        [
+            GraphNode(
+                "brief", lambda answers: answers.upper(), inputs=("answers",), outputs=("brief",)
+            ),
+            GraphNode("pm", persona("pm"), inputs=("brief",), outputs=("prd",)),
+            GraphNode(
+                "architect", persona("architect"), inputs=("brief",), outputs=("architecture",)
+            ),
+            GraphNode("qa", persona("qa"), inputs=("brief",), outputs=("test_plan",)),
+            GraphNode(
+                "merge",
+                lambda prd, architecture, test_plan: [prd, architecture, test_plan],
+                inputs=("prd", "architecture", "test_plan"),
+                outputs=("bundle",),
+                reduce=True,
+            ),
+        ]
+    )
+
+
+def test_fan_out_runs_concurrently_and_fan_in_emits_reduce_events(tmp_path: Path) -> None:
+    active: list[int] = []
+    peak: list[int] = []
+    emitter = EventEmitter("run-graph", tmp_path)
+    events: list[dict] = []
+    emitter.subscribe(events.append)
+
+    run = asyncio.run(
+        GraphExecutor(_persona_graph(active, peak), emitter=emitter).execute({"answers": "scope"})
+    )
+
+    assert run.values["bundle"] == ["pm:SCOPE", "architect:SCOPE", "qa:SCOPE"]
+    assert max(peak) == 3
+    assert set(run.timings) == {"brief", "pm", "architect", "qa", "merge"}
+    personas_end = max(run.timings[name].end_ms for name in ("pm", "architect", "qa"))
+    assert run.timings["merge"].start_ms >= personas_end
+    reduce_events = [event for event in events if event["event"] == "reduce"]
+    assert [event["status"] for event in reduce_events] == ["start", "done"]
+    assert reduce_events[0]["inputs"] == 3
+    assert reduce_events[1]["result_ref"] == "bundle"
+    done = [event for event in events if event["event"] == "node" and event["status"] == "done"]
+    assert len(done) == 5 and all("duration_ms" in event for event in done)
+
+
+def test_concurrency_limit_is_respected() -> None:
+    active: list[int] = []
+    peak: list[int] = []
+
+    executor = GraphExecutor(_persona_graph(active, peak), max_concurrency=1)
+    asyncio.run(executor.execute({"answers": "x"}))
+
+    assert max(peak) == 1
+
+
+def test_sync_nodes_run_off_the_event_loop_and_return_multiple_outputs() -> None:
+    loop_thread = threading.get_ident()
+
+    def split(text: str):
+        return {"head": text[:1], "tail": text[1:], "thread": threading.get_ident()}
+
+    graph = ExecutionGraph(
+        [GraphNode("split", split, inputs=("text",), outputs=("head", "tail", "thread"))]
+    )
+    run = asyncio.run(GraphExecutor(graph).execute({"text": "abc"}))
+
+    assert (run.values["head"], run.values["tail"]) == ("a", "bc")
+    assert run.values["thread"] != loop_thread
+
+
+def test_graph_definition_errors() -> None:
+    with pytest.raises(GraphDefinitionError, match="produced by both"):
+        ExecutionGraph([GraphNode("a", len, outputs=("x",)), GraphNode("b", len, outputs=("x",))])
+
+    cyclic = ExecutionGraph(
+        [
+            GraphNode("a", len, inputs=("y",), outputs=("x",)),
+            GraphNode("b", len, inputs=("x",), outputs=("y",)),
+        ]
+    )
+    with pytest.raises(GraphDefinitionError, match="cycle"):
+        cyclic.topological_order()
+
+    with pytest.raises(GraphDefinitionError, match="nothing provides"):
+        ExecutionGraph([GraphNode("a", len, inputs=("missing",))]).topological_order()
+
+
+def test_failure_cancels_running_nodes() -> None:
+    cancelled = []
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def boom() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("persona failed")
+
+    graph = ExecutionGraph([GraphNode("slow", slow), GraphNode("boom", boom)])
+    with pytest.raises(NodeExecutionError) as excinfo:
+        asyncio.run(GraphExecutor(graph).execute())
+
+    assert excinfo.value.node == "boom"
+    assert str(excinfo.value.error) == "persona failed"
+    assert cancelled == [True]
+
+
+def test_cancelled_token_stops_pending_nodes() -> None:
+    token = CancellationToken()
+    calls: list[str] = []
+
+    def first() -> str:
+        token.cancel()
+        return "done"
+
+    graph = ExecutionGraph(
+        [
+            GraphNode("first", first, outputs=("value",)),
+            GraphNode("second", calls.append, inputs=("value",)),
+        ]
+    )
+    with pytest.raises(CancellationError):
+        asyncio.run(GraphExecutor(graph, cancel_token=token).execute())
+    assert calls == []
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml  # type: ignore[import-untyped]
+from click.testing import CliRunner
+
+from arcindex.agents.discovery import DiscoveryAgent
+from arcindex.agents.sdk import SummaryResponse
+from arcindex.artifacts import ArtifactStore
+from arcindex.cli import arcindex
+from arcindex.events import EventEmitter
+from arcindex.orchestrator import OrchestratorController
+from arcindex.runner import (
+    ArcindexRunner,
+    ExecutionGraph,
+    GraphExecutor,
+    GraphNode,
+    MemoPolicy,
+    NodeCache,
+    memo_key,
+)
+from arcindex.tests.conftest import _DummyDiscoveryClient
+
+ANSWERS = {"project_name": "Arcindex", "project_concept": "Concept", "target_users": "Engineers"}
+
+
+def test_memo_key_is_canonical_and_versioned() -> None:
+    policy = MemoPolicy(prompt="Summarise", model="gpt-4.1-mini")
+    key = memo_key("summary", {"answers": {"a": "1", "b": "2"}, "tags": {"x", "y"}}, policy)
+
+    assert key == memo_key("summary", {"tags": {"y", "x"}, "answers": {"b": "2", "a": "1"}}, policy)
+    inputs = {"answers": {"a": "1", "b": "2"}, "tags": {"x", "y"}}
+    assert key != memo_key("summary", inputs, MemoPolicy(prompt="Summarise", model="gpt-4.1"))
+    assert key != memo_key(
+        "summary", inputs, MemoPolicy(prompt="Summarise v2", model="gpt-4.1-mini")
+    )
+    assert memo_key("summary", {"client": object()}, policy) is None
+
+
+def _summarise_graph(calls: list[str]) -> ExecutionGraph:
+    def summarise(brief: str) -> str:
+        calls.append(brief)
+        return brief.upper()
+
+    return ExecutionGraph(
+        [
+            GraphNode(
+                "summarise",
+                summarise,
+                inputs=("brief",),
+                outputs=("summary",),
+                phase="discovery",
+                memo=MemoPolicy(model="m"),
+            )
+        ]
+    )
+
+
+def _execute(tmp_path: Path, run_id: str, calls: list[str], *, refresh: bool = False):
+    emitter = EventEmitter(run_id, tmp_path / "runs")
+    events: list[dict[str, Any]] = []
+    emitter.subscribe(events.append)
+    executor = GraphExecutor(
+        _summarise_graph(calls),
+        emitter=emitter,
+        cache=NodeCache(tmp_path / "cache"),
+        artifact_store=ArtifactStore(run_id, tmp_path / "runs"),
+        refresh=refresh,
+    )
+    run = asyncio.run(executor.execute({"brief": "scope"}))
+    return run, events
+
+
+def test_cached_results_are_replayed_as_artifacts(tmp_path: Path) -> None:
+    calls: list[str] = []
+    first, first_events = _execute(tmp_path, "run-1", calls)
+    second, second_events = _execute(tmp_path, "run-2", calls)
+
+    assert calls == ["scope"]
+    assert first.values["summary"] == second.values["summary"] == "SCOPE"
+    assert first.memo_hits == set() and second.memo_hits == {"summarise"}
+
+    first_artifact = next(event for event in first_events if event["event"] == "artifact")
+    second_artifact = next(event for event in second_events if event["event"] == "artifact")
+    assert first_artifact["sha256"] == second_artifact["sha256"]
+    assert second_artifact["metadata"]["memo"] == "hit"
+    assert Path(second_artifact["path"]).is_file()
+    done = next(
+        event
+        for event in second_events
+        if event["event"] == "node" and event["status"] == "done"
+    )
+    assert done["details"]["memo"] == "hit"
+
+
+def test_refresh_and_invalidation_recompute(tmp_path: Path) -> None:
+    calls: list[str] = []
+    _execute(tmp_path, "run-1", calls)
+    _execute(tmp_path, "run-2", calls, refresh=True)
+    assert len(calls) == 2
+
+    cache = NodeCache(tmp_path / "cache")
+    assert [entry.node for entry in cache.entries()] == ["summarise"]
+    assert cache.invalidate_node("other") == 0
+    assert cache.invalidate_node("summarise") == 1
+    _execute(tmp_path, "run-3", calls)
+    assert len(calls) == 3
+    assert cache.clear() == 1
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = NodeCache(tmp_path / "cache", max_entries=2)
+    for key in ("aa01", "bb02"):
+        cache.put(key, "node", {"value": key})
+    assert cache.get("aa01") is not None  # now the most recently used
+
+    cache.put("cc03", "node", {"value": "cc03"})
+
+    assert sorted(entry.key for entry in cache.entries()) == ["aa01", "cc03"]
+
+    sized = NodeCache(tmp_path / "sized", max_bytes=1)
+    sized.put("aa01", "node", {"value": "a"})
+    sized.put("bb02", "node", {"value": "b"})
+    # The newest entry is kept even when it alone exceeds the byte limit.
+    assert [entry.key for entry in sized.entries()] == ["bb02"]
+
+
+def test_unserialisable_outputs_are_not_cached(tmp_path: Path) -> None:
+    calls: list[int] = []
+
+    def build() -> object:
+        calls.append(1)
+        return object()
+
+    graph = ExecutionGraph([GraphNode("build", build, outputs=("thing",), memo=MemoPolicy())])
+    for _ in range(2):
+        asyncio.run(GraphExecutor(graph, cache=NodeCache(tmp_path / "cache")).execute())
+
+    assert len(calls) == 2
+    assert list(NodeCache(tmp_path / "cache").entries()) == []
+
+
+class _CountingClient(_DummyDiscoveryClient):
+    calls = 0
+
+    def generate_summary(self, **kwargs) -> SummaryResponse:
+        type(self).calls += 1
+        return super().generate_summary(**kwargs)
+
+
+def _prepare_config(tmp_path: Path) -> Path:
+    config_dir = tmp_path / "config"
+    state_dir = tmp_path / "state"
+    (config_dir / "workflows").mkdir(parents=True)
+    state_dir.mkdir()
+    template = state_dir / "workflow_template.json"
+    shutil.copy(Path("arcindex/state/workflow_template.json"), template)
+
+    runtime_data = yaml.safe_load(Path("arcindex/config/runtime.yaml").read_text())
+    runtime_data["state"]["persistence"] = str(state_dir)
+    runtime_data["state"]["workflow_template"] = str(template)
+    runtime_data["runs"] = {
+        "root": str(tmp_path / "runs"),
+        "node_cache": str(tmp_path / "node-cache"),
+    }
+    runtime_data["docs"]["root"] = str(tmp_path / "docs")
+    runtime_path = config_dir / "runtime.yaml"
+    runtime_path.write_text(yaml.safe_dump(runtime_data, sort_keys=False), encoding="utf-8")
+    return runtime_path
+
+
+def _discover(runtime_path: Path) -> str:
+    controller = OrchestratorController.from_config_path(runtime_path)
+    runner = ArcindexRunner(controller)
+    state, timestamp = controller.initialise_discovery("greenfield-discovery", "Arcindex")
+    context = runner.create_run(emit_phase_start=False)
+    controller.bind_run_directory(context.artifact_store.run_directory, state)
+    summary = asyncio.run(runner.discovery_summary(context, ANSWERS, "Arcindex"))
+    result = asyncio.run(runner.complete_discovery(context, state, ANSWERS, timestamp, "Arcindex"))
+    assert result.summary_markdown == summary
+    return summary
+
+
+def test_discovery_summary_is_memoised_across_runs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(DiscoveryAgent, "default_client_factory", staticmethod(_CountingClient))
+    monkeypatch.setattr(_CountingClient, "calls", 0)
+    runtime_path = _prepare_config(tmp_path)
+
+    first = _discover(runtime_path)
+    second = _discover(runtime_path)
+
+    assert first == second
+    assert _CountingClient.calls == 1
+
+    result = CliRunner().invoke(
+        arcindex,
+        ["cache", "clear", "--node", "generate_summary", "--config", str(runtime_path)],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Removed 1" in result.output
+
+    _discover(runtime_path)
+    assert _CountingClient.calls == 2
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import shutil
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import pytest
+import yaml  # type: ignore[import-untyped]
+from click.testing import CliRunner
+
+from arcindex.cli import arcindex
+from arcindex.events import ArtifactEvent
+from arcindex.orchestrator import OrchestratorController
+from arcindex.runner import (
+    ArcindexRunner,
+    NodeExecutionError,
+    PlanStep,
+    RunContext,
+    load_run_progress,
+    read_events,
+)
+from arcindex.tools import current_timestamp
+from bridge.adapter import RunJobManager
+
+REVIEW_WORKFLOW = {
+    "id": "review",
+    "phases": [
+        {"phase": "brief", "agent": "analyst", "creates": "brief.md"},
+        {"phase": "prd", "agent": "pm", "creates": "prd.md", "requires": ["brief.md"]},
+        {
+            "phase": "architecture",
+            "agent": "architect",
+            "creates": "architecture.md",
+            "requires": ["brief.md"],
+        },
+        {"phase": "prp", "agent": "prp-creator", "requires": ["prd.md", "architecture.md"]},
+    ],
+}
+
+ANSWERS = {
+    "project_name": "Arcindex",
+    "project_concept": "Concept",
+    "target_users": "Engineers",
+    "success_criteria": "Adoption",
+}
+
+
+def _prepare_config(tmp_path: Path) -> Path:
+    config_dir = tmp_path / "config"
+    workflows_dir = config_dir / "workflows"
+    state_dir = tmp_path / "state"
+    workflows_dir.mkdir(parents=True)
+    state_dir.mkdir()
+    template = state_dir / "workflow_template.json"
+    shutil.copy(Path("arcindex/state/workflow_template.json"), template)
+    (workflows_dir / "review.yaml").write_text(yaml.safe_dump(REVIEW_WORKFLOW), encoding="utf-8")
+
+    runtime_data = yaml.safe_load(Path("arcindex/config/runtime.yaml").read_text())
+    runtime_data["workflows"] = {"directory": "./workflows"}
+    runtime_data["state"]["persistence"] = str(state_dir)
+    runtime_data["state"]["workflow_template"] = str(template)
+    runtime_data["state"].pop("legacy_template", None)
+    runtime_data["runs"]["root"] = str(tmp_path / "runs")
+    runtime_data["docs"]["root"] = str(tmp_path / "docs")
+    runtime_path = config_dir / "runtime.yaml"
+    runtime_path.write_text(yaml.safe_dump(runtime_data, sort_keys=False), encoding="utf-8")
+    return runtime_path
+
+
+def _handler(context: RunContext, calls: list[str], fail: str = ""):
+    def handle(step: PlanStep, results: Mapping[str, Any]) -> str:
+        calls.append(step.id)
+        if step.id == fail:
+            raise RuntimeError(f"{step.id} crashed")
+        record = context.artifact_store.write_text(
+            step.id, f"# {step.id}\n", phase=step.id, agent=step.agent
+        )
+        event = ArtifactEvent(
+            run_id=context.run_id, ts=current_timestamp(), **record.to_event_payload()
+        )
+        context.emitter.emit(event)
+        return step.id
+
+    return handle
+
+
+def _start(runtime_path: Path, calls: list[str], fail: str) -> str:
+    controller = OrchestratorController.from_config_path(runtime_path)
+    runner = ArcindexRunner(controller, max_concurrency=1)
+    state, _ = controller.initialise_discovery("review", "Arcindex")
+    context = runner.create_run(emit_phase_start=False)
+    controller.bind_run_directory(context.artifact_store.run_directory, state)
+    with pytest.raises(NodeExecutionError):
+        asyncio.run(
+            runner.run_plan(
+                context, controller.workflow_plan("review"), _handler(context, calls, fail)
+            )
+        )
+    return context.run_id
+
+
+def _resume(runtime_path: Path, run_id: str, calls: list[str]):
+    controller = OrchestratorController.from_config_path(runtime_path)
+    runner = ArcindexRunner(controller)
+    context, progress = runner.resume_run(run_id)
+    run = asyncio.run(
+        runner.run_plan(
+            context, controller.workflow_plan(), _handler(context, calls), progress=progress
+        )
+    )
+    return context, run
+
+
+def _crash_discovery(runtime_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
+    controller = OrchestratorController.from_config_path(runtime_path)
+    runner = ArcindexRunner(controller)
+
+    def crash(state, timestamp):
+        raise RuntimeError("crashed while finalising")
+
+    state, timestamp = controller.initialise_discovery("review", "Arcindex")
+    context = runner.create_run(emit_phase_start=False)
+    controller.bind_run_directory(context.artifact_store.run_directory, state)
+    with monkeypatch.context() as patch:
+        patch.setattr(controller, "finalise_discovery", crash)
+        with pytest.raises(NodeExecutionError):
+            asyncio.run(runner.complete_discovery(context, state, ANSWERS, timestamp, "Arcindex"))
+    return context.run_id
+
+
+def test_resume_finishes_an_interrupted_discovery(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runtime_path = _prepare_config(tmp_path)
+    run_id = _crash_discovery(runtime_path, monkeypatch)
+    progress = load_run_progress(tmp_path / "runs" / run_id)
+    assert progress.completed_nodes == ["persist_summary"]
+    assert progress.status == "error"
+
+    controller = OrchestratorController.from_config_path(runtime_path)
+    persisted: list[object] = []
+    monkeypatch.setattr(controller, "persist_summary", lambda *args, **kwargs: persisted.append(1))
+    runner = ArcindexRunner(controller)
+    context, progress = runner.resume_run(run_id)
+    result = asyncio.run(runner.resume_discovery(context, progress))
+
+    # The summary came back from disk, not from a second persist_summary.
+    assert persisted == []
+    assert result.status == "ok"
+    assert result.summary_markdown.startswith("# Discovery Summary for Arcindex")
+    assert result.summary_artifact is not None and result.summary_artifact.path.exists()
+    events = read_events(context.events_path)
+    assert [event["seq"] for event in events] == list(range(len(events)))
+    skipped = [event["node"] for event in events if event.get("status") == "skipped"]
+    assert skipped == ["persist_summary"]
+    progress = load_run_progress(tmp_path / "runs" / run_id)
+    assert progress.finished
+    assert progress.state is not None and "discovery" in progress.state["completed_phases"]
+
+
+def test_bridge_resumes_an_interrupted_discovery(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runtime_path = _prepare_config(tmp_path)
+    run_id = _crash_discovery(runtime_path, monkeypatch)
+
+    async def main():
+        manager = RunJobManager(runtime_path)
+        job, status = await manager.resume_job(run_id)
+        assert status == "started" and job is not None
+        assert job.task is not None
+        result = await job.task
+        events = []
+        while not job.queue.empty():
+            events.append(job.queue.get_nowait())
+        again = await manager.resume_job(run_id)
+        missing = await manager.resume_job("missing")
+        return result, events, again, missing
+
+    result, events, again, missing = asyncio.run(main())
+
+    assert result.status == "ok"
+    assert events[-1]["event"] == "end" and events[-1]["status"] == "ok"
+    assert again == (None, "completed")
+    assert missing == (None, "not_found")
+
+
+def test_resume_skips_completed_steps(tmp_path: Path) -> None:
+    runtime_path = _prepare_config(tmp_path)
+    first: list[str] = []
+    run_id = _start(runtime_path, first, fail="architecture")
+    assert first == ["brief", "prd", "architecture"]
+
+    progress = load_run_progress(tmp_path / "runs" / run_id)
+    assert progress.completed_nodes == ["brief", "prd"]
+    assert progress.workflow_id == "review"
+    assert [record.phase for record in progress.artifacts] == ["brief", "prd"]
+
+    resumed: list[str] = []
+    context, run = _resume(runtime_path, run_id, resumed)
+
+    assert resumed == ["architecture", "prp"]
+    assert [record.phase for record in run.values["prd"]] == ["prd"]
+    events = read_events(context.events_path)
+    assert [event["seq"] for event in events] == list(range(len(events)))
+    skipped = [event["node"] for event in events if event.get("status") == "skipped"]
+    assert skipped == ["brief", "prd"]
+
+
+def test_resume_reruns_phases_with_modified_artifacts(tmp_path: Path) -> None:
+    runtime_path = _prepare_config(tmp_path)
+    run_id = _start(runtime_path, [], fail="prp")
+    progress = load_run_progress(tmp_path / "runs" / run_id)
+    brief = progress.artifacts_for("brief")[0].path
+    brief.write_text("tampered", encoding="utf-8")
+
+    progress = load_run_progress(tmp_path / "runs" / run_id)
+    assert [record.phase for record in progress.invalid_artifacts] == ["brief"]
+    assert "brief" not in progress.completed_nodes
+
+    resumed: list[str] = []
+    _resume(runtime_path, run_id, resumed)
+    # Everything downstream of the damaged brief is rebuilt too.
+    assert resumed == ["brief", "prd", "architecture", "prp"]
+
+
+def test_cli_continue_reports_remaining_work(tmp_path: Path) -> None:
+    runtime_path = _prepare_config(tmp_path)
+    run_id = _start(runtime_path, [], fail="architecture")
+
+    result = CliRunner().invoke(arcindex, ["continue", "--config", str(runtime_path)])
+
+    assert result.exit_code != 0
+    assert run_id in result.output
+    assert "Verified artifacts: 2" in result.output
+    assert "Remaining steps: architecture, prp" in result.output
+    # The plan run never reached discovery, so there are no answers to resume it with.
+    assert "did not record its discovery answers" in result.output
+
+
+def test_cli_continue_finishes_an_interrupted_discovery(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    runtime_path = _prepare_config(tmp_path)
+    run_id = _crash_discovery(runtime_path, monkeypatch)
+
+    result = CliRunner().invoke(arcindex, ["continue", run_id, "--config", str(runtime_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "Completed phases: none" in result.output
+    assert "Discovery completed" in result.output
+    assert load_run_progress(tmp_path / "runs" / run_id).finished
+
+    result = CliRunner().invoke(arcindex, ["continue", run_id, "--config", str(runtime_path)])
+    assert result.exit_code == 0, result.output
+    assert "Run already completed" in result.output
+
+
+def test_cli_continue_unknown_run(tmp_path: Path) -> None:
+    runtime_path = _prepare_config(tmp_path)
+
+    result = CliRunner().invoke(arcindex, ["continue", "missing", "--config", str(runtime_path)])
+
+    assert result.exit_code != 0
+    assert "No event log" in result.output
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from arcindex.agents.sdk import OpenAIDiscoveryClient
+from arcindex.events import EventEmitter
+from arcindex.orchestrator import OrchestratorController
+from arcindex.runner import (
+    NO_RETRY,
+    ArcindexRunner,
+    ExecutionGraph,
+    GraphExecutor,
+    GraphNode,
+    NodeExecutionError,
+    RetryBudget,
+    RetryPolicy,
+)
+from arcindex.tests.test_runner_memo import ANSWERS, _prepare_config
+from arcindex.tools import CircuitBreaker, CircuitOpenError, is_transient
+from arcindex.tools.retry import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+
+FAST = RetryPolicy(max_attempts=3, base_delay_s=0)
+
+
+class RateLimitError(Exception):
+    """Named like the provider SDK's throttling error."""
+
+
+def _flaky(failures: list[BaseException], calls: list[str]):
+    def call(prompt: str) -> str:
+        calls.append(prompt)
+        if failures:
+            raise failures.pop(0)
+        return prompt.upper()
+
+    return call
+
+
+def _execute(graph: ExecutionGraph, emitter: EventEmitter, **kwargs) -> dict[str, Any]:
+    executor = GraphExecutor(graph, emitter=emitter, **kwargs)
+    return asyncio.run(executor.execute({"prompt": "hi"})).values
+
+
+def test_transient_failures_are_retried_and_each_attempt_recorded(tmp_path: Path) -> None:
+    calls: list[str] = []
+    failures: list[BaseException] = [TimeoutError("slow"), RateLimitError("429")]
+    node = GraphNode("call", _flaky(failures, calls), inputs=("prompt",), outputs=("reply",))
+    graph = ExecutionGraph([node])
+    emitter = EventEmitter("run-1", tmp_path)
+    events: list[dict[str, Any]] = []
+    emitter.subscribe(events.append)
+
+    values = _execute(graph, emitter, retry=FAST)
+
+    assert values["reply"] == "HI"
+    assert len(calls) == 3
+    statuses = [(event["status"], (event.get("details") or {}).get("attempt")) for event in events]
+    assert statuses == [("start", None), ("retry", 1), ("retry", 2), ("done", None)]
+    assert events[2]["details"]["error_type"] == "RateLimitError"
+    assert events[-1]["details"] == {"attempts": 3}
+
+
+def test_permanent_errors_no_retry_nodes_and_exhausted_budgets_fail_fast(tmp_path: Path) -> None:
+    emitter = EventEmitter("run-1", tmp_path)
+
+    calls: list[str] = []
+    graph = ExecutionGraph([GraphNode("call", _flaky([ValueError()], calls), inputs=("prompt",))])
+    with pytest.raises(NodeExecutionError) as excinfo:
+        _execute(graph, emitter, retry=FAST)
+    assert len(calls) == 1 and excinfo.value.attempts == 1
+
+    calls = []
+    node = GraphNode("call", _flaky([ConnectionError()], calls), inputs=("prompt",), retry=NO_RETRY)
+    with pytest.raises(NodeExecutionError):
+        _execute(ExecutionGraph([node]), emitter, retry=FAST)
+    assert len(calls) == 1
+
+    calls = []
+    graph = ExecutionGraph(
+        [GraphNode("call", _flaky([ConnectionError()] * 5, calls), inputs=("prompt",))]
+    )
+    patient = RetryPolicy(max_attempts=5, base_delay_s=0)
+    with pytest.raises(NodeExecutionError) as excinfo:
+        _execute(graph, emitter, retry=patient, retry_budget=RetryBudget(ratio=0, minimum=1))
+    assert len(calls) == 2 and excinfo.value.attempts == 2
+
+
+def test_backoff_frees_the_concurrency_slot(tmp_path: Path) -> None:
+    order: list[str] = []
+    failures: list[BaseException] = [ConnectionError("reset")]
+
+    def flaky(prompt: str) -> str:
+        order.append("flaky")
+        if failures:
+            raise failures.pop(0)
+        return prompt
+
+    def other(prompt: str) -> str:
+        order.append("other")
+        return prompt
+
+    graph = ExecutionGraph(
+        [
+            GraphNode("flaky", flaky, inputs=("prompt",), outputs=("a",)),
+            GraphNode("other", other, inputs=("prompt",), outputs=("b",)),
+        ]
+    )
+    slow = RetryPolicy(max_attempts=2, base_delay_s=0.2, jitter=0)
+    _execute(graph, EventEmitter("run-1", tmp_path), retry=slow, max_concurrency=1)
+
+    # With one slot, "other" only runs first if the retry did not hold it while waiting.
+    assert order == ["flaky", "other", "flaky"]
+
+
+def test_policy_backoff_and_per_error_overrides() -> None:
+    throttled = RetryPolicy(max_attempts=6, base_delay_s=2.0)
+    policy = RetryPolicy(base_delay_s=0.5, max_delay_s=4.0, by_error={"RateLimitError": throttled})
+    rng = random.Random(7)
+
+    assert policy.for_error(RateLimitError()) is throttled
+    assert policy.for_error(TimeoutError()) is policy
+    delays = [policy.delay_s(attempt, rng) for attempt in range(1, 6)]
+    assert all(0 <= delay <= cap for delay, cap in zip(delays, [0.5, 1.0, 2.0, 4.0, 4.0]))
+    assert RetryPolicy(jitter=0).delay_s(3) == 2.0
+
+    assert policy.should_retry(ConnectionError(), 1)
+    assert not policy.should_retry(ConnectionError(), 3)
+    assert not policy.should_retry(KeyError("x"), 1)
+    assert RetryPolicy(retry_on=("KeyError",)).should_retry(KeyError("x"), 1)
+    error = RuntimeError("server")
+    error.status_code = 503  # type: ignore[attr-defined]
+    assert is_transient(error)
+
+
+def test_idempotency_check_skips_work_already_done(tmp_path: Path) -> None:
+    written: list[str] = []
+    calls: list[str] = []
+
+    def write_then_fail(prompt: str) -> str:
+        calls.append(prompt)
+        written.append(prompt)
+        raise ConnectionError("connection reset after the write")
+
+    node = GraphNode(
+        "write",
+        write_then_fail,
+        inputs=("prompt",),
+        outputs=("path",),
+        idempotency=lambda prompt: f"{prompt}.md" if prompt in written else None,
+    )
+    emitter = EventEmitter("run-1", tmp_path)
+    events: list[dict[str, Any]] = []
+    emitter.subscribe(events.append)
+
+    assert _execute(ExecutionGraph([node]), emitter, retry=FAST)["path"] == "hi.md"
+    assert len(calls) == 1
+    assert [event["status"] for event in events] == ["start", "retry", "skipped"]
+    assert events[-1]["details"] == {"idempotent": True, "attempts": 1}
+
+    # A rerun skips the node without starting it.
+    events.clear()
+    assert _execute(ExecutionGraph([node]), emitter, retry=FAST)["path"] == "hi.md"
+    assert len(calls) == 1 and [event["status"] for event in events] == ["skipped"]
+
+
+def test_circuit_breaker_opens_probes_and_closes() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker("llm", failure_threshold=2, reset_timeout_s=10, clock=lambda: now[0])
+
+    breaker.record_failure(ValueError("client bug"))  # not transient; ignored
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == CIRCUIT_CLOSED
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == CIRCUIT_OPEN
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after_s == pytest.approx(10)
+
+    now[0] = 10.0
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    breaker.before_call()  # the probe
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # everyone else waits for it
+    breaker.record_failure(TimeoutError())
+    assert breaker.state == CIRCUIT_OPEN
+
+    now[0] = 20.0
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+
+
+def test_openai_client_calls_pass_through_its_circuit_breaker() -> None:
+    class _Responses:
+        def create(self, **kwargs):
+            raise ConnectionError("provider down")
+
+    class _Client:
+        responses = _Responses()
+
+    breaker = CircuitBreaker("openai-test", failure_threshold=1, reset_timeout_s=60)
+    client = OpenAIDiscoveryClient(
+        client_factory=_Client,  # type: ignore[arg-type]
+        circuit_breaker=breaker,
+    )
+
+    for expected in (ConnectionError, CircuitOpenError):
+        with pytest.raises(expected):
+            client.generate_summary(
+                answers=ANSWERS, project_name="Arcindex", workflow_type="greenfield-discovery"
+            )
+
+
+def _discovery_run(tmp_path: Path, persist):
+    controller = OrchestratorController.from_config_path(_prepare_config(tmp_path))
+    runner = ArcindexRunner(controller, retry=FAST)
+    state, timestamp = controller.initialise_discovery("greenfield-discovery", "Arcindex")
+    events: list[dict[str, Any]] = []
+    context = runner.create_run([events.append], emit_phase_start=False)
+    controller.bind_run_directory(context.artifact_store.run_directory, state)
+    real_persist = controller.persist_summary
+    controller.persist_summary = lambda **kwargs: persist(real_persist, **kwargs)  # type: ignore
+    asyncio.run(runner.discovery_summary(context, ANSWERS, "Arcindex"))
+    try:
+        result = asyncio.run(
+            runner.complete_discovery(context, state, ANSWERS, timestamp, "Arcindex")
+        )
+    except NodeExecutionError:
+        result = None
+    return result, events
+
+
+def test_discovery_retry_skips_summary_persisted_before_a_failure(tmp_path: Path) -> None:
+    attempts: list[int] = []
+
+    def persist(real, **kwargs):
+        attempts.append(1)
+        real(**kwargs)
+        raise ConnectionError("dropped after writing")
+
+    result, events = _discovery_run(tmp_path, persist)
+
+    assert result is not None and result.status == "ok"
+    assert len(attempts) == 1
+    assert "Arcindex" in result.summary_markdown
+    node_events = [(event["node"], event["status"]) for event in events if event["event"] == "node"]
+    assert ("persist_summary", "retry") in node_events
+    assert ("persist_summary", "skipped") in node_events
+    assert events[-1]["event"] == "end" and events[-1]["status"] == "ok"
+
+
+def test_exhausted_transient_failure_is_reported_as_retryable(tmp_path: Path) -> None:
+    def persist(real, **kwargs):
+        raise ConnectionError("provider unavailable")
+
+    result, events = _discovery_run(tmp_path, persist)
+
+    assert result is None
+    error = next(event for event in events if event["event"] == "error")
+    assert error["retryable"] is True
+    assert error["details"] == {"node": "persist_summary", "attempts": 3}
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+
+from arcindex.agents.sdk import SummaryResponse
+from arcindex.agents.singleflight import SingleFlight, SingleFlightDiscoveryClient
+from arcindex.tests.conftest import _DummyDiscoveryClient
+from arcindex.tests.test_runner_memo import ANSWERS
+from arcindex.tools import CancellationError, CancellationToken, use_token
+
+SUMMARY_KWARGS: dict[str, Any] = {
+    "answers": ANSWERS,
+    "project_name": "Arcindex",
+    "workflow_type": "greenfield-discovery",
+}
+
+
+class _GatedClient(_DummyDiscoveryClient):
+    """Calls block until released, so identical calls overlap."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.release = threading.Event()
+        self.error: Exception | None = None
+
+    def generate_summary(self, **kwargs) -> SummaryResponse:
+        self.calls.append(kwargs["project_name"])
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return super().generate_summary(**kwargs)
+
+    async def agenerate_summary(self, **kwargs) -> SummaryResponse:
+        self.calls.append(kwargs["project_name"])
+        while not self.release.is_set():
+            await asyncio.sleep(0.01)
+        return super().generate_summary(**kwargs)
+
+
+async def _until(predicate) -> None:
+    while not predicate():
+        await asyncio.sleep(0.01)
+
+
+def test_identical_concurrent_requests_share_one_call() -> None:
+    inner = _GatedClient()
+    client = SingleFlightDiscoveryClient(inner, SingleFlight())
+
+    async def main():
+        same = [client.agenerate_summary(**SUMMARY_KWARGS) for _ in range(5)]
+        other = client.agenerate_summary(**{**SUMMARY_KWARGS, "project_name": "Other"})
+        calls = asyncio.gather(*same, other)
+        await _until(lambda: len(inner.calls) == 2 and client.flights.stats().collapsed == 4)
+        inner.release.set()
+        return await calls
+
+    responses = asyncio.run(main())
+
+    assert sorted(inner.calls) == ["Arcindex", "Other"]
+    assert len({id(response) for response in responses[:5]}) == 1
+    assert responses[5].markdown != responses[0].markdown
+    stats = client.flights.stats()
+    assert (stats.leaders, stats.collapsed, stats.in_flight) == (2, 4, 0)
+    # Once the flight has landed, the next identical call is sent again.
+    asyncio.run(client.agenerate_summary(**SUMMARY_KWARGS))
+    assert len(inner.calls) == 3
+
+
+def test_leader_failure_reaches_followers_but_cancellation_does_not() -> None:
+    inner = _GatedClient()
+    client = SingleFlightDiscoveryClient(inner, SingleFlight())
+    inner.error = RuntimeError("provider failed")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(client.generate_summary, **SUMMARY_KWARGS) for _ in range(3)]
+        while client.flights.stats().collapsed < 2:
+            time.sleep(0.01)
+        inner.release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError, match="provider failed"):
+                future.result()
+    assert len(inner.calls) == 1 and client.flights.stats().failed == 1
+
+    inner = _GatedClient()
+    client = SingleFlightDiscoveryClient(inner, SingleFlight())
+
+    async def main():
+        leader = asyncio.ensure_future(client.agenerate_summary(**SUMMARY_KWARGS))
+        await _until(lambda: inner.calls)
+        follower = asyncio.ensure_future(client.agenerate_summary(**SUMMARY_KWARGS))
+        await _until(lambda: client.flights.stats().collapsed == 1)
+        leader.cancel()  # as cancelling the run's token does
+        await _until(lambda: len(inner.calls) == 2)  # the follower took over
+        inner.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()).markdown.startswith("# Discovery Summary for Arcindex")
+    stats = client.flights.stats()
+    assert (stats.leaders, stats.abandoned, stats.failed) == (2, 1, 0)
+
+
+def test_a_cancelled_follower_leaves_the_flight_running() -> None:
+    inner = _GatedClient()
+    client = SingleFlightDiscoveryClient(inner, SingleFlight())
+    token = CancellationToken()
+
+    async def main():
+        leader = asyncio.ensure_future(client.agenerate_summary(**SUMMARY_KWARGS))
+        await _until(lambda: inner.calls)
+        with use_token(token):
+            follower = asyncio.ensure_future(client.agenerate_summary(**SUMMARY_KWARGS))
+        await _until(lambda: client.flights.stats().collapsed == 1)
+        token.cancel()
+        with pytest.raises(CancellationError):
+            await follower
+        inner.release.set()
+        return await leader
+
+    assert asyncio.run(main()).markdown.startswith("# Discovery Summary")
+    assert len(inner.calls) == 1
+
+
+def test_a_blocking_call_on_the_leaders_loop_sends_its_own_request() -> None:
+    flights = SingleFlight()
+
+    async def main() -> tuple[str, str]:
+        release = asyncio.Event()
+
+        async def lead() -> str:
+            await release.wait()
+            return "leader"
+
+        leader = asyncio.ensure_future(flights.ado("key", lead))
+        await asyncio.sleep(0)
+        # Following would block this loop, so the leader could never finish.
+        own = flights.do("key", lambda: "own")
+        release.set()
+        return own, await leader
+
+    assert asyncio.run(main()) == ("own", "leader")
+    stats = flights.stats()
+    assert (stats.leaders, stats.collapsed, stats.in_flight) == (1, 0, 0)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from arcindex.state import (
+    DURABILITY_LEVELS,
+    STATE_FILENAME,
+    WorkflowStateStore,
+    atomic_write_bytes,
+)
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "state" / "workflow_template.json"
+
+
+@pytest.mark.parametrize("durability", DURABILITY_LEVELS)
+def test_atomic_write_replaces_contents_without_leftovers(tmp_path: Path, durability: str) -> None:
+    target = tmp_path / "nested" / "doc.json"
+    atomic_write_bytes(target, b'{"v": 1}', durability=durability)
+    atomic_write_bytes(target, b'{"v": 2}', durability=durability)
+
+    assert json.loads(target.read_text()) == {"v": 2}
+    assert [path.name for path in target.parent.iterdir()] == ["doc.json"]
+
+
+def test_atomic_write_failure_keeps_previous_version(tmp_path: Path, monkeypatch) -> None:
+    target = tmp_path / "doc.json"
+    target.write_text("original")
+
+    def _boom(*_args, **_kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("arcindex.state.atomic.os.replace", _boom)
+    with pytest.raises(OSError):
+        atomic_write_bytes(target, b"replacement")
+
+    assert target.read_text() == "original"
+    assert [path.name for path in tmp_path.iterdir()] == ["doc.json"]
+
+
+def test_atomic_write_rejects_unknown_durability(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        atomic_write_bytes(tmp_path / "doc.json", b"{}", durability="sometimes")
+
+
+def test_concurrent_reader_never_sees_partial_state(tmp_path: Path) -> None:
+    store = WorkflowStateStore(tmp_path, TEMPLATE_PATH, durability="none")
+    state = json.loads(TEMPLATE_PATH.read_text())
+    state["elicitation_history"] = [{"note": "x" * 512} for _ in range(200)]
+    store.save(state)
+
+    stop = threading.Event()
+    errors: list = []
+
+    def _reader() -> None:
+        while not stop.is_set():
+            try:
+                json.loads((tmp_path / STATE_FILENAME).read_text())
+            except ValueError as exc:  # pragma: no cover - failure path
+                errors.append(exc)
+
+    reader = threading.Thread(target=_reader)
+    reader.start()
+    try:
+        for index in range(50):
+            state["last_updated"] = str(index)
+            store.save(state)
+    finally:
+        stop.set()
+        reader.join()
+
+    assert errors == []
+    assert store.load()["last_updated"] == "49"
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from arcindex.state import STATE_FILENAME, CheckpointNotFound, CheckpointStore
+from arcindex.state.checkpoints import apply_ops, diff_states
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "state" / "workflow_template.json"
+
+
+def _state() -> dict:
+    state = json.loads(TEMPLATE_PATH.read_text())
+    state["workflow_id"] = "arcindex-test"
+    return state
+
+
+def test_diff_and_apply_round_trip() -> None:
+    old = {"a": {"b": 1, "c": [1, 2]}, "gone": True}
+    new = {"a": {"b": 2, "c": [1, 2, 3]}, "added": "x"}
+
+    ops = diff_states(old, new)
+
+    assert {"op": "extend", "path": ["a", "c"], "values": [3]} in ops
+    assert apply_ops(old, ops) == new
+    assert old == {"a": {"b": 1, "c": [1, 2]}, "gone": True}
+
+
+def test_capture_load_and_diff_survive_reload(tmp_path: Path) -> None:
+    store = CheckpointStore(tmp_path, keyframe_interval=2)
+    state = _state()
+    first = store.capture(state, label="start")
+    state["elicitation_history"].append({"method_selected": "2. Critique and Refine"})
+    store.capture(state, label="elicitation:2")
+    state["current_phase"] = "analyst"
+    third = store.capture(state, label="discovery->analyst")
+
+    reloaded = CheckpointStore(tmp_path)
+    assert [cp.label for cp in reloaded.list()] == ["start", "elicitation:2", "discovery->analyst"]
+    assert [cp.keyframe for cp in reloaded.list()] == [True, False, True]
+
+    as_of_first = reloaded.load(first.checkpoint_id)
+    assert as_of_first["elicitation_history"] == []
+    assert [entry["label"] for entry in as_of_first["context_checkpoints"]] == ["start"]
+    assert reloaded.load(1)["elicitation_history"][0]["method_selected"].startswith("2.")
+    assert reloaded.load(third.seq) == state
+
+    ops = reloaded.diff(first.checkpoint_id, third.checkpoint_id)
+    paths = {tuple(op["path"]) for op in ops}
+    assert ("current_phase",) in paths
+    assert ("elicitation_history",) in paths
+
+    with pytest.raises(CheckpointNotFound):
+        reloaded.load("missing")
+
+
+def test_snapshots_share_unchanged_sections(tmp_path: Path) -> None:
+    store = CheckpointStore(tmp_path)
+    state = _state()
+    store.capture(state, label="one")
+    state["status"] = "active"
+    store.capture(state, label="two")
+
+    first, second = store._snapshots[0], store._snapshots[1]
+    assert first["project_discovery"] is second["project_discovery"]
+    assert first["status"] != second["status"]
+
+
+def test_fork_materialises_state_and_history(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    store = CheckpointStore(source)
+    state = _state()
+    checkpoint = store.capture(state, label="one")
+    state["current_phase"] = "analyst"
+    store.capture(state, label="two")
+
+    forked_path = store.fork(checkpoint.checkpoint_id, tmp_path / "fork")
+
+    assert forked_path == tmp_path / "fork" / STATE_FILENAME
+    forked = json.loads(forked_path.read_text())
+    assert forked["current_phase"] == "discovery"
+    assert [cp.label for cp in CheckpointStore(tmp_path / "fork").list()] == ["one"]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from arcindex.cli import arcindex
+from arcindex.state import (
+    STATE_FILENAME,
+    SUMMARY_FILENAME,
+    bulk_migrate_legacy_states,
+    discover_legacy_state_dirs,
+)
+from arcindex.state.migrate import MIGRATION_MANIFEST_FILENAME, legacy_run_id
+
+
+def _make_legacy(root: Path, count: int) -> list:
+    directories = []
+    for index in range(count):
+        directory = root / f"project-{index}" / ".codex" / "state"
+        directory.mkdir(parents=True)
+        (directory / STATE_FILENAME).write_text(json.dumps({"workflow_id": f"wf-{index}"}))
+        (directory / SUMMARY_FILENAME).write_text(f"# Project {index}\n")
+        directories.append(directory.parent.parent)
+    return directories
+
+
+def test_discover_finds_codex_state_and_skips_excluded_directories(tmp_path: Path) -> None:
+    projects = _make_legacy(tmp_path / "legacy", 2)
+    (projects[0] / ".git").mkdir()
+    (projects[0] / ".git" / STATE_FILENAME).write_text("{}")
+    runs_root = tmp_path / "legacy" / "runs"
+    (runs_root / "legacy-abc").mkdir(parents=True)
+    (runs_root / "legacy-abc" / STATE_FILENAME).write_text("{}")
+
+    found = discover_legacy_state_dirs(tmp_path / "legacy", exclude=[runs_root])
+
+    assert found == [project / ".codex" / "state" for project in projects]
+
+
+def test_bulk_migration_hardlinks_and_resumes(tmp_path: Path) -> None:
+    sources = [project / ".codex" / "state" for project in _make_legacy(tmp_path / "legacy", 5)]
+    runs_root = tmp_path / "runs"
+
+    report = bulk_migrate_legacy_states(sources, runs_root, workers=3, link_mode="hardlink")
+
+    assert (report.migrated, report.skipped, report.failed) == (5, 0, 0)
+    assert report.methods == {"hardlink": 5}
+    assert report.bytes_copied == 0
+    migrated = runs_root / legacy_run_id(sources[0]) / STATE_FILENAME
+    assert os.path.samefile(migrated, sources[0] / STATE_FILENAME)
+    assert (migrated.parent / SUMMARY_FILENAME).read_text() == "# Project 0\n"
+    assert len((runs_root / MIGRATION_MANIFEST_FILENAME).read_text().splitlines()) == 5
+
+    rerun = bulk_migrate_legacy_states(sources, runs_root, link_mode="copy")
+
+    assert (rerun.migrated, rerun.skipped) == (0, 5)
+
+
+def test_bulk_migration_records_failures_without_stopping(tmp_path: Path) -> None:
+    sources = [project / ".codex" / "state" for project in _make_legacy(tmp_path / "legacy", 2)]
+    missing = tmp_path / "legacy" / "missing"
+    missing.mkdir()
+    runs_root = tmp_path / "runs"
+
+    report = bulk_migrate_legacy_states(sources + [missing], runs_root, link_mode="copy")
+
+    assert (report.migrated, report.failed) == (2, 1)
+    assert report.bytes_copied > 0
+    failure = next(outcome for outcome in report.outcomes if outcome.status == "failed")
+    assert failure.source == missing
+
+    retry = bulk_migrate_legacy_states(sources + [missing], runs_root, link_mode="copy")
+    assert (retry.skipped, retry.failed) == (2, 1)
+
+
+def test_cli_migrate_legacy(tmp_path: Path) -> None:
+    _make_legacy(tmp_path / "legacy", 3)
+    runs_root = tmp_path / "runs"
+
+    result = CliRunner().invoke(
+        arcindex,
+        [
+            "migrate-legacy",
+            str(tmp_path / "legacy"),
+            "--runs-root",
+            str(runs_root),
+            "--workers",
+            "2",
+        ],
+        catch_exceptions=False,
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Found 3 legacy state directories" in result.output
+    assert "Migrated 3, skipped 0, failed 0" in result.output
+    assert len([path for path in runs_root.iterdir() if path.is_dir()]) == 3
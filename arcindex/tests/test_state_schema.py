@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from arcindex.state import (
+    LazyWorkflowState,
+    WorkflowStateStore,
+    WorkflowStateValidationError,
+    load_workflow_schema,
+)
+from arcindex.state.schema import WorkflowStateSchema
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "state" / "workflow_template.json"
+LEGACY_TEMPLATE_PATH = (
+    Path(__file__).resolve().parents[2] / "legacy" / ".codex" / "state" / "workflow.json.template"
+)
+
+
+def _state() -> dict:
+    state = json.loads(TEMPLATE_PATH.read_text())
+    state["workflow_id"] = "arcindex-test"
+    return state
+
+
+def test_schema_accepts_both_templates() -> None:
+    schema = load_workflow_schema(TEMPLATE_PATH, LEGACY_TEMPLATE_PATH)
+
+    assert schema.errors(_state()) == []
+    if LEGACY_TEMPLATE_PATH.exists():
+        assert schema.errors(json.loads(LEGACY_TEMPLATE_PATH.read_text())) == []
+    assert load_workflow_schema(TEMPLATE_PATH, LEGACY_TEMPLATE_PATH) is schema
+
+
+def test_schema_reports_field_errors() -> None:
+    schema = WorkflowStateSchema.from_templates(
+        [
+            {"status": "inactive", "flags": {"done": False}, "history": []},
+            {
+                "status": "{active|paused}",
+                "flags": {"done": False},
+                "history": [{"phase": "{phase}"}],
+            },
+        ]
+    )
+    state = {"flags": {"done": "yes"}, "history": [{"phase": None}, {"phase": 3}]}
+
+    assert schema.errors(state) == [
+        "status: missing",
+        "flags.done: expected boolean, got string",
+        "history[1].phase: expected string, got number",
+    ]
+    # Sections outside the changed set are assumed valid.
+    assert schema.errors(state, sections=["history"]) == [
+        "status: missing",
+        "history[1].phase: expected string, got number",
+    ]
+
+
+@pytest.mark.parametrize("layout", ["single", "sectioned"])
+def test_store_rejects_invalid_state_without_writing(tmp_path: Path, layout: str) -> None:
+    schema = load_workflow_schema(TEMPLATE_PATH)
+    store = WorkflowStateStore(tmp_path, TEMPLATE_PATH, layout=layout, schema=schema)
+    state = _state()
+    store.save(state)
+
+    state["elicitation_completed"]["discovery"] = "done"
+    with pytest.raises(WorkflowStateValidationError) as excinfo:
+        store.save(state)
+
+    assert excinfo.value.errors == ["elicitation_completed.discovery: expected boolean, got string"]
+    assert store.load()["elicitation_completed"]["discovery"] is False
+
+
+def test_single_layout_output_unchanged_and_only_changes_validated(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    schema = load_workflow_schema(TEMPLATE_PATH)
+    store = WorkflowStateStore(tmp_path, TEMPLATE_PATH, schema=schema)
+    state = _state()
+    store.save(state)
+    assert store.path.read_text() == json.dumps(state, indent=2, sort_keys=True)
+
+    checked = []
+    original = schema.errors
+
+    def recording_errors(current, sections=None):
+        checked.append(sections)
+        return original(current, sections)
+
+    monkeypatch.setattr(schema, "errors", recording_errors)
+    state["elicitation_history"].append({"phase": "discovery", "method_selected": "1. Expand"})
+    state["status"] = "active"
+    store.save(state)
+    state["elicitation_history"].append({"phase": "discovery", "method_selected": "2. Critique"})
+    store.save(state)
+    state["elicitation_history"][0]["phase"] = "analyst"
+    store.save(state)
+
+    # Appends only re-check the new tail; an in-place edit re-checks the whole section.
+    assert checked == [
+        {"elicitation_history": 0, "status": 0},
+        {"elicitation_history": 1},
+        {"elicitation_history": 0},
+    ]
+    assert store.path.read_text() == json.dumps(state, indent=2, sort_keys=True)
+
+
+@pytest.mark.parametrize("layout", ["single", "sectioned"])
+def test_incremental_validation_tracks_values_not_their_encoding(
+    tmp_path: Path, layout: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    schema = load_workflow_schema(TEMPLATE_PATH)
+    store = WorkflowStateStore(tmp_path, TEMPLATE_PATH, layout=layout, schema=schema)
+    state = _state()
+    state["elicitation_history"].append({"phase": "discovery", "method_selected": "1. Expand"})
+    store.save(state)
+
+    checked = []
+    original = schema.errors
+
+    def recording_errors(current, sections=None):
+        checked.append(dict(sections))
+        return original(current, sections)
+
+    monkeypatch.setattr(schema, "errors", recording_errors)
+    state["elicitation_history"].append({"phase": "discovery", "method_selected": "2. Critique"})
+    store.save(state)
+    state["elicitation_completed"]["discovery"] = "done"
+    with pytest.raises(WorkflowStateValidationError):
+        store.save(state)
+
+    assert checked == [{"elicitation_history": 1}, {"elicitation_completed": 0}]
+
+
+def test_lazy_state_validation_does_not_load_untouched_sections(tmp_path: Path) -> None:
+    schema = load_workflow_schema(TEMPLATE_PATH)
+    store = WorkflowStateStore(tmp_path, TEMPLATE_PATH, layout="sectioned", schema=schema)
+    store.save(_state())
+
+    lazy = store.load_lazy()
+    assert isinstance(lazy, LazyWorkflowState)
+    lazy["elicitation_history"].append({"phase": "discovery", "method_selected": "1. Expand"})
+    lazy["status"] = "active"
+    store.save(lazy)
+
+    assert lazy.loaded_sections() == {"elicitation_history"}
+    assert store.load()["status"] == "active"
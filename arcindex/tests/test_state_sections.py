@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from arcindex.state import LAYOUT_SECTIONED, STATE_FILENAME, LazyWorkflowState, WorkflowStateStore
+from arcindex.state.sections import SectionedStateFile
+
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "state" / "workflow_template.json"
+
+
+def _store(directory: Path) -> WorkflowStateStore:
+    return WorkflowStateStore(directory, TEMPLATE_PATH, layout=LAYOUT_SECTIONED)
+
+
+def test_lazy_state_loads_sections_on_demand(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    state = json.loads(TEMPLATE_PATH.read_text())
+    state["elicitation_history"] = [{"method_selected": "2. Critique and Refine"}]
+    store.save(state)
+
+    lazy = store.load_lazy()
+    assert isinstance(lazy, LazyWorkflowState)
+    assert lazy["current_phase"] == "discovery"
+    assert lazy.loaded_sections() == set()
+
+    assert lazy["project_discovery"]["discovery_completed"] is False
+    assert lazy.loaded_sections() == {"project_discovery"}
+    assert store.load() == state
+
+
+def test_saving_lazy_state_rewrites_only_changed_sections(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save(json.loads(TEMPLATE_PATH.read_text()))
+    layout = SectionedStateFile(tmp_path)
+    before = layout.read_index()["sections"]
+
+    lazy = store.load_lazy()
+    assert isinstance(lazy, LazyWorkflowState)
+    lazy["project_discovery"]["project_scope"] = "Scoped"
+    lazy["agent_context"]  # loaded but unchanged
+    lazy["current_phase"] = "analyst"
+    assert lazy.dirty_sections() == {"project_discovery"}
+    store.save(lazy)
+
+    after = layout.read_index()
+    changed = {key for key, entry in after["sections"].items() if before[key] != entry}
+    assert changed == {"project_discovery"}
+    assert after["scalars"]["current_phase"] == "analyst"
+    assert lazy.dirty_sections() == set()
+    referenced = {entry["file"] for entry in after["sections"].values()}
+    assert referenced <= {path.name for path in layout.root.iterdir()}
+
+
+def test_sectioned_store_reads_existing_single_file_state(tmp_path: Path) -> None:
+    state = json.loads(TEMPLATE_PATH.read_text())
+    (tmp_path / STATE_FILENAME).write_text(json.dumps(state))
+    store = _store(tmp_path)
+
+    assert store.exists()
+    assert store.load_lazy() == state
@@ -1,17 +1,45 @@
 """Tool registry for the Arcindex runtime."""
 
-from .elicitation import ElicitationMenu, ElicitationOption, PROCEED_LABEL
+from .cancellation import (
+    CancellationError,
+    CancellationToken,
+    DeadlineExceeded,
+    abort_on_cancel,
+    current_token,
+    use_token,
+)
+from .elicitation import PROCEED_LABEL, ElicitationMenu, ElicitationOption
 from .quality_gate import (
     QualityGateResult,
     current_timestamp,
     record_quality_gate_placeholder,
 )
+from .retry import (
+    NO_RETRY,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    RetryPolicy,
+    is_transient,
+)
 
 __all__ = [
+    "NO_RETRY",
+    "PROCEED_LABEL",
+    "CancellationError",
+    "CancellationToken",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "DeadlineExceeded",
     "ElicitationMenu",
     "ElicitationOption",
-    "PROCEED_LABEL",
     "QualityGateResult",
+    "RetryBudget",
+    "RetryPolicy",
+    "abort_on_cancel",
     "current_timestamp",
+    "current_token",
+    "is_transient",
     "record_quality_gate_placeholder",
+    "use_token",
 ]
@@ -0,0 +1,269 @@
+"""
+Cooperative cancellation and deadlines shared by the runner and agent clients.
+
+A :class:`CancellationToken` is cancelled explicitly (``cancel()``, safe from
+any thread) or implicitly once its deadline passes. Tokens form a tree: a
+child created with :meth:`CancellationToken.child` is cancelled with its
+parent and may impose a tighter deadline of its own, which is how per-node
+timeouts nest inside a per-run timeout.
+
+Work that blocks outside asyncio (an HTTP request in a worker thread, an MCP
+tool call) reads the token of the code that scheduled it via
+:func:`current_token`, bounds itself by :meth:`CancellationToken.remaining`,
+and registers an abort hook with :meth:`CancellationToken.add_callback` so a
+cancellation interrupts it rather than waiting for it to finish.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager, suppress
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+REASON_CANCELLED = "cancelled"
+REASON_DEADLINE = "deadline"
+
+_CURRENT: contextvars.ContextVar[CancellationToken | None] = contextvars.ContextVar(
+    "arcindex_cancellation_token", default=None
+)
+
+
+class CancellationError(RuntimeError):
+    """Raised when a run is cancelled."""
+
+    def __init__(self, reason: str = REASON_CANCELLED) -> None:
+        outcome = "deadline exceeded" if reason == REASON_DEADLINE else "cancelled"
+        super().__init__(f"Run {outcome}.")
+        self.reason = reason
+
+
+class DeadlineExceeded(CancellationError):
+    """Raised when a run or node runs past its deadline."""
+
+    def __init__(self) -> None:
+        super().__init__(REASON_DEADLINE)
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag with an optional deadline.
+
+    ``timeout`` (seconds) sets a deadline relative to now; a child's effective
+    deadline is the earlier of its own and its parent's.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float | None = None,
+        parent: CancellationToken | None = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._reason: str | None = None
+        self._callbacks: list[Callable[[], None]] = []
+        self._waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = []
+        self._deadline = time.monotonic() + timeout if timeout is not None else None
+        self._parent = parent
+        self._detach: Callable[[], None] | None = None
+        if parent is not None:
+            parent_deadline = parent.deadline
+            if parent_deadline is not None and (
+                self._deadline is None or parent_deadline < self._deadline
+            ):
+                self._deadline = parent_deadline
+            self._detach = parent.add_callback(
+                lambda: self.cancel(parent.reason or REASON_CANCELLED)
+            )
+
+    @property
+    def deadline(self) -> float | None:
+        """``time.monotonic()`` value after which the token counts as cancelled."""
+        return self._deadline
+
+    @property
+    def reason(self) -> str | None:
+        """``"cancelled"`` or ``"deadline"`` once cancelled, otherwise ``None``."""
+        self.is_cancelled()
+        return self._reason
+
+    def remaining(self) -> float | None:
+        """Seconds until the deadline (never negative), or ``None`` without one."""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def cancel(self, reason: str = REASON_CANCELLED) -> None:
+        """Trigger cancellation; callbacks run in the calling thread."""
+        with self._lock:
+            if self._reason is not None:
+                return
+            self._reason = reason
+            callbacks, self._callbacks = self._callbacks, []
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            with suppress(RuntimeError):  # loop already closed
+                loop.call_soon_threadsafe(_resolve, future)
+        for callback in callbacks:
+            # An abort hook that fails must not keep the others from running.
+            with suppress(Exception):
+                callback()
+
+    def is_cancelled(self) -> bool:
+        """Return True if cancellation was requested or the deadline passed."""
+        deadline = self._deadline
+        if self._reason is None and deadline is not None and time.monotonic() >= deadline:
+            self.cancel(REASON_DEADLINE)
+        return self._reason is not None
+
+    def raise_if_cancelled(self) -> None:
+        """Raise :class:`CancellationError` (or :class:`DeadlineExceeded`) if cancelled."""
+        if self.is_cancelled():
+            raise _error(self._reason)
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Call ``callback`` on cancellation (immediately if already cancelled).
+
+        Returns a function that unregisters it; callers should unregister once
+        the guarded work finishes.
+        """
+        with self._lock:
+            if self._reason is None:
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def child(self, timeout: float | None = None) -> CancellationToken:
+        """A token cancelled with this one, optionally with a tighter deadline."""
+        return CancellationToken(timeout=timeout, parent=self)
+
+    def close(self) -> None:
+        """Detach a child from its parent once the work it guarded is done."""
+        if self._detach is not None:
+            self._detach()
+            self._detach = None
+
+    async def wait(self) -> None:
+        """Await cancellation or the deadline, whichever comes first."""
+        if self.is_cancelled():
+            return
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        with self._lock:
+            if self._reason is None:
+                self._waiters.append((loop, future))
+            else:
+                future.set_result(None)
+        try:
+            remaining = self.remaining()
+            if remaining is None:
+                await future
+                return
+            try:
+                await asyncio.wait_for(asyncio.shield(future), remaining)
+            except TimeoutError:
+                self.cancel(REASON_DEADLINE)
+        finally:
+            with self._lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Await ``awaitable`` unless the token is cancelled first.
+
+        On cancellation the underlying task is cancelled and
+        :class:`CancellationError` raised without waiting for it to unwind, so
+        latency is bounded by the event loop rather than by the work.
+        """
+        self.raise_if_cancelled()
+        work = asyncio.ensure_future(awaitable)
+        waiter = asyncio.ensure_future(self.wait())
+        try:
+            await asyncio.wait({work, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            work.cancel()
+            raise
+        finally:
+            waiter.cancel()
+        if work.done():
+            return work.result()
+        work.cancel()
+        work.add_done_callback(_consume)
+        raise _error(self.reason)
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+def _consume(task: asyncio.Future[Any]) -> None:
+    # Abandoned work may still fail while unwinding; nobody is waiting for it.
+    if not task.cancelled():
+        task.exception()
+
+
+def _error(reason: str | None) -> CancellationError:
+    if reason == REASON_DEADLINE:
+        return DeadlineExceeded()
+    return CancellationError(reason or REASON_CANCELLED)
+
+
+def current_token() -> CancellationToken | None:
+    """Token governing the current task or worker thread, if any."""
+    return _CURRENT.get()
+
+
+@contextmanager
+def use_token(token: CancellationToken | None) -> Iterator[CancellationToken | None]:
+    """Make ``token`` the :func:`current_token` for the enclosed block."""
+    reset = _CURRENT.set(token)
+    try:
+        yield token
+    finally:
+        _CURRENT.reset(reset)
+
+
+@contextmanager
+def abort_on_cancel(abort: Callable[[], None]) -> Iterator[CancellationToken | None]:
+    """
+    Call ``abort`` if the current token is cancelled inside the block.
+
+    Raises :class:`CancellationError` up front when the token is already
+    cancelled, so no new request is started for abandoned work.
+    """
+    token = current_token()
+    if token is None:
+        yield None
+        return
+    token.raise_if_cancelled()
+    unregister = token.add_callback(abort)
+    try:
+        yield token
+    finally:
+        unregister()
+
+
+__all__ = [
+    "REASON_CANCELLED",
+    "REASON_DEADLINE",
+    "CancellationError",
+    "CancellationToken",
+    "DeadlineExceeded",
+    "abort_on_cancel",
+    "current_token",
+    "use_token",
+]
@@ -0,0 +1,240 @@
+"""
+Retry policies, retry budgets and a circuit breaker for transient failures.
+
+A :class:`RetryPolicy` decides whether a failed attempt is worth repeating and
+how long to back off first: exponential growth capped at ``max_delay_s``,
+randomised by ``jitter`` so concurrent runs hitting the same rate limit do not
+retry in lockstep. ``by_error`` swaps in a different policy for particular
+exception classes (named rather than imported, so provider SDKs stay
+optional), e.g. longer backoff for ``RateLimitError``.
+
+A :class:`RetryBudget` caps retries across a whole run at a fraction of first
+attempts, so a provider outage fails runs promptly instead of multiplying the
+load on it. A :class:`CircuitBreaker` guards a client: after
+``failure_threshold`` consecutive transient failures it opens and rejects
+calls with :class:`CircuitOpenError` until ``reset_timeout_s`` has passed,
+then lets a single probe through.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+
+from .cancellation import CancellationError
+
+# Status codes worth retrying: timeouts, conflicts, rate limits and server errors.
+TRANSIENT_STATUS_CODES = frozenset({408, 409, 425, 429})
+
+# Provider SDK exceptions (matched by class name along the MRO) that signal a
+# transient condition: connection failures, timeouts, throttling, 5xx.
+TRANSIENT_ERROR_NAMES = frozenset(
+    {"APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError"}
+)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a client whose circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after_s: float) -> None:
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_after_s:.1f}s.")
+        self.name = name
+        self.retry_after_s = retry_after_s
+
+
+def _error_names(error: BaseException) -> tuple[str, ...]:
+    return tuple(cls.__name__ for cls in type(error).__mro__)
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    True when ``error`` is likely to succeed on a later attempt.
+
+    Cancellations and deadlines are never transient; the attempt was stopped
+    on purpose.
+    """
+    if isinstance(error, CancellationError):
+        return False
+    if isinstance(error, (CircuitOpenError, TimeoutError, ConnectionError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in TRANSIENT_STATUS_CODES or status_code >= 500
+    return not TRANSIENT_ERROR_NAMES.isdisjoint(_error_names(error))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How often, and how patiently, to retry a failed attempt.
+
+    ``max_attempts`` counts the first attempt, so ``1`` disables retries.
+    ``jitter`` is the fraction of each delay that is randomised (``1.0`` is
+    "full jitter"). Errors are retried when :func:`is_transient` says so or
+    their class name is listed in ``retry_on``.
+    """
+
+    max_attempts: int = 3
+    base_delay_s: float = 0.5
+    max_delay_s: float = 20.0
+    multiplier: float = 2.0
+    jitter: float = 1.0
+    retry_on: tuple[str, ...] = ()
+    by_error: Mapping[str, RetryPolicy] = field(default_factory=dict, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if self.base_delay_s < 0 or self.max_delay_s < 0:
+            raise ValueError("Retry delays cannot be negative.")
+        if not 0 <= self.jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1.")
+        object.__setattr__(self, "retry_on", tuple(self.retry_on))
+
+    def for_error(self, error: BaseException) -> RetryPolicy:
+        """Policy governing ``error``: the most specific ``by_error`` match, else this one."""
+        for name in _error_names(error):
+            if name in self.by_error:
+                return self.by_error[name]
+        return self
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """True if ``attempt`` (1-based) failed with ``error`` and may be repeated."""
+        if attempt >= self.max_attempts or isinstance(error, CancellationError):
+            return False
+        return is_transient(error) or not set(self.retry_on).isdisjoint(_error_names(error))
+
+    def delay_s(self, attempt: int, rng: random.Random | None = None) -> float:
+        """Backoff before the attempt following ``attempt``."""
+        ceiling = min(self.max_delay_s, self.base_delay_s * self.multiplier ** (attempt - 1))
+        spread = ceiling * self.jitter
+        return ceiling - spread + (rng or random).random() * spread
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class RetryBudget:
+    """
+    Run-wide allowance of retries: ``minimum`` plus ``ratio`` × first attempts.
+
+    Safe to share between the concurrent nodes of a run.
+    """
+
+    def __init__(self, ratio: float = 0.2, minimum: int = 3) -> None:
+        if ratio < 0 or minimum < 0:
+            raise ValueError("Retry budget ratio and minimum cannot be negative.")
+        self._ratio = ratio
+        self._minimum = minimum
+        self._lock = threading.Lock()
+        self._attempts = 0
+        self._retries = 0
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    def record_attempt(self) -> None:
+        """Count a first attempt, which earns ``ratio`` of a retry."""
+        with self._lock:
+            self._attempts += 1
+
+    def try_spend(self) -> bool:
+        """Reserve one retry; ``False`` when the budget is exhausted."""
+        with self._lock:
+            if self._retries >= self._minimum + self._ratio * self._attempts:
+                return False
+            self._retries += 1
+            return True
+
+
+class CircuitBreaker:
+    """
+    Thread-safe consecutive-failure breaker for a client.
+
+    Only transient failures count towards opening; a client bug should fail
+    the call, not block everyone else's.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1.")
+        self.name = name
+        self._threshold = failure_threshold
+        self._reset_timeout_s = reset_timeout_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CIRCUIT_CLOSED
+        if self._clock() - self._opened_at >= self._reset_timeout_s:
+            return CIRCUIT_HALF_OPEN
+        return CIRCUIT_OPEN
+
+    def before_call(self) -> None:
+        """Raise :class:`CircuitOpenError` unless a call may proceed now."""
+        with self._lock:
+            state = self._state()
+            if state == CIRCUIT_CLOSED:
+                return
+            if state == CIRCUIT_HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            elapsed = self._clock() - (self._opened_at or 0.0)
+            raise CircuitOpenError(self.name, max(self._reset_timeout_s - elapsed, 0.0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            if not is_transient(error):
+                self._probing = False
+                return
+            self._failures += 1
+            if self._probing or self._failures >= self._threshold:
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def reset(self) -> None:
+        """Close the circuit and forget past failures."""
+        self.record_success()
+
+
+__all__ = [
+    "CIRCUIT_CLOSED",
+    "CIRCUIT_HALF_OPEN",
+    "CIRCUIT_OPEN",
+    "NO_RETRY",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RetryBudget",
+    "RetryPolicy",
+    "is_transient",
+]
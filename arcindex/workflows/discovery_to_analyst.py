@@ -8,10 +8,11 @@ Codex quickstart, pared down to Arcindex's orchestrator, discovery, and analyst
 from __future__ import annotations
 
 import os
-from typing import Any, Dict
+from typing import Any
 
 from dotenv import load_dotenv
 
+from arcindex.tools.cancellation import CancellationToken, current_token
 from scripts.codex_mcp import MCP_NAME, MCP_PARAMS, MCP_SESSION_TIMEOUT_SECONDS
 
 try:
@@ -87,15 +88,29 @@ async def run_discovery_to_analyst(
     discovery_instructions: str = DISCOVERY_INSTRUCTIONS,
     analyst_instructions: str = ANALYST_INSTRUCTIONS,
     orchestrator_instructions: str = ORCHESTRATOR_INSTRUCTIONS,
-    orchestrator_model_settings: Dict[str, Any] | None = None,
+    orchestrator_model_settings: dict[str, Any] | None = None,
+    cancel_token: CancellationToken | None = None,
+    timeout_s: float | None = None,
 ):
     """
     Execute the multi-agent workflow and return the runner result.
 
     The workflow launches Codex MCP, instantiates Arcindex personas, and orchestrates
     handoffs via the Agents SDK Runner, closely mirroring the Codex quickstart sample.
+
+    The run is abandoned with :class:`~arcindex.tools.CancellationError` when
+    ``cancel_token`` (by default the caller's current token) is cancelled or
+    ``timeout_s`` elapses; leaving the MCP server context then shuts the Codex
+    subprocess down, interrupting any tool call still in flight.
     """
     _configure_openai_from_env()
+    parent = cancel_token or current_token()
+    if parent is not None:
+        token: CancellationToken | None = parent.child(timeout_s)
+    elif timeout_s is not None:
+        token = CancellationToken(timeout=timeout_s)
+    else:
+        token = None
 
     async with MCPServerStdio(
         name=MCP_NAME,
@@ -135,13 +150,18 @@ async def run_discovery_to_analyst(
         discovery_agent.handoffs = [orchestrator_agent]
         analyst_agent.handoffs = [orchestrator_agent]
 
-        result = await Runner.run(
+        run = Runner.run(
             agent=orchestrator_agent,
             task=task,
             max_turns=max_turns,
             handoffs=[discovery_agent, analyst_agent],
         )
-        return result
+        if token is None:
+            return await run
+        try:
+            return await token.run(run)
+        finally:
+            token.close()
 
 
 def run_discovery_to_analyst_sync(
@@ -152,7 +172,8 @@ def run_discovery_to_analyst_sync(
     discovery_instructions: str = DISCOVERY_INSTRUCTIONS,
     analyst_instructions: str = ANALYST_INSTRUCTIONS,
     orchestrator_instructions: str = ORCHESTRATOR_INSTRUCTIONS,
-    orchestrator_model_settings: Dict[str, Any] | None = None,
+    orchestrator_model_settings: dict[str, Any] | None = None,
+    timeout_s: float | None = None,
 ):
     """Convenience wrapper for synchronous callers such as CLI commands."""
     import asyncio
@@ -166,5 +187,6 @@ def run_discovery_to_analyst_sync(
             analyst_instructions=analyst_instructions,
             orchestrator_instructions=orchestrator_instructions,
             orchestrator_model_settings=orchestrator_model_settings,
+            timeout_s=timeout_s,
         )
     )
@@ -5,22 +5,41 @@ Adapters that connect the Arcindex runner to HTTP/SSE consumers.
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
+from collections import Counter
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Tuple
+from typing import Any
 
+from arcindex.codec import dumps_compact
 from arcindex.orchestrator import OrchestratorController
-from arcindex.runner import ArcindexRunner, RunContext, RunResult
-
-
-def _sse_frame(event: Dict[str, Any]) -> str:
+from arcindex.runner import (
+    ArcindexRunner,
+    CancellationError,
+    RunContext,
+    RunNotFound,
+    RunProgress,
+    RunResult,
+)
+from arcindex.tools import ElicitationMenu
+
+from .scheduler import PRIORITY_INTERACTIVE, AdmissionRejected, RunScheduler, validate_priority
+from .workers import RunSpec, WorkerPool, run_summary_steps
+
+# How long a cancel request waits for the run to wind down before answering.
+# In-flight nodes are abandoned as soon as the token fires, so this only
+# covers emitting the terminal events.
+CANCEL_GRACE_SECONDS = 2.0
+
+
+def _sse_frame(event: dict[str, Any]) -> str:
     """Render an event payload as an SSE frame."""
-    return f"event: {event.get('event', 'message')}\ndata: {json.dumps(event)}\n\n"
+    return f"event: {event.get('event', 'message')}\ndata: {dumps_compact(event)}\n\n"
 
 
-def _make_queue_subscriber(queue: "asyncio.Queue[Dict[str, Any]]", loop: asyncio.AbstractEventLoop):
-    def _subscriber(payload: Dict[str, Any]) -> None:
+def _make_queue_subscriber(queue: asyncio.Queue[dict[str, Any]], loop: asyncio.AbstractEventLoop):
+    def _subscriber(payload: dict[str, Any]) -> None:
         loop.call_soon_threadsafe(queue.put_nowait, payload)
 
     return _subscriber
@@ -33,42 +52,103 @@ class RunJob:
     run_id: str
     runner: ArcindexRunner
     context: RunContext
-    queue: "asyncio.Queue[Dict[str, Any]]"
-    controller: OrchestratorController
+    queue: asyncio.Queue[dict[str, Any]]
+    controller: OrchestratorController | None
     state: MutableMapping[str, Any]
     timestamp: str
-    project_name: Optional[str]
-    expected_keys: Tuple[str, ...]
-    questionnaire: List[Dict[str, Any]]
-    answers: Dict[str, str] = field(default_factory=dict)
-    elicitation_choice: int = 1
-    task: Optional[asyncio.Task[RunResult]] = None
-    result: Optional[RunResult] = None
+    project_name: str | None
+    expected_keys: tuple[str, ...]
+    questionnaire: list[dict[str, Any]]
+    answers: dict[str, str] = field(default_factory=dict)
+    elicitation_choice: int | None = 1
+    selection: asyncio.Future[int] | None = None
+    tenant: str | None = None
+    priority: str = PRIORITY_INTERACTIVE
+    progress: RunProgress | None = None  # set when resuming an interrupted run
+    retry_after_s: float | None = None
+    task: asyncio.Task[RunResult] | None = None
+    result: RunResult | None = None
     cancelled: bool = False
     completed: bool = False
+    running: bool = False
+    ended: bool = False
 
-    def missing_keys(self) -> List[str]:
+    def missing_keys(self) -> list[str]:
         return [key for key in self.expected_keys if key not in self.answers]
 
 
 class RunJobManager:
-    """Manage active Arcindex runs for the HTTP bridge."""
-
-    def __init__(self, runtime_config: Path) -> None:
+    """
+    Manage active Arcindex runs for the HTTP bridge.
+
+    Runs execute on the bridge's event loop unless a :class:`WorkerPool` is
+    given, in which case each run, once its answers are complete, executes in
+    a worker process and its events are relayed into the job's queue.
+
+    With a :class:`RunScheduler`, ready jobs wait for a slot under its global
+    and per-tenant caps and stream ``status`` events with their queue
+    position; jobs it refuses report ``rejected`` and may be retried by
+    submitting answers again.
+
+    A job started without an ``elicitation_choice`` publishes an
+    ``elicitation_menu`` after its summary and waits for
+    :meth:`select_elicitation` (holding its scheduler slot meanwhile). With
+    ``speculate`` > 0 it applies that many of the methods users pick most
+    often in the background while it waits, so a matching selection is
+    served without another model call.
+
+    :meth:`resume_job` finishes an interrupted run's discovery graph; resumed
+    runs always execute on the bridge's event loop.
+    """
+
+    def __init__(
+        self,
+        runtime_config: Path,
+        *,
+        pool: WorkerPool | None = None,
+        scheduler: RunScheduler | None = None,
+        speculate: int = 0,
+    ) -> None:
         self._runtime_config = runtime_config
-        self._jobs: Dict[str, RunJob] = {}
+        self._jobs: dict[str, RunJob] = {}
         self._lock = asyncio.Lock()
+        self._pool = pool
+        self._scheduler = scheduler
+        self._speculate = speculate
+        self._selections: Counter[str] = Counter()
+
+    @property
+    def pool(self) -> WorkerPool | None:
+        return self._pool
+
+    @property
+    def scheduler(self) -> RunScheduler | None:
+        return self._scheduler
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, if any."""
+        if self._pool is not None:
+            self._pool.shutdown()
 
     async def start_job(
         self,
         *,
-        project_name: Optional[str],
-        answers: Optional[Dict[str, str]] = None,
-        workflow_id: Optional[str] = None,
-        operation_mode: Optional[str] = None,
-        elicitation_choice: int = 1,
-    ) -> Tuple[RunJob, str]:
-        """Create a discovery job and, when possible, launch it immediately."""
+        project_name: str | None,
+        answers: dict[str, str] | None = None,
+        workflow_id: str | None = None,
+        operation_mode: str | None = None,
+        elicitation_choice: int | None = 1,
+        tenant: str | None = None,
+        priority: str = PRIORITY_INTERACTIVE,
+    ) -> tuple[RunJob, str]:
+        """
+        Create a discovery job and, when possible, launch it immediately.
+
+        ``elicitation_choice=None`` defers the choice until after the summary
+        (see :meth:`select_elicitation`).
+        """
+        validate_priority(priority)
+        self._check_deferred_choice(elicitation_choice)
         controller = OrchestratorController.from_config_path(self._runtime_config)
         runner = ArcindexRunner(controller)
 
@@ -86,12 +166,12 @@ class RunJobManager:
         ]
         expected_keys = tuple(question.key for question, _ in questionnaire_raw)
 
-        merged_answers: Dict[str, str] = dict(answers or {})
+        merged_answers: dict[str, str] = dict(answers or {})
         if project_name and "project_name" not in merged_answers:
             merged_answers["project_name"] = project_name
 
         loop = asyncio.get_running_loop()
-        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
         context = runner.create_run(
             subscribers=[_make_queue_subscriber(queue, loop)],
             emit_phase_start=False,
@@ -112,6 +192,8 @@ class RunJobManager:
             questionnaire=questionnaire,
             answers=merged_answers,
             elicitation_choice=elicitation_choice,
+            tenant=tenant,
+            priority=priority,
         )
 
         async with self._lock:
@@ -120,17 +202,72 @@ class RunJobManager:
         status = await self._launch_if_ready(job)
         return job, status
 
-    def _on_run_complete(self, run_id: str, task: asyncio.Task[RunResult]) -> None:
+    async def resume_job(
+        self,
+        run_id: str,
+        *,
+        tenant: str | None = None,
+        priority: str = PRIORITY_INTERACTIVE,
+    ) -> tuple[RunJob | None, str]:
+        """
+        Resume an interrupted run from its run directory.
+
+        Returns ``not_found`` for an unknown run and ``completed`` for one that
+        already ended successfully; a run still active here is left alone.
+        Raises ``ValueError`` if the run did not record its discovery answers.
+        """
+        validate_priority(priority)
+        existing = await self.get_job(run_id)
+        if existing is not None and not existing.completed:
+            return existing, "running"
+
+        controller = OrchestratorController.from_config_path(self._runtime_config)
+        runner = ArcindexRunner(controller)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
         try:
-            result = task.result()
-        except Exception:  # pragma: no cover
-            result = None
+            context, progress = runner.resume_run(
+                run_id, subscribers=[_make_queue_subscriber(queue, loop)]
+            )
+        except RunNotFound:
+            return None, "not_found"
+        inputs = controller.discovery_inputs(progress.state) if progress.state else None
+        if progress.finished or progress.state is None or inputs is None:
+            context.close()
+            if progress.finished:
+                return None, "completed"
+            raise ValueError(f"Run {run_id} did not record its discovery answers; start a new run.")
+        answers, timestamp, project_name = inputs
+
+        job = RunJob(
+            run_id=run_id,
+            runner=runner,
+            context=context,
+            queue=queue,
+            controller=controller,
+            state=progress.state,
+            timestamp=timestamp,
+            project_name=project_name,
+            expected_keys=(),
+            questionnaire=[],
+            answers=answers,
+            tenant=tenant,
+            priority=priority,
+            progress=progress,
+        )
+        async with self._lock:
+            self._jobs[run_id] = job
+        return job, await self._launch_if_ready(job)
+
+    def _on_run_complete(self, run_id: str, task: asyncio.Task[RunResult]) -> None:
+        failed = task.cancelled() or task.exception() is not None
+        result = None if failed else task.result()
         job = self._jobs.get(run_id)
         if job:
             job.result = result
             job.completed = True
 
-    async def get_job(self, run_id: str) -> Optional[RunJob]:
+    async def get_job(self, run_id: str) -> RunJob | None:
         async with self._lock:
             return self._jobs.get(run_id)
 
@@ -152,9 +289,15 @@ class RunJobManager:
             await self.remove_job(run_id)
             return "cancelled"
 
-        job.runner.cancel()
         job.cancelled = True
-        await job.task
+        if not job.running:
+            job.task.cancel()  # still waiting for a scheduler slot
+        if job.selection is not None and not job.selection.done():
+            job.selection.cancel()  # waiting for an elicitation choice
+        job.runner.cancel()
+        if self._pool is not None:
+            self._pool.cancel(run_id)
+        await asyncio.wait({job.task}, timeout=CANCEL_GRACE_SECONDS)
         await self.remove_job(run_id)
         return "cancelling"
 
@@ -178,9 +321,9 @@ class RunJobManager:
     async def submit_answers(
         self,
         run_id: str,
-        answers: Dict[str, str],
+        answers: dict[str, str],
         *,
-        elicitation_choice: Optional[int] = None,
+        elicitation_choice: int | None = None,
     ) -> str:
         job = await self.get_job(run_id)
         if not job:
@@ -202,6 +345,39 @@ class RunJobManager:
         )
         return await self._launch_if_ready(job)
 
+    async def select_elicitation(self, run_id: str, choice: int) -> str:
+        """
+        Record the elicitation method for a job that deferred its choice.
+
+        Raises ``ValueError`` for a choice that is not on the menu.
+        """
+        job = await self.get_job(run_id)
+        if not job:
+            return "not_found"
+        if job.task and job.task.done():
+            return "completed"
+        option = next((opt for opt in ElicitationMenu().build() if opt.number == choice), None)
+        if option is None:
+            raise ValueError(f"Invalid elicitation selection: {choice}")
+        self._selections[option.label] += 1
+        job.elicitation_choice = choice
+        if job.selection is not None and not job.selection.done():
+            job.selection.set_result(choice)
+        return "selected"
+
+    def _check_deferred_choice(self, elicitation_choice: int | None) -> None:
+        if elicitation_choice is None and self._pool is not None:
+            raise ValueError(
+                "Choosing the elicitation method after the summary needs in-process runs; "
+                "pass elicitation_choice when the bridge uses worker processes."
+            )
+
+    async def _choose(self, job: RunJob) -> int:
+        if job.elicitation_choice is not None:
+            return job.elicitation_choice  # selected while the summary was generating
+        job.selection = asyncio.get_running_loop().create_future()
+        return await job.selection
+
     async def _launch_if_ready(self, job: RunJob) -> str:
         if job.missing_keys():
             job.queue.put_nowait(
@@ -224,56 +400,117 @@ class RunJobManager:
             }
         )
 
-        controller = job.controller
-        state = job.state
-        answers = dict(job.answers)
-        project_name = job.project_name
+        if self._scheduler is not None:
+            try:
+                self._scheduler.admit(job.tenant, job.priority)
+            except AdmissionRejected as exc:
+                # The job stays registered: resubmitting answers retries admission.
+                job.queue.put_nowait(
+                    {
+                        "event": "status",
+                        "status": "rejected",
+                        "reason": str(exc),
+                        "retry_after_s": round(exc.retry_after_s, 3),
+                    }
+                )
+                job.retry_after_s = exc.retry_after_s
+                return "rejected"
+            status = "started" if self._scheduler.has_capacity(job.tenant) else "queued"
+        else:
+            status = "started"
 
-        summary_markdown = controller.summary_markdown(answers, project_name)
-        job.queue.put_nowait(
-            {
-                "event": "summary",
-                "summary": summary_markdown,
-            }
-        )
+        task = asyncio.create_task(self._run_job(job, dict(job.answers)))
+        job.task = task
+        task.add_done_callback(functools.partial(self._on_run_complete, job.run_id))
+        return status
 
-        if job.elicitation_choice != 1:
-            options = controller.elicitation_options()
-            selected_option = next(
-                (opt for opt in options if opt.number == job.elicitation_choice),
-                None,
-            )
-            if selected_option is None:
-                raise ValueError(f"Invalid elicitation selection: {job.elicitation_choice}")
-            summary_markdown = controller.apply_elicitation(
+    async def _run_job(self, job: RunJob, answers: dict[str, str]) -> RunResult:
+        publish = job.queue.put_nowait
+        try:
+            if self._scheduler is None:
+                job.running = True
+                return await self._execute(job, answers)
+
+            def on_position(position: int, queued: int) -> None:
+                publish(
+                    {"event": "status", "status": "queued", "position": position, "queued": queued}
+                )
+
+            async with self._scheduler.slot(
+                job.run_id,
+                tenant=job.tenant,
+                priority=job.priority,
+                on_position=on_position,
+            ):
+                job.running = True
+                publish({"event": "status", "status": "running"})
+                return await self._execute(job, answers)
+        except (CancellationError, asyncio.CancelledError):
+            if not job.ended:
+                job.ended = True
+                publish({"event": "end", "status": "cancelled"})
+            raise
+        except Exception as exc:
+            if not job.ended:
+                job.ended = True
+                publish({"event": "end", "status": "error", "message": str(exc)})
+            raise
+
+    async def _execute(self, job: RunJob, answers: dict[str, str]) -> RunResult:
+        if job.progress is not None:
+            job.ended = True  # complete_discovery emits the terminal event itself
+            job.controller = None
+            return await job.runner.resume_discovery(job.context, job.progress)
+        if self._pool is not None:
+            return await self._execute_in_pool(job, answers)
+        state = job.state
+        controller = job.controller
+        assert controller is not None  # released only once the run has finished
+        try:
+            await run_summary_steps(
+                job.runner,
+                job.context,
+                controller,
                 state,
                 answers,
+                job.project_name,
                 job.elicitation_choice,
-                selected_option,
-                project_name,
+                job.queue.put_nowait,
+                choose=lambda: self._choose(job),
+                speculate=self._speculate,
+                popularity=self._selections,
             )
-            job.queue.put_nowait(
-                {
-                    "event": "elicitation",
-                    "method": selected_option.label,
-                    "description": selected_option.description,
-                    "summary": summary_markdown,
-                }
+            job.ended = True  # complete_discovery emits the terminal event itself
+            return await job.runner.complete_discovery(
+                job.context,
+                state,
+                answers,
+                job.timestamp,
+                job.project_name,
             )
+        finally:
+            job.controller = None  # help GC
 
-        async def _execute_run() -> RunResult:
-            try:
-                return await job.runner.complete_discovery(
-                    job.context,
-                    state,
-                    answers,
-                    job.timestamp,
-                    project_name,
-                )
-            finally:
-                job.controller = None  # help GC
+    async def _execute_in_pool(self, job: RunJob, answers: dict[str, str]) -> RunResult:
+        assert self._pool is not None
+        assert job.elicitation_choice is not None  # see _check_deferred_choice
+        state = job.state
+        spec = RunSpec(
+            run_id=job.run_id,
+            runtime_config=self._runtime_config,
+            state=state.materialise() if hasattr(state, "materialise") else dict(state),
+            answers=answers,
+            timestamp=job.timestamp,
+            project_name=job.project_name,
+            elicitation_choice=job.elicitation_choice,
+        )
+        # The worker opens its own emitter on the run; this process only relays.
+        job.context.close()
+        job.controller = None
 
-        task = asyncio.create_task(_execute_run())
-        job.task = task
-        task.add_done_callback(lambda t, rid=job.run_id: self._on_run_complete(rid, t))
-        return "started"
+        def relay(payload: dict[str, Any]) -> None:
+            if payload.get("event") == "end":
+                job.ended = True
+            job.queue.put_nowait(payload)
+
+        return await self._pool.submit(spec, relay)
@@ -4,56 +4,160 @@ FastAPI application exposing Arcindex runs via HTTP and SSE.
 
 from __future__ import annotations
 
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Literal
 
-from fastapi import Depends, FastAPI, HTTPException, Request, Response, status
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
+from arcindex.agents.sdk import ASYNC_OPENAI_CLIENTS
+from arcindex.config import load_runtime_config
+from arcindex.orchestrator import OrchestratorController, configure_llm_clients
+
 from .adapter import RunJobManager
-from arcindex.orchestrator import OrchestratorController
+from .scheduler import RunScheduler, SchedulerSettings
+from .workers import WorkerPool
 
 
 class BridgeSettings(BaseModel):
     """Runtime settings for the bridge."""
 
     runtime_config: Path = Field(..., description="Path to the Arcindex runtime configuration YAML.")
+    workers: int = Field(
+        0,
+        ge=0,
+        description="Worker processes executing runs; 0 runs them on the server's event loop.",
+    )
+    speculate: int = Field(
+        0,
+        ge=0,
+        description=(
+            "Elicitation methods to precompute while a user chooses; 0 disables speculation."
+        ),
+    )
 
 
 class JobRequest(BaseModel):
     """Payload for creating a discovery job."""
 
-    project_name: Optional[str] = None
-    answers: Optional[Dict[str, str]] = None
-    workflow_id: Optional[str] = None
-    operation_mode: Optional[str] = None
-    elicitation_choice: int = 1
+    project_name: str | None = None
+    answers: dict[str, str] | None = None
+    workflow_id: str | None = None
+    operation_mode: str | None = None
+    elicitation_choice: int | None = Field(
+        1,
+        description=(
+            "Elicitation menu number; null to choose after the summary "
+            "via /jobs/{run_id}/elicitation."
+        ),
+    )
+    tenant: str | None = Field(
+        None, description="Tenant whose concurrency cap the run counts against."
+    )
+    priority: Literal["interactive", "batch"] = "interactive"
 
 
 class AnswerUpdate(BaseModel):
     """Incremental answer submission payload."""
 
-    answers: Dict[str, str]
-    elicitation_choice: Optional[int] = None
+    answers: dict[str, str]
+    elicitation_choice: int | None = None
+
+
+class ElicitationSelection(BaseModel):
+    """Elicitation method chosen after the summary was shown."""
+
+    choice: int
+
+
+def _rejected(run_id: str, retry_after_s: float | None) -> JSONResponse:
+    retry_after = max(1, round(retry_after_s or 1))
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"run_id": run_id, "status": "rejected", "retry_after_s": retry_after},
+        headers={"Retry-After": str(retry_after)},
+    )
 
 
 def _default_runtime_config() -> Path:
     return Path(__file__).resolve().parent.parent / "arcindex" / "config" / "runtime.yaml"
 
 
-def create_app(runtime_config_path: Optional[Path] = None) -> FastAPI:
-    """Construct the FastAPI application."""
+def _default_workers() -> int:
+    return int(os.environ.get("ARCINDEX_BRIDGE_WORKERS", "0"))
+
+
+def _default_speculate() -> int:
+    return int(os.environ.get("ARCINDEX_BRIDGE_SPECULATE", "0"))
+
+
+def _default_scheduler() -> SchedulerSettings | None:
+    max_runs = int(os.environ.get("ARCINDEX_BRIDGE_MAX_RUNS", "0"))
+    if max_runs <= 0:
+        return None
+    budget = os.environ.get("ARCINDEX_BRIDGE_LATENCY_BUDGET")
+    return SchedulerSettings(
+        max_concurrent=max_runs,
+        max_per_tenant=int(os.environ.get("ARCINDEX_BRIDGE_TENANT_RUNS", str(max_runs))),
+        max_queue_depth=int(os.environ.get("ARCINDEX_BRIDGE_MAX_QUEUE", "64")),
+        latency_budget_s=float(budget) if budget else None,
+    )
+
+
+def create_app(
+    runtime_config_path: Path | None = None,
+    *,
+    workers: int | None = None,
+    scheduler: SchedulerSettings | None = None,
+    speculate: int | None = None,
+) -> FastAPI:
+    """
+    Construct the FastAPI application.
+
+    ``workers`` (default: ``$ARCINDEX_BRIDGE_WORKERS``, else 0) enables the
+    multi-process execution mode. ``scheduler`` caps concurrent runs; by
+    default it is configured from ``$ARCINDEX_BRIDGE_MAX_RUNS`` (plus
+    ``_TENANT_RUNS``, ``_MAX_QUEUE`` and ``_LATENCY_BUDGET``) and runs are
+    otherwise unlimited. ``speculate`` (default: ``$ARCINDEX_BRIDGE_SPECULATE``,
+    else 0) is how many elicitation methods to precompute for jobs that choose
+    theirs after the summary.
+    """
     runtime_config_path = runtime_config_path or _default_runtime_config()
-    app = FastAPI(title="Arcindex Bridge", version="0.1.0")
-    settings = BridgeSettings(runtime_config=runtime_config_path)
-    manager = RunJobManager(settings.runtime_config)
+    settings = BridgeSettings(
+        runtime_config=runtime_config_path,
+        workers=_default_workers() if workers is None else workers,
+        speculate=_default_speculate() if speculate is None else speculate,
+    )
+    configure_llm_clients(load_runtime_config(settings.runtime_config))
+    pool = WorkerPool(settings.workers) if settings.workers else None
+    scheduler = scheduler or _default_scheduler()
+    manager = RunJobManager(
+        settings.runtime_config,
+        pool=pool,
+        scheduler=RunScheduler(scheduler) if scheduler is not None else None,
+        speculate=settings.speculate,
+    )
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        if pool is not None:
+            pool.start()
+        try:
+            yield
+        finally:
+            await ASYNC_OPENAI_CLIENTS.aclose()  # in-process runs share the server loop's client
+            manager.shutdown()
+
+    app = FastAPI(title="Arcindex Bridge", version="0.1.0", lifespan=lifespan)
 
     def get_manager() -> RunJobManager:
         return manager
 
     @app.get("/discovery/questions")
-    async def list_questions() -> Dict[str, object]:
+    async def list_questions() -> dict[str, object]:
         controller = OrchestratorController.from_config_path(settings.runtime_config)
         questionnaire = controller.discovery_questionnaire(None)
         questions = [
@@ -68,18 +172,43 @@ def create_app(runtime_config_path: Optional[Path] = None) -> FastAPI:
 
     @app.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
     async def create_job(request: JobRequest, mgr: RunJobManager = Depends(get_manager)):
-        job, status_value = await mgr.start_job(
-            project_name=request.project_name,
-            answers=dict(request.answers or {}),
-            workflow_id=request.workflow_id,
-            operation_mode=request.operation_mode,
-            elicitation_choice=request.elicitation_choice,
-        )
+        try:
+            job, status_value = await mgr.start_job(
+                project_name=request.project_name,
+                answers=dict(request.answers or {}),
+                workflow_id=request.workflow_id,
+                operation_mode=request.operation_mode,
+                elicitation_choice=request.elicitation_choice,
+                tenant=request.tenant,
+                priority=request.priority,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        if status_value == "rejected":
+            return _rejected(job.run_id, job.retry_after_s)
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
             content={"run_id": job.run_id, "status": status_value},
         )
 
+    @app.post("/jobs/{run_id}/resume", status_code=status.HTTP_202_ACCEPTED)
+    async def resume_job(
+        run_id: str,
+        mgr: RunJobManager = Depends(get_manager),  # noqa: B008 - FastAPI dependency
+    ):
+        try:
+            job, status_value = await mgr.resume_job(run_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        if status_value == "not_found":
+            raise HTTPException(status_code=404, detail="Run not found")
+        if status_value == "rejected":
+            return _rejected(run_id, job.retry_after_s if job else None)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"run_id": run_id, "status": status_value},
+        )
+
     @app.post("/jobs/{run_id}/answers")
     async def submit_answers(
         run_id: str,
@@ -91,6 +220,23 @@ def create_app(runtime_config_path: Optional[Path] = None) -> FastAPI:
             dict(payload.answers),
             elicitation_choice=payload.elicitation_choice,
         )
+        if status_value == "not_found":
+            raise HTTPException(status_code=404, detail="Run not found")
+        if status_value == "rejected":
+            job = await mgr.get_job(run_id)
+            return _rejected(run_id, job.retry_after_s if job else None)
+        return {"run_id": run_id, "status": status_value}
+
+    @app.post("/jobs/{run_id}/elicitation")
+    async def select_elicitation(
+        run_id: str,
+        payload: ElicitationSelection,
+        mgr: RunJobManager = Depends(get_manager),  # noqa: B008 - FastAPI dependency
+    ):
+        try:
+            status_value = await mgr.select_elicitation(run_id, payload.choice)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
         if status_value == "not_found":
             raise HTTPException(status_code=404, detail="Run not found")
         return {"run_id": run_id, "status": status_value}
@@ -0,0 +1,268 @@
+"""
+Priority scheduling and admission control for bridge runs.
+
+Jobs whose answers are complete ask the :class:`RunScheduler` for a slot
+before executing. Slots are bounded globally and per tenant; waiting jobs
+are granted in priority order (interactive before batch, then arrival order),
+skipping jobs whose tenant is at its cap rather than blocking behind them.
+
+Admission control rejects work up front instead of letting every run time out
+under a burst: a job is refused when the queue is full, batch jobs are shed
+once the queue passes ``batch_queue_share`` of its capacity, and, with a
+``latency_budget_s``, any job whose estimated wait (queue ahead of it ×
+recent median run time ÷ slots) would exceed the budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import statistics
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+PRIORITIES = {PRIORITY_INTERACTIVE: 0, PRIORITY_BATCH: 10}
+
+DEFAULT_TENANT = "default"
+
+PositionCallback = Callable[[int, int], None]
+
+
+class AdmissionRejected(RuntimeError):
+    """Raised when the scheduler refuses a job; ``retry_after_s`` suggests when to retry."""
+
+    def __init__(self, message: str, retry_after_s: float) -> None:
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+def validate_priority(priority: str) -> str:
+    """Return ``priority`` if it is known, otherwise raise ``ValueError``."""
+    if priority not in PRIORITIES:
+        choices = ", ".join(PRIORITIES)
+        raise ValueError(f"Unknown priority '{priority}'. Expected one of: {choices}.")
+    return priority
+
+
+@dataclass(frozen=True)
+class SchedulerSettings:
+    """Caps and admission thresholds for a :class:`RunScheduler`."""
+
+    max_concurrent: int = 4
+    max_per_tenant: int = 2
+    max_queue_depth: int = 64
+    batch_queue_share: float = 0.5
+    latency_budget_s: float | None = None
+    latency_window: int = 50
+
+    def __post_init__(self) -> None:
+        if self.max_concurrent < 1 or self.max_per_tenant < 1:
+            raise ValueError("Scheduler concurrency caps must be at least 1.")
+        if self.max_queue_depth < 0:
+            raise ValueError("max_queue_depth cannot be negative.")
+        if not 0 <= self.batch_queue_share <= 1:
+            raise ValueError("batch_queue_share must be between 0 and 1.")
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    seq: int
+    job_id: str = field(compare=False)
+    tenant: str = field(compare=False)
+    future: asyncio.Future[None] = field(compare=False)
+    on_position: PositionCallback | None = field(compare=False, default=None)
+    position: int = field(compare=False, default=0)
+
+
+@dataclass
+class SchedulerStats:
+    """Point-in-time view of the scheduler."""
+
+    running: int
+    queued: int
+    running_by_tenant: dict[str, int]
+    median_latency_s: float | None
+
+
+class RunScheduler:
+    """
+    Grants execution slots to jobs on one event loop.
+
+    Use :meth:`admit` when a job becomes ready (it raises
+    :class:`AdmissionRejected`) and then hold :meth:`slot` around its
+    execution. ``on_position`` is called with ``(position, queued)`` whenever a
+    waiting job's place in line changes; position 1 is next.
+    """
+
+    def __init__(self, settings: SchedulerSettings | None = None) -> None:
+        self._settings = settings or SchedulerSettings()
+        self._waiting: list[_Waiter] = []
+        self._running: dict[str, str] = {}
+        self._latencies: deque[float] = deque(maxlen=self._settings.latency_window)
+        self._seq = itertools.count()
+
+    @property
+    def settings(self) -> SchedulerSettings:
+        return self._settings
+
+    def stats(self) -> SchedulerStats:
+        return SchedulerStats(
+            running=len(self._running),
+            queued=len(self._waiting),
+            running_by_tenant=self._tenant_counts(),
+            median_latency_s=self.median_latency_s(),
+        )
+
+    def median_latency_s(self) -> float | None:
+        """Median duration of recently completed runs."""
+        return statistics.median(self._latencies) if self._latencies else None
+
+    def has_capacity(self, tenant: str | None = None) -> bool:
+        """True when a job for ``tenant`` submitted now would start without queueing."""
+        tenant = tenant or DEFAULT_TENANT
+        return (
+            not self._waiting
+            and len(self._running) < self._settings.max_concurrent
+            and self._tenant_counts().get(tenant, 0) < self._settings.max_per_tenant
+        )
+
+    def estimated_wait_s(self, priority: str = PRIORITY_INTERACTIVE) -> float:
+        """Expected queueing delay for a new job of ``priority``, from recent latency."""
+        median = self.median_latency_s()
+        if median is None:
+            return 0.0
+        rank = PRIORITIES[validate_priority(priority)]
+        ahead = sum(1 for waiter in self._waiting if waiter.rank <= rank)
+        free = self._settings.max_concurrent - len(self._running)
+        if ahead < free:
+            return 0.0
+        return (ahead - free + 1) * median / self._settings.max_concurrent
+
+    def admit(self, tenant: str | None = None, priority: str = PRIORITY_INTERACTIVE) -> None:
+        """Raise :class:`AdmissionRejected` if a new job should be refused now."""
+        settings = self._settings
+        validate_priority(priority)
+        depth = len(self._waiting)
+        retry_after = max(self.median_latency_s() or 1.0, 1.0)
+        if depth >= settings.max_queue_depth and not self.has_capacity(tenant):
+            raise AdmissionRejected(f"Run queue is full ({depth} waiting).", retry_after)
+        batch_depth = settings.max_queue_depth * settings.batch_queue_share
+        if (
+            priority == PRIORITY_BATCH
+            and depth >= batch_depth
+            and not self.has_capacity(tenant)
+        ):
+            raise AdmissionRejected(
+                f"Shedding batch work with {depth} runs waiting.", retry_after
+            )
+        if settings.latency_budget_s is not None:
+            wait = self.estimated_wait_s(priority)
+            if wait > settings.latency_budget_s:
+                budget = settings.latency_budget_s
+                raise AdmissionRejected(
+                    f"Estimated wait {wait:.1f}s exceeds the {budget:g}s budget.", wait
+                )
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        job_id: str,
+        *,
+        tenant: str | None = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        on_position: PositionCallback | None = None,
+    ) -> AsyncIterator[None]:
+        """Wait for, then hold, an execution slot for ``job_id``."""
+        await self.acquire(job_id, tenant=tenant, priority=priority, on_position=on_position)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            yield
+        finally:
+            self.release(job_id, loop.time() - started)
+
+    async def acquire(
+        self,
+        job_id: str,
+        *,
+        tenant: str | None = None,
+        priority: str = PRIORITY_INTERACTIVE,
+        on_position: PositionCallback | None = None,
+    ) -> None:
+        """Wait until ``job_id`` may run; cancelling the wait withdraws it from the queue."""
+        waiter = _Waiter(
+            rank=PRIORITIES[validate_priority(priority)],
+            seq=next(self._seq),
+            job_id=job_id,
+            tenant=tenant or DEFAULT_TENANT,
+            future=asyncio.get_running_loop().create_future(),
+            on_position=on_position,
+        )
+        heapq.heappush(self._waiting, waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except BaseException:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(job_id)  # granted just as the wait was cancelled
+            else:
+                if waiter in self._waiting:
+                    self._waiting.remove(waiter)
+                    heapq.heapify(self._waiting)
+                self._dispatch()
+            raise
+
+    def release(self, job_id: str, duration_s: float | None = None) -> None:
+        """Free ``job_id``'s slot, recording how long it ran."""
+        if self._running.pop(job_id, None) is None:
+            return
+        if duration_s is not None:
+            self._latencies.append(duration_s)
+        self._dispatch()
+
+    def _tenant_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for tenant in self._running.values():
+            counts[tenant] = counts.get(tenant, 0) + 1
+        return counts
+
+    def _dispatch(self) -> None:
+        counts = self._tenant_counts()
+        remaining: list[_Waiter] = []
+        for waiter in sorted(self._waiting):
+            if waiter.future.done():
+                continue  # wait cancelled; acquire() is about to withdraw it
+            if (
+                len(self._running) < self._settings.max_concurrent
+                and counts.get(waiter.tenant, 0) < self._settings.max_per_tenant
+            ):
+                self._running[waiter.job_id] = waiter.tenant
+                counts[waiter.tenant] = counts.get(waiter.tenant, 0) + 1
+                waiter.future.set_result(None)
+            else:
+                remaining.append(waiter)
+        self._waiting = remaining  # sorted, so already a valid heap
+        for position, waiter in enumerate(remaining, start=1):
+            if waiter.position != position:
+                waiter.position = position
+                if waiter.on_position is not None:
+                    waiter.on_position(position, len(remaining))
+
+
+__all__ = [
+    "DEFAULT_TENANT",
+    "PRIORITIES",
+    "PRIORITY_BATCH",
+    "PRIORITY_INTERACTIVE",
+    "AdmissionRejected",
+    "RunScheduler",
+    "SchedulerSettings",
+    "SchedulerStats",
+    "validate_priority",
+]
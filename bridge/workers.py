@@ -0,0 +1,499 @@
+"""
+Process pool that executes bridge runs outside the server's event loop.
+
+The bridge collects discovery answers itself, then hands each run to a
+:class:`WorkerPool` as a picklable :class:`RunSpec`. Worker processes execute
+the run with their own :class:`~arcindex.runner.ArcindexRunner` and stream
+every event back over a shared queue, where a pump thread routes it to the
+submitting job's callback on the bridge's loop. Runs therefore use every core,
+and a run that hogs the CPU or blocks on I/O only occupies its own worker.
+
+Cancellation is broadcast to all workers over per-worker control pipes; the
+worker running (or about to pick up) the run cancels it. A worker that dies
+mid-run fails that run with :class:`WorkerCrashed` and is replaced.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import queue
+import threading
+import time
+from collections.abc import Awaitable, Callable, Mapping, MutableMapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from arcindex.agents.sdk import ASYNC_OPENAI_CLIENTS
+from arcindex.config import load_runtime_config
+from arcindex.orchestrator import (
+    ElicitationSpeculator,
+    OrchestratorController,
+    configure_llm_clients,
+)
+from arcindex.runner import ArcindexRunner, CancellationError, RunContext, RunResult
+
+EventCallback = Callable[[dict[str, Any]], None]
+
+MSG_STARTED = "started"
+MSG_EVENT = "event"
+MSG_DONE = "done"
+MSG_FAILED = "failed"
+MSG_CANCELLED = "cancelled"
+
+# How often the pump thread checks for (and replaces) dead workers.
+_POLL_SECONDS = 0.5
+_SHUTDOWN_TIMEOUT_SECONDS = 5.0
+
+
+class WorkerCrashed(RuntimeError):
+    """Raised for a run whose worker process exited before finishing it."""
+
+
+class RunFailed(RuntimeError):
+    """Raised for a run that failed inside a worker; carries the worker's error text."""
+
+
+@dataclass
+class RunSpec:
+    """Everything a worker process needs to execute a prepared discovery run."""
+
+    run_id: str
+    runtime_config: Path
+    state: MutableMapping[str, Any]
+    answers: dict[str, str]
+    timestamp: str
+    project_name: str | None = None
+    elicitation_choice: int = 1
+
+
+async def run_summary_steps(
+    runner: ArcindexRunner,
+    context: RunContext,
+    controller: OrchestratorController,
+    state: MutableMapping[str, Any],
+    answers: Mapping[str, str],
+    project_name: str | None,
+    elicitation_choice: int | None,
+    publish: EventCallback,
+    *,
+    choose: Callable[[], Awaitable[int]] | None = None,
+    speculate: int = 0,
+    popularity: Mapping[str, int] | None = None,
+) -> str:
+    """
+    Generate the discovery summary and apply the selected elicitation method.
+
+    ``publish`` receives the ``summary`` and ``elicitation`` bridge events.
+    Shared by in-process and worker execution so both stream the same events.
+
+    With no ``elicitation_choice``, an ``elicitation_menu`` event is published
+    once the summary exists and ``choose`` is awaited for the selection.
+    Meanwhile, with ``speculate`` > 0, that many likely methods (see
+    :func:`~arcindex.orchestrator.rank_options`) are applied in the
+    background so the selection can be served without waiting on the model.
+    """
+    summary_markdown = await runner.discovery_summary(context, answers, project_name)
+    publish({"event": "summary", "summary": summary_markdown})
+
+    options = controller.elicitation_options()
+    speculator: ElicitationSpeculator | None = None
+    try:
+        if elicitation_choice is None:
+            if choose is None:
+                raise ValueError("An elicitation choice or a way to ask for one is required.")
+            precomputing: list[int] = []
+            if speculate > 0:
+                speculator = ElicitationSpeculator(
+                    controller,
+                    answers,
+                    project_name,
+                    summary_markdown,
+                    top_k=speculate,
+                    popularity=popularity,
+                    cancel_token=runner.cancel_token,
+                )
+                precomputing = [option.number for option in speculator.start(options)]
+            publish(
+                {
+                    "event": "elicitation_menu",
+                    "options": [
+                        {"number": opt.number, "label": opt.label, "description": opt.description}
+                        for opt in options
+                    ],
+                    "precomputing": precomputing,
+                }
+            )
+            elicitation_choice = await choose()
+
+        if elicitation_choice != 1:
+            selected_option = next(
+                (opt for opt in options if opt.number == elicitation_choice),
+                None,
+            )
+            if selected_option is None:
+                raise ValueError(f"Invalid elicitation selection: {elicitation_choice}")
+            precomputed = await speculator.take(selected_option) if speculator else None
+            summary_markdown = await controller.aapply_elicitation(
+                state,
+                answers,
+                elicitation_choice,
+                selected_option,
+                project_name,
+                precomputed=precomputed,
+            )
+            publish(
+                {
+                    "event": "elicitation",
+                    "method": selected_option.label,
+                    "description": selected_option.description,
+                    "summary": summary_markdown,
+                    "precomputed": precomputed is not None,
+                }
+            )
+    finally:
+        if speculator is not None:
+            speculator.cancel()
+    return summary_markdown
+
+
+async def _execute_spec(
+    spec: RunSpec,
+    publish: EventCallback,
+    register: Callable[[ArcindexRunner], None],
+) -> RunResult:
+    controller = OrchestratorController.from_config_path(spec.runtime_config)
+    runner = ArcindexRunner(controller)
+    register(runner)
+    context = runner.create_run([publish], emit_phase_start=False, run_id=spec.run_id)
+    controller.resume_run_directory(context.artifact_store.run_directory, spec.state)
+    try:
+        try:
+            await run_summary_steps(
+                runner,
+                context,
+                controller,
+                spec.state,
+                spec.answers,
+                spec.project_name,
+                spec.elicitation_choice,
+                publish,
+            )
+        except BaseException:
+            context.close()
+            raise
+        return await runner.complete_discovery(
+            context,
+            spec.state,
+            spec.answers,
+            spec.timestamp,
+            spec.project_name,
+        )
+    finally:
+        await ASYNC_OPENAI_CLIENTS.aclose()  # each spec runs on a fresh loop
+
+
+def _worker_main(index: int, tasks: Any, events: Any, control: Any) -> None:
+    lock = threading.Lock()
+    current: dict[str, Any] = {"run_id": None, "runner": None}
+    cancelled: set[str] = set()
+    configured: Path | None = None
+
+    def listen() -> None:
+        while True:
+            try:
+                run_id = control.recv()
+            except (EOFError, OSError):
+                return
+            if run_id is None:
+                return
+            with lock:
+                cancelled.add(run_id)
+                if current["run_id"] == run_id and current["runner"] is not None:
+                    current["runner"].cancel()
+
+    def register(runner: ArcindexRunner) -> None:
+        with lock:
+            current["runner"] = runner
+            if current["run_id"] in cancelled:
+                runner.cancel()
+
+    threading.Thread(target=listen, name="arcindex-worker-control", daemon=True).start()
+    while True:
+        spec: RunSpec | None = tasks.get()
+        if spec is None:
+            return
+        with lock:
+            skip = spec.run_id in cancelled
+            current.update(run_id=spec.run_id, runner=None)
+        events.put((MSG_STARTED, spec.run_id, index))
+        if skip:
+            events.put((MSG_CANCELLED, spec.run_id, "cancelled"))
+            continue
+
+        def publish(payload: dict[str, Any], run_id: str = spec.run_id) -> None:
+            events.put((MSG_EVENT, run_id, dict(payload)))
+
+        try:
+            if spec.runtime_config != configured:
+                # The worker's LLM clients are process-wide, like the bridge's own.
+                configure_llm_clients(load_runtime_config(spec.runtime_config))
+                configured = spec.runtime_config
+            result = asyncio.run(_execute_spec(spec, publish, register))
+        except CancellationError as exc:
+            events.put((MSG_CANCELLED, spec.run_id, exc.reason))
+        except BaseException as exc:  # noqa: BLE001 - reported to the bridge
+            events.put((MSG_FAILED, spec.run_id, f"{type(exc).__name__}: {exc}"))
+        else:
+            events.put((MSG_DONE, spec.run_id, result))
+        finally:
+            with lock:
+                current.update(run_id=None, runner=None)
+
+
+@dataclass
+class _Worker:
+    process: Any
+    control: Any
+    run_id: str | None = None
+
+
+@dataclass
+class _Submission:
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future[RunResult]
+    on_event: EventCallback
+    worker: int | None = None
+
+
+@dataclass
+class WorkerPoolStats:
+    """Point-in-time view of pool utilisation."""
+
+    workers: int
+    alive: int
+    busy: int
+    queued: int
+    restarts: int = 0
+    running: list[str] = field(default_factory=list)
+
+
+class WorkerPool:
+    """
+    ``workers`` processes executing :class:`RunSpec` jobs.
+
+    ``start_method`` selects the multiprocessing context (``spawn``,
+    ``forkserver`` or ``fork``); the platform default is used when omitted.
+    Processes start on first use.
+    """
+
+    def __init__(self, workers: int, *, start_method: str | None = None) -> None:
+        if workers < 1:
+            raise ValueError("A worker pool needs at least one worker.")
+        self._size = workers
+        # Typed as BaseContext, which lacks the Process class every concrete context has.
+        self._ctx: Any = multiprocessing.get_context(start_method)
+        self._lock = threading.Lock()
+        self._workers: list[_Worker] = []
+        self._submissions: dict[str, _Submission] = {}
+        self._tasks: Any = None
+        self._events: Any = None
+        self._pump: threading.Thread | None = None
+        self._closed = False
+        self._restarts = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def start(self) -> None:
+        """Start the worker processes and the event pump (idempotent)."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Worker pool has been shut down.")
+            if self._pump is not None:
+                return
+            self._tasks = self._ctx.Queue()
+            self._events = self._ctx.Queue()
+            self._workers = [self._spawn(index) for index in range(self._size)]
+            self._pump = threading.Thread(
+                target=self._pump_events, name="arcindex-worker-pump", daemon=True
+            )
+            self._pump.start()
+
+    def submit(self, spec: RunSpec, on_event: EventCallback) -> asyncio.Future[RunResult]:
+        """
+        Queue ``spec`` and return a future for its result.
+
+        Must be called from the event loop that should receive ``on_event``
+        callbacks and the result. The future fails with :class:`RunFailed`,
+        :class:`WorkerCrashed` or :class:`CancellationError`.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[RunResult] = loop.create_future()
+        with self._lock:
+            if spec.run_id in self._submissions:
+                raise ValueError(f"Run {spec.run_id} is already queued.")
+            self._submissions[spec.run_id] = _Submission(loop, future, on_event)
+        self._tasks.put(spec)
+        return future
+
+    def cancel(self, run_id: str) -> None:
+        """Ask whichever worker holds ``run_id`` to cancel it."""
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            try:
+                worker.control.send(run_id)
+            except (BrokenPipeError, OSError):
+                continue
+
+    def stats(self) -> WorkerPoolStats:
+        with self._lock:
+            running = [worker.run_id for worker in self._workers if worker.run_id]
+            return WorkerPoolStats(
+                workers=self._size,
+                alive=sum(1 for worker in self._workers if worker.process.is_alive()),
+                busy=len(running),
+                queued=len(self._submissions) - len(running),
+                restarts=self._restarts,
+                running=running,
+            )
+
+    def shutdown(self, *, timeout: float = _SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """Stop the workers; runs still queued or executing fail with ``RuntimeError``."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+            started = self._pump is not None
+        if not started:
+            return
+        for worker in workers:
+            self._tasks.put(None)
+            try:
+                worker.control.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+        if self._pump is not None:
+            self._pump.join(_POLL_SECONDS * 4)
+        with self._lock:
+            pending, self._submissions = self._submissions, {}
+        for submission in pending.values():
+            error = RuntimeError("Worker pool shut down before the run finished.")
+            self._resolve(submission, error=error)
+
+    def _spawn(self, index: int) -> _Worker:
+        receiver, sender = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(index, self._tasks, self._events, receiver),
+            name=f"arcindex-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        receiver.close()
+        return _Worker(process=process, control=sender)
+
+    def _pump_events(self) -> None:
+        next_check = time.monotonic() + _POLL_SECONDS
+        while True:
+            try:
+                kind, run_id, payload = self._events.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self._closed:
+                    return
+            except (EOFError, OSError):
+                return
+            else:
+                self._dispatch(kind, run_id, payload)
+            if time.monotonic() >= next_check:
+                self._replace_dead_workers()
+                next_check = time.monotonic() + _POLL_SECONDS
+
+    def _dispatch(self, kind: str, run_id: str, payload: Any) -> None:
+        with self._lock:
+            if kind == MSG_STARTED:
+                self._workers[payload].run_id = run_id
+                submission = self._submissions.get(run_id)
+                if submission is not None:
+                    submission.worker = payload
+                return
+            if kind == MSG_EVENT:
+                submission = self._submissions.get(run_id)
+            else:
+                submission = self._submissions.pop(run_id, None)
+                for worker in self._workers:
+                    if worker.run_id == run_id:
+                        worker.run_id = None
+        if submission is None:
+            return
+        if kind == MSG_EVENT:
+            self._call(submission, submission.on_event, payload)
+        elif kind == MSG_DONE:
+            self._resolve(submission, result=payload)
+        elif kind == MSG_CANCELLED:
+            self._resolve(submission, error=CancellationError(payload))
+        else:
+            self._resolve(submission, error=RunFailed(payload))
+
+    def _replace_dead_workers(self) -> None:
+        crashed: list[tuple[str, int]] = []
+        with self._lock:
+            if self._closed:
+                return
+            for index, worker in enumerate(self._workers):
+                if worker.process.is_alive():
+                    continue
+                if worker.run_id is not None:
+                    crashed.append((worker.run_id, worker.process.exitcode))
+                worker.control.close()
+                self._workers[index] = self._spawn(index)
+                self._restarts += 1
+            submissions = [(self._submissions.pop(run_id, None), code) for run_id, code in crashed]
+        for submission, code in submissions:
+            if submission is not None:
+                self._resolve(submission, error=WorkerCrashed(f"Worker exited with code {code}."))
+
+    @staticmethod
+    def _call(submission: _Submission, fn: Callable[..., None], *args: Any) -> None:
+        try:
+            submission.loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:  # pragma: no cover - the submitting loop has closed
+            pass
+
+    def _resolve(
+        self,
+        submission: _Submission,
+        *,
+        result: RunResult | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        def settle() -> None:
+            if submission.future.done():
+                return
+            if error is not None:
+                submission.future.set_exception(error)
+            else:
+                submission.future.set_result(result)  # type: ignore[arg-type]
+
+        self._call(submission, settle)
+
+
+__all__ = [
+    "EventCallback",
+    "RunFailed",
+    "RunSpec",
+    "WorkerCrashed",
+    "WorkerPool",
+    "WorkerPoolStats",
+    "run_summary_steps",
+]
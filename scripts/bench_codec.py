@@ -0,0 +1,123 @@
+"""
+Benchmark JSON encoding and decoding across codec backends.
+
+Covers the payloads Arcindex actually serialises: a grown ``workflow.json``
+in pretty mode, a stream of run events in compact (NDJSON/SSE) mode, and
+parsing both back::
+
+    python -m scripts.bench_codec --iterations 200 --history 500 --events 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from arcindex import codec
+from arcindex.events import ArtifactEvent, BaseEvent, PhaseEvent, TokenEvent, ToolEvent
+from scripts.bench_state_writes import build_state
+
+
+def build_events(count: int) -> list[dict[str, Any]]:
+    """Return ``count`` event payloads in the mix a discovery run produces."""
+    ts = "2025-01-01T00:00:00Z"
+    payloads: list[dict[str, Any]] = []
+    for index in range(count):
+        kind = index % 10
+        event: BaseEvent
+        if kind < 7:
+            event = TokenEvent(
+                run_id="run-bench", ts=ts, agent="discovery", channel="stdout", text="déjà vu " * 4
+            )
+        elif kind < 9:
+            event = ToolEvent(
+                run_id="run-bench",
+                ts=ts,
+                name="generate_summary",
+                status="result",
+                args={"project_name": "Arcindex", "answers": {"scope": "MVP"}},
+                duration_ms=1234,
+            )
+        elif index % 20 == 9:
+            event = PhaseEvent(
+                run_id="run-bench", ts=ts, phase="discovery", status="end", meta={"round": index}
+            )
+        else:
+            event = ArtifactEvent(
+                run_id="run-bench",
+                ts=ts,
+                artifact_type="discovery_summary",
+                path="artifacts/discovery/summary.json",
+                sha256="0" * 64,
+                metadata={"sections": 9},
+            )
+        payload = event.to_dict()
+        payload["seq"] = index
+        payloads.append(payload)
+    return payloads
+
+
+def _measure(fn: Callable[[], Any], iterations: int) -> float:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(iterations: int, history: int, events: int) -> dict[str, dict[str, float]]:
+    state = build_state(history)
+    payloads = build_events(events)
+    state_text = codec.dumps_pretty(state)
+    event_lines = [codec.dumps_compact(payload) for payload in payloads]
+
+    backends = [codec.BACKEND_STDLIB]
+    try:
+        codec.set_backend(codec.BACKEND_ORJSON)
+        backends.append(codec.BACKEND_ORJSON)
+    except ValueError:
+        pass
+
+    results: dict[str, dict[str, float]] = {}
+    previous = codec.get_backend()
+    try:
+        for backend in backends:
+            codec.set_backend(backend)
+            results[backend] = {
+                "state pretty": _measure(lambda: codec.dumps_pretty(state), iterations),
+                "state loads": _measure(lambda: codec.loads(state_text), iterations),
+                "events compact": _measure(
+                    lambda: [codec.dumps_compact(p) for p in payloads], iterations
+                ),
+                "events loads": _measure(
+                    lambda: [codec.loads(line) for line in event_lines], iterations
+                ),
+            }
+    finally:
+        codec.set_backend(previous)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--history", type=int, default=200, help="Entries per growing state list.")
+    parser.add_argument("--events", type=int, default=1000, help="Events per batch.")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.history, args.events)
+    cases = list(next(iter(results.values())))
+    header = "".join(f"{backend + ' ms':>14}" for backend in results)
+    print(f"{'case':<16}{header}{'speedup':>10}")
+    for case in cases:
+        timings = [results[backend][case] for backend in results]
+        speedup = f"{timings[0] / timings[-1]:>9.1f}x" if len(timings) > 1 else ""
+        print(f"{case:<16}" + "".join(f"{value:>14.3f}" for value in timings) + speedup)
+
+
+if __name__ == "__main__":
+    main()
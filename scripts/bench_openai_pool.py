@@ -0,0 +1,89 @@
+"""
+Benchmark pooled OpenAI clients against constructing one per call.
+
+Runs ``OpenAIDiscoveryClient.generate_summary`` against the local stand-in
+for the Responses API (:mod:`scripts.fake_responses_api`), once with a pool
+that keeps no idle clients (a new ``OpenAI`` client, HTTP connection pool and
+connection per call, as before pooling) and once with the default pool::
+
+    python -m scripts.bench_openai_pool --calls 300 --concurrency 4
+
+The stand-in speaks plain HTTP on localhost, so the saving shown excludes
+the TLS handshake and network round trips a real endpoint would add to
+every fresh connection.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from arcindex.agents.pool import DEFAULT_MAX_IDLE_CLIENTS, ClientPool
+from arcindex.agents.sdk import OpenAIDiscoveryClient
+from scripts.fake_responses_api import start_server
+
+ANSWERS = {"project_name": "Bench", "project_concept": "Concept", "target_users": "Engineers"}
+
+
+def _measure(client: OpenAIDiscoveryClient, calls: int, concurrency: int) -> dict[str, float]:
+    def call(_: int) -> float:
+        start = time.perf_counter()
+        client.generate_summary(
+            answers=ANSWERS, project_name="Bench", workflow_type="greenfield-discovery"
+        )
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples: list[float] = sorted(executor.map(call, range(calls)))
+    elapsed_s = time.perf_counter() - start
+    return {
+        "calls_per_s": calls / elapsed_s if elapsed_s else float("inf"),
+        "p50_ms": statistics.median(samples),
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def run(calls: int, concurrency: int) -> dict[str, dict[str, float]]:
+    from openai import OpenAI
+
+    server = start_server()
+    results: dict[str, dict[str, float]] = {}
+    try:
+        modes = (("per-call client", 0), ("pooled", max(DEFAULT_MAX_IDLE_CLIENTS, concurrency)))
+        for mode, max_idle in modes:
+            pool = ClientPool(
+                lambda: OpenAI(api_key="bench", base_url=server.base_url, max_retries=0),
+                max_idle=max_idle,
+            )
+            client = OpenAIDiscoveryClient(client_pool=pool)
+            _measure(client, concurrency, concurrency)  # warm up imports and the pool
+            results[mode] = _measure(client, calls, concurrency)
+            stats = pool.stats()
+            results[mode]["clients"] = float(stats.created)
+            pool.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=4, help="Threads issuing calls at once.")
+    args = parser.parse_args()
+
+    results = run(args.calls, args.concurrency)
+    print(f"{'mode':<18} {'calls/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'clients':>8}")
+    for mode, stats in results.items():
+        print(
+            f"{mode:<18} {stats['calls_per_s']:>10.1f} {stats['p50_ms']:>10.3f} "
+            f"{stats['p99_ms']:>10.3f} {int(stats['clients']):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark the cost of schema validation on workflow state saves.
+
+Each iteration appends an elicitation round and bumps ``last_updated``, the
+write pattern the discovery loop produces, and compares median save latency with and
+without the template-derived schema::
+
+    python -m scripts.bench_state_validation --iterations 200 --history 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import statistics
+import tempfile
+import time
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any
+
+from arcindex.state import (
+    DURABILITY_NONE,
+    STATE_LAYOUTS,
+    WorkflowStateSchema,
+    WorkflowStateStore,
+    load_workflow_schema,
+)
+from scripts.bench_state_writes import TEMPLATE_PATH, build_state
+
+LEGACY_TEMPLATE_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "legacy"
+    / ".codex"
+    / "state"
+    / "workflow.json.template"
+)
+
+
+def _round(state: MutableMapping[str, Any], index: int) -> None:
+    state["elicitation_history"].append(
+        {
+            "phase": "discovery",
+            "timestamp": f"2025-01-02T00:{index % 60:02d}:00Z",
+            "method_selected": "2. Expand or Contract for Audience",
+            "user_response": None,
+            "applied_changes": "Adjusted tone.",
+        }
+    )
+    state["last_updated"] = f"2025-01-02T00:{index % 60:02d}:00Z"
+
+
+def _measure(
+    root: Path,
+    layout: str,
+    durability: str,
+    schema: WorkflowStateSchema,
+    base: MutableMapping[str, Any],
+    iterations: int,
+) -> dict[str, float]:
+    # Plain and validated saves alternate so disk and CPU noise hits both equally.
+    stores = {
+        "plain": WorkflowStateStore(
+            root / "plain", TEMPLATE_PATH, durability=durability, layout=layout
+        ),
+        "schema": WorkflowStateStore(
+            root / "schema", TEMPLATE_PATH, durability=durability, layout=layout, schema=schema
+        ),
+    }
+    states = {name: copy.deepcopy(base) for name in stores}
+    samples: dict[str, list[float]] = {name: [] for name in stores}
+    for name, store in stores.items():
+        store.save(states[name])
+    for index in range(iterations):
+        for name, store in stores.items():
+            _round(states[name], index)
+            start = time.perf_counter()
+            store.save(states[name])
+            samples[name].append((time.perf_counter() - start) * 1000)
+    plain = statistics.median(samples["plain"])
+    checked = statistics.median(samples["schema"])
+    return {
+        "plain_ms": plain,
+        "validated_ms": checked,
+        "overhead_pct": (checked - plain) / plain * 100 if plain else 0.0,
+    }
+
+
+def run(iterations: int, history: int, durability: str) -> dict[str, dict[str, float]]:
+    schema = load_workflow_schema(TEMPLATE_PATH, LEGACY_TEMPLATE_PATH)
+    base = build_state(history)
+    with tempfile.TemporaryDirectory() as tmp:
+        return {
+            layout: _measure(Path(tmp) / layout, layout, durability, schema, base, iterations)
+            for layout in STATE_LAYOUTS
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--history", type=int, default=200, help="Entries per growing state list.")
+    parser.add_argument(
+        "--durability", default="fsync", help=f"Durability level (e.g. {DURABILITY_NONE})."
+    )
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.history, args.durability)
+    print(f"{'layout':<12} {'plain p50':>10} {'schema p50':>10} {'overhead':>10}")
+    for layout, stats in results.items():
+        print(
+            f"{layout:<12} {stats['plain_ms']:>10.3f} {stats['validated_ms']:>10.3f} "
+            f"{stats['overhead_pct']:>9.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark workflow state saves across durability levels.
+
+Compares the legacy truncate-in-place write with the atomic writer at each
+durability level using a realistic, grown ``workflow.json``::
+
+    python -m scripts.bench_state_writes --iterations 200 --history 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, MutableMapping
+from pathlib import Path
+from typing import Any
+
+from arcindex.state import DURABILITY_LEVELS, WorkflowStateStore
+
+TEMPLATE_PATH = (
+    Path(__file__).resolve().parent.parent / "arcindex" / "state" / "workflow_template.json"
+)
+
+
+def build_state(history: int) -> MutableMapping[str, Any]:
+    """Return a workflow state grown to ``history`` entries per append-only section."""
+    state = json.loads(TEMPLATE_PATH.read_text(encoding="utf-8"))
+    state["workflow_id"] = "arcindex-bench"
+    state["elicitation_history"] = [
+        {
+            "phase": "discovery",
+            "timestamp": f"2025-01-01T00:{index % 60:02d}:00Z",
+            "method_selected": "3. Critique and Refine",
+            "user_response": "Looks good, tighten the scope section." * 3,
+            "applied_changes": "Refined scope and success criteria.",
+        }
+        for index in range(history)
+    ]
+    state["violation_log"] = [
+        {"rule": f"R{index}", "severity": "minor"} for index in range(history)
+    ]
+    state["execution_reports"] = [{"task": index, "status": "ok"} for index in range(history)]
+    return state
+
+
+def _legacy_save(path: Path, state: MutableMapping[str, Any]) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2, sort_keys=True)
+
+
+def _measure(save: Callable[[], None], iterations: int) -> dict[str, float]:
+    samples: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        save()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    total_s = sum(samples) / 1000
+    return {
+        "ops_per_s": iterations / total_s if total_s else float("inf"),
+        "p50_ms": statistics.median(samples),
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def run(iterations: int, history: int) -> dict[str, dict[str, float]]:
+    state = build_state(history)
+    results: dict[str, dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        legacy_path = root / "legacy" / "workflow.json"
+        legacy_path.parent.mkdir()
+        results["truncate (legacy)"] = _measure(
+            lambda: _legacy_save(legacy_path, state), iterations
+        )
+        for level in DURABILITY_LEVELS:
+            store = WorkflowStateStore(root / level, TEMPLATE_PATH, durability=level)
+            results[f"atomic/{level}"] = _measure(
+                functools.partial(store.save, state), iterations
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--history", type=int, default=200, help="Entries per growing state list.")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.history)
+    print(f"{'mode':<20} {'ops/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for mode, stats in results.items():
+        print(
+            f"{mode:<20} {stats['ops_per_s']:>10.1f} "
+            f"{stats['p50_ms']:>10.3f} {stats['p99_ms']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
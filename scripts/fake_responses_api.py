@@ -0,0 +1,395 @@
+"""
+Local stand-in for the OpenAI Responses API, for offline load and latency tests.
+
+Serves ``POST /v1/responses`` with templated markdown, both as a single JSON
+response and, for ``stream: true``, as the server-sent events the SDK parses
+(``response.created``, ``response.output_text.delta``, ...,
+``response.completed``). Timing and failures are configurable:
+
+* latency before the first byte, ``fixed``, ``uniform`` (``latency_ms`` ±
+  ``jitter_ms``) or ``lognormal`` (median ``latency_ms``, spread ``jitter_ms``);
+* streaming cadence: ``chunk_tokens`` words per delta, ``chunk_interval_ms``
+  apart;
+* injected ``500`` errors and ``429`` rate limits (with ``retry-after-ms``) at
+  the given rates.
+
+Every response reports ``usage`` token counts (estimated like prompt budgets,
+see :func:`arcindex.agents.budget.estimate_tokens`), and ``GET /stats`` returns
+running totals. Point the SDK, and therefore the bridge or any other entry
+point, at it through the environment::
+
+    python -m scripts.fake_responses_api --port 8787 --latency-ms 800 \\
+        --latency-dist lognormal --jitter-ms 400 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8787/v1 OPENAI_API_KEY=fake \\
+        uvicorn --factory bridge.app:create_app --port 8000
+
+The template is ``str.format`` text with ``{model}``, ``{request}`` (a per
+server request counter) and ``{input_tokens}`` fields; ``--output-tokens``
+pads it with filler prose to about that many tokens.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import re
+import socket
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from arcindex.agents.budget import estimate_tokens
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+DEFAULT_TEMPLATE = """# Discovery Summary
+
+## Project Name
+Stand-in project (response {request} from {model})
+
+## Concept
+A deterministic summary served by the local Responses API stand-in.
+
+## Target Users
+Engineers benchmarking Arcindex offline.
+
+## Success Criteria
+Latency and throughput measured without the live API.
+
+## Recommended Next Steps
+- Compare the numbers against a run on the live API.
+"""
+
+_FILLER = (
+    "The stand-in pads this section with neutral prose so responses reach a "
+    "realistic length and streams take a realistic time to finish. "
+)
+_WORDS = re.compile(r"\S+\s*")
+
+
+@dataclass
+class FakeResponsesConfig:
+    """How the stand-in times, shapes and fails its responses."""
+
+    latency_ms: float = 0.0
+    latency_dist: str = "fixed"
+    jitter_ms: float = 0.0
+    chunk_tokens: int = 4
+    chunk_interval_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_ms: int = 1000
+    template: str = DEFAULT_TEMPLATE
+    output_tokens: int | None = None
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.latency_dist not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_dist must be one of {', '.join(LATENCY_DISTRIBUTIONS)}.")
+        if self.chunk_tokens < 1:
+            raise ValueError("chunk_tokens must be positive.")
+        if not 0 <= self.error_rate + self.rate_limit_rate <= 1:
+            raise ValueError("error_rate and rate_limit_rate must add up to at most 1.")
+
+
+@dataclass
+class FakeResponsesStats:
+    """Running totals of what the stand-in served."""
+
+    requests: int = 0
+    streamed: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class FakeResponsesServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the stand-in's config, randomness and totals."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: FakeResponsesConfig) -> None:
+        super().__init__(address, _ResponsesHandler)
+        self.config = config
+        self._random = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._stats = FakeResponsesStats()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        if isinstance(host, bytes):  # typeshed allows bytes for AF_UNIX addresses
+            host = host.decode()
+        return f"http://{host}:{port}/v1"
+
+    def stats(self) -> FakeResponsesStats:
+        with self._lock:
+            return FakeResponsesStats(**asdict(self._stats))
+
+    def _admit(self, *, stream: bool) -> tuple[int | None, float, int]:
+        """Outcome (an error status or ``None``), first-byte delay in seconds and request number."""
+        config = self.config
+        with self._lock:
+            self._stats.requests += 1
+            number = self._stats.requests
+            roll = self._random.random()
+            status: int | None = None
+            if roll < config.rate_limit_rate:
+                status = 429
+                self._stats.rate_limited += 1
+            elif roll < config.rate_limit_rate + config.error_rate:
+                status = 500
+                self._stats.errors += 1
+            elif stream:
+                self._stats.streamed += 1
+            delay_ms = self._latency_ms()
+        return status, max(0.0, delay_ms) / 1000, number
+
+    def _latency_ms(self) -> float:
+        config = self.config
+        if config.latency_dist == "uniform":
+            return self._random.uniform(
+                config.latency_ms - config.jitter_ms, config.latency_ms + config.jitter_ms
+            )
+        if config.latency_dist == "lognormal" and config.latency_ms > 0:
+            sigma = config.jitter_ms / config.latency_ms
+            return config.latency_ms * math.exp(self._random.gauss(0.0, sigma))
+        return config.latency_ms
+
+    def _account(self, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            self._stats.input_tokens += input_tokens
+            self._stats.output_tokens += output_tokens
+
+
+class _ResponsesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    server: FakeResponsesServer
+
+    def setup(self) -> None:
+        super().setup()
+        # Send each streamed event as it is written, as the real API does,
+        # rather than letting Nagle's algorithm batch small writes.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") != "/stats":
+            self._send_json(404, _error("not_found", f"No route for GET {self.path}."))
+            return
+        self._send_json(200, asdict(self.server.stats()))
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.rstrip("/") != "/v1/responses":
+            self._send_json(404, _error("not_found", f"No route for POST {self.path}."))
+            return
+        request = json.loads(body or b"{}")
+        stream = bool(request.get("stream"))
+        status, delay_s, number = self.server._admit(stream=stream)
+        time.sleep(delay_s)
+        if status == 429:
+            headers = {"retry-after-ms": str(self.server.config.retry_after_ms)}
+            self._send_json(429, _error("rate_limit_exceeded", "Rate limit reached."), headers)
+            return
+        if status is not None:
+            self._send_json(status, _error("server_error", "Injected server error."))
+            return
+
+        model = str(request.get("model", "gpt-4.1-mini"))
+        input_tokens = estimate_tokens(_input_text(request.get("input")))
+        text = _render(self.server.config, model=model, request=number, input_tokens=input_tokens)
+        output_tokens = estimate_tokens(text)
+        self.server._account(input_tokens, output_tokens)
+        response = _response(f"resp_{number}", model, text, input_tokens, output_tokens)
+        if stream:
+            self._stream(response, text)
+        else:
+            self._send_json(200, response)
+
+    def _stream(self, response: dict[str, Any], text: str) -> None:
+        config = self.server.config
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        first_delta = True
+        try:
+            for event in _stream_events(response, text, config.chunk_tokens):
+                if event["type"] == "response.output_text.delta":
+                    if not first_delta:
+                        time.sleep(config.chunk_interval_ms / 1000)
+                    first_delta = False
+                payload = json.dumps(event)
+                self.wfile.write(f"event: {event['type']}\ndata: {payload}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client cancelled the stream
+
+    def _send_json(
+        self, status: int, document: Mapping[str, Any], headers: Mapping[str, str] | None = None
+    ) -> None:
+        body = json.dumps(document).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _error(code: str, message: str) -> dict[str, Any]:
+    return {"error": {"message": message, "type": code, "code": code, "param": None}}
+
+
+def _input_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "\n".join(
+            _input_text(item.get("content")) for item in value if isinstance(item, dict)
+        )
+    return ""
+
+
+def _render(config: FakeResponsesConfig, **fields: Any) -> str:
+    text = config.template.format(**fields)
+    if config.output_tokens is not None:
+        while estimate_tokens(text) < config.output_tokens:
+            text += _FILLER
+    return text
+
+
+def _response(
+    response_id: str, model: str, text: str, input_tokens: int, output_tokens: int
+) -> dict[str, Any]:
+    return {
+        "id": response_id,
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": model,
+        "status": "completed",
+        "output": [
+            {
+                "id": f"msg_{response_id}",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+    }
+
+
+def _stream_events(
+    response: dict[str, Any], text: str, chunk_tokens: int
+) -> Iterator[dict[str, Any]]:
+    item_id = response["output"][0]["id"]
+    in_progress = {**response, "status": "in_progress", "output": [], "usage": None}
+    words = _WORDS.findall(text)
+    chunks = [
+        "".join(words[index : index + chunk_tokens]) for index in range(0, len(words), chunk_tokens)
+    ]
+    events: list[dict[str, Any]] = [{"type": "response.created", "response": in_progress}]
+    for chunk in chunks:
+        events.append(
+            {
+                "type": "response.output_text.delta",
+                "item_id": item_id,
+                "output_index": 0,
+                "content_index": 0,
+                "delta": chunk,
+                "logprobs": [],
+            }
+        )
+    events.append(
+        {
+            "type": "response.output_text.done",
+            "item_id": item_id,
+            "output_index": 0,
+            "content_index": 0,
+            "text": text,
+            "logprobs": [],
+        }
+    )
+    events.append({"type": "response.completed", "response": response})
+    for sequence_number, event in enumerate(events, start=1):
+        yield {**event, "sequence_number": sequence_number}
+
+
+def start_server(
+    config: FakeResponsesConfig | None = None, *, host: str = "127.0.0.1", port: int = 0
+) -> FakeResponsesServer:
+    """Serve the stand-in on a background thread (an ephemeral port by default)."""
+    server = FakeResponsesServer((host, port), config or FakeResponsesConfig())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Typical time to first byte.")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Spread of the latency.")
+    parser.add_argument("--chunk-tokens", type=int, default=4, help="Words per streamed delta.")
+    parser.add_argument("--chunk-interval-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 500 responses.")
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Share of 429 responses."
+    )
+    parser.add_argument("--retry-after-ms", type=int, default=1000)
+    parser.add_argument("--template", type=Path, help="File with the markdown template to serve.")
+    parser.add_argument(
+        "--output-tokens", type=int, help="Pad responses to about this many tokens."
+    )
+    parser.add_argument("--seed", type=int, help="Seed latency and failure sampling.")
+    args = parser.parse_args()
+
+    config = FakeResponsesConfig(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        jitter_ms=args.jitter_ms,
+        chunk_tokens=args.chunk_tokens,
+        chunk_interval_ms=args.chunk_interval_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_ms=args.retry_after_ms,
+        template=args.template.read_text(encoding="utf-8") if args.template else DEFAULT_TEMPLATE,
+        output_tokens=args.output_tokens,
+        seed=args.seed,
+    )
+    server = FakeResponsesServer((args.host, args.port), config)
+    print(f"Fake Responses API on {server.base_url} (stats at {server.base_url[:-3]}/stats)")
+    print(f"  OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=fake")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()